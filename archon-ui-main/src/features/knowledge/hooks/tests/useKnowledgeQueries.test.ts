@@ -2,6 +2,8 @@ import { QueryClient, QueryClientProvider } from "@tanstack/react-query";
 import { renderHook, waitFor } from "@testing-library/react";
 import React from "react";
 import { beforeEach, describe, expect, it, vi } from "vitest";
+import { progressKeys } from "../../../progress/hooks/useProgressQueries";
+import type { ActiveOperationsResponse } from "../../../progress/types";
 import type { KnowledgeItemsResponse } from "../../types";
 import { knowledgeKeys, useCrawlUrl, useDeleteKnowledgeItem, useUploadDocument } from "../useKnowledgeQueries";
 
@@ -151,6 +153,38 @@ describe("useKnowledgeQueries", () => {
       });
     });
 
+    it("should track a background deletion as an active operation", async () => {
+      const { knowledgeService } = await import("../../services");
+      vi.mocked(knowledgeService.deleteKnowledgeItem).mockResolvedValue({
+        success: true,
+        message: "Started deletion of knowledge item source-1",
+        progressId: "delete-123",
+      });
+
+      const queryClient = new QueryClient({
+        defaultOptions: {
+          queries: { retry: false },
+          mutations: { retry: false },
+        },
+      });
+      const invalidateSpy = vi.spyOn(queryClient, "invalidateQueries");
+      const wrapper = ({ children }: { children: React.ReactNode }) =>
+        React.createElement(QueryClientProvider, { client: queryClient }, children);
+
+      const { result } = renderHook(() => useDeleteKnowledgeItem(), { wrapper });
+
+      await result.current.mutateAsync("source-1");
+
+      const active = queryClient.getQueryData<ActiveOperationsResponse>(progressKeys.active());
+      expect(active?.operations[0]).toMatchObject({
+        operation_id: "delete-123",
+        operation_type: "source_deletion",
+        source_id: "source-1",
+      });
+      // Summaries are not refetched while the deletion is still running
+      expect(invalidateSpy).not.toHaveBeenCalledWith({ queryKey: knowledgeKeys.summariesPrefix() });
+    });
+
     it("should handle deletion error", async () => {
       const { knowledgeService } = await import("../../services");
       vi.mocked(knowledgeService.deleteKnowledgeItem).mockRejectedValue(new Error("Deletion failed"));
@@ -4,7 +4,7 @@
  */
 
 import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
-import { useMemo, useState } from "react";
+import { useCallback, useEffect, useMemo, useRef, useState } from "react";
 import { useSmartPolling } from "@/features/shared/hooks";
 import { useToast } from "@/features/shared/hooks/useToast";
 import { createOptimisticEntity, createOptimisticId } from "@/features/shared/utils/optimistic";
@@ -546,9 +546,41 @@ export function useDeleteKnowledgeItem() {
       const errorMessage = error instanceof Error ? error.message : "Failed to delete item";
       showToast(errorMessage, "error");
     },
-    onSuccess: (data) => {
+    onSuccess: (data, sourceId) => {
       showToast(data.message || "Item deleted successfully", "success");
 
+      if (data.progressId) {
+        // Deletion runs in the background - track it so summaries keep the item hidden
+        // until it finishes (refetching now would bring the item back)
+        const deleteOperation: ActiveOperation = {
+          operation_id: data.progressId,
+          operation_type: "source_deletion",
+          status: "starting",
+          progress: 0,
+          message: data.message,
+          started_at: new Date().toISOString(),
+          progressId: data.progressId,
+          type: "source_deletion",
+          source_id: sourceId,
+        };
+        queryClient.setQueryData<ActiveOperationsResponse>(progressKeys.active(), (old) => {
+          if (!old) {
+            return {
+              operations: [deleteOperation],
+              count: 1,
+              timestamp: new Date().toISOString(),
+            };
+          }
+          return {
+            ...old,
+            operations: [deleteOperation, ...old.operations],
+            count: old.count + 1,
+          };
+        });
+        queryClient.invalidateQueries({ queryKey: progressKeys.active() });
+        return;
+      }
+
       // Invalidate summaries to reconcile with server
       queryClient.invalidateQueries({ queryKey: knowledgeKeys.summariesPrefix() });
       // Also invalidate detail views
@@ -739,18 +771,51 @@ export function useKnowledgeSummaries(filter?: KnowledgeItemsFilter) {
     }));
   }, [activeOperationsData]);
 
+  // Sources with a background deletion still running stay hidden until it finishes
+  const deletingSourceIds = useMemo(
+    () =>
+      activeOperations
+        .filter((op) => op.operation_type === "source_deletion" && op.source_id)
+        .map((op) => op.source_id as string),
+    [activeOperations],
+  );
+
+  const hideDeletingSources = useCallback(
+    (data: KnowledgeItemsResponse): KnowledgeItemsResponse => {
+      if (deletingSourceIds.length === 0) return data;
+      const items = data.items.filter((item) => !deletingSourceIds.includes(item.source_id));
+      const removed = data.items.length - items.length;
+      if (removed === 0) return data;
+      return { ...data, items, total: Math.max(0, (data.total ?? data.items.length) - removed) };
+    },
+    [deletingSourceIds],
+  );
+
   // Fetch summaries with smart polling when there are active operations
   const { refetchInterval } = useSmartPolling(hasActiveOperations ? STALE_TIMES.frequent : STALE_TIMES.normal);
 
   const summaryQuery = useQuery<KnowledgeItemsResponse>({
     queryKey: knowledgeKeys.summaries(filter),
     queryFn: () => knowledgeService.getKnowledgeSummaries(filter),
+    select: hideDeletingSources,
     refetchInterval: hasActiveOperations ? refetchInterval : false, // Poll when ANY operations are active
     refetchOnWindowFocus: true,
     staleTime: STALE_TIMES.normal, // Consider data stale after 30 seconds
   });
 
-  // When operations complete, remove them from tracking
+  // When a deletion finishes, reconcile with the server (the item is gone, or back if it failed)
+  const queryClient = useQueryClient();
+  const previousDeletingIds = useRef<string[]>([]);
+  useEffect(() => {
+    const finished = previousDeletingIds.current.some((id) => !deletingSourceIds.includes(id));
+    previousDeletingIds.current = deletingSourceIds;
+    if (finished) {
+      queryClient.invalidateQueries({ queryKey: knowledgeKeys.summariesPrefix() });
+      queryClient.invalidateQueries({ queryKey: knowledgeKeys.all });
+    }
+  }, [deletingSourceIds, queryClient]);
+
+  // When other operations complete, remove them from tracking
   // Trust smart polling to handle eventual consistency - no manual invalidation needed
   // Active operations are already tracked and polling handles updates when operations complete
 
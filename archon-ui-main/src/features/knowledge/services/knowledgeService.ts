@@ -52,12 +52,15 @@ export const knowledgeService = {
   },
 
   /**
-   * Delete a knowledge item
+   * Delete a knowledge item (runs in the background; progress is tracked under progressId)
    */
-  async deleteKnowledgeItem(sourceId: string): Promise<{ success: boolean; message: string }> {
-    const response = await callAPIWithETag<{ success: boolean; message: string }>(`/api/knowledge-items/${sourceId}`, {
-      method: "DELETE",
-    });
+  async deleteKnowledgeItem(sourceId: string): Promise<{ success: boolean; message: string; progressId?: string }> {
+    const response = await callAPIWithETag<{ success: boolean; message: string; progressId?: string }>(
+      `/api/knowledge-items/${sourceId}`,
+      {
+        method: "DELETE",
+      },
+    );
 
     return response;
   },
@@ -0,0 +1,80 @@
+-- =====================================================
+-- Add archon_embedding_cache table for content-addressed embedding reuse
+-- =====================================================
+-- This migration adds a persistent cache in front of the embedding providers
+-- so that recrawls only pay for chunks whose text actually changed.
+--
+-- Features:
+-- - Vectors keyed by hash of (provider, model, dimensions, text)
+-- - Size-bounded with least-recently-used eviction
+-- - Settings to enable/disable the cache and set its size bound
+-- =====================================================
+
+-- Create archon_embedding_cache table
+CREATE TABLE IF NOT EXISTS archon_embedding_cache (
+    -- SHA256 of provider|model|dimensions|sha256(text)
+    cache_key TEXT PRIMARY KEY,
+
+    -- Scope of the cached vector
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    dimensions INT NOT NULL,
+
+    -- Vector stored as a plain float array so any dimension fits
+    embedding REAL[] NOT NULL,
+
+    -- Timestamps
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    last_accessed_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Index used by LRU eviction
+CREATE INDEX IF NOT EXISTS idx_archon_embedding_cache_last_accessed ON archon_embedding_cache(last_accessed_at);
+
+-- Evict least-recently-used entries beyond max_entries, returning the number removed
+CREATE OR REPLACE FUNCTION prune_archon_embedding_cache(max_entries INTEGER)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    removed INTEGER;
+BEGIN
+    DELETE FROM archon_embedding_cache
+    WHERE cache_key IN (
+        SELECT cache_key
+        FROM archon_embedding_cache
+        ORDER BY last_accessed_at DESC
+        OFFSET GREATEST(max_entries, 0)
+    );
+    GET DIAGNOSTICS removed = ROW_COUNT;
+    RETURN removed;
+END;
+$$;
+
+-- Add comments to document the table structure
+COMMENT ON TABLE archon_embedding_cache IS 'Content-addressed cache of embedding vectors reused across recrawls';
+COMMENT ON COLUMN archon_embedding_cache.cache_key IS 'SHA256 of provider, model, dimensions and the SHA256 of the embedded text';
+COMMENT ON COLUMN archon_embedding_cache.embedding IS 'Embedding vector as returned by the provider';
+COMMENT ON COLUMN archon_embedding_cache.last_accessed_at IS 'Last hit or write, used for LRU eviction';
+
+-- Enable RLS on archon_embedding_cache (service role only)
+ALTER TABLE archon_embedding_cache ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow service role full access to archon_embedding_cache" ON archon_embedding_cache;
+CREATE POLICY "Allow service role full access to archon_embedding_cache" ON archon_embedding_cache
+    FOR ALL USING (auth.role() = 'service_role');
+
+-- Embedding cache settings
+INSERT INTO archon_settings (key, value, is_encrypted, category, description) VALUES
+('EMBEDDING_CACHE_ENABLED', 'true', false, 'rag_strategy', 'Reuse embeddings for unchanged text across crawls instead of re-embedding it'),
+('EMBEDDING_CACHE_MAX_ENTRIES', '500000', false, 'rag_strategy', 'Maximum number of cached embeddings before least-recently-used entries are evicted')
+ON CONFLICT (key) DO NOTHING;
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '012_add_embedding_cache')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
@@ -0,0 +1,28 @@
+-- =====================================================
+-- Add content hashes to pages and chunks for incremental recrawls
+-- =====================================================
+-- This migration stores a SHA256 of each page's markdown and each chunk's
+-- text so a refresh can skip unchanged pages and only re-embed the chunks
+-- that actually changed.
+--
+-- Rows written before this migration have a NULL hash and are treated as
+-- changed on their next refresh.
+-- =====================================================
+
+ALTER TABLE archon_page_metadata
+ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+ALTER TABLE archon_crawled_pages
+ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+COMMENT ON COLUMN archon_page_metadata.content_hash IS 'SHA256 of full_content, used to skip unchanged pages on refresh';
+COMMENT ON COLUMN archon_crawled_pages.content_hash IS 'SHA256 of the raw chunk text (before contextual enrichment), used to skip unchanged chunks on refresh';
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '013_add_content_hashes')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
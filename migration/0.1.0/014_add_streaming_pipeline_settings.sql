@@ -0,0 +1,22 @@
+-- =====================================================
+-- Add streaming crawl pipeline settings
+-- =====================================================
+-- Sitemap and recursive crawls now chunk, embed and store pages in small
+-- batches while the crawler keeps fetching. These settings control the
+-- batch size and how many crawled pages may wait for storage.
+-- =====================================================
+
+INSERT INTO archon_settings (key, value, is_encrypted, category, description) VALUES
+('STREAMING_PIPELINE_ENABLED', 'true', false, 'rag_strategy', 'Store sitemap and recursive crawl pages while crawling instead of after the crawl finishes'),
+('STREAMING_BATCH_PAGES', '10', false, 'rag_strategy', 'Number of crawled pages chunked, embedded and stored together by the streaming pipeline'),
+('STREAMING_QUEUE_SIZE', '50', false, 'rag_strategy', 'Maximum crawled pages waiting for storage before the crawler is paused')
+ON CONFLICT (key) DO NOTHING;
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '014_add_streaming_pipeline_settings')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
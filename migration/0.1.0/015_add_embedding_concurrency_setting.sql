@@ -0,0 +1,20 @@
+-- =====================================================
+-- Add concurrent embedding sub-batch setting
+-- =====================================================
+-- Embedding sub-batches are now sent to the provider concurrently, with the
+-- batch size adapting to latency and rate limits. This setting caps how many
+-- sub-batches may be in flight for a single embedding call.
+-- =====================================================
+
+INSERT INTO archon_settings (key, value, is_encrypted, category, description) VALUES
+('EMBEDDING_MAX_IN_FLIGHT', '4', false, 'rag_strategy', 'Maximum embedding sub-batches sent to the provider at the same time (1-16)')
+ON CONFLICT (key) DO NOTHING;
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '015_add_embedding_concurrency_setting')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
@@ -0,0 +1,21 @@
+-- =====================================================
+-- Add reranking backend settings
+-- =====================================================
+-- Cross-encoder reranking can run on an ONNX export of the model (for
+-- example the int8-quantized CPU build) instead of PyTorch, which cuts
+-- reranking latency substantially on CPU-only hosts.
+-- =====================================================
+
+INSERT INTO archon_settings (key, value, is_encrypted, category, description) VALUES
+('RERANKING_BACKEND', 'torch', false, 'rag_strategy', 'Cross-encoder backend for reranking: torch, onnx or openvino (onnx/openvino need the optimum extras)'),
+('RERANKING_ONNX_FILE', 'onnx/model_qint8_avx2.onnx', false, 'rag_strategy', 'ONNX model file loaded when RERANKING_BACKEND is onnx (int8-quantized by default)')
+ON CONFLICT (key) DO NOTHING;
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '016_add_reranking_backend_settings')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
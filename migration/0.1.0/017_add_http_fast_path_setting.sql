@@ -0,0 +1,20 @@
+-- =====================================================
+-- Add HTTP fast path crawl setting
+-- =====================================================
+-- Single-page and batch crawls now try a plain HTTP GET before launching the
+-- headless browser. Pages that look JavaScript-rendered or come back too thin
+-- still go through the browser. This setting turns the fast path off.
+-- =====================================================
+
+INSERT INTO archon_settings (key, value, is_encrypted, category, description) VALUES
+('CRAWL_HTTP_FAST_PATH', 'true', false, 'rag_strategy', 'Fetch static pages over plain HTTP and only use the browser for JavaScript-rendered pages')
+ON CONFLICT (key) DO NOTHING;
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '017_add_http_fast_path_setting')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
@@ -0,0 +1,29 @@
+-- =====================================================
+-- Add HTTP cache validators to stored pages
+-- =====================================================
+-- This migration stores the ETag and Last-Modified response headers of each
+-- crawled page. Incremental recrawls send them back as conditional requests,
+-- and pages answered with 304 Not Modified skip markdown generation,
+-- chunking and embedding entirely.
+--
+-- Rows written before this migration have no validators and are fetched
+-- unconditionally on their next refresh.
+-- =====================================================
+
+ALTER TABLE archon_page_metadata
+ADD COLUMN IF NOT EXISTS http_etag TEXT;
+
+ALTER TABLE archon_page_metadata
+ADD COLUMN IF NOT EXISTS http_last_modified TEXT;
+
+COMMENT ON COLUMN archon_page_metadata.http_etag IS 'ETag response header from the last crawl, sent as If-None-Match on refresh';
+COMMENT ON COLUMN archon_page_metadata.http_last_modified IS 'Last-Modified response header from the last crawl, sent as If-Modified-Since on refresh';
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '018_add_page_http_validators')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
@@ -0,0 +1,20 @@
+-- =====================================================
+-- Add per-host crawl concurrency setting
+-- =====================================================
+-- Recursive crawls now pull pages from a priority frontier with a continuous
+-- in-flight window instead of crawling depth by depth. This setting caps how
+-- many pages of one host are in flight at once (0 = CRAWL_MAX_CONCURRENT).
+-- =====================================================
+
+INSERT INTO archon_settings (key, value, is_encrypted, category, description) VALUES
+('CRAWL_MAX_PER_HOST', '0', false, 'rag_strategy', 'Maximum pages of one host crawled in parallel during recursive crawls (0 = same as CRAWL_MAX_CONCURRENT)')
+ON CONFLICT (key) DO NOTHING;
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '019_add_crawl_max_per_host_setting')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
@@ -0,0 +1,22 @@
+-- =====================================================
+-- Add per-host crawl politeness setting
+-- =====================================================
+-- Batch and recursive crawls now schedule requests per host: each host's
+-- concurrency adapts to how quickly it answers (up to CRAWL_MAX_PER_HOST),
+-- 429/503 responses pause the host with backoff, and request starts are
+-- spaced by the host's robots.txt Crawl-delay. This setting turns the
+-- Crawl-delay lookup off.
+-- =====================================================
+
+INSERT INTO archon_settings (key, value, is_encrypted, category, description) VALUES
+('CRAWL_RESPECT_CRAWL_DELAY', 'true', false, 'rag_strategy', 'Read each host''s robots.txt and space requests by its Crawl-delay (capped at 10 seconds)')
+ON CONFLICT (key) DO NOTHING;
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '020_add_crawl_politeness_setting')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
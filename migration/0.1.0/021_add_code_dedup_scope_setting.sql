@@ -0,0 +1,21 @@
+-- =====================================================
+-- Add source-wide code deduplication setting
+-- =====================================================
+-- Near-duplicate code examples are now found with MinHash/LSH instead of
+-- comparing every pair of blocks, which makes it cheap to deduplicate across
+-- all pages of a source rather than only within each page. This setting
+-- turns source-wide deduplication on (off by default).
+-- =====================================================
+
+INSERT INTO archon_settings (key, value, is_encrypted, category, description) VALUES
+('CODE_DEDUP_ACROSS_SOURCE', 'false', false, 'code_extraction', 'Merge near-duplicate code examples across all pages of a source instead of within each page')
+ON CONFLICT (key) DO NOTHING;
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '021_add_code_dedup_scope_setting')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
@@ -0,0 +1,260 @@
+-- =====================================================
+-- Add archon_source_stats table with incrementally maintained counts
+-- =====================================================
+-- The knowledge listing endpoints used to run one count(*) per source on
+-- every page load. This migration keeps per-source counts in their own table
+-- so listings read them with the sources in a single query.
+--
+-- Features:
+-- - Chunk, code example and page counts, word count, first URL, last crawl time
+-- - Maintained by statement-level triggers on the chunk, code example and page
+--   tables, so every insert and delete path (including cascades) keeps it current
+-- - refresh_archon_source_stats() recomputes the counts from scratch
+-- =====================================================
+
+-- Create archon_source_stats table
+CREATE TABLE IF NOT EXISTS archon_source_stats (
+    source_id TEXT PRIMARY KEY REFERENCES archon_sources(source_id) ON DELETE CASCADE,
+
+    -- Counts
+    chunk_count BIGINT NOT NULL DEFAULT 0,
+    code_example_count BIGINT NOT NULL DEFAULT 0,
+    page_count BIGINT NOT NULL DEFAULT 0,
+    word_count BIGINT NOT NULL DEFAULT 0,
+
+    -- URL of the source's earliest stored chunk
+    first_url TEXT,
+
+    -- Timestamps
+    last_crawled_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Keep chunk_count and first_url current
+CREATE OR REPLACE FUNCTION archon_source_stats_track_chunks()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO archon_source_stats (source_id, chunk_count, first_url, last_crawled_at)
+        SELECT source_id, COUNT(*), (array_agg(url ORDER BY id))[1], NOW()
+        FROM new_rows
+        GROUP BY source_id
+        ON CONFLICT (source_id) DO UPDATE SET
+            chunk_count = archon_source_stats.chunk_count + EXCLUDED.chunk_count,
+            first_url = COALESCE(archon_source_stats.first_url, EXCLUDED.first_url),
+            last_crawled_at = EXCLUDED.last_crawled_at,
+            updated_at = NOW();
+    ELSE
+        UPDATE archon_source_stats AS stats
+        SET chunk_count = GREATEST(stats.chunk_count - removed.chunk_count, 0),
+            first_url = CASE WHEN stats.first_url = ANY(removed.urls) THEN NULL ELSE stats.first_url END,
+            updated_at = NOW()
+        FROM (
+            SELECT source_id, COUNT(*) AS chunk_count, array_agg(DISTINCT url) AS urls
+            FROM old_rows
+            GROUP BY source_id
+        ) AS removed
+        WHERE stats.source_id = removed.source_id
+          AND EXISTS (SELECT 1 FROM archon_sources s WHERE s.source_id = stats.source_id);
+
+        -- Sources whose first URL was deleted pick the next earliest chunk
+        UPDATE archon_source_stats AS stats
+        SET first_url = (
+            SELECT c.url FROM archon_crawled_pages c
+            WHERE c.source_id = stats.source_id
+            ORDER BY c.id
+            LIMIT 1
+        )
+        WHERE stats.first_url IS NULL
+          AND stats.source_id IN (SELECT DISTINCT source_id FROM old_rows);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Keep code_example_count current
+CREATE OR REPLACE FUNCTION archon_source_stats_track_code_examples()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO archon_source_stats (source_id, code_example_count)
+        SELECT source_id, COUNT(*)
+        FROM new_rows
+        GROUP BY source_id
+        ON CONFLICT (source_id) DO UPDATE SET
+            code_example_count = archon_source_stats.code_example_count + EXCLUDED.code_example_count,
+            updated_at = NOW();
+    ELSE
+        UPDATE archon_source_stats AS stats
+        SET code_example_count = GREATEST(stats.code_example_count - removed.code_example_count, 0),
+            updated_at = NOW()
+        FROM (SELECT source_id, COUNT(*) AS code_example_count FROM old_rows GROUP BY source_id) AS removed
+        WHERE stats.source_id = removed.source_id
+          AND EXISTS (SELECT 1 FROM archon_sources s WHERE s.source_id = stats.source_id);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Keep page_count, word_count and last_crawled_at current
+CREATE OR REPLACE FUNCTION archon_source_stats_track_pages()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO archon_source_stats (source_id, page_count, word_count, last_crawled_at)
+        SELECT source_id, COUNT(*), COALESCE(SUM(word_count), 0), NOW()
+        FROM new_rows
+        GROUP BY source_id
+        ON CONFLICT (source_id) DO UPDATE SET
+            page_count = archon_source_stats.page_count + EXCLUDED.page_count,
+            word_count = archon_source_stats.word_count + EXCLUDED.word_count,
+            last_crawled_at = EXCLUDED.last_crawled_at,
+            updated_at = NOW();
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- Re-stored pages (upserts on url) only change the word count
+        UPDATE archon_source_stats AS stats
+        SET word_count = GREATEST(stats.word_count + delta.word_count, 0),
+            updated_at = NOW()
+        FROM (
+            SELECT source_id, SUM(word_count) AS word_count
+            FROM (
+                SELECT source_id, word_count FROM new_rows
+                UNION ALL
+                SELECT source_id, -word_count FROM old_rows
+            ) AS changes
+            GROUP BY source_id
+        ) AS delta
+        WHERE stats.source_id = delta.source_id AND delta.word_count <> 0;
+    ELSE
+        UPDATE archon_source_stats AS stats
+        SET page_count = GREATEST(stats.page_count - removed.page_count, 0),
+            word_count = GREATEST(stats.word_count - removed.word_count, 0),
+            updated_at = NOW()
+        FROM (
+            SELECT source_id, COUNT(*) AS page_count, COALESCE(SUM(word_count), 0) AS word_count
+            FROM old_rows
+            GROUP BY source_id
+        ) AS removed
+        WHERE stats.source_id = removed.source_id
+          AND EXISTS (SELECT 1 FROM archon_sources s WHERE s.source_id = stats.source_id);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Statement-level triggers see every row of a batch insert/delete at once.
+-- Transition tables require one trigger per event. Delete handlers skip sources
+-- that are themselves being deleted: their stats row goes with them (cascade).
+DROP TRIGGER IF EXISTS archon_crawled_pages_stats_insert ON archon_crawled_pages;
+CREATE TRIGGER archon_crawled_pages_stats_insert
+    AFTER INSERT ON archon_crawled_pages
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_track_chunks();
+
+DROP TRIGGER IF EXISTS archon_crawled_pages_stats_delete ON archon_crawled_pages;
+CREATE TRIGGER archon_crawled_pages_stats_delete
+    AFTER DELETE ON archon_crawled_pages
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_track_chunks();
+
+DROP TRIGGER IF EXISTS archon_code_examples_stats_insert ON archon_code_examples;
+CREATE TRIGGER archon_code_examples_stats_insert
+    AFTER INSERT ON archon_code_examples
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_track_code_examples();
+
+DROP TRIGGER IF EXISTS archon_code_examples_stats_delete ON archon_code_examples;
+CREATE TRIGGER archon_code_examples_stats_delete
+    AFTER DELETE ON archon_code_examples
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_track_code_examples();
+
+DROP TRIGGER IF EXISTS archon_page_metadata_stats_insert ON archon_page_metadata;
+CREATE TRIGGER archon_page_metadata_stats_insert
+    AFTER INSERT ON archon_page_metadata
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_track_pages();
+
+DROP TRIGGER IF EXISTS archon_page_metadata_stats_update ON archon_page_metadata;
+CREATE TRIGGER archon_page_metadata_stats_update
+    AFTER UPDATE ON archon_page_metadata
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_track_pages();
+
+DROP TRIGGER IF EXISTS archon_page_metadata_stats_delete ON archon_page_metadata;
+CREATE TRIGGER archon_page_metadata_stats_delete
+    AFTER DELETE ON archon_page_metadata
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_track_pages();
+
+-- Recompute stats from the underlying tables (all sources, or one), returning the number of rows written
+CREATE OR REPLACE FUNCTION refresh_archon_source_stats(p_source_id TEXT DEFAULT NULL)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    refreshed INTEGER;
+BEGIN
+    INSERT INTO archon_source_stats (
+        source_id, chunk_count, code_example_count, page_count, word_count, first_url, last_crawled_at
+    )
+    SELECT
+        s.source_id,
+        (SELECT COUNT(*) FROM archon_crawled_pages c WHERE c.source_id = s.source_id),
+        (SELECT COUNT(*) FROM archon_code_examples e WHERE e.source_id = s.source_id),
+        (SELECT COUNT(*) FROM archon_page_metadata p WHERE p.source_id = s.source_id),
+        (SELECT COALESCE(SUM(p.word_count), 0) FROM archon_page_metadata p WHERE p.source_id = s.source_id),
+        (SELECT c.url FROM archon_crawled_pages c WHERE c.source_id = s.source_id ORDER BY c.id LIMIT 1),
+        s.updated_at
+    FROM archon_sources s
+    WHERE p_source_id IS NULL OR s.source_id = p_source_id
+    ON CONFLICT (source_id) DO UPDATE SET
+        chunk_count = EXCLUDED.chunk_count,
+        code_example_count = EXCLUDED.code_example_count,
+        page_count = EXCLUDED.page_count,
+        word_count = EXCLUDED.word_count,
+        first_url = EXCLUDED.first_url,
+        last_crawled_at = COALESCE(archon_source_stats.last_crawled_at, EXCLUDED.last_crawled_at),
+        updated_at = NOW();
+    GET DIAGNOSTICS refreshed = ROW_COUNT;
+    RETURN refreshed;
+END;
+$$;
+
+-- Backfill existing sources
+SELECT refresh_archon_source_stats();
+
+-- Add comments to document the table structure
+COMMENT ON TABLE archon_source_stats IS 'Per-source counts maintained by triggers on chunks, code examples and pages';
+COMMENT ON COLUMN archon_source_stats.chunk_count IS 'Number of rows in archon_crawled_pages for the source';
+COMMENT ON COLUMN archon_source_stats.code_example_count IS 'Number of rows in archon_code_examples for the source';
+COMMENT ON COLUMN archon_source_stats.page_count IS 'Number of rows in archon_page_metadata for the source';
+COMMENT ON COLUMN archon_source_stats.word_count IS 'Sum of archon_page_metadata.word_count for the source';
+COMMENT ON COLUMN archon_source_stats.first_url IS 'URL of the earliest stored chunk, used as a display fallback';
+COMMENT ON COLUMN archon_source_stats.last_crawled_at IS 'When chunks or pages were last inserted for the source';
+
+-- Enable RLS on archon_source_stats
+ALTER TABLE archon_source_stats ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow public read access to archon_source_stats" ON archon_source_stats;
+CREATE POLICY "Allow public read access to archon_source_stats" ON archon_source_stats
+    FOR SELECT TO public USING (true);
+
+DROP POLICY IF EXISTS "Allow service role full access to archon_source_stats" ON archon_source_stats;
+CREATE POLICY "Allow service role full access to archon_source_stats" ON archon_source_stats
+    FOR ALL USING (auth.role() = 'service_role');
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '022_add_source_stats_table')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
@@ -0,0 +1,74 @@
+-- =====================================================
+-- Add get_archon_database_metrics() for cheap database metrics
+-- =====================================================
+-- The database metrics endpoint used count="exact" selects that read every
+-- chunk and code example row (embeddings included) just to count them. This
+-- function answers from catalog data and archon_source_stats instead:
+--
+-- - Exact totals summed from archon_source_stats (one row per source)
+-- - Planner row estimates (pg_class.reltuples) and table/index sizes for
+--   every archon_ table
+-- - Per-index sizes, largest first
+-- - Knowledge type distribution grouped in the database
+-- =====================================================
+
+CREATE OR REPLACE FUNCTION get_archon_database_metrics()
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'database_bytes', pg_database_size(current_database()),
+        'totals', (
+            SELECT jsonb_build_object(
+                'sources', (SELECT COUNT(*) FROM archon_sources),
+                'chunks', COALESCE(SUM(stats.chunk_count), 0),
+                'code_examples', COALESCE(SUM(stats.code_example_count), 0),
+                'pages', COALESCE(SUM(stats.page_count), 0)
+            )
+            FROM archon_source_stats stats
+        ),
+        'tables', COALESCE((
+            SELECT jsonb_object_agg(c.relname, jsonb_build_object(
+                -- reltuples is -1 until the table has been vacuumed or analyzed
+                'estimated_rows', CASE WHEN c.reltuples < 0 THEN NULL ELSE c.reltuples::BIGINT END,
+                'total_bytes', pg_total_relation_size(c.oid),
+                'table_bytes', pg_relation_size(c.oid),
+                'index_bytes', pg_indexes_size(c.oid)
+            ))
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p') AND c.relname LIKE 'archon\_%'
+        ), '{}'::jsonb),
+        'indexes', COALESCE((
+            SELECT jsonb_agg(
+                jsonb_build_object('name', i.relname, 'table', t.relname, 'bytes', pg_relation_size(i.oid))
+                ORDER BY pg_relation_size(i.oid) DESC
+            )
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            JOIN pg_class t ON t.oid = x.indrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            WHERE n.nspname = 'public' AND t.relname LIKE 'archon\_%'
+        ), '[]'::jsonb),
+        'knowledge_types', COALESCE((
+            SELECT jsonb_object_agg(types.knowledge_type, types.sources)
+            FROM (
+                SELECT COALESCE(metadata->>'knowledge_type', 'unknown') AS knowledge_type, COUNT(*) AS sources
+                FROM archon_sources
+                GROUP BY 1
+            ) AS types
+        ), '{}'::jsonb)
+    );
+$$;
+
+COMMENT ON FUNCTION get_archon_database_metrics() IS 'Row totals, planner estimates, and table and index sizes for the archon_ tables, read from catalogs and archon_source_stats without scanning row data';
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '023_add_database_metrics_function')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
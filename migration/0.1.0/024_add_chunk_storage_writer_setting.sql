@@ -0,0 +1,21 @@
+-- =====================================================
+-- Add chunk storage writer setting
+-- =====================================================
+-- Chunks and code examples can now be written either through PostgREST
+-- (JSON inserts, the default) or with binary COPY into a staging table that
+-- is inserted into archon_crawled_pages / archon_code_examples. The COPY
+-- writer needs SUPABASE_DB_URL and falls back to PostgREST without it.
+-- =====================================================
+
+INSERT INTO archon_settings (key, value, is_encrypted, category, description) VALUES
+('CHUNK_STORAGE_WRITER', 'postgrest', false, 'rag_strategy', 'How embedded chunks are stored: postgrest (JSON inserts) or copy (binary COPY through SUPABASE_DB_URL)')
+ON CONFLICT (key) DO NOTHING;
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '024_add_chunk_storage_writer_setting')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
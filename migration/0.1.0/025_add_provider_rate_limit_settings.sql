@@ -0,0 +1,26 @@
+-- =====================================================
+-- Add per-provider rate limit settings
+-- =====================================================
+-- Each provider/model pair gets its own token and request buckets. These
+-- settings size the buckets per provider (RATE_LIMIT_<PROVIDER>_TPM and
+-- RATE_LIMIT_<PROVIDER>_RPM); providers without them use the default
+-- OpenAI-sized limits. Add rows for other providers the same way.
+-- =====================================================
+
+INSERT INTO archon_settings (key, value, is_encrypted, category, description) VALUES
+('RATE_LIMIT_OPENAI_TPM', '200000', false, 'rag_strategy', 'Tokens per minute allowed per OpenAI model'),
+('RATE_LIMIT_OPENAI_RPM', '3000', false, 'rag_strategy', 'Requests per minute allowed per OpenAI model'),
+('RATE_LIMIT_GOOGLE_TPM', '1000000', false, 'rag_strategy', 'Tokens per minute allowed per Google model'),
+('RATE_LIMIT_GOOGLE_RPM', '1500', false, 'rag_strategy', 'Requests per minute allowed per Google model'),
+('RATE_LIMIT_OLLAMA_TPM', '10000000', false, 'rag_strategy', 'Tokens per minute allowed per Ollama model (local, effectively unlimited)'),
+('RATE_LIMIT_OLLAMA_RPM', '10000', false, 'rag_strategy', 'Requests per minute allowed per Ollama model (local, effectively unlimited)')
+ON CONFLICT (key) DO NOTHING;
+
+-- Record migration application for tracking
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '025_add_provider_rate_limit_settings')
+ON CONFLICT (version, migration_name) DO NOTHING;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
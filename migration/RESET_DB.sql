@@ -147,6 +147,18 @@ BEGIN
     
     -- Task management functions
     DROP FUNCTION IF EXISTS archive_task(UUID, TEXT) CASCADE;
+
+    -- Embedding cache maintenance
+    DROP FUNCTION IF EXISTS prune_archon_embedding_cache(INTEGER) CASCADE;
+
+    -- Source statistics maintenance
+    DROP FUNCTION IF EXISTS archon_source_stats_track_chunks() CASCADE;
+    DROP FUNCTION IF EXISTS archon_source_stats_track_code_examples() CASCADE;
+    DROP FUNCTION IF EXISTS archon_source_stats_track_pages() CASCADE;
+    DROP FUNCTION IF EXISTS refresh_archon_source_stats(TEXT) CASCADE;
+
+    -- Database metrics
+    DROP FUNCTION IF EXISTS get_archon_database_metrics() CASCADE;
     
     RAISE NOTICE 'Functions dropped successfully.';
     
@@ -172,9 +184,11 @@ BEGIN
     DROP TABLE IF EXISTS archon_prompts CASCADE;
     
     -- Knowledge Base System - new archon_ prefixed tables
+    DROP TABLE IF EXISTS archon_source_stats CASCADE;
     DROP TABLE IF EXISTS archon_code_examples CASCADE;
     DROP TABLE IF EXISTS archon_crawled_pages CASCADE;
     DROP TABLE IF EXISTS archon_sources CASCADE;
+    DROP TABLE IF EXISTS archon_embedding_cache CASCADE;
     
     -- Configuration System - new archon_ prefixed table
     DROP TABLE IF EXISTS archon_settings CASCADE;
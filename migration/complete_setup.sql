@@ -95,7 +95,8 @@ INSERT INTO archon_settings (key, encrypted_value, is_encrypted, category, descr
 INSERT INTO archon_settings (key, value, is_encrypted, category, description) VALUES
 ('LLM_PROVIDER', 'openai', false, 'rag_strategy', 'LLM provider to use: openai, ollama, or google'),
 ('LLM_BASE_URL', NULL, false, 'rag_strategy', 'Custom base URL for LLM provider (mainly for Ollama, e.g., http://host.docker.internal:11434/v1)'),
-('EMBEDDING_MODEL', 'text-embedding-3-small', false, 'rag_strategy', 'Embedding model for vector search and similarity matching (required for all embedding operations)')
+('EMBEDDING_MODEL', 'text-embedding-3-small', false, 'rag_strategy', 'Embedding model for vector search and similarity matching (required for all embedding operations)'),
+('CHUNK_STORAGE_WRITER', 'postgrest', false, 'rag_strategy', 'How embedded chunks are stored: postgrest (JSON inserts) or copy (binary COPY through SUPABASE_DB_URL)')
 ON CONFLICT (key) DO NOTHING;
 
 -- Add provider API key placeholders
@@ -129,7 +130,8 @@ INSERT INTO archon_settings (key, value, is_encrypted, category, description) VA
 
 -- Processing Settings
 ('CODE_EXTRACTION_MAX_WORKERS', '3', false, 'code_extraction', 'Number of parallel workers for generating code summaries'),
-('ENABLE_CODE_SUMMARIES', 'true', false, 'code_extraction', 'Generate AI-powered summaries and names for extracted code examples')
+('ENABLE_CODE_SUMMARIES', 'true', false, 'code_extraction', 'Generate AI-powered summaries and names for extracted code examples'),
+('CODE_DEDUP_ACROSS_SOURCE', 'false', false, 'code_extraction', 'Merge near-duplicate code examples across all pages of a source instead of within each page')
 
 -- Only insert if they don't already exist
 ON CONFLICT (key) DO NOTHING;
@@ -140,7 +142,10 @@ INSERT INTO archon_settings (key, value, is_encrypted, category, description) VA
 ('CRAWL_MAX_CONCURRENT', '10', false, 'rag_strategy', 'Maximum concurrent browser sessions for crawling (1-20)'),
 ('CRAWL_WAIT_STRATEGY', 'domcontentloaded', false, 'rag_strategy', 'When to consider page loaded: domcontentloaded, networkidle, or load'),
 ('CRAWL_PAGE_TIMEOUT', '30000', false, 'rag_strategy', 'Maximum time to wait for page load in milliseconds'),
-('CRAWL_DELAY_BEFORE_HTML', '0.5', false, 'rag_strategy', 'Time to wait for JavaScript rendering in seconds (0.1-5.0)')
+('CRAWL_DELAY_BEFORE_HTML', '0.5', false, 'rag_strategy', 'Time to wait for JavaScript rendering in seconds (0.1-5.0)'),
+('CRAWL_HTTP_FAST_PATH', 'true', false, 'rag_strategy', 'Fetch static pages over plain HTTP and only use the browser for JavaScript-rendered pages'),
+('CRAWL_MAX_PER_HOST', '0', false, 'rag_strategy', 'Maximum pages of one host crawled in parallel during recursive crawls (0 = same as CRAWL_MAX_CONCURRENT)'),
+('CRAWL_RESPECT_CRAWL_DELAY', 'true', false, 'rag_strategy', 'Read each host''s robots.txt and space requests by its Crawl-delay (capped at 10 seconds)')
 ON CONFLICT (key) DO NOTHING;
 
 -- Document Storage Performance Settings (from add_performance_settings.sql and optimize_batch_sizes.sql)
@@ -159,7 +164,21 @@ INSERT INTO archon_settings (key, value, is_encrypted, category, description) VA
 ('DISPATCHER_CHECK_INTERVAL', '0.5', false, 'rag_strategy', 'How often to check memory usage in seconds (0.1-2.0)'),
 ('CODE_EXTRACTION_BATCH_SIZE', '40', false, 'rag_strategy', 'Number of code blocks to extract per batch (20-100) - increased for better performance'),
 ('CODE_SUMMARY_MAX_WORKERS', '3', false, 'rag_strategy', 'Maximum parallel workers for code summarization (1-10)'),
-('CONTEXTUAL_EMBEDDING_BATCH_SIZE', '50', false, 'rag_strategy', 'Number of chunks to process in contextual embedding batch API calls (20-100)')
+('CONTEXTUAL_EMBEDDING_BATCH_SIZE', '50', false, 'rag_strategy', 'Number of chunks to process in contextual embedding batch API calls (20-100)'),
+('EMBEDDING_CACHE_ENABLED', 'true', false, 'rag_strategy', 'Reuse embeddings for unchanged text across crawls instead of re-embedding it'),
+('EMBEDDING_CACHE_MAX_ENTRIES', '500000', false, 'rag_strategy', 'Maximum number of cached embeddings before least-recently-used entries are evicted'),
+('STREAMING_PIPELINE_ENABLED', 'true', false, 'rag_strategy', 'Store sitemap and recursive crawl pages while crawling instead of after the crawl finishes'),
+('STREAMING_BATCH_PAGES', '10', false, 'rag_strategy', 'Number of crawled pages chunked, embedded and stored together by the streaming pipeline'),
+('STREAMING_QUEUE_SIZE', '50', false, 'rag_strategy', 'Maximum crawled pages waiting for storage before the crawler is paused'),
+('EMBEDDING_MAX_IN_FLIGHT', '4', false, 'rag_strategy', 'Maximum embedding sub-batches sent to the provider at the same time (1-16)'),
+('RERANKING_BACKEND', 'torch', false, 'rag_strategy', 'Cross-encoder backend for reranking: torch, onnx or openvino (onnx/openvino need the optimum extras)'),
+('RERANKING_ONNX_FILE', 'onnx/model_qint8_avx2.onnx', false, 'rag_strategy', 'ONNX model file loaded when RERANKING_BACKEND is onnx (int8-quantized by default)'),
+('RATE_LIMIT_OPENAI_TPM', '200000', false, 'rag_strategy', 'Tokens per minute allowed per OpenAI model'),
+('RATE_LIMIT_OPENAI_RPM', '3000', false, 'rag_strategy', 'Requests per minute allowed per OpenAI model'),
+('RATE_LIMIT_GOOGLE_TPM', '1000000', false, 'rag_strategy', 'Tokens per minute allowed per Google model'),
+('RATE_LIMIT_GOOGLE_RPM', '1500', false, 'rag_strategy', 'Requests per minute allowed per Google model'),
+('RATE_LIMIT_OLLAMA_TPM', '10000000', false, 'rag_strategy', 'Tokens per minute allowed per Ollama model (local, effectively unlimited)'),
+('RATE_LIMIT_OLLAMA_RPM', '10000', false, 'rag_strategy', 'Requests per minute allowed per Ollama model (local, effectively unlimited)')
 ON CONFLICT (key) DO UPDATE SET
     value = EXCLUDED.value,
     description = EXCLUDED.description;
@@ -204,6 +223,7 @@ CREATE TABLE IF NOT EXISTS archon_crawled_pages (
     url VARCHAR NOT NULL,
     chunk_number INTEGER NOT NULL,
     content TEXT NOT NULL,
+    content_hash TEXT,                   -- SHA256 of the raw chunk text, used by incremental recrawls
     metadata JSONB NOT NULL DEFAULT '{}'::jsonb,
     source_id TEXT NOT NULL,
     -- Multi-dimensional embedding support for different models
@@ -286,6 +306,11 @@ CREATE TABLE IF NOT EXISTS archon_page_metadata (
 
     -- Content
     full_content TEXT NOT NULL,
+    content_hash TEXT,  -- SHA256 of full_content, used by incremental recrawls
+
+    -- HTTP validators from the last crawl, sent as conditional requests on refresh
+    http_etag TEXT,
+    http_last_modified TEXT,
 
     -- Section metadata (for llms-full.txt H1 sections)
     section_title TEXT,
@@ -332,6 +357,8 @@ COMMENT ON COLUMN archon_page_metadata.section_title IS 'H1 section title for ll
 COMMENT ON COLUMN archon_page_metadata.section_order IS 'Order of section in llms-full.txt file (0-based)';
 COMMENT ON COLUMN archon_page_metadata.word_count IS 'Number of words in full_content';
 COMMENT ON COLUMN archon_page_metadata.char_count IS 'Number of characters in full_content';
+COMMENT ON COLUMN archon_page_metadata.http_etag IS 'ETag response header from the last crawl, sent as If-None-Match on refresh';
+COMMENT ON COLUMN archon_page_metadata.http_last_modified IS 'Last-Modified response header from the last crawl, sent as If-Modified-Since on refresh';
 COMMENT ON COLUMN archon_page_metadata.chunk_count IS 'Number of chunks created from this page';
 COMMENT ON COLUMN archon_page_metadata.metadata IS 'Flexible JSON metadata (page_type, knowledge_type, tags, etc)';
 COMMENT ON COLUMN archon_crawled_pages.page_id IS 'Foreign key linking chunk to parent page';
@@ -339,6 +366,49 @@ COMMENT ON COLUMN archon_crawled_pages.page_id IS 'Foreign key linking chunk to
 -- Enable RLS on archon_page_metadata
 ALTER TABLE archon_page_metadata ENABLE ROW LEVEL SECURITY;
 
+-- Create archon_embedding_cache table
+-- Content-addressed cache of embedding vectors so recrawls only embed changed text
+CREATE TABLE IF NOT EXISTS archon_embedding_cache (
+    cache_key TEXT PRIMARY KEY,          -- SHA256 of provider|model|dimensions|sha256(text)
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    dimensions INT NOT NULL,
+    embedding REAL[] NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    last_accessed_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_archon_embedding_cache_last_accessed ON archon_embedding_cache(last_accessed_at);
+
+-- Evict least-recently-used entries beyond max_entries, returning the number removed
+CREATE OR REPLACE FUNCTION prune_archon_embedding_cache(max_entries INTEGER)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    removed INTEGER;
+BEGIN
+    DELETE FROM archon_embedding_cache
+    WHERE cache_key IN (
+        SELECT cache_key
+        FROM archon_embedding_cache
+        ORDER BY last_accessed_at DESC
+        OFFSET GREATEST(max_entries, 0)
+    );
+    GET DIAGNOSTICS removed = ROW_COUNT;
+    RETURN removed;
+END;
+$$;
+
+COMMENT ON TABLE archon_embedding_cache IS 'Content-addressed cache of embedding vectors reused across recrawls';
+COMMENT ON COLUMN archon_embedding_cache.last_accessed_at IS 'Last hit or write, used for LRU eviction';
+
+-- Enable RLS on archon_embedding_cache (service role only)
+ALTER TABLE archon_embedding_cache ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow service role full access to archon_embedding_cache" ON archon_embedding_cache
+    FOR ALL USING (auth.role() = 'service_role');
+
 -- Multi-dimensional indexes
 CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_384 ON archon_code_examples USING ivfflat (embedding_384 vector_cosine_ops) WITH (lists = 100);
 CREATE INDEX IF NOT EXISTS idx_archon_code_examples_embedding_768 ON archon_code_examples USING ivfflat (embedding_768 vector_cosine_ops) WITH (lists = 100);
@@ -359,6 +429,233 @@ CREATE INDEX idx_archon_code_examples_embedding_model ON archon_code_examples (e
 CREATE INDEX idx_archon_code_examples_embedding_dimension ON archon_code_examples (embedding_dimension);
 CREATE INDEX idx_archon_code_examples_llm_chat_model ON archon_code_examples (llm_chat_model);
 
+-- Create archon_source_stats table
+-- Per-source counts kept current by triggers so listings never count rows per source
+CREATE TABLE IF NOT EXISTS archon_source_stats (
+    source_id TEXT PRIMARY KEY REFERENCES archon_sources(source_id) ON DELETE CASCADE,
+
+    -- Counts
+    chunk_count BIGINT NOT NULL DEFAULT 0,
+    code_example_count BIGINT NOT NULL DEFAULT 0,
+    page_count BIGINT NOT NULL DEFAULT 0,
+    word_count BIGINT NOT NULL DEFAULT 0,
+
+    -- URL of the source's earliest stored chunk
+    first_url TEXT,
+
+    -- Timestamps
+    last_crawled_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Keep chunk_count and first_url current
+CREATE OR REPLACE FUNCTION archon_source_stats_track_chunks()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO archon_source_stats (source_id, chunk_count, first_url, last_crawled_at)
+        SELECT source_id, COUNT(*), (array_agg(url ORDER BY id))[1], NOW()
+        FROM new_rows
+        GROUP BY source_id
+        ON CONFLICT (source_id) DO UPDATE SET
+            chunk_count = archon_source_stats.chunk_count + EXCLUDED.chunk_count,
+            first_url = COALESCE(archon_source_stats.first_url, EXCLUDED.first_url),
+            last_crawled_at = EXCLUDED.last_crawled_at,
+            updated_at = NOW();
+    ELSE
+        UPDATE archon_source_stats AS stats
+        SET chunk_count = GREATEST(stats.chunk_count - removed.chunk_count, 0),
+            first_url = CASE WHEN stats.first_url = ANY(removed.urls) THEN NULL ELSE stats.first_url END,
+            updated_at = NOW()
+        FROM (
+            SELECT source_id, COUNT(*) AS chunk_count, array_agg(DISTINCT url) AS urls
+            FROM old_rows
+            GROUP BY source_id
+        ) AS removed
+        WHERE stats.source_id = removed.source_id
+          AND EXISTS (SELECT 1 FROM archon_sources s WHERE s.source_id = stats.source_id);
+
+        -- Sources whose first URL was deleted pick the next earliest chunk
+        UPDATE archon_source_stats AS stats
+        SET first_url = (
+            SELECT c.url FROM archon_crawled_pages c
+            WHERE c.source_id = stats.source_id
+            ORDER BY c.id
+            LIMIT 1
+        )
+        WHERE stats.first_url IS NULL
+          AND stats.source_id IN (SELECT DISTINCT source_id FROM old_rows);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Keep code_example_count current
+CREATE OR REPLACE FUNCTION archon_source_stats_track_code_examples()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO archon_source_stats (source_id, code_example_count)
+        SELECT source_id, COUNT(*)
+        FROM new_rows
+        GROUP BY source_id
+        ON CONFLICT (source_id) DO UPDATE SET
+            code_example_count = archon_source_stats.code_example_count + EXCLUDED.code_example_count,
+            updated_at = NOW();
+    ELSE
+        UPDATE archon_source_stats AS stats
+        SET code_example_count = GREATEST(stats.code_example_count - removed.code_example_count, 0),
+            updated_at = NOW()
+        FROM (SELECT source_id, COUNT(*) AS code_example_count FROM old_rows GROUP BY source_id) AS removed
+        WHERE stats.source_id = removed.source_id
+          AND EXISTS (SELECT 1 FROM archon_sources s WHERE s.source_id = stats.source_id);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Keep page_count, word_count and last_crawled_at current
+CREATE OR REPLACE FUNCTION archon_source_stats_track_pages()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO archon_source_stats (source_id, page_count, word_count, last_crawled_at)
+        SELECT source_id, COUNT(*), COALESCE(SUM(word_count), 0), NOW()
+        FROM new_rows
+        GROUP BY source_id
+        ON CONFLICT (source_id) DO UPDATE SET
+            page_count = archon_source_stats.page_count + EXCLUDED.page_count,
+            word_count = archon_source_stats.word_count + EXCLUDED.word_count,
+            last_crawled_at = EXCLUDED.last_crawled_at,
+            updated_at = NOW();
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- Re-stored pages (upserts on url) only change the word count
+        UPDATE archon_source_stats AS stats
+        SET word_count = GREATEST(stats.word_count + delta.word_count, 0),
+            updated_at = NOW()
+        FROM (
+            SELECT source_id, SUM(word_count) AS word_count
+            FROM (
+                SELECT source_id, word_count FROM new_rows
+                UNION ALL
+                SELECT source_id, -word_count FROM old_rows
+            ) AS changes
+            GROUP BY source_id
+        ) AS delta
+        WHERE stats.source_id = delta.source_id AND delta.word_count <> 0;
+    ELSE
+        UPDATE archon_source_stats AS stats
+        SET page_count = GREATEST(stats.page_count - removed.page_count, 0),
+            word_count = GREATEST(stats.word_count - removed.word_count, 0),
+            updated_at = NOW()
+        FROM (
+            SELECT source_id, COUNT(*) AS page_count, COALESCE(SUM(word_count), 0) AS word_count
+            FROM old_rows
+            GROUP BY source_id
+        ) AS removed
+        WHERE stats.source_id = removed.source_id
+          AND EXISTS (SELECT 1 FROM archon_sources s WHERE s.source_id = stats.source_id);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Statement-level triggers see every row of a batch insert/delete at once.
+-- Transition tables require one trigger per event. Delete handlers skip sources
+-- that are themselves being deleted: their stats row goes with them (cascade).
+CREATE TRIGGER archon_crawled_pages_stats_insert
+    AFTER INSERT ON archon_crawled_pages
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_track_chunks();
+
+CREATE TRIGGER archon_crawled_pages_stats_delete
+    AFTER DELETE ON archon_crawled_pages
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_track_chunks();
+
+CREATE TRIGGER archon_code_examples_stats_insert
+    AFTER INSERT ON archon_code_examples
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_track_code_examples();
+
+CREATE TRIGGER archon_code_examples_stats_delete
+    AFTER DELETE ON archon_code_examples
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_track_code_examples();
+
+CREATE TRIGGER archon_page_metadata_stats_insert
+    AFTER INSERT ON archon_page_metadata
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_track_pages();
+
+CREATE TRIGGER archon_page_metadata_stats_update
+    AFTER UPDATE ON archon_page_metadata
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_track_pages();
+
+CREATE TRIGGER archon_page_metadata_stats_delete
+    AFTER DELETE ON archon_page_metadata
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION archon_source_stats_track_pages();
+
+-- Recompute stats from the underlying tables (all sources, or one), returning the number of rows written
+CREATE OR REPLACE FUNCTION refresh_archon_source_stats(p_source_id TEXT DEFAULT NULL)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    refreshed INTEGER;
+BEGIN
+    INSERT INTO archon_source_stats (
+        source_id, chunk_count, code_example_count, page_count, word_count, first_url, last_crawled_at
+    )
+    SELECT
+        s.source_id,
+        (SELECT COUNT(*) FROM archon_crawled_pages c WHERE c.source_id = s.source_id),
+        (SELECT COUNT(*) FROM archon_code_examples e WHERE e.source_id = s.source_id),
+        (SELECT COUNT(*) FROM archon_page_metadata p WHERE p.source_id = s.source_id),
+        (SELECT COALESCE(SUM(p.word_count), 0) FROM archon_page_metadata p WHERE p.source_id = s.source_id),
+        (SELECT c.url FROM archon_crawled_pages c WHERE c.source_id = s.source_id ORDER BY c.id LIMIT 1),
+        s.updated_at
+    FROM archon_sources s
+    WHERE p_source_id IS NULL OR s.source_id = p_source_id
+    ON CONFLICT (source_id) DO UPDATE SET
+        chunk_count = EXCLUDED.chunk_count,
+        code_example_count = EXCLUDED.code_example_count,
+        page_count = EXCLUDED.page_count,
+        word_count = EXCLUDED.word_count,
+        first_url = EXCLUDED.first_url,
+        last_crawled_at = COALESCE(archon_source_stats.last_crawled_at, EXCLUDED.last_crawled_at),
+        updated_at = NOW();
+    GET DIAGNOSTICS refreshed = ROW_COUNT;
+    RETURN refreshed;
+END;
+$$;
+
+-- Add comments to document the table structure
+COMMENT ON TABLE archon_source_stats IS 'Per-source counts maintained by triggers on chunks, code examples and pages';
+COMMENT ON COLUMN archon_source_stats.chunk_count IS 'Number of rows in archon_crawled_pages for the source';
+COMMENT ON COLUMN archon_source_stats.code_example_count IS 'Number of rows in archon_code_examples for the source';
+COMMENT ON COLUMN archon_source_stats.page_count IS 'Number of rows in archon_page_metadata for the source';
+COMMENT ON COLUMN archon_source_stats.word_count IS 'Sum of archon_page_metadata.word_count for the source';
+COMMENT ON COLUMN archon_source_stats.first_url IS 'URL of the earliest stored chunk, used as a display fallback';
+COMMENT ON COLUMN archon_source_stats.last_crawled_at IS 'When chunks or pages were last inserted for the source';
+
+-- Enable RLS on archon_source_stats
+ALTER TABLE archon_source_stats ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow public read access to archon_source_stats" ON archon_source_stats
+    FOR SELECT TO public USING (true);
+
+CREATE POLICY "Allow service role full access to archon_source_stats" ON archon_source_stats
+    FOR ALL USING (auth.role() = 'service_role');
+
 -- =====================================================
 -- SECTION 4.5: MULTI-DIMENSIONAL EMBEDDING HELPER FUNCTIONS
 -- =====================================================
@@ -817,6 +1114,59 @@ COMMENT ON FUNCTION hybrid_search_archon_crawled_pages IS 'Legacy hybrid search
 COMMENT ON FUNCTION hybrid_search_archon_code_examples_multi IS 'Multi-dimensional hybrid search on code examples with configurable embedding dimensions';
 COMMENT ON FUNCTION hybrid_search_archon_code_examples IS 'Legacy hybrid search function for code examples (uses 1536D embeddings)';
 
+-- Database metrics from catalogs and archon_source_stats (no row scans)
+CREATE OR REPLACE FUNCTION get_archon_database_metrics()
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'database_bytes', pg_database_size(current_database()),
+        'totals', (
+            SELECT jsonb_build_object(
+                'sources', (SELECT COUNT(*) FROM archon_sources),
+                'chunks', COALESCE(SUM(stats.chunk_count), 0),
+                'code_examples', COALESCE(SUM(stats.code_example_count), 0),
+                'pages', COALESCE(SUM(stats.page_count), 0)
+            )
+            FROM archon_source_stats stats
+        ),
+        'tables', COALESCE((
+            SELECT jsonb_object_agg(c.relname, jsonb_build_object(
+                -- reltuples is -1 until the table has been vacuumed or analyzed
+                'estimated_rows', CASE WHEN c.reltuples < 0 THEN NULL ELSE c.reltuples::BIGINT END,
+                'total_bytes', pg_total_relation_size(c.oid),
+                'table_bytes', pg_relation_size(c.oid),
+                'index_bytes', pg_indexes_size(c.oid)
+            ))
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p') AND c.relname LIKE 'archon\_%'
+        ), '{}'::jsonb),
+        'indexes', COALESCE((
+            SELECT jsonb_agg(
+                jsonb_build_object('name', i.relname, 'table', t.relname, 'bytes', pg_relation_size(i.oid))
+                ORDER BY pg_relation_size(i.oid) DESC
+            )
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            JOIN pg_class t ON t.oid = x.indrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            WHERE n.nspname = 'public' AND t.relname LIKE 'archon\_%'
+        ), '[]'::jsonb),
+        'knowledge_types', COALESCE((
+            SELECT jsonb_object_agg(types.knowledge_type, types.sources)
+            FROM (
+                SELECT COALESCE(metadata->>'knowledge_type', 'unknown') AS knowledge_type, COUNT(*) AS sources
+                FROM archon_sources
+                GROUP BY 1
+            ) AS types
+        ), '{}'::jsonb)
+    );
+$$;
+
+COMMENT ON FUNCTION get_archon_database_metrics() IS 'Row totals, planner estimates, and table and index sizes for the archon_ tables, read from catalogs and archon_source_stats without scanning row data';
+
 -- =====================================================
 -- SECTION 6: RLS POLICIES FOR KNOWLEDGE BASE
 -- =====================================================
@@ -1062,7 +1412,21 @@ VALUES
   ('0.1.0', '008_add_migration_tracking'),
   ('0.1.0', '009_add_cascade_delete_constraints'),
   ('0.1.0', '010_add_provider_placeholders'),
-  ('0.1.0', '011_add_page_metadata_table')
+  ('0.1.0', '011_add_page_metadata_table'),
+  ('0.1.0', '012_add_embedding_cache'),
+  ('0.1.0', '013_add_content_hashes'),
+  ('0.1.0', '014_add_streaming_pipeline_settings'),
+  ('0.1.0', '015_add_embedding_concurrency_setting'),
+  ('0.1.0', '016_add_reranking_backend_settings'),
+  ('0.1.0', '017_add_http_fast_path_setting'),
+  ('0.1.0', '018_add_page_http_validators'),
+  ('0.1.0', '019_add_crawl_max_per_host_setting'),
+  ('0.1.0', '020_add_crawl_politeness_setting'),
+  ('0.1.0', '021_add_code_dedup_scope_setting'),
+  ('0.1.0', '022_add_source_stats_table'),
+  ('0.1.0', '023_add_database_metrics_function'),
+  ('0.1.0', '024_add_chunk_storage_writer_setting'),
+  ('0.1.0', '025_add_provider_rate_limit_settings')
 ON CONFLICT (version, migration_name) DO NOTHING;
 
 -- Enable Row Level Security on migrations table
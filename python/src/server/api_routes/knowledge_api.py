@@ -13,6 +13,7 @@ import asyncio
 import json
 import uuid
 from datetime import datetime
+from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile
@@ -32,6 +33,9 @@ from ..services.storage import DocumentStorageService
 from ..utils import get_supabase_client
 from ..utils.document_processing import extract_text_from_document
 
+if TYPE_CHECKING:
+    from ..utils.progress.progress_tracker import ProgressTracker
+
 # Get logger for this module
 logger = get_logger(__name__)
 
@@ -151,6 +155,7 @@ class KnowledgeItemRequest(BaseModel):
     update_frequency: int = 7
     max_depth: int = 2  # Maximum crawl depth (1-5)
     extract_code_examples: bool = True  # Whether to extract code examples
+    incremental: bool = False  # Only re-embed pages/chunks whose content changed
 
     class Config:
         schema_extra = {
@@ -313,53 +318,86 @@ async def update_knowledge_item(source_id: str, updates: dict):
 
 @router.delete("/knowledge-items/{source_id}")
 async def delete_knowledge_item(source_id: str):
-    """Delete a knowledge item from the database."""
+    """
+    Delete a knowledge item in the background.
+
+    Rows are removed in batches; poll /api/progress/{progressId} for progress.
+    """
     try:
-        logger.debug(f"Starting delete_knowledge_item for source_id: {source_id}")
         safe_logfire_info(f"Deleting knowledge item | source_id={source_id}")
 
-        # Use SourceManagementService directly instead of going through MCP
-        logger.debug("Creating SourceManagementService...")
-        from ..services.source_management_service import SourceManagementService
+        progress_id = await _start_source_deletion(source_id)
 
-        source_service = SourceManagementService(get_supabase_client())
-        logger.debug("Successfully created SourceManagementService")
-
-        logger.debug("Calling delete_source function...")
-        success, result_data = source_service.delete_source(source_id)
-        logger.debug(f"delete_source returned: success={success}, data={result_data}")
-
-        # Convert to expected format
-        result = {
-            "success": success,
-            "error": result_data.get("error") if not success else None,
-            **result_data,
+        return {
+            "success": True,
+            "message": f"Started deletion of knowledge item {source_id}",
+            "progressId": progress_id,
         }
 
-        if result.get("success"):
-            safe_logfire_info(f"Knowledge item deleted successfully | source_id={source_id}")
-
-            return {"success": True, "message": f"Successfully deleted knowledge item {source_id}"}
-        else:
-            safe_logfire_error(
-                f"Knowledge item deletion failed | source_id={source_id} | error={result.get('error')}"
-            )
-            raise HTTPException(
-                status_code=500, detail={"error": result.get("error", "Deletion failed")}
-            )
-
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Exception in delete_knowledge_item: {e}")
-        logger.error(f"Exception type: {type(e)}")
-        import traceback
-
-        logger.error(f"Traceback: {traceback.format_exc()}")
         safe_logfire_error(
             f"Failed to delete knowledge item | error={str(e)} | source_id={source_id}"
         )
         raise HTTPException(status_code=500, detail={"error": str(e)})
 
 
+async def _start_source_deletion(source_id: str) -> str:
+    """Start a batched source deletion task and return its progress ID."""
+    from ..services.source_management_service import SourceManagementService
+    from ..utils.progress.progress_tracker import ProgressTracker
+
+    supabase_client = get_supabase_client()
+    existing = await asyncio.to_thread(
+        lambda: supabase_client.table("archon_sources").select("source_id").eq("source_id", source_id).execute()
+    )
+    if not existing.data:
+        raise HTTPException(status_code=404, detail={"error": f"Source {source_id} not found"})
+
+    progress_id = str(uuid.uuid4())
+    tracker = ProgressTracker(progress_id, operation_type="source_deletion")
+    await tracker.start({
+        "source_id": source_id,
+        "log": f"Starting deletion of {source_id}",
+    })
+
+    source_service = SourceManagementService(supabase_client)
+    deletion_task = asyncio.create_task(
+        _perform_source_deletion(progress_id, source_id, source_service, tracker)
+    )
+    # Track the task so /knowledge-items/stop/{progress_id} can cancel it
+    active_crawl_tasks[progress_id] = deletion_task
+    return progress_id
+
+
+async def _perform_source_deletion(
+    progress_id: str,
+    source_id: str,
+    source_service,
+    tracker: "ProgressTracker",
+):
+    """Delete a source in batches, reporting progress through the tracker."""
+    try:
+        success, result = await source_service.delete_source_in_batches(
+            source_id, progress_callback=tracker.update
+        )
+        if success:
+            await tracker.complete({"log": f"Deleted source {source_id}", **result})
+            safe_logfire_info(f"Source deleted successfully | source_id={source_id} | progress_id={progress_id}")
+        else:
+            await tracker.error(result.get("error", "Deletion failed"))
+    except asyncio.CancelledError:
+        safe_logfire_info(f"Source deletion cancelled | source_id={source_id} | progress_id={progress_id}")
+        raise
+    except Exception as e:
+        await tracker.error(f"Deletion failed: {str(e)}")
+        safe_logfire_error(f"Source deletion failed | source_id={source_id} | error={str(e)}")
+    finally:
+        if progress_id in active_crawl_tasks:
+            del active_crawl_tasks[progress_id]
+
+
 @router.get("/knowledge-items/{source_id}/chunks")
 async def get_knowledge_item_chunks(
     source_id: str,
@@ -610,8 +648,15 @@ async def get_knowledge_item_code_examples(
 
 
 @router.post("/knowledge-items/{source_id}/refresh")
-async def refresh_knowledge_item(source_id: str):
-    """Refresh a knowledge item by re-crawling its URL with the same metadata."""
+async def refresh_knowledge_item(source_id: str, incremental: bool = True):
+    """
+    Refresh a knowledge item by re-crawling its URL with the same metadata.
+
+    By default the refresh is incremental: unchanged pages and chunks keep their
+    stored rows and embeddings. If the embedding provider, model, dimensions or
+    contextual setting changed since the last crawl, everything is re-embedded.
+    Pass incremental=false to force a full re-index.
+    """
     
     # Validate API key before starting expensive refresh operation
     logger.info("🔍 About to validate API key for refresh...")
@@ -687,6 +732,7 @@ async def refresh_knowledge_item(source_id: str):
             "max_depth": max_depth,
             "extract_code_examples": True,
             "generate_summary": True,
+            "incremental": incremental,
         }
 
         # Create a wrapped task that acquires the semaphore
@@ -840,6 +886,7 @@ async def _perform_crawl_with_progress(
                 "max_depth": request.max_depth,
                 "extract_code_examples": request.extract_code_examples,
                 "generate_summary": True,
+                "incremental": request.incremental,
             }
 
             # Orchestrate the crawl - this returns immediately with task info including the actual task
@@ -1206,32 +1253,18 @@ async def get_available_sources():
 
 @router.delete("/sources/{source_id}")
 async def delete_source(source_id: str):
-    """Delete a source and all its associated data."""
+    """Delete a source and all its associated data in the background."""
     try:
         safe_logfire_info(f"Deleting source | source_id={source_id}")
 
-        # Use SourceManagementService directly
-        from ..services.source_management_service import SourceManagementService
-
-        source_service = SourceManagementService(get_supabase_client())
-
-        success, result_data = source_service.delete_source(source_id)
-
-        if success:
-            safe_logfire_info(f"Source deleted successfully | source_id={source_id}")
+        progress_id = await _start_source_deletion(source_id)
 
-            return {
-                "success": True,
-                "message": f"Successfully deleted source {source_id}",
-                **result_data,
-            }
-        else:
-            safe_logfire_error(
-                f"Source deletion failed | source_id={source_id} | error={result_data.get('error')}"
-            )
-            raise HTTPException(
-                status_code=500, detail={"error": result_data.get("error", "Deletion failed")}
-            )
+        return {
+            "success": True,
+            "message": f"Started deletion of source {source_id}",
+            "source_id": source_id,
+            "progressId": progress_id,
+        }
     except HTTPException:
         raise
     except Exception as e:
@@ -1270,11 +1303,21 @@ async def knowledge_health():
             "migration_instructions": "Open Supabase Dashboard → SQL Editor → Run: migration/add_source_url_display_name.sql"
         }
 
+    from ..services.embeddings import get_embedding_cache, get_query_embedding_cache
+    from ..services.llm_provider_service import get_client_pool_stats
+    from ..services.threading_service import get_threading_service
+
     # Removed health check logging to reduce console noise
     result = {
         "status": "healthy",
         "service": "knowledge-api",
         "timestamp": datetime.now().isoformat(),
+        "caches": {
+            "query_embeddings": get_query_embedding_cache().get_stats(),
+            "embeddings": get_embedding_cache().get_stats(),
+        },
+        "rate_limits": get_threading_service().get_rate_limit_metrics(),
+        "llm_clients": get_client_pool_stats(),
     }
 
     return result
@@ -1,15 +1,17 @@
-"""Progress API endpoints for polling operation status."""
+"""Progress API endpoints for polling and streaming operation status."""
 
+import json
 from datetime import datetime
 from email.utils import formatdate
 
 from fastapi import APIRouter, Header, HTTPException, Response
 from fastapi import status as http_status
+from fastapi.responses import StreamingResponse
 
 from ..config.logfire_config import get_logger, logfire
 from ..models.progress_models import create_progress_response
 from ..utils.etag_utils import check_etag, generate_etag
-from ..utils.progress import ProgressTracker
+from ..utils.progress import ProgressTracker, progress_stream
 
 logger = get_logger(__name__)
 
@@ -97,6 +99,44 @@ async def get_progress(
         raise HTTPException(status_code=500, detail={"error": str(e)}) from e
 
 
+@router.get("/{operation_id}/stream")
+async def stream_progress(
+    operation_id: str,
+    since: int | None = None,
+    last_event_id: str | None = Header(None),
+):
+    """
+    Stream progress for an operation as Server-Sent Events.
+
+    The first event is a snapshot of the full progress state; later events are
+    deltas with only the changed fields and new log entries (logs_appended).
+    Each event id is a sequence number: reconnect with Last-Event-ID (or
+    ?since=) to resume after it. The stream closes once the operation finishes.
+    """
+    if ProgressTracker.get_progress(operation_id) is None:
+        raise HTTPException(status_code=404, detail={"error": f"Operation {operation_id} not found"})
+
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+
+    async def events():
+        yield "retry: 2000\n\n"
+        async for event, seq, payload in progress_stream.stream_progress(
+            operation_id, lambda: ProgressTracker.get_progress(operation_id), since=since
+        ):
+            if payload is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"id: {seq}\nevent: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+    logfire.info(f"Progress stream opened | operation_id={operation_id} | since={since}")
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/")
 async def list_active_operations():
     """
@@ -139,6 +139,14 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             api_logger.warning("Could not cleanup crawling context: %s", e, exc_info=True)
 
+        # Close the search database pool
+        try:
+            from .services.search.search_rpc import close_search_pool
+
+            await close_search_pool()
+        except Exception as e:
+            api_logger.warning("Could not close search database pool: %s", e, exc_info=True)
+
 
         api_logger.info("✅ Cleanup completed")
 
@@ -24,6 +24,7 @@ from .strategies.batch import BatchCrawlStrategy
 from .strategies.recursive import RecursiveCrawlStrategy
 from .strategies.single_page import SinglePageCrawlStrategy
 from .strategies.sitemap import SitemapCrawlStrategy
+from .streaming_pipeline import StreamingStoragePipeline
 
 __all__ = [
     "CrawlingService",
@@ -34,6 +35,7 @@ __all__ = [
     "RecursiveCrawlStrategy",
     "SinglePageCrawlStrategy",
     "SitemapCrawlStrategy",
+    "StreamingStoragePipeline",
     "URLHandler",
     "SiteConfig",
     "get_active_orchestration",
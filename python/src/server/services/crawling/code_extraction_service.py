@@ -5,16 +5,30 @@ Handles extraction, processing, and storage of code examples from documents.
 """
 
 import asyncio
-import re
 from collections.abc import Callable
+from concurrent.futures.process import BrokenProcessPool
 from typing import Any
 
 from ...config.logfire_config import safe_logfire_error, safe_logfire_info
 from ...services.credential_service import credential_service
 from ..storage.code_storage_service import (
     add_code_examples_to_supabase,
+    deduplicate_code_blocks,
     generate_code_summaries_batch,
 )
+from ..text_processing.code_block_extractor import (
+    LANGUAGE_PATTERNS,
+    ExtractionSettings,
+    calculate_min_length,
+    clean_code_content,
+    detect_language,
+    extract_html_code_blocks,
+    validate_code_quality,
+)
+from ..threading_service import get_threading_service
+
+# Crawls with at least this many documents parse HTML in the process pool
+PROCESS_POOL_MIN_DOCUMENTS = 20
 
 
 class CodeExtractionService:
@@ -23,38 +37,7 @@ class CodeExtractionService:
     """
 
     # Language-specific patterns for better extraction
-    LANGUAGE_PATTERNS = {
-        "typescript": {
-            "block_start": r"^\s*(export\s+)?(class|interface|function|const|type|enum)\s+\w+",
-            "block_end": r"^\}(\s*;)?$",
-            "min_indicators": [":", "{", "}", "=>", "function", "class", "interface", "type"],
-        },
-        "javascript": {
-            "block_start": r"^\s*(export\s+)?(class|function|const|let|var)\s+\w+",
-            "block_end": r"^\}(\s*;)?$",
-            "min_indicators": ["function", "{", "}", "=>", "const", "let", "var"],
-        },
-        "python": {
-            "block_start": r"^\s*(class|def|async\s+def)\s+\w+",
-            "block_end": r"^\S",  # Unindented line
-            "min_indicators": ["def", ":", "return", "self", "import", "class"],
-        },
-        "java": {
-            "block_start": r"^\s*(public|private|protected)?\s*(class|interface|enum)\s+\w+",
-            "block_end": r"^\}$",
-            "min_indicators": ["class", "public", "private", "{", "}", ";"],
-        },
-        "rust": {
-            "block_start": r"^\s*(pub\s+)?(fn|struct|impl|trait|enum)\s+\w+",
-            "block_end": r"^\}$",
-            "min_indicators": ["fn", "let", "mut", "impl", "struct", "->"],
-        },
-        "go": {
-            "block_start": r"^\s*(func|type|struct)\s+\w+",
-            "block_end": r"^\}$",
-            "min_indicators": ["func", "type", "struct", "{", "}", ":="],
-        },
-    }
+    LANGUAGE_PATTERNS = LANGUAGE_PATTERNS
 
     def __init__(self, supabase_client):
         """
@@ -132,6 +115,10 @@ class CodeExtractionService:
         """Check if code summaries generation is enabled."""
         return await self._get_setting("ENABLE_CODE_SUMMARIES", True)
 
+    async def _is_source_code_dedup_enabled(self) -> bool:
+        """Check if near-duplicate code blocks are merged across all pages of a source."""
+        return await self._get_setting("CODE_DEDUP_ACROSS_SOURCE", False)
+
     async def extract_and_store_code_examples(
         self,
         crawl_results: list[dict[str, Any]],
@@ -265,6 +252,10 @@ class CodeExtractionService:
         """
         Extract code blocks from all documents.
 
+        Large crawls parse several pages at once in the shared process pool; smaller
+        ones parse one page at a time in a worker thread. Either way the event loop
+        stays free, and blocks are returned in document order.
+
         Args:
             crawl_results: List of crawled documents
             source_id: The unique source_id for all documents
@@ -272,135 +263,21 @@ class CodeExtractionService:
         Returns:
             List of code blocks with metadata
         """
-        # Progress will be reported during the loop below
-
-        all_code_blocks = []
         total_docs = len(crawl_results)
         completed_docs = 0
+        blocks_found = 0
+        doc_blocks: list[list[dict[str, Any]]] = [[] for _ in crawl_results]
 
-        for doc in crawl_results:
-            # Check for cancellation before processing each document
-            if cancellation_check:
-                try:
-                    cancellation_check()
-                except asyncio.CancelledError:
-                    if progress_callback:
-                        await progress_callback({
-                            "status": "cancelled",
-                            "progress": 99,
-                            "message": f"Code extraction cancelled at document {completed_docs + 1}/{total_docs}"
-                        })
-                    raise
-
-            try:
-                source_url = doc["url"]
-                html_content = doc.get("html", "")
-                md = doc.get("markdown", "")
-
-                # Debug logging
-                safe_logfire_info(
-                    f"Document content check | url={source_url} | has_html={bool(html_content)} | has_markdown={bool(md)} | html_len={len(html_content) if html_content else 0} | md_len={len(md) if md else 0}"
-                )
-
-                # Get dynamic minimum length based on document context
-
-                # Check markdown first to see if it has code blocks
-                if md:
-                    has_backticks = "```" in md
-                    backtick_count = md.count("```")
-                    safe_logfire_info(
-                        f"Markdown check | url={source_url} | has_backticks={has_backticks} | backtick_count={backtick_count}"
-                    )
-
-                    if "getting-started" in source_url and md:
-                        # Log a sample of the markdown
-                        sample = md[:500]
-                        safe_logfire_info(f"Markdown sample for getting-started: {sample}...")
-
-                # Improved extraction logic - check for text files first, then HTML, then markdown
-                code_blocks = []
-
-                # Check if this is a text file (e.g., .txt, .md, .html after cleaning) or PDF
-                is_text_file = source_url.endswith((
-                    ".txt",
-                    ".text",
-                    ".md",
-                    ".html",
-                    ".htm",
-                )) or "text/plain" in doc.get("content_type", "") or "text/markdown" in doc.get("content_type", "")
-                
-                is_pdf_file = source_url.endswith(".pdf") or "application/pdf" in doc.get("content_type", "")
-
-                if is_text_file:
-                    # For text files, use specialized text extraction
-                    safe_logfire_info(f"🎯 TEXT FILE DETECTED | url={source_url}")
-                    safe_logfire_info(
-                        f"📊 Content types - has_html={bool(html_content)}, has_md={bool(md)}"
-                    )
-                    # For text files, the HTML content should be the raw text (not wrapped in <pre>)
-                    text_content = html_content if html_content else md
-                    if text_content:
-                        safe_logfire_info(
-                            f"📝 Using {'HTML' if html_content else 'MARKDOWN'} content for text extraction"
-                        )
-                        safe_logfire_info(
-                            f"🔍 Content preview (first 500 chars): {repr(text_content[:500])}..."
-                        )
-                        code_blocks = await self._extract_text_file_code_blocks(
-                            text_content, source_url
-                        )
-                        safe_logfire_info(
-                            f"📦 Text extraction complete | found={len(code_blocks)} blocks | url={source_url}"
-                        )
-                    else:
-                        safe_logfire_info(f"⚠️ NO CONTENT for text file | url={source_url}")
-
-                # If this is a PDF file, use specialized PDF extraction
-                elif is_pdf_file:
-                    safe_logfire_info(f"📄 PDF FILE DETECTED | url={source_url}")
-                    # For PDFs, use the content that should be PDF-extracted text
-                    pdf_content = html_content if html_content else md
-                    if pdf_content:
-                        safe_logfire_info(f"📝 Using {'HTML' if html_content else 'MARKDOWN'} content for PDF extraction")
-                        code_blocks = await self._extract_pdf_code_blocks(pdf_content, source_url)
-                        safe_logfire_info(f"📦 PDF extraction complete | found={len(code_blocks)} blocks | url={source_url}")
-                    else:
-                        safe_logfire_info(f"⚠️ NO CONTENT for PDF file | url={source_url}")
-
-                # If not a text file or PDF, or no code blocks found, try HTML extraction as fallback
-                if len(code_blocks) == 0 and html_content and not is_text_file:
-                    safe_logfire_info(
-                        f"Trying HTML extraction first | url={source_url} | html_length={len(html_content)}"
-                    )
-                    html_code_blocks = await self._extract_html_code_blocks(html_content)
-                    if html_code_blocks:
-                        code_blocks = html_code_blocks
-                        safe_logfire_info(
-                            f"Found {len(code_blocks)} code blocks from HTML | url={source_url}"
-                        )
+        use_process_pool = total_docs >= PROCESS_POOL_MIN_DOCUMENTS
+        max_parallel = get_threading_service().config.process_workers if use_process_pool else 1
+        pending: dict[asyncio.Task, int] = {}
 
-                # If still no code blocks, try markdown extraction as fallback
-                if len(code_blocks) == 0 and md and "```" in md:
-                    safe_logfire_info(
-                        f"No code blocks from HTML, trying markdown extraction | url={source_url}"
-                    )
-                    from ..storage.code_storage_service import extract_code_blocks
-
-                    # Use dynamic minimum for markdown extraction
-                    base_min_length = 250  # Default for markdown
-                    code_blocks = extract_code_blocks(md, min_length=base_min_length)
-                    safe_logfire_info(
-                        f"Found {len(code_blocks)} code blocks from markdown | url={source_url}"
-                    )
-
-                if code_blocks:
-                    # Use the provided source_id for all code blocks
-                    for block in code_blocks:
-                        all_code_blocks.append({
-                            "block": block,
-                            "source_url": source_url,
-                            "source_id": source_id,
-                        })
+        async def collect(done: set[asyncio.Task]) -> None:
+            nonlocal completed_docs, blocks_found
+            for task in done:
+                index = pending.pop(task)
+                doc_blocks[index] = task.result()
+                blocks_found += len(doc_blocks[index])
 
                 # Update progress only after completing document extraction
                 completed_docs += 1
@@ -410,351 +287,185 @@ class CodeExtractionService:
                     await progress_callback({
                         "status": "code_extraction",
                         "progress": raw_progress,
-                        "log": f"Extracted code from {completed_docs}/{total_docs} documents ({len(all_code_blocks)} code blocks found)",
+                        "log": f"Extracted code from {completed_docs}/{total_docs} documents ({blocks_found} code blocks found)",
                         "completed_documents": completed_docs,
                         "total_documents": total_docs,
-                        "code_blocks_found": len(all_code_blocks),
+                        "code_blocks_found": blocks_found,
                     })
 
-            except Exception as e:
-                safe_logfire_error(
-                    f"Error processing code from document | url={doc.get('url')} | error={str(e)}"
-                )
+        try:
+            for index, doc in enumerate(crawl_results):
+                # Check for cancellation before processing each document
+                if cancellation_check:
+                    try:
+                        cancellation_check()
+                    except asyncio.CancelledError:
+                        if progress_callback:
+                            await progress_callback({
+                                "status": "cancelled",
+                                "progress": 99,
+                                "message": f"Code extraction cancelled at document {completed_docs + 1}/{total_docs}"
+                            })
+                        raise
+
+                if len(pending) >= max_parallel:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    await collect(done)
+                task = asyncio.create_task(self._extract_document_code_blocks(doc, use_process_pool))
+                pending[task] = index
+
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                await collect(done)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        # Use the provided source_id for all code blocks
+        all_code_blocks = [
+            {"block": block, "source_url": doc["url"], "source_id": source_id}
+            for doc, code_blocks in zip(crawl_results, doc_blocks, strict=True)
+            for block in code_blocks
+        ]
+
+        if len(all_code_blocks) > 1 and await self._is_source_code_dedup_enabled():
+            all_code_blocks = await asyncio.to_thread(self._deduplicate_across_source, all_code_blocks)
 
         return all_code_blocks
 
-    async def _extract_html_code_blocks(self, content: str) -> list[dict[str, Any]]:
+    def _deduplicate_across_source(self, all_code_blocks: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """
-        Extract code blocks from HTML patterns in content.
-        This is a fallback when markdown conversion didn't preserve code blocks.
+        Merge near-duplicate code blocks found on different pages of a source.
+
+        Each group keeps its best variant together with the URL of the page it came from.
 
         Args:
-            content: The content to search for HTML code patterns
-            min_length: Minimum length for code blocks
+            all_code_blocks: Code block items with block, source_url and source_id
 
         Returns:
-            List of code blocks with metadata
+            One item per group of similar blocks, in document order of the groups
         """
-        import re
+        # deduplicate_code_blocks returns the kept block dicts themselves
+        item_by_block = {id(item["block"]): item for item in all_code_blocks}
+        kept_blocks = deduplicate_code_blocks([item["block"] for item in all_code_blocks])
+        return [item_by_block[id(block)] for block in kept_blocks]
 
-        # Add detailed logging
-        safe_logfire_info(f"Processing HTML of length {len(content)} for code extraction")
-
-        # Check if we have actual content
-        if len(content) < 1000:
-            safe_logfire_info(
-                f"Warning: HTML content seems too short, first 500 chars: {repr(content[:500])}"
-            )
-
-        # Look for specific indicators of code blocks
-        has_prism = "prism" in content.lower()
-        has_highlight = "highlight" in content.lower()
-        has_shiki = "shiki" in content.lower()
-        has_codemirror = "codemirror" in content.lower() or "cm-" in content
-        safe_logfire_info(
-            f"Code library indicators | prism={has_prism} | highlight={has_highlight} | shiki={has_shiki} | codemirror={has_codemirror}"
-        )
+    async def _extract_document_code_blocks(
+        self, doc: dict[str, Any], use_process_pool: bool = False
+    ) -> list[dict[str, Any]]:
+        """
+        Extract code blocks from one document.
 
-        # Check for any pre tags with different attributes
-        pre_matches = re.findall(r"<pre[^>]*>", content[:5000], re.IGNORECASE)
-        if pre_matches:
-            safe_logfire_info(f"Found {len(pre_matches)} <pre> tags in first 5000 chars")
-            for i, pre_tag in enumerate(pre_matches[:3]):  # Show first 3
-                safe_logfire_info(f"Pre tag {i + 1}: {pre_tag}")
+        Text files and PDFs use their specialized extractors, other pages their HTML,
+        with the markdown as a fallback when neither yields anything.
 
-        code_blocks = []
-        extracted_positions = set()  # Track already extracted code block positions
-
-        # Comprehensive patterns for various code block formats
-        # Order matters - more specific patterns first
-        patterns = [
-            # GitHub/GitLab patterns
-            (
-                r'<div[^>]*class=["\'][^"\']*highlight[^"\']*["\'][^>]*>.*?<pre[^>]*class=["\'][^"\']*(?:language-)?(\w+)[^"\']*["\'][^>]*><code[^>]*>(.*?)</code></pre>',
-                "github-highlight",
-            ),
-            (
-                r'<div[^>]*class=["\'][^"\']*snippet-clipboard-content[^"\']*["\'][^>]*>.*?<pre[^>]*><code[^>]*>(.*?)</code></pre>',
-                "github-snippet",
-            ),
-            # Docusaurus patterns
-            (
-                r'<div[^>]*class=["\'][^"\']*codeBlockContainer[^"\']*["\'][^>]*>.*?<pre[^>]*class=["\'][^"\']*prism-code[^"\']*language-(\w+)[^"\']*["\'][^>]*>(.*?)</pre>',
-                "docusaurus",
-            ),
-            (
-                r'<div[^>]*class=["\'][^"\']*language-(\w+)[^"\']*["\'][^>]*>.*?<pre[^>]*class=["\'][^"\']*prism-code[^"\']*["\'][^>]*>(.*?)</pre>',
-                "docusaurus-alt",
-            ),
-            # Milkdown specific patterns - check their actual HTML structure
-            (
-                r'<pre[^>]*><code[^>]*class=["\'][^"\']*language-(\w+)[^"\']*["\'][^>]*>(.*?)</code></pre>',
-                "milkdown-typed",
-            ),
-            (
-                r'<div[^>]*class=["\'][^"\']*code-wrapper[^"\']*["\'][^>]*>.*?<pre[^>]*>(.*?)</pre>',
-                "milkdown-wrapper",
-            ),
-            (
-                r'<div[^>]*class=["\'][^"\']*code-block-wrapper[^"\']*["\'][^>]*>.*?<pre[^>]*><code[^>]*>(.*?)</code></pre>',
-                "milkdown-wrapper-code",
-            ),
-            (
-                r'<div[^>]*class=["\'][^"\']*milkdown-code-block[^"\']*["\'][^>]*>.*?<pre[^>]*><code[^>]*>(.*?)</code></pre>',
-                "milkdown-code-block",
-            ),
-            (
-                r'<pre[^>]*class=["\'][^"\']*code-block[^"\']*["\'][^>]*><code[^>]*>(.*?)</code></pre>',
-                "milkdown",
-            ),
-            (r"<div[^>]*data-code-block[^>]*>.*?<pre[^>]*>(.*?)</pre>", "milkdown-alt"),
-            (
-                r'<div[^>]*class=["\'][^"\']*milkdown[^"\']*["\'][^>]*>.*?<pre[^>]*><code[^>]*>(.*?)</code></pre>',
-                "milkdown-div",
-            ),
-            # Monaco Editor - capture all view-lines content
-            (
-                r'<div[^>]*class=["\'][^"\']*monaco-editor[^"\']*["\'][^>]*>.*?<div[^>]*class=["\'][^"\']*view-lines[^"\']*[^>]*>(.*?)</div>(?=.*?</div>.*?</div>)',
-                "monaco",
-            ),
-            # CodeMirror patterns
-            (
-                r'<div[^>]*class=["\'][^"\']*cm-content[^"\']*["\'][^>]*>((?:<div[^>]*class=["\'][^"\']*cm-line[^"\']*["\'][^>]*>.*?</div>\s*)+)</div>',
-                "codemirror",
-            ),
-            (
-                r'<div[^>]*class=["\'][^"\']*CodeMirror[^"\']*["\'][^>]*>.*?<div[^>]*class=["\'][^"\']*CodeMirror-code[^"\']*["\'][^>]*>(.*?)</div>',
-                "codemirror-legacy",
-            ),
-            # Prism.js with language - must be before generic pre
-            (
-                r'<pre[^>]*class=["\'][^"\']*language-(\w+)[^"\']*["\'][^>]*>\s*<code[^>]*>(.*?)</code>\s*</pre>',
-                "prism",
-            ),
-            (
-                r'<pre[^>]*>\s*<code[^>]*class=["\'][^"\']*language-(\w+)[^"\']*["\'][^>]*>(.*?)</code>\s*</pre>',
-                "prism-alt",
-            ),
-            # highlight.js - must be before generic pre/code
-            (
-                r'<pre[^>]*><code[^>]*class=["\'][^"\']*hljs(?:\s+language-(\w+))?[^"\']*["\'][^>]*>(.*?)</code></pre>',
-                "hljs",
-            ),
-            (
-                r'<pre[^>]*class=["\'][^"\']*hljs[^"\']*["\'][^>]*><code[^>]*>(.*?)</code></pre>',
-                "hljs-pre",
-            ),
-            # Shiki patterns (VitePress, Astro, etc.)
-            (
-                r'<pre[^>]*class=["\'][^"\']*shiki[^"\']*["\'][^>]*(?:.*?style=["\'][^"\']*background-color[^"\']*["\'])?[^>]*>\s*<code[^>]*>(.*?)</code>\s*</pre>',
-                "shiki",
-            ),
-            (r'<pre[^>]*class=["\'][^"\']*astro-code[^"\']*["\'][^>]*>(.*?)</pre>', "astro-shiki"),
-            (
-                r'<div[^>]*class=["\'][^"\']*astro-code[^"\']*["\'][^>]*>.*?<pre[^>]*>(.*?)</pre>',
-                "astro-wrapper",
-            ),
-            # VitePress/Vue patterns
-            (
-                r'<div[^>]*class=["\'][^"\']*language-(\w+)[^"\']*["\'][^>]*>.*?<pre[^>]*>(.*?)</pre>',
-                "vitepress",
-            ),
-            (
-                r'<div[^>]*class=["\'][^"\']*vp-code[^"\']*["\'][^>]*>.*?<pre[^>]*>(.*?)</pre>',
-                "vitepress-vp",
-            ),
-            # Nextra patterns
-            (r"<div[^>]*data-nextra-code[^>]*>.*?<pre[^>]*>(.*?)</pre>", "nextra"),
-            (
-                r'<pre[^>]*class=["\'][^"\']*nx-[^"\']*["\'][^>]*><code[^>]*>(.*?)</code></pre>',
-                "nextra-nx",
-            ),
-            # Standard pre/code patterns - should be near the end
-            (
-                r'<pre[^>]*><code[^>]*class=["\'][^"\']*language-(\w+)[^"\']*["\'][^>]*>(.*?)</code></pre>',
-                "standard-lang",
-            ),
-            (r"<pre[^>]*>\s*<code[^>]*>(.*?)</code>\s*</pre>", "standard"),
-            # Generic patterns - should be last
-            (
-                r'<div[^>]*class=["\'][^"\']*code-block[^"\']*["\'][^>]*>.*?<pre[^>]*>(.*?)</pre>',
-                "generic-div",
-            ),
-            (
-                r'<div[^>]*class=["\'][^"\']*codeblock[^"\']*["\'][^>]*>(.*?)</div>',
-                "generic-codeblock",
-            ),
-            (
-                r'<div[^>]*class=["\'][^"\']*highlight[^"\']*["\'][^>]*>.*?<pre[^>]*>(.*?)</pre>',
-                "highlight",
-            ),
-        ]
+        Args:
+            doc: Crawled document with url, html, markdown and optional content_type
+            use_process_pool: Parse HTML in the shared process pool instead of a thread
 
-        for pattern_tuple in patterns:
-            pattern_str, source_type = pattern_tuple
-            matches = list(re.finditer(pattern_str, content, re.DOTALL | re.IGNORECASE))
-
-            # Log pattern matches for Milkdown patterns and CodeMirror
-            if matches and (
-                "milkdown" in source_type
-                or "codemirror" in source_type
-                or "milkdown" in content[:1000].lower()
-            ):
-                safe_logfire_info(f"Pattern {source_type} found {len(matches)} matches")
-
-            for match in matches:
-                # Extract code content based on pattern type
-                if source_type in ["standard-lang", "prism", "vitepress", "hljs", "milkdown-typed"]:
-                    # These patterns capture language in group 1, code in group 2
-                    if match.lastindex and match.lastindex >= 2:
-                        language = match.group(1)
-                        code_content = match.group(2).strip()
-                    else:
-                        code_content = match.group(1).strip()
-                        language = ""
-                else:
-                    # Most patterns have code in group 1
-                    code_content = match.group(1).strip()
-                    # Try to extract language from the full match
-                    full_match = match.group(0)
-                    lang_match = re.search(r'class=["\'].*?language-(\w+)', full_match)
-                    language = lang_match.group(1) if lang_match else ""
-
-                # Get the start position for complete block extraction
-                code_start_pos = match.start()
-
-                # For CodeMirror, extract text from cm-lines
-                if source_type == "codemirror":
-                    # Extract text from each cm-line div
-                    cm_lines = re.findall(
-                        r'<div[^>]*class=["\'][^"\']*cm-line[^"\']*["\'][^>]*>(.*?)</div>',
-                        code_content,
-                        re.DOTALL,
+        Returns:
+            List of code blocks (empty on error)
+        """
+        try:
+            source_url = doc["url"]
+            html_content = doc.get("html", "")
+            md = doc.get("markdown", "")
+
+            # Improved extraction logic - check for text files first, then HTML, then markdown
+            code_blocks = []
+
+            # Check if this is a text file (e.g., .txt, .md, .html after cleaning) or PDF
+            is_text_file = source_url.endswith((
+                ".txt",
+                ".text",
+                ".md",
+                ".html",
+                ".htm",
+            )) or "text/plain" in doc.get("content_type", "") or "text/markdown" in doc.get("content_type", "")
+
+            is_pdf_file = source_url.endswith(".pdf") or "application/pdf" in doc.get("content_type", "")
+
+            if is_text_file:
+                # For text files, the HTML content should be the raw text (not wrapped in <pre>)
+                text_content = html_content if html_content else md
+                if text_content:
+                    code_blocks = await self._extract_text_file_code_blocks(text_content, source_url)
+                    safe_logfire_info(
+                        f"Text extraction complete | found={len(code_blocks)} blocks | url={source_url}"
                     )
-                    if cm_lines:
-                        # Clean each line and join
-                        cleaned_lines = []
-                        for line in cm_lines:
-                            # Remove span tags but keep content
-                            line = re.sub(r"<span[^>]*>", "", line)
-                            line = re.sub(r"</span>", "", line)
-                            # Remove other HTML tags
-                            line = re.sub(r"<[^>]+>", "", line)
-                            cleaned_lines.append(line)
-                        code_content = "\n".join(cleaned_lines)
-                    else:
-                        # Fallback: just clean HTML
-                        code_content = re.sub(r"<span[^>]*>", "", code_content)
-                        code_content = re.sub(r"</span>", "", code_content)
-                        code_content = re.sub(r"<[^>]+>", "\n", code_content)
-
-                # For Monaco, extract text from nested divs
-                if source_type == "monaco":
-                    # Extract actual code from Monaco's complex structure
-                    code_content = re.sub(r"<div[^>]*>", "\n", code_content)
-                    code_content = re.sub(r"</div>", "", code_content)
-                    code_content = re.sub(r"<span[^>]*>", "", code_content)
-                    code_content = re.sub(r"</span>", "", code_content)
-
-                # Calculate dynamic minimum length
-                context_for_length = content[max(0, code_start_pos - 500) : code_start_pos + 500]
-                min_length = await self._calculate_min_length(language, context_for_length)
-
-                # Skip if initial content is too short
-                if len(code_content) < min_length:
-                    # Try to find complete block if we have a language
-                    if language and code_start_pos > 0:
-                        # Look for complete code block
-                        complete_code, block_end_pos = await self._find_complete_code_block(
-                            content, code_start_pos, min_length, language
-                        )
-                        if len(complete_code) >= min_length:
-                            code_content = complete_code
-                            end_pos = block_end_pos
-                        else:
-                            continue
-                    else:
-                        continue
-
-                # Extract position info for deduplication
-                start_pos = match.start()
-                end_pos = (
-                    match.end()
-                    if len(code_content) <= len(match.group(0))
-                    else code_start_pos + len(code_content)
-                )
+                else:
+                    safe_logfire_info(f"No content for text file | url={source_url}")
+
+            # If this is a PDF file, use specialized PDF extraction
+            elif is_pdf_file:
+                # For PDFs, use the content that should be PDF-extracted text
+                pdf_content = html_content if html_content else md
+                if pdf_content:
+                    code_blocks = await self._extract_pdf_code_blocks(pdf_content, source_url)
+                    safe_logfire_info(f"PDF extraction complete | found={len(code_blocks)} blocks | url={source_url}")
+                else:
+                    safe_logfire_info(f"No content for PDF file | url={source_url}")
 
-                # Check if we've already extracted code from this position
-                position_key = (start_pos, end_pos)
-                overlapping = False
-                for existing_start, existing_end in extracted_positions:
-                    # Check if this match overlaps with an existing extraction
-                    if not (end_pos <= existing_start or start_pos >= existing_end):
-                        overlapping = True
-                        break
+            # If not a text file or PDF, or no code blocks found, try HTML extraction as fallback
+            if len(code_blocks) == 0 and html_content and not is_text_file:
+                code_blocks = await self._extract_html_code_blocks(html_content, use_process_pool)
+                if code_blocks:
+                    safe_logfire_info(f"Found {len(code_blocks)} code blocks from HTML | url={source_url}")
 
-                if not overlapping:
-                    extracted_positions.add(position_key)
+            # If still no code blocks, try markdown extraction as fallback
+            if len(code_blocks) == 0 and md and "```" in md:
+                from ..storage.code_storage_service import extract_code_blocks
 
-                    # Extract context
-                    context_before = content[max(0, start_pos - 1000) : start_pos].strip()
-                    context_after = content[end_pos : min(len(content), end_pos + 1000)].strip()
+                # Use dynamic minimum for markdown extraction
+                base_min_length = 250  # Default for markdown
+                code_blocks = extract_code_blocks(md, min_length=base_min_length)
+                safe_logfire_info(
+                    f"Found {len(code_blocks)} code blocks from markdown | url={source_url}"
+                )
 
-                    # Clean the code content
-                    cleaned_code = self._clean_code_content(code_content, language)
+            return code_blocks
 
-                    # Validate code quality
-                    if await self._validate_code_quality(cleaned_code, language):
-                        # Log successful extraction
-                        safe_logfire_info(
-                            f"Extracted code block | source_type={source_type} | language={language} | min_length={min_length} | original_length={len(code_content)} | cleaned_length={len(cleaned_code)}"
-                        )
+        except Exception as e:
+            safe_logfire_error(
+                f"Error processing code from document | url={doc.get('url')} | error={str(e)}"
+            )
+            return []
+
+    async def _get_extraction_settings(self) -> ExtractionSettings:
+        """Resolve the extraction settings into the snapshot the synchronous extractors take."""
+        return ExtractionSettings(
+            min_code_length=await self._get_min_code_length(),
+            max_code_length=await self._get_max_code_length(),
+            complete_block_detection=await self._is_complete_block_detection_enabled(),
+            language_patterns=await self._is_language_patterns_enabled(),
+            prose_filtering=await self._is_prose_filtering_enabled(),
+            max_prose_ratio=await self._get_max_prose_ratio(),
+            min_code_indicators=await self._get_min_code_indicators(),
+            diagram_filtering=await self._is_diagram_filtering_enabled(),
+            contextual_length=await self._is_contextual_length_enabled(),
+        )
 
-                        code_blocks.append({
-                            "code": cleaned_code,
-                            "language": language,
-                            "context_before": context_before,
-                            "context_after": context_after,
-                            "full_context": f"{context_before}\n\n{cleaned_code}\n\n{context_after}",
-                            "source_type": source_type,  # Track which pattern matched
-                        })
-                    else:
-                        safe_logfire_info(
-                            f"Code block failed validation | source_type={source_type} | language={language} | length={len(cleaned_code)}"
-                        )
+    async def _extract_html_code_blocks(self, content: str, use_process_pool: bool = False) -> list[dict[str, Any]]:
+        """
+        Extract code blocks from a page's HTML.
 
-        # Pattern 2: <code>...</code> (standalone)
-        if not code_blocks:  # Only if we didn't find pre/code blocks
-            code_pattern = r"<code[^>]*>(.*?)</code>"
-            matches = re.finditer(code_pattern, content, re.DOTALL | re.IGNORECASE)
-
-            for match in matches:
-                code_content = match.group(1).strip()
-                # Clean the code content
-                cleaned_code = self._clean_code_content(code_content, "")
-
-                # Check if it's multiline or substantial enough and validate quality
-                # Use a minimal length for standalone code tags
-                if len(cleaned_code) >= 100 and ("\n" in cleaned_code or len(cleaned_code) > 100):
-                    if await self._validate_code_quality(cleaned_code, ""):
-                        start_pos = match.start()
-                        end_pos = match.end()
-                        context_before = content[max(0, start_pos - 1000) : start_pos].strip()
-                        context_after = content[end_pos : min(len(content), end_pos + 1000)].strip()
+        Parsing is CPU-bound, so it never runs on the event loop: it goes to the shared
+        process pool when use_process_pool is set and to a worker thread otherwise.
 
-                        code_blocks.append({
-                            "code": cleaned_code,
-                            "language": "",
-                            "context_before": context_before,
-                            "context_after": context_after,
-                            "full_context": f"{context_before}\n\n{cleaned_code}\n\n{context_after}",
-                        })
-                    else:
-                        safe_logfire_info(
-                            f"Standalone code block failed validation | length={len(cleaned_code)}"
-                        )
+        Args:
+            content: The page HTML
+            use_process_pool: Parse in the shared process pool
 
-        return code_blocks
+        Returns:
+            List of code blocks with metadata
+        """
+        settings = await self._get_extraction_settings()
+        if use_process_pool:
+            try:
+                return await get_threading_service().run_in_process(extract_html_code_blocks, content, settings)
+            except BrokenProcessPool as e:
+                safe_logfire_error(f"Code extraction worker died, parsing in a thread instead | error={e}")
+        return await asyncio.to_thread(extract_html_code_blocks, content, settings)
 
     async def _extract_text_file_code_blocks(
         self, content: str, url: str, min_length: int | None = None
@@ -780,12 +491,6 @@ class CodeExtractionService:
         safe_logfire_info(
             f"🔍 TEXT FILE EXTRACTION START | url={url} | content_length={len(content)}"
         )
-        safe_logfire_info(f"📄 First 1000 chars: {repr(content[:1000])}...")
-        safe_logfire_info(
-            f"📄 Sample showing backticks: {repr(content[5000:6000])}..."
-            if len(content) > 6000
-            else "Content too short for mid-sample"
-        )
 
         code_blocks = []
 
@@ -1102,124 +807,7 @@ class CodeExtractionService:
         Try to detect programming language from code content.
         This is a simple heuristic approach.
         """
-        import re
-
-        # Language detection patterns
-        patterns = {
-            "python": [
-                r"\bdef\s+\w+\s*\(",
-                r"\bclass\s+\w+",
-                r"\bimport\s+\w+",
-                r"\bfrom\s+\w+\s+import",
-            ],
-            "javascript": [
-                r"\bfunction\s+\w+\s*\(",
-                r"\bconst\s+\w+\s*=",
-                r"\blet\s+\w+\s*=",
-                r"\bvar\s+\w+\s*=",
-            ],
-            "typescript": [
-                r"\binterface\s+\w+",
-                r":\s*\w+\[\]",
-                r"\btype\s+\w+\s*=",
-                r"\bclass\s+\w+.*\{",
-            ],
-            "java": [
-                r"\bpublic\s+class\s+\w+",
-                r"\bprivate\s+\w+\s+\w+",
-                r"\bpublic\s+static\s+void\s+main",
-            ],
-            "rust": [r"\bfn\s+\w+\s*\(", r"\blet\s+mut\s+\w+", r"\bimpl\s+\w+", r"\bstruct\s+\w+"],
-            "go": [r"\bfunc\s+\w+\s*\(", r"\bpackage\s+\w+", r"\btype\s+\w+\s+struct"],
-        }
-
-        # Count matches for each language
-        scores = {}
-        for lang, lang_patterns in patterns.items():
-            score = 0
-            for pattern in lang_patterns:
-                if re.search(pattern, code, re.MULTILINE):
-                    score += 1
-            if score > 0:
-                scores[lang] = score
-
-        # Return language with highest score
-        if scores:
-            return max(scores, key=scores.get)
-
-        return ""
-
-    async def _find_complete_code_block(
-        self,
-        content: str,
-        start_pos: int,
-        min_length: int = 250,
-        language: str = "",
-        max_length: int = None,
-    ) -> tuple[str, int]:
-        """
-        Find a complete code block starting from a position, extending until we find a natural boundary.
-
-        Args:
-            content: The full content to search in
-            start_pos: Starting position in the content
-            min_length: Minimum length for the code block
-            language: Detected language for language-specific patterns
-
-        Returns:
-            Tuple of (complete_code_block, end_position)
-        """
-        # Start with the minimum content
-        if start_pos + min_length > len(content):
-            return content[start_pos:], len(content)
-
-        # Look for natural code boundaries
-        boundary_patterns = [
-            r"\n}\s*$",  # Closing brace at end of line
-            r"\n}\s*;?\s*$",  # Closing brace with optional semicolon
-            r"\n\)\s*;?\s*$",  # Closing parenthesis
-            r"\n\s*$\n\s*$",  # Double newline (paragraph break)
-            r"\n(?=class\s)",  # Before next class
-            r"\n(?=function\s)",  # Before next function
-            r"\n(?=def\s)",  # Before next Python function
-            r"\n(?=export\s)",  # Before next export
-            r"\n(?=const\s)",  # Before next const declaration
-            r"\n(?=//)",  # Before comment block
-            r"\n(?=#)",  # Before Python comment
-            r"\n(?=\*)",  # Before JSDoc/comment
-            r"\n(?=```)",  # Before next code block
-        ]
-
-        # Add language-specific patterns if available
-        if language and language.lower() in self.LANGUAGE_PATTERNS:
-            lang_patterns = self.LANGUAGE_PATTERNS[language.lower()]
-            if "block_end" in lang_patterns:
-                boundary_patterns.insert(0, lang_patterns["block_end"])
-
-        # Extend until we find a boundary
-        extended_pos = start_pos + min_length
-        while extended_pos < len(content):
-            # Check next 500 characters for a boundary
-            lookahead_end = min(extended_pos + 500, len(content))
-            lookahead = content[extended_pos:lookahead_end]
-
-            for pattern in boundary_patterns:
-                match = re.search(pattern, lookahead, re.MULTILINE)
-                if match:
-                    final_pos = extended_pos + match.end()
-                    return content[start_pos:final_pos].rstrip(), final_pos
-
-            # If no boundary found, extend by another chunk
-            extended_pos += 100
-
-            # Cap at maximum length
-            if max_length is None:
-                max_length = await self._get_max_code_length()
-            if extended_pos - start_pos > max_length:
-                break
-
-        # Return what we have
-        return content[start_pos:extended_pos].rstrip(), extended_pos
+        return detect_language(code)
 
     async def _calculate_min_length(self, language: str, context: str) -> int:
         """
@@ -1232,100 +820,7 @@ class CodeExtractionService:
         Returns:
             Calculated minimum length
         """
-        # Base lengths by language
-        # Check if contextual length adjustment is enabled
-        if not await self._is_contextual_length_enabled():
-            # Return default minimum length
-            return await self._get_min_code_length()
-
-        # Base lengths by language
-        base_lengths = {
-            "json": 100,  # JSON can be short
-            "yaml": 100,  # YAML too
-            "xml": 100,  # XML structures
-            "html": 150,  # HTML snippets
-            "css": 150,  # CSS rules
-            "sql": 150,  # SQL queries
-            "python": 200,  # Python functions
-            "javascript": 250,  # JavaScript typically longer
-            "typescript": 250,  # TypeScript typically longer
-            "java": 300,  # Java even more verbose
-            "c++": 300,  # C++ similar to Java
-            "cpp": 300,  # C++ alternative
-            "c": 250,  # C slightly less verbose
-            "rust": 250,  # Rust medium verbosity
-            "go": 200,  # Go is concise
-        }
-
-        # Get default minimum from settings
-        default_min = await self._get_min_code_length()
-        min_length = base_lengths.get(language.lower(), default_min)
-
-        # Adjust based on context clues
-        context_lower = context.lower()
-        if any(word in context_lower for word in ["example", "snippet", "sample", "demo"]):
-            min_length = int(min_length * 0.7)  # Examples can be shorter
-        elif any(word in context_lower for word in ["implementation", "complete", "full"]):
-            min_length = int(min_length * 1.5)  # Full implementations should be longer
-        elif any(word in context_lower for word in ["minimal", "simple", "basic"]):
-            min_length = int(min_length * 0.8)  # Simple examples can be shorter
-
-        # Ensure reasonable bounds
-        return max(100, min(1000, min_length))
-
-    def _decode_html_entities(self, text: str) -> str:
-        """Decode common HTML entities and clean HTML tags from code."""
-        import re
-
-        # First, handle span tags that wrap individual tokens
-        # Check if spans are being used for syntax highlighting (no spaces between tags)
-        if "</span><span" in text:
-            # This indicates syntax highlighting - preserve the structure
-            text = re.sub(r"</span>", "", text)
-            text = re.sub(r"<span[^>]*>", "", text)
-        else:
-            # Normal span usage - might need spacing
-            # Only add space if there isn't already whitespace
-            text = re.sub(r"</span>(?=[A-Za-z0-9])", " ", text)
-            text = re.sub(r"<span[^>]*>", "", text)
-
-        # Remove any other HTML tags but preserve their content
-        text = re.sub(r"</?[^>]+>", "", text)
-
-        # Decode HTML entities
-        replacements = {
-            "&lt;": "<",
-            "&gt;": ">",
-            "&amp;": "&",
-            "&quot;": '"',
-            "&#39;": "'",
-            "&nbsp;": " ",
-            "&#x27;": "'",
-            "&#x2F;": "/",
-            "&#60;": "<",
-            "&#62;": ">",
-        }
-
-        for entity, char in replacements.items():
-            text = text.replace(entity, char)
-
-        # Replace escaped newlines with actual newlines
-        text = text.replace("\\n", "\n")
-
-        # Clean up excessive whitespace while preserving intentional spacing
-        # Replace multiple spaces with single space, but preserve newlines
-        lines = text.split("\n")
-        cleaned_lines = []
-        for line in lines:
-            # Replace multiple spaces with single space
-            line = re.sub(r" +", " ", line)
-            # Trim trailing spaces but preserve leading spaces (indentation)
-            line = line.rstrip()
-            cleaned_lines.append(line)
-
-        text = "\n".join(cleaned_lines)
-
-        return text
+        return calculate_min_length(language, context, await self._get_extraction_settings())
 
     def _clean_code_content(self, code: str, language: str = "") -> str:
         """
@@ -1338,69 +833,7 @@ class CodeExtractionService:
         Returns:
             Cleaned code content
         """
-        import re
-
-        # First apply HTML entity decoding and tag cleaning
-        code = self._decode_html_entities(code)
-
-        # Fix common concatenation issues from span removal
-        # Common patterns where spaces are missing between keywords
-        spacing_fixes = [
-            # Import statements
-            (r"(\b(?:from|import|as)\b)([A-Za-z])", r"\1 \2"),
-            # Function/class definitions
-            (r"(\b(?:def|class|async|await|return|raise|yield)\b)([A-Za-z])", r"\1 \2"),
-            # Control flow
-            (r"(\b(?:if|elif|else|for|while|try|except|finally|with)\b)([A-Za-z])", r"\1 \2"),
-            # Type hints and declarations
-            (
-                r"(\b(?:int|str|float|bool|list|dict|tuple|set|None|True|False)\b)([A-Za-z])",
-                r"\1 \2",
-            ),
-            # Common Python keywords
-            (r"(\b(?:and|or|not|in|is|lambda)\b)([A-Za-z])", r"\1 \2"),
-            # Fix missing spaces around operators (but be careful with negative numbers)
-            (r"([A-Za-z_)])(\+|-|\*|/|=|<|>|%)", r"\1 \2"),
-            (r"(\+|-|\*|/|=|<|>|%)([A-Za-z_(])", r"\1 \2"),
-        ]
-
-        for pattern, replacement in spacing_fixes:
-            code = re.sub(pattern, replacement, code)
-
-        # Fix specific patterns for different languages
-        if language.lower() in ["python", "py"]:
-            # Fix Python-specific issues
-            code = re.sub(r"(\b(?:from|import)\b)(\w+)(\b(?:import)\b)", r"\1 \2 \3", code)
-            # Fix missing colons
-            code = re.sub(
-                r"(\b(?:def|class|if|elif|else|for|while|try|except|finally|with)\b[^:]+)$",
-                r"\1:",
-                code,
-                flags=re.MULTILINE,
-            )
-
-        # Remove backticks that might have been included
-        if code.startswith("```") and code.endswith("```"):
-            lines = code.split("\n")
-            if len(lines) > 2:
-                # Remove first and last line
-                code = "\n".join(lines[1:-1])
-        elif code.startswith("`") and code.endswith("`"):
-            code = code[1:-1]
-
-        # Final cleanup
-        # Remove any remaining excessive spaces while preserving indentation
-        lines = code.split("\n")
-        cleaned_lines = []
-        for line in lines:
-            # Don't touch leading whitespace (indentation)
-            stripped = line.lstrip()
-            indent = line[: len(line) - len(stripped)]
-            # Clean the rest of the line
-            cleaned = re.sub(r" {2,}", " ", stripped)
-            cleaned_lines.append(indent + cleaned)
-
-        return "\n".join(cleaned_lines).strip()
+        return clean_code_content(code, language)
 
     async def _validate_code_quality(self, code: str, language: str = "") -> bool:
         """
@@ -1413,150 +846,10 @@ class CodeExtractionService:
         Returns:
             True if code passes quality checks, False otherwise
         """
-        import re
-
-        # Basic checks
-        if not code or len(code.strip()) < 20:
-            return False
-
-        # Skip diagram languages if filtering is enabled
-        if await self._is_diagram_filtering_enabled():
-            if language.lower() in ["mermaid", "plantuml", "graphviz", "dot", "diagram"]:
-                safe_logfire_info(f"Skipping diagram language: {language}")
-                return False
-
-        # Check for common formatting issues that indicate poor extraction
-        bad_patterns = [
-            # Concatenated keywords without spaces (but allow camelCase)
-            r"\b(from|import|def|class|if|for|while|return)(?=[a-z])",
-            # HTML entities that weren't decoded
-            r"&[lg]t;|&amp;|&quot;|&#\d+;",
-            # Excessive HTML tags
-            r"<[^>]{50,}>",  # Very long HTML tags
-            # Multiple spans in a row (indicates poor extraction)
-            r"(<span[^>]*>){5,}",
-            # Suspicious character sequences
-            r"[^\s]{200,}",  # Very long unbroken strings (increased threshold)
-        ]
-
-        for pattern in bad_patterns:
-            if re.search(pattern, code):
-                safe_logfire_info(f"Code failed quality check: pattern '{pattern}' found")
-                return False
-
-        # Check for minimum code complexity using various indicators
-        code_indicators = {
-            "function_calls": r"\w+\s*\([^)]*\)",
-            "assignments": r"\w+\s*=\s*.+",
-            "control_flow": r"\b(if|for|while|switch|case|try|catch|except)\b",
-            "declarations": r"\b(var|let|const|def|class|function|interface|type|struct|enum)\b",
-            "imports": r"\b(import|from|require|include|using|use)\b",
-            "brackets": r"[\{\}\[\]]",
-            "operators": r"[\+\-\*\/\%\&\|\^<>=!]",
-            "method_chains": r"\.\w+",
-            "arrows": r"(=>|->)",
-            "keywords": r"\b(return|break|continue|yield|await|async)\b",
-        }
-
-        indicator_count = 0
-        indicator_details = []
-        for name, pattern in code_indicators.items():
-            if re.search(pattern, code):
-                indicator_count += 1
-                indicator_details.append(name)
-
-        # Require minimum code indicators
-        min_indicators = await self._get_min_code_indicators()
-        if indicator_count < min_indicators:
-            safe_logfire_info(
-                f"Code has insufficient indicators: {indicator_count} found ({', '.join(indicator_details)})"
-            )
-            return False
-
-        # Check code-to-comment ratio
-        lines = code.split("\n")
-        non_empty_lines = [line for line in lines if line.strip()]
-
-        if not non_empty_lines:
-            return False
-
-        # Count comment lines (various comment styles)
-        comment_patterns = [
-            r"^\s*(//|#|/\*|\*|<!--)",  # Single line comments
-            r'^\s*"""',  # Python docstrings
-            r"^\s*'''",  # Python docstrings alt
-            r"^\s*\*\s",  # JSDoc style
-        ]
-
-        comment_lines = 0
-        for line in lines:
-            for pattern in comment_patterns:
-                if re.match(pattern, line.strip()):
-                    comment_lines += 1
-                    break
-
-        # Allow up to 70% comments (documentation is important)
-        if non_empty_lines and comment_lines / len(non_empty_lines) > 0.7:
-            safe_logfire_info(
-                f"Code is mostly comments: {comment_lines}/{len(non_empty_lines)} lines"
-            )
-            return False
-
-        # Language-specific validation
-        if language.lower() in self.LANGUAGE_PATTERNS:
-            lang_info = self.LANGUAGE_PATTERNS[language.lower()]
-            min_indicators = lang_info.get("min_indicators", [])
-
-            # Check for language-specific indicators
-            found_lang_indicators = sum(
-                1 for indicator in min_indicators if indicator in code.lower()
-            )
-
-            if found_lang_indicators < 2:  # Need at least 2 language-specific indicators
-                safe_logfire_info(
-                    f"Code lacks {language} indicators: only {found_lang_indicators} found"
-                )
-                return False
-
-        # Check for reasonable structure
-        # Too few meaningful lines
-        if len(non_empty_lines) < 3:
-            safe_logfire_info(f"Code has too few non-empty lines: {len(non_empty_lines)}")
-            return False
-
-        # Check for reasonable line lengths
-        very_long_lines = sum(1 for line in lines if len(line) > 300)
-        if len(lines) > 0 and very_long_lines > len(lines) * 0.5:
-            safe_logfire_info("Code has too many very long lines")
-            return False
-
-        # Check if it's mostly prose/documentation
-        prose_indicators = [
-            r"\b(the|this|that|these|those|is|are|was|were|will|would|should|could|have|has|had)\b",
-            r"[.!?]\s+[A-Z]",  # Sentence endings followed by capital letter
-            r"\b(however|therefore|furthermore|moreover|nevertheless)\b",
-        ]
-
-        prose_score = 0
-        word_count = len(code.split())
-        for pattern in prose_indicators:
-            matches = len(re.findall(pattern, code, re.IGNORECASE))
-            prose_score += matches
-
-        # Check prose filtering
-        if await self._is_prose_filtering_enabled():
-            max_prose_ratio = await self._get_max_prose_ratio()
-            if word_count > 0 and prose_score / word_count > max_prose_ratio:
-                safe_logfire_info(
-                    f"Code appears to be prose: prose_score={prose_score}, word_count={word_count}"
-                )
-                return False
-
-        # Passed all checks
-        safe_logfire_info(
-            f"Code passed validation: indicators={indicator_count}, language={language}, lines={len(non_empty_lines)}"
-        )
-        return True
+        passed, reason = validate_code_quality(code, language, await self._get_extraction_settings())
+        if not passed:
+            safe_logfire_info(reason)
+        return passed
 
     async def _generate_code_summaries(
         self,
@@ -17,11 +17,13 @@ from ...config.logfire_config import get_logger, safe_logfire_error, safe_logfir
 from ...utils import get_supabase_client
 from ...utils.progress.progress_tracker import ProgressTracker
 from ..credential_service import credential_service
+from ..storage.document_storage_service import stored_embeddings_match
 
 # Import strategies
 # Import operations
 from .discovery_service import DiscoveryService
 from .document_storage_operations import DocumentStorageOperations
+from .helpers.crawl_result_store import CrawlResultStore
 from .helpers.site_config import SiteConfig
 
 # Import helpers
@@ -31,7 +33,12 @@ from .progress_mapper import ProgressMapper
 from .strategies.batch import BatchCrawlStrategy
 from .strategies.recursive import RecursiveCrawlStrategy
 from .strategies.single_page import SinglePageCrawlStrategy
-from .strategies.sitemap import SitemapCrawlStrategy
+from .strategies.sitemap import SitemapCrawlStrategy, SitemapEntry
+from .streaming_pipeline import (
+    DEFAULT_BATCH_PAGES,
+    DEFAULT_QUEUE_SIZE,
+    StreamingStoragePipeline,
+)
 
 logger = get_logger(__name__)
 
@@ -139,6 +146,15 @@ class CrawlingService:
         self.progress_mapper = ProgressMapper()
         # Cancellation support
         self._cancelled = False
+        # Active streaming pipeline for the current orchestration (None = stage-by-stage)
+        self.streaming_pipeline: StreamingStoragePipeline | None = None
+        # Disk-backed store for pages collected until the crawl ends (None outside an orchestration)
+        self.result_store: CrawlResultStore | None = None
+        # Incremental recrawls send conditional requests using the validators stored with each page
+        self.conditional_recrawl = False
+        # Pages an incremental recrawl skipped without fetching content (sitemap <lastmod> or HTTP 304)
+        self.skipped_unchanged_urls: list[str] = []
+        self.skipped_unchanged_word_count = 0
 
     def set_progress_id(self, progress_id: str):
         """Set the progress ID for HTTP polling updates."""
@@ -218,13 +234,16 @@ class CrawlingService:
             )
 
     # Simple delegation methods for backward compatibility
-    async def crawl_single_page(self, url: str, retry_count: int = 3) -> dict[str, Any]:
+    async def crawl_single_page(
+        self, url: str, retry_count: int = 3, validators: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
         """Crawl a single web page."""
         return await self.single_page_strategy.crawl_single_page(
             url,
             self.url_handler.transform_github_url,
             self.site_config.is_documentation_site,
             retry_count,
+            validators,
         )
 
     async def crawl_markdown_file(
@@ -240,9 +259,34 @@ class CrawlingService:
             end_progress,
         )
 
-    def parse_sitemap(self, sitemap_url: str) -> list[str]:
+    async def parse_sitemap(self, sitemap_url: str) -> list[str]:
         """Parse a sitemap and extract URLs."""
-        return self.sitemap_strategy.parse_sitemap(sitemap_url, self._check_cancellation)
+        return await self.sitemap_strategy.parse_sitemap(sitemap_url, self._check_cancellation)
+
+    async def _skip_unchanged_sitemap_entries(self, entries: list[SitemapEntry]) -> list[str]:
+        """
+        Drop sitemap entries whose <lastmod> is not newer than the stored page.
+
+        Entries without a <lastmod>, or pages never stored before, are kept.
+        Skipped pages are remembered so the source word count still includes them.
+        """
+        dated_urls = [entry.url for entry in entries if entry.lastmod]
+        crawl_dates = await self.page_storage_ops.get_page_crawl_dates(dated_urls) if dated_urls else {}
+
+        urls_to_crawl = []
+        for entry in entries:
+            stored = crawl_dates.get(entry.url)
+            if stored and entry.lastmod and entry.lastmod <= stored["updated_at"]:
+                self.skipped_unchanged_urls.append(entry.url)
+                self.skipped_unchanged_word_count += stored["word_count"]
+            else:
+                urls_to_crawl.append(entry.url)
+
+        if self.skipped_unchanged_urls:
+            safe_logfire_info(
+                f"Sitemap lastmod filter | unchanged={len(self.skipped_unchanged_urls)} | to_crawl={len(urls_to_crawl)}"
+            )
+        return urls_to_crawl
 
     async def crawl_batch_with_progress(
         self,
@@ -250,9 +294,21 @@ class CrawlingService:
         max_concurrent: int | None = None,
         progress_callback: Callable[[str, int, str], Awaitable[None]] | None = None,
         link_text_fallbacks: dict[str, str] | None = None,
+        page_callback: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
     ) -> list[dict[str, Any]]:
         """Batch crawl multiple URLs in parallel."""
-        return await self.batch_strategy.crawl_batch_with_progress(
+        validators = None
+        not_modified_callback = None
+        if self.conditional_recrawl:
+            validators = await self.page_storage_ops.get_page_validators(urls)
+
+            async def not_modified_callback(url: str) -> None:
+                # The stored page is still current - keep it and count it towards the source
+                self.skipped_unchanged_urls.append(url)
+                self.skipped_unchanged_word_count += validators[url]["word_count"]
+
+        spilled_pages, page_callback = self._spill_pages_unless_streamed(page_callback)
+        results = await self.batch_strategy.crawl_batch_with_progress(
             urls,
             self.url_handler.transform_github_url,
             self.site_config.is_documentation_site,
@@ -260,7 +316,11 @@ class CrawlingService:
             progress_callback,
             self._check_cancellation,  # Pass cancellation check
             link_text_fallbacks,  # Pass link text fallbacks
+            page_callback,
+            validators,
+            not_modified_callback,
         )
+        return results if spilled_pages is None else spilled_pages
 
     async def crawl_recursive_with_progress(
         self,
@@ -268,9 +328,11 @@ class CrawlingService:
         max_depth: int = 3,
         max_concurrent: int | None = None,
         progress_callback: Callable[[str, int, str], Awaitable[None]] | None = None,
+        page_callback: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
     ) -> list[dict[str, Any]]:
         """Recursively crawl internal links from start URLs."""
-        return await self.recursive_strategy.crawl_recursive_with_progress(
+        spilled_pages, page_callback = self._spill_pages_unless_streamed(page_callback)
+        results = await self.recursive_strategy.crawl_recursive_with_progress(
             start_urls,
             self.url_handler.transform_github_url,
             self.site_config.is_documentation_site,
@@ -278,6 +340,118 @@ class CrawlingService:
             max_concurrent,
             progress_callback,
             self._check_cancellation,  # Pass cancellation check
+            page_callback,
+        )
+        return results if spilled_pages is None else spilled_pages
+
+    def _spill_pages_unless_streamed(
+        self, page_callback: Callable[[dict[str, Any]], Awaitable[None]] | None
+    ) -> tuple[list[dict[str, Any]] | None, Callable[[dict[str, Any]], Awaitable[None]] | None]:
+        """
+        Collect pages that are not streamed to storage in the result store instead of in memory.
+
+        Returns:
+            Tuple of (list the spilled pages are appended to or None, page callback to pass on)
+        """
+        if page_callback or not self.result_store:
+            return None, page_callback
+
+        store = self.result_store
+        spilled_pages: list[dict[str, Any]] = []
+
+        async def spill_page(page: dict[str, Any]) -> None:
+            spilled_pages.append(store.add(page))
+
+        return spilled_pages, spill_page
+
+    def _stream_pages_as(self, crawl_type: str) -> Callable[[dict[str, Any]], Awaitable[None]] | None:
+        """Route crawled pages into the streaming pipeline, if this orchestration has one."""
+        if not self.streaming_pipeline:
+            return None
+        self.streaming_pipeline.crawl_type = crawl_type
+        return self.streaming_pipeline.submit
+
+    async def _resolve_code_extraction_providers(self, request: dict[str, Any]) -> tuple[str, str | None]:
+        """Resolve the LLM and embedding providers used for code example summaries."""
+        # Extract provider from request or use credential service default
+        provider = request.get("provider")
+        embedding_provider = None
+
+        if not provider:
+            try:
+                provider_config = await credential_service.get_active_provider("llm")
+                provider = provider_config.get("provider", "openai")
+            except Exception as e:
+                logger.warning(
+                    f"Failed to get provider from credential service: {e}, defaulting to openai"
+                )
+                provider = "openai"
+
+        try:
+            embedding_config = await credential_service.get_active_provider("embedding")
+            embedding_provider = embedding_config.get("provider")
+        except Exception as e:
+            logger.warning(
+                f"Failed to get embedding provider from credential service: {e}. Using configured default."
+            )
+            embedding_provider = None
+
+        return provider, embedding_provider
+
+    async def _create_streaming_pipeline(
+        self,
+        request: dict[str, Any],
+        source_id: str,
+        source_url: str,
+        source_display_name: str,
+    ) -> StreamingStoragePipeline | None:
+        """
+        Create the streaming storage pipeline for this crawl, unless disabled in settings.
+
+        Sitemap and recursive crawls feed pages into it as they are crawled; other
+        crawl types keep the stage-by-stage flow.
+        """
+        try:
+            settings = await credential_service.get_credentials_by_category("rag_strategy")
+            if str(settings.get("STREAMING_PIPELINE_ENABLED", "true")).lower() != "true":
+                return None
+            batch_pages = int(settings.get("STREAMING_BATCH_PAGES", str(DEFAULT_BATCH_PAGES)))
+            queue_size = int(settings.get("STREAMING_QUEUE_SIZE", str(DEFAULT_QUEUE_SIZE)))
+        except Exception as e:
+            logger.warning(f"Failed to load streaming pipeline settings: {e}, using defaults")
+            batch_pages = DEFAULT_BATCH_PAGES
+            queue_size = DEFAULT_QUEUE_SIZE
+
+        extract_code_examples = request.get("extract_code_examples", True)
+        provider, embedding_provider = (
+            await self._resolve_code_extraction_providers(request) if extract_code_examples else (None, None)
+        )
+
+        async def storage_progress_callback(status: str, progress: int, message: str, **kwargs):
+            # Storage runs alongside crawling, so report counters without moving the stage
+            if not self.progress_tracker:
+                return
+            await self.progress_tracker.update(
+                status=self.progress_tracker.state.get("status", "crawling"),
+                progress=self.progress_tracker.state.get("progress", 0),
+                log=message,
+                source_id=source_id,
+                **{k: v for k, v in kwargs.items() if k in ("chunks_stored", "code_examples_found")},
+            )
+
+        return StreamingStoragePipeline(
+            self.doc_storage_ops,
+            request,
+            source_id,
+            source_url=source_url,
+            source_display_name=source_display_name,
+            progress_callback=storage_progress_callback,
+            cancellation_check=self._check_cancellation,
+            batch_pages=batch_pages,
+            queue_size=queue_size,
+            extract_code_examples=extract_code_examples,
+            provider=provider,
+            embedding_provider=embedding_provider,
         )
 
     # Orchestration methods
@@ -362,6 +536,17 @@ class CrawlingService:
                 f"Generated unique source_id '{original_source_id}' and display name '{source_display_name}' from URL '{url}'"
             )
 
+            # Kept vectors are only valid for the embedding configuration that produced them
+            if request.get("incremental") and not await stored_embeddings_match(
+                self.supabase_client, original_source_id
+            ):
+                safe_logfire_info(
+                    f"Embedding configuration changed since last crawl, re-embedding everything | source_id={original_source_id}"
+                )
+                request = {**request, "incremental": False}
+
+            self.conditional_recrawl = bool(request.get("incremental", False))
+
             # Helper to update progress with mapper
             async def update_mapped_progress(
                 stage: str, stage_progress: int, message: str, **kwargs
@@ -405,8 +590,7 @@ class CrawlingService:
                     "discovery", 25, f"Discovering best related file for {url}", current_url=url
                 )
                 try:
-                    # Offload potential sync I/O to avoid blocking the event loop
-                    discovered_file = await asyncio.to_thread(self.discovery_service.discover_files, url)
+                    discovered_file = await self.discovery_service.discover_files(url)
 
                     # Add the single best discovered file to crawl list
                     if discovered_file:
@@ -449,6 +633,14 @@ class CrawlingService:
                         "discovery", 100, "Discovery phase failed, continuing with regular crawl", current_url=url
                     )
 
+            # Pages that are not streamed wait for the storage stage on disk instead of in memory
+            self.result_store = CrawlResultStore()
+
+            # Large crawls store pages while crawling instead of after it
+            self.streaming_pipeline = await self._create_streaming_pipeline(
+                request, original_source_id, url, source_display_name
+            )
+
             # Analyzing stage - determine what to crawl
             if discovered_urls:
                 # Discovery found a file - crawl ONLY the discovered file, not the main URL
@@ -500,7 +692,36 @@ class CrawlingService:
             # Send heartbeat after potentially long crawl operation
             await send_heartbeat_if_needed()
 
-            if not crawl_results:
+            # Pages already handed to the streaming pipeline are not in crawl_results
+            pages_streamed = self.streaming_pipeline.pages_submitted if self.streaming_pipeline else 0
+
+            if not crawl_results and not pages_streamed and self.skipped_unchanged_urls:
+                # Incremental recrawl where every page is unchanged since the stored copy
+                unchanged_count = len(self.skipped_unchanged_urls)
+                completion_message = f"Crawl completed: all {unchanged_count} pages unchanged since the last crawl"
+                await update_mapped_progress(
+                    "completed",
+                    100,
+                    completion_message,
+                    chunks_stored=0,
+                    code_examples_found=0,
+                    processed_pages=unchanged_count,
+                    total_pages=unchanged_count,
+                )
+                if self.progress_tracker:
+                    await self.progress_tracker.complete({
+                        "chunks_stored": 0,
+                        "code_examples_found": 0,
+                        "processed_pages": unchanged_count,
+                        "total_pages": unchanged_count,
+                        "sourceId": original_source_id,
+                        "log": "Crawl completed successfully!",
+                    })
+                if self.progress_id:
+                    await unregister_orchestration(self.progress_id)
+                return
+
+            if not crawl_results and not pages_streamed:
                 raise ValueError("No content was crawled from the provided URL")
 
             # Processing stage
@@ -510,7 +731,7 @@ class CrawlingService:
             self._check_cancellation()
 
             # Calculate total work units for accurate progress tracking
-            total_pages = len(crawl_results)
+            total_pages = len(crawl_results) + pages_streamed
 
             # Process and store documents using document storage operations
             last_logged_progress = 0
@@ -548,17 +769,38 @@ class CrawlingService:
                         **kwargs
                     )
 
-            storage_results = await self.doc_storage_ops.process_and_store_documents(
-                crawl_results,
-                request,
-                crawl_type,
-                original_source_id,
-                doc_storage_callback,
-                self._check_cancellation,
-                source_url=url,
-                source_display_name=source_display_name,
-                url_to_page_id=None,  # Will be populated after page storage
-            )
+            if pages_streamed:
+                # Most pages are stored already; drain the queue and flush what is left
+                await update_mapped_progress(
+                    "document_storage", 50, "Storing remaining crawled pages...", total_pages=total_pages
+                )
+                for doc in crawl_results:
+                    await self.streaming_pipeline.submit(doc)
+                storage_results = await self.streaming_pipeline.finish()
+            else:
+                if self.streaming_pipeline:
+                    await self.streaming_pipeline.finish()
+                storage_results = await self.doc_storage_ops.process_and_store_documents(
+                    crawl_results,
+                    request,
+                    crawl_type,
+                    original_source_id,
+                    doc_storage_callback,
+                    self._check_cancellation,
+                    source_url=url,
+                    source_display_name=source_display_name,
+                    url_to_page_id=None,  # Will be populated after page storage
+                    incremental=bool(request.get("incremental", False)),
+                )
+
+            # Pages skipped by the sitemap <lastmod> filter or a 304 still belong to the source
+            if self.skipped_unchanged_word_count and storage_results.get("source_id"):
+                storage_results["total_word_count"] = (
+                    storage_results.get("total_word_count", 0) + self.skipped_unchanged_word_count
+                )
+                await self.doc_storage_ops.update_source_word_count(
+                    storage_results["source_id"], storage_results["total_word_count"]
+                )
 
             # Update progress tracker with source_id now that it's created
             if self.progress_tracker and storage_results.get("source_id"):
@@ -582,7 +824,8 @@ class CrawlingService:
 
             # CRITICAL: Verify that chunks were actually stored
             actual_chunks_stored = storage_results.get("chunks_stored", 0)
-            if storage_results["chunk_count"] > 0 and actual_chunks_stored == 0:
+            chunks_unchanged = storage_results.get("chunks_unchanged", 0)
+            if storage_results["chunk_count"] > 0 and actual_chunks_stored + chunks_unchanged == 0:
                 # We processed chunks but none were stored - this is a failure
                 error_msg = (
                     f"Failed to store documents: {storage_results['chunk_count']} chunks processed but 0 stored "
@@ -591,9 +834,9 @@ class CrawlingService:
                 safe_logfire_error(error_msg)
                 raise ValueError(error_msg)
 
-            # Extract code examples if requested
-            code_examples_count = 0
-            if request.get("extract_code_examples", True) and actual_chunks_stored > 0:
+            # Extract code examples if requested (streamed batches already did this as they were stored)
+            code_examples_count = storage_results.get("code_examples_count", 0)
+            if request.get("extract_code_examples", True) and actual_chunks_stored > 0 and not pages_streamed:
                 # Check for cancellation before starting code extraction
                 self._check_cancellation()
 
@@ -616,31 +859,16 @@ class CrawlingService:
                         )
 
                 try:
-                    # Extract provider from request or use credential service default
-                    provider = request.get("provider")
-                    embedding_provider = None
-
-                    if not provider:
-                        try:
-                            provider_config = await credential_service.get_active_provider("llm")
-                            provider = provider_config.get("provider", "openai")
-                        except Exception as e:
-                            logger.warning(
-                                f"Failed to get provider from credential service: {e}, defaulting to openai"
-                            )
-                            provider = "openai"
-
-                    try:
-                        embedding_config = await credential_service.get_active_provider("embedding")
-                        embedding_provider = embedding_config.get("provider")
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to get embedding provider from credential service: {e}. Using configured default."
-                        )
-                        embedding_provider = None
+                    provider, embedding_provider = await self._resolve_code_extraction_providers(request)
+
+                    # Unchanged pages from an incremental recrawl keep their code examples
+                    unchanged_urls = set(storage_results.get("unchanged_urls", []))
+                    changed_crawl_results = [
+                        doc for doc in crawl_results if doc.get("url") not in unchanged_urls
+                    ]
 
                     code_examples_count = await self.doc_storage_ops.extract_and_store_code_examples(
-                        crawl_results,
+                        changed_crawl_results,
                         storage_results["url_to_full_document"],
                         storage_results["source_id"],
                         code_progress_callback,
@@ -678,15 +906,19 @@ class CrawlingService:
                 code_examples_found=code_examples_count,
             )
 
+            completion_message = f"Crawl completed: {actual_chunks_stored} chunks, {code_examples_count} code examples"
+            if chunks_unchanged:
+                completion_message += f" ({chunks_unchanged} unchanged chunks kept)"
+
             # Complete - send both the progress update and completion event
             await update_mapped_progress(
                 "completed",
                 100,
-                f"Crawl completed: {actual_chunks_stored} chunks, {code_examples_count} code examples",
+                completion_message,
                 chunks_stored=actual_chunks_stored,
                 code_examples_found=code_examples_count,
-                processed_pages=len(crawl_results),
-                total_pages=len(crawl_results),
+                processed_pages=total_pages,
+                total_pages=total_pages,
             )
 
             # Mark crawl as completed
@@ -694,8 +926,8 @@ class CrawlingService:
                 await self.progress_tracker.complete({
                     "chunks_stored": actual_chunks_stored,
                     "code_examples_found": code_examples_count,
-                    "processed_pages": len(crawl_results),
-                    "total_pages": len(crawl_results),
+                    "processed_pages": total_pages,
+                    "total_pages": total_pages,
                     "sourceId": storage_results.get("source_id", ""),
                     "log": "Crawl completed successfully!",
                 })
@@ -749,6 +981,14 @@ class CrawlingService:
                 safe_logfire_info(
                     f"Unregistered orchestration service on error | progress_id={self.progress_id}"
                 )
+        finally:
+            # Stop the storage consumer if the crawl ended before the pipeline was drained
+            if self.streaming_pipeline:
+                await self.streaming_pipeline.abort()
+                self.streaming_pipeline = None
+            if self.result_store:
+                self.result_store.close()
+                self.result_store = None
 
     def _is_same_domain(self, url: str, base_domain: str) -> bool:
         """
@@ -1032,7 +1272,11 @@ class CrawlingService:
                 }]
                 return crawl_results, crawl_type
 
-            sitemap_urls = self.parse_sitemap(url)
+            sitemap_entries = await self.sitemap_strategy.read_sitemap(url, self._check_cancellation)
+            if request.get("incremental"):
+                sitemap_urls = await self._skip_unchanged_sitemap_entries(sitemap_entries)
+            else:
+                sitemap_urls = [entry.url for entry in sitemap_entries]
 
             if sitemap_urls:
                 # Update progress before starting batch crawl
@@ -1045,6 +1289,7 @@ class CrawlingService:
                 crawl_results = await self.crawl_batch_with_progress(
                     sitemap_urls,
                     progress_callback=await self._create_crawl_progress_callback("crawling"),
+                    page_callback=self._stream_pages_as(crawl_type),
                 )
 
         else:
@@ -1065,6 +1310,7 @@ class CrawlingService:
                 max_depth=max_depth,
                 max_concurrent=None,  # Let strategy use settings
                 progress_callback=await self._create_crawl_progress_callback("crawling"),
+                page_callback=self._stream_pages_as(crawl_type),
             )
 
         return crawl_results, crawl_type
@@ -3,14 +3,22 @@ Discovery Service for Automatic File Detection
 
 Handles automatic discovery and parsing of llms.txt, sitemap.xml, and related files
 to enhance crawling capabilities with priority-based discovery methods.
+
+All candidate locations are probed concurrently (HEAD, falling back to GET) over
+one connection pool, and hostnames are SSRF-validated once per service through a
+shared resolver cache. Discovery returns as soon as the highest-priority
+candidate is known to exist.
 """
 
+import asyncio
 import ipaddress
 import socket
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from html.parser import HTMLParser
 from urllib.parse import urljoin, urlparse
 
-import requests
+import httpx
 
 from ...config.logfire_config import get_logger
 
@@ -47,12 +55,30 @@ class SitemapHTMLParser(HTMLParser):
                     self.sitemaps.append(('meta', content))
 
 
+def _product_token(user_agent: str) -> str:
+    """Get the lowercased product token of a user agent ("ArchonCrawler/1.0" -> "archoncrawler")."""
+    parts = user_agent.strip().split(maxsplit=1)
+    return parts[0].split("/", 1)[0].lower() if parts else ""
+
+
 class DiscoveryService:
     """Service for discovering related files automatically during crawls."""
 
     # Maximum response size to prevent memory exhaustion (10MB default)
     MAX_RESPONSE_SIZE = 10 * 1024 * 1024  # 10 MB
 
+    # Probe settings - every candidate location is checked concurrently
+    MAX_CONCURRENT_PROBES = 16
+    PROBE_TIMEOUT = 5.0
+    FETCH_TIMEOUT = 30.0
+    MAX_REDIRECTS = 3
+    # HEAD responses that mean "ask again with GET" rather than "not found"
+    HEAD_FALLBACK_STATUS_CODES = frozenset({403, 405, 501})
+
+    REQUEST_HEADERS = {
+        'User-Agent': 'Archon-Discovery/1.0 (SSRF-Protected)'
+    }
+
     # Global priority order - select ONE best file from all categories
     # Based on actual usage research - only includes files commonly found in the wild
     DISCOVERY_PRIORITY = [
@@ -75,7 +101,11 @@ class DiscoveryService:
         '.rss', '.yaml', '.yml', '.pdf', '.zip'
     }
 
-    def discover_files(self, base_url: str) -> str | None:
+    def __init__(self):
+        # hostname -> pending or finished SSRF check, shared by all probes of this service
+        self._hostname_checks: dict[str, asyncio.Future[bool]] = {}
+
+    async def discover_files(self, base_url: str) -> str | None:
         """
         Main discovery orchestrator - selects ONE best file across all categories.
         All files contain similar AI/crawling guidance, so we only need the best one.
@@ -92,19 +122,25 @@ class DiscoveryService:
             # Extract directory path from base URL
             base_dir = self._extract_directory(base_url)
 
-            # Try each file in priority order
+            # Every candidate location, highest priority first
+            candidates: list[str] = []
             for filename in self.DISCOVERY_PRIORITY:
-                discovered_url = self._try_locations(base_url, base_dir, filename)
+                for candidate in self._candidate_urls(base_url, base_dir, filename):
+                    if candidate not in candidates:
+                        candidates.append(candidate)
+
+            async with self._client_scope() as client:
+                discovered_url = await self._first_existing_url(candidates, client)
                 if discovered_url:
                     logger.info(f"Discovery found best file: {discovered_url}")
                     return discovered_url
 
-            # Fallback: Check HTML meta tags for sitemap references
-            html_sitemaps = self._parse_html_meta_tags(base_url)
-            if html_sitemaps:
-                best_file = html_sitemaps[0]
-                logger.info(f"Discovery found best file from HTML meta tags: {best_file}")
-                return best_file
+                # Fallback: Check HTML meta tags for sitemap references
+                html_sitemaps = await self._parse_html_meta_tags(base_url, client)
+                if html_sitemaps:
+                    best_file = html_sitemaps[0]
+                    logger.info(f"Discovery found best file from HTML meta tags: {best_file}")
+                    return best_file
 
             logger.info(f"Discovery completed for {base_url}: no files found")
             return None
@@ -113,6 +149,31 @@ class DiscoveryService:
             logger.exception(f"Unexpected error during discovery for {base_url}")
             return None
 
+    async def _first_existing_url(self, candidates: list[str], client: httpx.AsyncClient) -> str | None:
+        """
+        Probe all candidates concurrently and return the first one, in priority order, that exists.
+
+        Returns as soon as every higher-priority probe has failed and this one succeeded;
+        remaining probes are cancelled.
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_PROBES)
+
+        async def probe(url: str) -> bool:
+            async with semaphore:
+                return await self._check_url_exists(url, client)
+
+        # Tasks start in priority order, so the most likely winners are probed first
+        probes = [asyncio.create_task(probe(url)) for url in candidates]
+        try:
+            for url, task in zip(candidates, probes, strict=True):
+                if await task:
+                    return url
+            return None
+        finally:
+            for task in probes:
+                task.cancel()
+            await asyncio.gather(*probes, return_exceptions=True)
+
     def _extract_directory(self, base_url: str) -> str:
         """
         Extract directory path from URL, handling both file URLs and directory URLs.
@@ -137,9 +198,9 @@ class DiscoveryService:
             # Last segment is a directory
             return base_path
 
-    def _try_locations(self, base_url: str, base_dir: str, filename: str) -> str | None:
+    def _candidate_urls(self, base_url: str, base_dir: str, filename: str) -> list[str]:
         """
-        Try different locations for a given filename in priority order.
+        List the locations to try for a given filename in priority order.
 
         Priority:
         1. Same directory as base_url (if not root)
@@ -152,29 +213,23 @@ class DiscoveryService:
             filename: Filename to search for
 
         Returns:
-            URL if file found, None otherwise
+            Candidate URLs, highest priority first
         """
         parsed = urlparse(base_url)
+        candidates = []
 
-        # Priority 1: Check same directory (if not root)
+        # Priority 1: Same directory (if not root)
         if base_dir and base_dir != '/':
-            same_dir_url = f"{parsed.scheme}://{parsed.netloc}{base_dir}/{filename}"
-            if self._check_url_exists(same_dir_url):
-                return same_dir_url
-
-        # Priority 2: Check root level
-        root_url = urljoin(base_url, filename)
-        if self._check_url_exists(root_url):
-            return root_url
-
-        # Priority 3: Check common subdirectories
-        subdirs = self._get_subdirs_for_file(base_dir, filename)
-        for subdir in subdirs:
-            subdir_url = urljoin(base_url, f"{subdir}/{filename}")
-            if self._check_url_exists(subdir_url):
-                return subdir_url
+            candidates.append(f"{parsed.scheme}://{parsed.netloc}{base_dir}/{filename}")
 
-        return None
+        # Priority 2: Root level
+        candidates.append(urljoin(base_url, filename))
+
+        # Priority 3: Common subdirectories
+        for subdir in self._get_subdirs_for_file(base_dir, filename):
+            candidates.append(urljoin(base_url, f"{subdir}/{filename}"))
+
+        return candidates
 
     def _get_subdirs_for_file(self, base_dir: str, filename: str) -> list[str]:
         """
@@ -260,19 +315,34 @@ class DiscoveryService:
             logger.warning(f"Invalid IP address format: {ip_str}")
             return False
 
-    def _resolve_and_validate_hostname(self, hostname: str) -> bool:
+    async def _resolve_and_validate_hostname(self, hostname: str) -> bool:
         """
         Resolve hostname to IP and validate it's safe.
 
+        Results are cached for the lifetime of the service, and concurrent checks of
+        the same hostname share one lookup.
+
         Args:
             hostname: Hostname to resolve and validate
 
         Returns:
             True if hostname resolves to safe IPs only, False otherwise
         """
+        check = self._hostname_checks.get(hostname)
+        if check is None:
+            check = asyncio.ensure_future(self._lookup_and_validate_hostname(hostname))
+            self._hostname_checks[hostname] = check
+        if check.done():
+            return check.result()
+        # Shielded so a cancelled probe does not cancel the lookup other probes wait on
+        return await asyncio.shield(check)
+
+    async def _lookup_and_validate_hostname(self, hostname: str) -> bool:
         try:
             # Resolve hostname to IP addresses
-            addr_info = socket.getaddrinfo(hostname, None, socket.AF_UNSPEC, socket.SOCK_STREAM)
+            addr_info = await asyncio.get_running_loop().getaddrinfo(
+                hostname, None, family=socket.AF_UNSPEC, type=socket.SOCK_STREAM
+            )
 
             # Check all resolved IPs
             for info in addr_info:
@@ -290,101 +360,120 @@ class DiscoveryService:
             logger.warning(f"Error resolving hostname {hostname}: {e}")
             return False
 
-    def _check_url_exists(self, url: str) -> bool:
-        """
-        Check if a URL exists and returns a successful response.
-        Includes SSRF protection by validating hostnames and blocking private IPs.
+    async def _is_safe_url(self, url: str) -> bool:
+        """Check a URL's scheme and that its hostname resolves to public addresses only."""
+        parsed = urlparse(url)
+        if not parsed.scheme or not parsed.netloc or not parsed.hostname:
+            logger.warning(f"Invalid URL format: {url}")
+            return False
 
-        Args:
-            url: URL to check
+        # Only allow HTTP/HTTPS
+        if parsed.scheme not in ('http', 'https'):
+            logger.warning(f"Blocked non-HTTP(S) scheme: {parsed.scheme}")
+            return False
+
+        if not await self._resolve_and_validate_hostname(parsed.hostname):
+            logger.warning(f"Request blocked due to unsafe hostname: {url}")
+            return False
+
+        return True
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Create the connection pool shared by one discovery run."""
+        return httpx.AsyncClient(
+            timeout=self.PROBE_TIMEOUT,
+            # Redirects are followed manually so every hop is SSRF-validated
+            follow_redirects=False,
+            headers=self.REQUEST_HEADERS,
+            limits=httpx.Limits(
+                max_connections=self.MAX_CONCURRENT_PROBES,
+                max_keepalive_connections=self.MAX_CONCURRENT_PROBES,
+            ),
+        )
+
+    @asynccontextmanager
+    async def _client_scope(self, client: httpx.AsyncClient | None = None) -> AsyncIterator[httpx.AsyncClient]:
+        """Use the given client, or a temporary one when called on its own."""
+        if client is not None:
+            yield client
+            return
+        async with self._create_client() as own_client:
+            yield own_client
+
+    async def _send(
+        self, client: httpx.AsyncClient, method: str, url: str, timeout: float | None = None
+    ) -> httpx.Response | None:
+        """
+        Send a streamed request, following up to MAX_REDIRECTS redirects and validating every hop.
 
         Returns:
-            True if URL returns 200, False otherwise
+            The open response (caller must close it), or None if a hop was blocked
         """
-        try:
-            # Parse URL to extract hostname
-            parsed = urlparse(url)
-            if not parsed.scheme or not parsed.netloc:
-                logger.warning(f"Invalid URL format: {url}")
-                return False
+        for _ in range(self.MAX_REDIRECTS + 1):
+            if not await self._is_safe_url(url):
+                return None
 
-            # Only allow HTTP/HTTPS
-            if parsed.scheme not in ('http', 'https'):
-                logger.warning(f"Blocked non-HTTP(S) scheme: {parsed.scheme}")
-                return False
+            request = client.build_request(method, url, timeout=timeout or self.PROBE_TIMEOUT)
+            response = await client.send(request, stream=True)
+            if not response.is_redirect:
+                return response
 
-            # Validate initial hostname
-            hostname = parsed.netloc.split(':')[0]  # Remove port if present
-            if not self._resolve_and_validate_hostname(hostname):
-                logger.warning(f"URL check blocked due to unsafe hostname: {url}")
-                return False
+            await response.aclose()
+            next_url = urljoin(str(response.url), response.headers["location"])
+            logger.debug(f"URL {url} redirects to {next_url}")
+            url = next_url
 
-            # Set safe User-Agent header
-            headers = {
-                'User-Agent': 'Archon-Discovery/1.0 (SSRF-Protected)'
-            }
-
-            # Create a session with limited redirects
-            session = requests.Session()
-            session.max_redirects = 3
-
-            # Make request with redirect validation
-            resp = session.get(
-                url,
-                timeout=5,
-                allow_redirects=True,
-                verify=True,
-                headers=headers
-            )
+        logger.warning(f"Too many redirects for URL: {url}")
+        return None
 
-            try:
-                # Check if there were redirects (history attribute exists on real responses)
-                if hasattr(resp, 'history') and resp.history:
-                    logger.debug(f"URL {url} had {len(resp.history)} redirect(s)")
+    async def _check_url_exists(self, url: str, client: httpx.AsyncClient | None = None) -> bool:
+        """
+        Check if a URL exists and returns a successful response.
+        Includes SSRF protection by validating hostnames and blocking private IPs.
 
-                    # Validate final destination
-                    final_url = resp.url
-                    final_parsed = urlparse(final_url)
+        Probes with HEAD first and falls back to GET for servers that reject HEAD.
 
-                    # Only allow HTTP/HTTPS for final destination
-                    if final_parsed.scheme not in ('http', 'https'):
-                        logger.warning(f"Blocked redirect to non-HTTP(S) scheme: {final_parsed.scheme}")
-                        return False
+        Args:
+            url: URL to check
+            client: Optional shared client (a temporary one is created otherwise)
 
-                    # Validate final hostname
-                    final_hostname = final_parsed.netloc.split(':')[0]
-                    if not self._resolve_and_validate_hostname(final_hostname):
-                        logger.warning(f"Redirect target blocked due to unsafe hostname: {final_url}")
+        Returns:
+            True if URL returns 200, False otherwise
+        """
+        try:
+            async with self._client_scope(client) as client:
+                status_code = None
+                for method in ("HEAD", "GET"):
+                    resp = await self._send(client, method, url)
+                    if resp is None:
                         return False
-
-                # Check response status
-                success = resp.status_code == 200
-                logger.debug(f"URL check: {url} -> {resp.status_code} ({'exists' if success else 'not found'})")
+                    # Only the status matters - the body is never read
+                    status_code = resp.status_code
+                    await resp.aclose()
+                    if status_code not in self.HEAD_FALLBACK_STATUS_CODES:
+                        break
+
+                success = status_code == 200
+                logger.debug(f"URL check: {url} -> {status_code} ({'exists' if success else 'not found'})")
                 return success
 
-            finally:
-                if hasattr(resp, 'close'):
-                    resp.close()
-
-        except requests.exceptions.TooManyRedirects:
-            logger.warning(f"Too many redirects for URL: {url}")
-            return False
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logger.debug(f"Timeout checking URL: {url}")
             return False
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.debug(f"Request error checking URL {url}: {e}")
             return False
         except Exception as e:
             logger.warning(f"Unexpected error checking URL {url}: {e}", exc_info=True)
             return False
 
-    def _parse_robots_txt(self, base_url: str) -> list[str]:
+    async def _parse_robots_txt(self, base_url: str, client: httpx.AsyncClient | None = None) -> list[str]:
         """
         Extract sitemap URLs from robots.txt.
 
         Args:
             base_url: Base URL to check robots.txt for
+            client: Optional shared client (a temporary one is created otherwise)
 
         Returns:
             List of sitemap URLs found in robots.txt
@@ -395,47 +484,44 @@ class DiscoveryService:
             robots_url = urljoin(base_url, "robots.txt")
             logger.info(f"Checking robots.txt at {robots_url}")
 
-            # Set safe User-Agent header
-            headers = {
-                'User-Agent': 'Archon-Discovery/1.0 (SSRF-Protected)'
-            }
-
-            resp = requests.get(robots_url, timeout=30, stream=True, verify=True, headers=headers)
-
-            try:
-                if resp.status_code != 200:
-                    logger.info(f"No robots.txt found: HTTP {resp.status_code}")
+            async with self._client_scope(client) as client:
+                resp = await self._send(client, "GET", robots_url, timeout=self.FETCH_TIMEOUT)
+                if resp is None:
                     return sitemaps
 
-                # Read response with size limit
-                content = self._read_response_with_limit(resp, robots_url)
-
-                # Parse robots.txt content for sitemap directives
-                for raw_line in content.splitlines():
-                    line = raw_line.strip()
-                    if line.lower().startswith("sitemap:"):
-                        sitemap_value = line.split(":", 1)[1].strip()
-                        if sitemap_value:
-                            # Allow absolute and relative sitemap values
-                            if sitemap_value.lower().startswith(("http://", "https://")):
-                                sitemap_url = sitemap_value
-                            else:
-                                # Resolve relative path against base_url
-                                sitemap_url = urljoin(base_url, sitemap_value)
-
-                            # Validate scheme is HTTP/HTTPS only
-                            parsed = urlparse(sitemap_url)
-                            if parsed.scheme not in ("http", "https"):
-                                logger.warning(f"Skipping non-HTTP(S) sitemap in robots.txt: {sitemap_url}")
-                                continue
-
-                            sitemaps.append(sitemap_url)
-                            logger.info(f"Found sitemap in robots.txt: {sitemap_url}")
-
-            finally:
-                resp.close()
-
-        except requests.exceptions.RequestException:
+                try:
+                    if resp.status_code != 200:
+                        logger.info(f"No robots.txt found: HTTP {resp.status_code}")
+                        return sitemaps
+
+                    # Read response with size limit
+                    content = await self._read_response_with_limit(resp, robots_url)
+                finally:
+                    await resp.aclose()
+
+            # Parse robots.txt content for sitemap directives
+            for raw_line in content.splitlines():
+                line = raw_line.strip()
+                if line.lower().startswith("sitemap:"):
+                    sitemap_value = line.split(":", 1)[1].strip()
+                    if sitemap_value:
+                        # Allow absolute and relative sitemap values
+                        if sitemap_value.lower().startswith(("http://", "https://")):
+                            sitemap_url = sitemap_value
+                        else:
+                            # Resolve relative path against base_url
+                            sitemap_url = urljoin(base_url, sitemap_value)
+
+                        # Validate scheme is HTTP/HTTPS only
+                        parsed = urlparse(sitemap_url)
+                        if parsed.scheme not in ("http", "https"):
+                            logger.warning(f"Skipping non-HTTP(S) sitemap in robots.txt: {sitemap_url}")
+                            continue
+
+                        sitemaps.append(sitemap_url)
+                        logger.info(f"Found sitemap in robots.txt: {sitemap_url}")
+
+        except httpx.HTTPError:
             logger.exception(f"Network error fetching robots.txt from {base_url}")
         except ValueError as e:
             logger.warning(f"robots.txt too large at {base_url}: {e}")
@@ -444,12 +530,66 @@ class DiscoveryService:
 
         return sitemaps
 
-    def _parse_html_meta_tags(self, base_url: str) -> list[str]:
+    @staticmethod
+    def parse_crawl_delay(content: str, user_agent: str = "ArchonCrawler") -> float | None:
+        """
+        Extract the Crawl-delay that applies to us from robots.txt content.
+
+        A group naming our user agent takes precedence over the wildcard group.
+
+        Args:
+            content: robots.txt text
+            user_agent: Our product token; a User-agent line matches if its product token
+                (the part before any "/version") equals it, ignoring case
+
+        Returns:
+            Delay in seconds, or None if robots.txt sets none for us
+        """
+        user_agent = _product_token(user_agent)
+        specific_delay: float | None = None
+        wildcard_delay: float | None = None
+        group_agents: list[str] = []
+        in_agent_lines = False
+
+        for raw_line in content.splitlines():
+            line = raw_line.split("#", 1)[0].strip()
+            if ":" not in line:
+                continue
+            field, value = (part.strip() for part in line.split(":", 1))
+            field = field.lower()
+
+            if field == "user-agent":
+                # Consecutive User-agent lines share one group of rules
+                if not in_agent_lines:
+                    group_agents = []
+                group_agents.append(_product_token(value))
+                in_agent_lines = True
+                continue
+            in_agent_lines = False
+
+            if field != "crawl-delay":
+                continue
+            try:
+                delay = float(value)
+            except ValueError:
+                logger.debug(f"Ignoring invalid Crawl-delay in robots.txt: {value!r}")
+                continue
+            if delay < 0:
+                continue
+            if user_agent in group_agents:
+                specific_delay = delay
+            elif "*" in group_agents:
+                wildcard_delay = delay
+
+        return specific_delay if specific_delay is not None else wildcard_delay
+
+    async def _parse_html_meta_tags(self, base_url: str, client: httpx.AsyncClient | None = None) -> list[str]:
         """
         Extract sitemap references from HTML meta tags using proper HTML parsing.
 
         Args:
             base_url: Base URL to check HTML for meta tags
+            client: Optional shared client (a temporary one is created otherwise)
 
         Returns:
             List of sitemap URLs found in HTML meta tags
@@ -459,47 +599,44 @@ class DiscoveryService:
         try:
             logger.info(f"Checking HTML meta tags for sitemaps at {base_url}")
 
-            # Set safe User-Agent header
-            headers = {
-                'User-Agent': 'Archon-Discovery/1.0 (SSRF-Protected)'
-            }
-
-            resp = requests.get(base_url, timeout=30, stream=True, verify=True, headers=headers)
-
-            try:
-                if resp.status_code != 200:
-                    logger.debug(f"Could not fetch HTML for meta tag parsing: HTTP {resp.status_code}")
+            async with self._client_scope(client) as client:
+                resp = await self._send(client, "GET", base_url, timeout=self.FETCH_TIMEOUT)
+                if resp is None:
                     return sitemaps
 
-                # Read response with size limit
-                content = self._read_response_with_limit(resp, base_url)
-
-                # Parse HTML using proper HTML parser
-                parser = SitemapHTMLParser()
                 try:
-                    parser.feed(content)
-                except Exception as e:
-                    logger.warning(f"HTML parsing error for {base_url}: {e}")
-                    return sitemaps
-
-                # Process found sitemaps
-                for tag_type, url in parser.sitemaps:
-                    # Resolve relative URLs
-                    sitemap_url = urljoin(base_url, url.strip())
-
-                    # Validate scheme is HTTP/HTTPS
-                    parsed = urlparse(sitemap_url)
-                    if parsed.scheme not in ("http", "https"):
-                        logger.debug(f"Skipping non-HTTP(S) sitemap URL: {sitemap_url}")
-                        continue
-
-                    sitemaps.append(sitemap_url)
-                    logger.info(f"Found sitemap in HTML {tag_type} tag: {sitemap_url}")
+                    if resp.status_code != 200:
+                        logger.debug(f"Could not fetch HTML for meta tag parsing: HTTP {resp.status_code}")
+                        return sitemaps
 
-            finally:
-                resp.close()
+                    # Read response with size limit
+                    content = await self._read_response_with_limit(resp, base_url)
+                finally:
+                    await resp.aclose()
 
-        except requests.exceptions.RequestException:
+            # Parse HTML using proper HTML parser
+            parser = SitemapHTMLParser()
+            try:
+                parser.feed(content)
+            except Exception as e:
+                logger.warning(f"HTML parsing error for {base_url}: {e}")
+                return sitemaps
+
+            # Process found sitemaps
+            for tag_type, url in parser.sitemaps:
+                # Resolve relative URLs
+                sitemap_url = urljoin(base_url, url.strip())
+
+                # Validate scheme is HTTP/HTTPS
+                parsed = urlparse(sitemap_url)
+                if parsed.scheme not in ("http", "https"):
+                    logger.debug(f"Skipping non-HTTP(S) sitemap URL: {sitemap_url}")
+                    continue
+
+                sitemaps.append(sitemap_url)
+                logger.info(f"Found sitemap in HTML {tag_type} tag: {sitemap_url}")
+
+        except httpx.HTTPError:
             logger.exception(f"Network error fetching HTML from {base_url}")
         except ValueError as e:
             logger.warning(f"HTML response too large at {base_url}: {e}")
@@ -508,12 +645,12 @@ class DiscoveryService:
 
         return sitemaps
 
-    def _read_response_with_limit(self, response: requests.Response, url: str, max_size: int | None = None) -> str:
+    async def _read_response_with_limit(self, response: httpx.Response, url: str, max_size: int | None = None) -> str:
         """
         Read response content with size limit to prevent memory exhaustion.
 
         Args:
-            response: The response object to read from
+            response: The streamed response to read from
             url: URL being read (for logging)
             max_size: Maximum bytes to read (defaults to MAX_RESPONSE_SIZE)
 
@@ -526,33 +663,26 @@ class DiscoveryService:
         if max_size is None:
             max_size = self.MAX_RESPONSE_SIZE
 
+        chunks = []
+        total_size = 0
+
+        # Read response in chunks to enforce size limit
+        async for chunk in response.aiter_bytes():
+            total_size += len(chunk)
+            if total_size > max_size:
+                size_mb = max_size / (1024 * 1024)
+                logger.warning(
+                    f"Response size exceeded limit of {size_mb:.1f}MB for {url}, "
+                    f"received {total_size / (1024 * 1024):.1f}MB"
+                )
+                raise ValueError(f"Response size exceeds {size_mb:.1f}MB limit")
+            chunks.append(chunk)
+
+        # Decode the complete response
+        content_bytes = b''.join(chunks)
+        encoding = response.charset_encoding or 'utf-8'
         try:
-            chunks = []
-            total_size = 0
-
-            # Read response in chunks to enforce size limit
-            for chunk in response.iter_content(chunk_size=8192, decode_unicode=False):
-                if chunk:
-                    total_size += len(chunk)
-                    if total_size > max_size:
-                        response.close()
-                        size_mb = max_size / (1024 * 1024)
-                        logger.warning(
-                            f"Response size exceeded limit of {size_mb:.1f}MB for {url}, "
-                            f"received {total_size / (1024 * 1024):.1f}MB"
-                        )
-                        raise ValueError(f"Response size exceeds {size_mb:.1f}MB limit")
-                    chunks.append(chunk)
-
-            # Decode the complete response
-            content_bytes = b''.join(chunks)
-            encoding = response.encoding or 'utf-8'
-            try:
-                return content_bytes.decode(encoding)
-            except UnicodeDecodeError:
-                # Fallback to utf-8 with error replacement
-                return content_bytes.decode('utf-8', errors='replace')
-
-        except Exception:
-            response.close()
-            raise
+            return content_bytes.decode(encoding)
+        except (UnicodeDecodeError, LookupError):
+            # Fallback to utf-8 with error replacement
+            return content_bytes.decode('utf-8', errors='replace')
@@ -11,9 +11,10 @@ from typing import Any
 
 from ...config.logfire_config import get_logger, safe_logfire_error, safe_logfire_info
 from ..source_management_service import extract_source_summary, update_source_info
-from ..storage.document_storage_service import add_documents_to_supabase
+from ..storage.document_storage_service import add_documents_to_supabase, compute_content_hash
 from ..storage.storage_services import DocumentStorageService
 from .code_extraction_service import CodeExtractionService
+from .helpers.crawl_result_store import FullDocumentMap
 
 logger = get_logger(__name__)
 
@@ -45,10 +46,15 @@ class DocumentStorageOperations:
         source_url: str | None = None,
         source_display_name: str | None = None,
         url_to_page_id: dict[str, str] | None = None,
+        incremental: bool = False,
+        create_source: bool = True,
     ) -> dict[str, Any]:
         """
         Process crawled documents and store them in the database.
 
+        In incremental mode, pages whose content hash matches the stored page are
+        skipped entirely, and changed pages only replace the chunks that differ.
+
         Args:
             crawl_results: List of crawled documents
             request: The original crawl request
@@ -58,6 +64,8 @@ class DocumentStorageOperations:
             cancellation_check: Optional function to check for cancellation
             source_url: Optional original URL that was crawled
             source_display_name: Optional human-readable name for the source
+            incremental: Skip unchanged pages and chunks instead of replacing everything
+            create_source: Create/update the source record (streamed batches after the first skip this)
 
         Returns:
             Dict containing storage statistics and document mappings
@@ -65,16 +73,36 @@ class DocumentStorageOperations:
         # Reuse initialized storage service for chunking
         storage_service = self.doc_storage_service
 
+        from .page_storage_operations import PageStorageOperations
+        page_storage_ops = PageStorageOperations(self.supabase_client)
+
+        # Stored page hashes for change detection (incremental recrawls only)
+        existing_pages: dict[str, dict[str, Any]] = {}
+        unchanged_urls: list[str] = []
+        unchanged_word_count = 0
+        if incremental:
+            crawled_urls = [(doc.get("url") or "").strip() for doc in crawl_results]
+            existing_pages = await page_storage_ops.get_existing_page_hashes(
+                [url for url in crawled_urls if url]
+            )
+
         # Prepare data for chunked storage
         all_urls = []
         all_chunk_numbers = []
         all_contents = []
         all_metadatas = []
         source_word_counts = {}
-        url_to_full_document = {}
+        # Spilled pages are read back from disk only when code extraction needs them
+        url_to_full_document = FullDocumentMap()
+        # HTTP validators (ETag / Last-Modified) stored with each page for conditional recrawls
+        url_to_validators: dict[str, dict[str, Any]] = {}
+        unchanged_validators: dict[str, dict[str, Any]] = {}
         processed_docs = 0
+        # Changed pages and their markdown, chunked together below
+        docs_to_chunk: list[tuple[str, dict]] = []
+        texts_to_chunk: list[str] = []
 
-        # Process and chunk each document
+        # Filter documents and collect the ones that need chunking
         for doc_index, doc in enumerate(crawl_results):
             # Check for cancellation during document processing
             if cancellation_check:
@@ -97,40 +125,55 @@ class DocumentStorageOperations:
                 logger.debug(f"Skipping document {doc_index}: empty {'URL' if not doc_url else 'content'}")
                 continue
 
+            validators = {"etag": doc.get("etag"), "last_modified": doc.get("last_modified")}
+
+            # Unchanged page: keep its stored chunks and vectors as they are
+            stored_page = existing_pages.get(doc_url)
+            if stored_page and stored_page["content_hash"] == compute_content_hash(markdown_content):
+                unchanged_urls.append(doc_url)
+                unchanged_word_count += stored_page.get("word_count") or 0
+                if validators["etag"] or validators["last_modified"]:
+                    unchanged_validators[doc_url] = validators
+                continue
+
+            url_to_validators[doc_url] = validators
+
             # Increment processed document count
             processed_docs += 1
 
             # Store full document for code extraction context
-            url_to_full_document[doc_url] = markdown_content
-
-            # CHUNK THE CONTENT
-            chunks = await storage_service.smart_chunk_text_async(markdown_content, chunk_size=5000)
-
-            # Use the original source_id for all documents
-            source_id = original_source_id
-            safe_logfire_info(f"Using original source_id '{source_id}' for URL '{doc_url}'")
-
-            # Process each chunk
-            for i, chunk in enumerate(chunks):
-                # Check for cancellation during chunk processing
-                if cancellation_check and i % 10 == 0:  # Check every 10 chunks
-                    try:
-                        cancellation_check()
-                    except asyncio.CancelledError:
-                        if progress_callback:
-                            await progress_callback(
-                                "cancelled",
-                                99,
-                                f"Chunk processing cancelled at chunk {i + 1}/{len(chunks)} of document {doc_index + 1}"
-                            )
-                        raise
+            url_to_full_document.set_page(doc_url, doc)
+            docs_to_chunk.append((doc_url, doc))
+            texts_to_chunk.append(markdown_content)
+
+        # CHUNK THE CONTENT (large crawls are chunked across CPU cores)
+        try:
+            chunked_docs = await storage_service.chunk_documents_async(
+                texts_to_chunk, chunk_size=5000, cancellation_check=cancellation_check
+            )
+        except asyncio.CancelledError:
+            if progress_callback:
+                await progress_callback(
+                    "cancelled",
+                    99,
+                    f"Document chunking cancelled ({len(docs_to_chunk)} documents queued)"
+                )
+            raise
+        # The chunks now hold the text; don't keep a second copy of every page
+        texts_to_chunk.clear()
+
+        # Use the original source_id for all documents
+        source_id = original_source_id
+        safe_logfire_info(f"Using original source_id '{source_id}' for {len(docs_to_chunk)} documents")
 
+        # Build chunk rows in document order
+        for doc_index, ((doc_url, doc), chunks) in enumerate(zip(docs_to_chunk, chunked_docs, strict=True)):
+            for i, (chunk, word_count) in enumerate(chunks):
                 all_urls.append(doc_url)
                 all_chunk_numbers.append(i)
                 all_contents.append(chunk)
 
                 # Create metadata for each chunk (page_id will be set later)
-                word_count = len(chunk.split())
                 metadata = {
                     "url": doc_url,
                     "title": doc.get("title", ""),
@@ -149,25 +192,20 @@ class DocumentStorageOperations:
                 # Accumulate word count
                 source_word_counts[source_id] = source_word_counts.get(source_id, 0) + word_count
 
-                # Yield control every 10 chunks to prevent event loop blocking
-                if i > 0 and i % 10 == 0:
-                    await asyncio.sleep(0)
-
-            # Yield control after processing each document
-            if doc_index > 0 and doc_index % 5 == 0:
+            # Yield control periodically to prevent event loop blocking
+            if doc_index > 0 and doc_index % 50 == 0:
                 await asyncio.sleep(0)
 
         # Create/update source record FIRST (required for FK constraints on pages and chunks)
-        if all_contents and all_metadatas:
+        if all_contents and all_metadatas and create_source:
+            # Only incremental recrawls carry word counts for skipped pages
+            extra_source_args = {"unchanged_word_count": unchanged_word_count} if unchanged_word_count else {}
             await self._create_source_records(
                 all_metadatas, all_contents, source_word_counts, request,
-                source_url, source_display_name
+                source_url, source_display_name, **extra_source_args
             )
 
         # Store pages AFTER source is created but BEFORE chunks (FK constraint requirement)
-        from .page_storage_operations import PageStorageOperations
-        page_storage_ops = PageStorageOperations(self.supabase_client)
-
         # Check if this is an llms-full.txt file
         is_llms_full = crawl_type == "llms-txt" or (
             len(url_to_full_document) == 1 and
@@ -200,19 +238,20 @@ class DocumentStorageOperations:
             url_to_full_document.clear()
 
             # Chunk each section separately
-            for section in sections:
+            chunked_sections = await storage_service.chunk_documents_async(
+                [section.content for section in sections],
+                chunk_size=5000,
+                cancellation_check=cancellation_check,
+            )
+            for section, section_chunks in zip(sections, chunked_sections, strict=True):
                 # Update url_to_full_document with section content
                 url_to_full_document[section.url] = section.content
-                section_chunks = await storage_service.smart_chunk_text_async(
-                    section.content, chunk_size=5000
-                )
 
-                for i, chunk in enumerate(section_chunks):
+                for i, (chunk, word_count) in enumerate(section_chunks):
                     all_urls.append(section.url)
                     all_chunk_numbers.append(i)
                     all_contents.append(chunk)
 
-                    word_count = len(chunk.split())
                     metadata = {
                         "url": section.url,
                         "title": section.section_title,
@@ -234,6 +273,7 @@ class DocumentStorageOperations:
                 reconstructed_crawl_results.append({
                     "url": url,
                     "markdown": markdown,
+                    **url_to_validators.get(url, {}),
                 })
 
             if reconstructed_crawl_results:
@@ -252,6 +292,10 @@ class DocumentStorageOperations:
                 if chunk_url and chunk_url in url_to_page_id:
                     metadata["page_id"] = url_to_page_id[chunk_url]
 
+        # Unchanged pages may still have been served with new validators
+        if unchanged_validators:
+            await page_storage_ops.update_page_validators(unchanged_validators)
+
         safe_logfire_info(f"url_to_full_document keys: {list(url_to_full_document.keys())[:5]}")
 
         # Log chunking results
@@ -259,6 +303,10 @@ class DocumentStorageOperations:
         safe_logfire_info(
             f"Document storage | processed={processed_docs}/{len(crawl_results)} | chunks={len(all_contents)} | avg_chunks_per_doc={avg_chunks:.1f}"
         )
+        if incremental:
+            safe_logfire_info(
+                f"Incremental recrawl | unchanged_pages={len(unchanged_urls)} | changed_pages={processed_docs}"
+            )
 
         # Call add_documents_to_supabase with the correct parameters
         storage_stats = await add_documents_to_supabase(
@@ -274,6 +322,7 @@ class DocumentStorageOperations:
             provider=None,  # Use configured provider
             cancellation_check=cancellation_check,  # Pass cancellation check
             url_to_page_id=url_to_page_id,  # Link chunks to pages
+            incremental=incremental,
         )
 
         # Calculate chunk counts
@@ -283,7 +332,9 @@ class DocumentStorageOperations:
         return {
             'chunk_count': chunk_count,
             'chunks_stored': chunks_stored,
-            'total_word_count': sum(source_word_counts.values()),
+            'chunks_unchanged': storage_stats.get("chunks_unchanged", 0),
+            'unchanged_urls': unchanged_urls,
+            'total_word_count': sum(source_word_counts.values()) + unchanged_word_count,
             'url_to_full_document': url_to_full_document,
             'source_id': original_source_id
         }
@@ -296,6 +347,7 @@ class DocumentStorageOperations:
         request: dict[str, Any],
         source_url: str | None = None,
         source_display_name: str | None = None,
+        unchanged_word_count: int = 0,
     ):
         """
         Create or update source records in the database.
@@ -305,6 +357,7 @@ class DocumentStorageOperations:
             all_contents: List of all chunk contents
             source_word_counts: Word counts per source_id
             request: Original crawl request
+            unchanged_word_count: Words in pages skipped by an incremental recrawl
         """
         # Find ALL unique source_ids in the crawl results
         unique_source_ids = set()
@@ -320,9 +373,9 @@ class DocumentStorageOperations:
                 source_id_contents[source_id] = []
             source_id_contents[source_id].append(all_contents[i])
 
-            # Track word counts per source_id
+            # Track word counts per source_id (skipped pages still count towards the total)
             if source_id not in source_id_word_counts:
-                source_id_word_counts[source_id] = 0
+                source_id_word_counts[source_id] = unchanged_word_count
             source_id_word_counts[source_id] += metadata.get('word_count', 0)
 
         safe_logfire_info(
@@ -435,6 +488,20 @@ class DocumentStorageOperations:
                 f"All {len(unique_source_ids)} source records verified - proceeding with document storage"
             )
 
+    async def update_source_word_count(self, source_id: str, word_count: int) -> None:
+        """
+        Overwrite the total word count of an existing source.
+
+        Used when a source was stored in several batches and the record created by
+        the first batch only counted that batch.
+        """
+        try:
+            self.supabase_client.table("archon_sources").update(
+                {"total_word_count": word_count}
+            ).eq("source_id", source_id).execute()
+        except Exception as e:
+            logger.warning(f"Failed to update word count for source '{source_id}': {e}", exc_info=True)
+
     async def extract_and_store_code_examples(
         self,
         crawl_results: list[dict],
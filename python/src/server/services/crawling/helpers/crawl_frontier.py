@@ -0,0 +1,151 @@
+"""
+Crawl Frontier
+
+Priority queue of URLs waiting to be crawled by the recursive strategy.
+
+URLs are scored so documentation paths and shallow pages are crawled first,
+de-duplicated through a set of 64-bit hashes of their normalized form (a few
+bytes per URL instead of the full string), and handed out subject to a
+per-host in-flight limit, which can be fixed or supplied by a HostScheduler.
+"""
+
+import hashlib
+import heapq
+import itertools
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from urllib.parse import urldefrag, urlparse
+
+# Path fragments that usually hold reference content worth crawling early
+_PREFERRED_PATH_PARTS = ("/docs", "/doc/", "/documentation", "/guide", "/reference", "/api", "/tutorial", "/learn", "/manual")
+# Path fragments that usually hold low-value or endless listings
+_DEFERRED_PATH_PARTS = ("/blog", "/news", "/tag/", "/tags/", "/category/", "/author/", "/page/", "/search", "/login", "/signup", "/archive")
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL for de-duplication (drop fragment, lowercase host, trim trailing slash)."""
+    url = urldefrag(url)[0]
+    parsed = urlparse(url)
+    path = parsed.path.rstrip("/") or "/"
+    normalized = parsed._replace(netloc=parsed.netloc.lower(), path=path)
+    return normalized.geturl()
+
+
+def _url_fingerprint(url: str) -> int:
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def score_url(url: str, depth: int) -> float:
+    """
+    Crawl priority for a URL (lower is crawled sooner).
+
+    Depth dominates so shallow pages go first; within a depth, documentation
+    paths are preferred and listing, query-string and deeply nested pages deferred.
+    """
+    parsed = urlparse(url)
+    path = parsed.path.lower()
+
+    score = depth * 10.0
+    if any(part in path for part in _PREFERRED_PATH_PARTS):
+        score -= 3.0
+    if any(part in path for part in _DEFERRED_PATH_PARTS):
+        score += 5.0
+    if parsed.query:
+        score += 2.0
+    score += 0.2 * path.count("/")
+    return score
+
+
+@dataclass(order=True)
+class FrontierItem:
+    """A URL waiting in the frontier."""
+
+    priority: float
+    sequence: int
+    url: str = field(compare=False)
+    depth: int = field(compare=False)
+
+    @property
+    def host(self) -> str:
+        return urlparse(self.url).netloc.lower()
+
+
+class CrawlFrontier:
+    """Priority frontier with a compact seen-set and per-host in-flight limits."""
+
+    def __init__(self, max_per_host: int | None = None, host_limit: Callable[[str], int] | None = None):
+        """
+        Initialize the frontier.
+
+        Args:
+            max_per_host: Maximum URLs of one host in flight at once (None = unlimited)
+            host_limit: Optional function giving a host's current in-flight limit; overrides max_per_host
+        """
+        self.max_per_host = max_per_host
+        self.host_limit = host_limit
+        # One heap per host so a host at its limit never has to be scanned past
+        self._heaps: dict[str, list[FrontierItem]] = {}
+        self._size = 0
+        self._seen: set[int] = set()
+        self._sequence = itertools.count()
+        self._in_flight_by_host: defaultdict[str, int] = defaultdict(int)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def discovered(self) -> int:
+        """Number of distinct URLs ever added."""
+        return len(self._seen)
+
+    def add(self, url: str, depth: int) -> bool:
+        """
+        Queue a URL unless it was seen before.
+
+        Returns:
+            True if the URL was new and queued
+        """
+        url = urldefrag(url)[0]
+        fingerprint = _url_fingerprint(normalize_url(url))
+        if fingerprint in self._seen:
+            return False
+        self._seen.add(fingerprint)
+
+        item = FrontierItem(score_url(url, depth), next(self._sequence), url, depth)
+        heapq.heappush(self._heaps.setdefault(item.host, []), item)
+        self._size += 1
+        return True
+
+    def pop(self) -> FrontierItem | None:
+        """
+        Take the best-scored URL whose host is below its in-flight limit and mark it in flight.
+
+        Returns:
+            The item, or None if nothing is queued or every queued host is at its limit
+        """
+        best_host = None
+        for host, heap in self._heaps.items():
+            limit = self.host_limit(host) if self.host_limit else self.max_per_host
+            if limit is not None and self._in_flight_by_host.get(host, 0) >= limit:
+                continue
+            if best_host is None or heap[0] < self._heaps[best_host][0]:
+                best_host = host
+
+        if best_host is None:
+            return None
+
+        heap = self._heaps[best_host]
+        item = heapq.heappop(heap)
+        if not heap:
+            del self._heaps[best_host]
+        self._size -= 1
+        self._in_flight_by_host[best_host] += 1
+        return item
+
+    def done(self, item: FrontierItem) -> None:
+        """Mark an item popped earlier as finished."""
+        host = item.host
+        self._in_flight_by_host[host] -= 1
+        if self._in_flight_by_host[host] <= 0:
+            del self._in_flight_by_host[host]
@@ -0,0 +1,175 @@
+"""
+Crawl Result Store
+
+Disk-backed storage for crawled pages that are collected until the crawl ends.
+
+The large fields of each page (raw HTML and markdown) are appended to an
+anonymous temporary file and read back through a memory map when accessed, so
+a crawl that collects thousands of pages keeps only small handles on the heap.
+The bytes live in the OS page cache, which the kernel can evict under memory
+pressure, instead of in the server's RSS.
+"""
+
+import mmap
+import tempfile
+from collections.abc import Iterator, Mapping, MutableMapping
+from typing import Any
+
+from ....config.logfire_config import get_logger
+
+logger = get_logger(__name__)
+
+# Page fields written to disk; everything else (url, title, validators...) stays in memory
+SPILLED_FIELDS = frozenset({"markdown", "html"})
+
+
+class CrawlResultStore:
+    """Append-only temporary file of page contents, read back through a memory map."""
+
+    def __init__(self, directory: str | None = None):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory for the temporary file (defaults to the system temp dir / TMPDIR)
+        """
+        # Anonymous file: unlinked immediately, so it disappears when closed or if the process dies
+        self._file = tempfile.TemporaryFile(dir=directory, prefix="archon-crawl-")
+        self._size = 0
+        self._mmap: mmap.mmap | None = None
+        self._spill_failed = False
+        self.pages_stored = 0
+
+    def __enter__(self) -> "CrawlResultStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def bytes_stored(self) -> int:
+        return self._size
+
+    def add(self, page: Mapping[str, Any]) -> Mapping[str, Any]:
+        """
+        Move a page's large fields to disk.
+
+        Returns:
+            A SpilledPage handle with the same keys, or the page itself if it could not be
+            written (e.g. the disk is full)
+        """
+        if self._spill_failed:
+            return page
+
+        fields: dict[str, Any] = {}
+        spans: dict[str, tuple[int, int]] = {}
+        try:
+            for key, value in page.items():
+                if key in SPILLED_FIELDS and isinstance(value, str):
+                    data = value.encode("utf-8", errors="surrogatepass")
+                    self._file.write(data)
+                    spans[key] = (self._size, len(data))
+                    self._size += len(data)
+                else:
+                    fields[key] = value
+        except OSError as e:
+            logger.warning(f"Could not spill crawl results to disk, keeping them in memory: {e}")
+            self._spill_failed = True
+            return page
+
+        self.pages_stored += 1
+        return SpilledPage(self, fields, spans)
+
+    def read(self, offset: int, length: int) -> str:
+        """Read a field back from the store."""
+        if length == 0:
+            return ""
+        if self._mmap is None or offset + length > len(self._mmap):
+            # The file grew since it was last mapped
+            self._remap()
+        return self._mmap[offset : offset + length].decode("utf-8", errors="surrogatepass")
+
+    def _remap(self) -> None:
+        self._file.flush()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._mmap = mmap.mmap(self._file.fileno(), self._size, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        """Release the memory map and delete the file. Handles become unreadable."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+
+class SpilledPage(Mapping[str, Any]):
+    """
+    Read-only page whose large fields are loaded from a CrawlResultStore on each access.
+
+    Behaves like the page dict it replaces. Callers should keep a field in a local
+    variable while they use it rather than re-reading it in a loop.
+    """
+
+    __slots__ = ("_store", "_fields", "_spans")
+
+    def __init__(self, store: CrawlResultStore, fields: dict[str, Any], spans: dict[str, tuple[int, int]]):
+        self._store = store
+        self._fields = fields
+        self._spans = spans
+
+    def __getitem__(self, key: str) -> Any:
+        span = self._spans.get(key)
+        if span is not None:
+            return self._store.read(*span)
+        return self._fields[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._fields
+        yield from self._spans
+
+    def __len__(self) -> int:
+        return len(self._fields) + len(self._spans)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._fields or key in self._spans
+
+    def __repr__(self) -> str:
+        return f"SpilledPage(url={self._fields.get('url')!r})"
+
+
+class FullDocumentMap(MutableMapping[str, str]):
+    """
+    URL -> full markdown mapping that reads spilled pages lazily.
+
+    Drop-in replacement for the url_to_full_document dict: regular strings are
+    stored as-is, spilled pages are only read when a document is looked up.
+    """
+
+    def __init__(self):
+        self._documents: dict[str, str | SpilledPage] = {}
+
+    def set_page(self, url: str, page: Mapping[str, Any]) -> None:
+        """Map a URL to a crawled page's markdown without loading spilled content."""
+        if isinstance(page, SpilledPage):
+            self._documents[url] = page
+        else:
+            self._documents[url] = (page.get("markdown") or "").strip()
+
+    def __getitem__(self, url: str) -> str:
+        document = self._documents[url]
+        if isinstance(document, SpilledPage):
+            return (document.get("markdown") or "").strip()
+        return document
+
+    def __setitem__(self, url: str, document: str) -> None:
+        self._documents[url] = document
+
+    def __delitem__(self, url: str) -> None:
+        del self._documents[url]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._documents)
+
+    def __len__(self) -> int:
+        return len(self._documents)
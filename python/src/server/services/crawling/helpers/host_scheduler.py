@@ -0,0 +1,229 @@
+"""
+Host Scheduler
+
+Per-host politeness for crawls that span several sites.
+
+Each host gets its own concurrency limit and request spacing instead of sharing
+one global CRAWL_MAX_CONCURRENT:
+
+- Request starts are spaced by the host's robots.txt Crawl-delay (a token
+  bucket with a burst of one).
+- 429 and 503 responses halve the host's limit and pause it with exponential
+  backoff, honouring Retry-After.
+- Hosts that keep answering quickly get their limit raised by roughly one per
+  round of requests, up to the configured per-host maximum; slow answers
+  lower it again.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any
+from urllib.parse import urlparse
+
+import httpx
+
+from ....config.logfire_config import get_logger
+from ..discovery_service import DiscoveryService
+from .http_fetcher import _get_shared_client
+
+logger = get_logger(__name__)
+
+# Requests a host starts with before it has proven it can take more
+INITIAL_HOST_CONCURRENCY = 2
+# Responses slower than this count against the host's limit
+SLOW_RESPONSE_SECONDS = 5.0
+# Status codes that mean "slow down"
+THROTTLE_STATUS_CODES = frozenset({429, 503})
+BACKOFF_INITIAL_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 60.0
+# Crawl-delay values above this are clamped so one host cannot stall a crawl indefinitely
+MAX_CRAWL_DELAY_SECONDS = 10.0
+ROBOTS_TIMEOUT_SECONDS = 10.0
+ROBOTS_MAX_BYTES = 512 * 1024
+
+
+@dataclass
+class HostState:
+    """Scheduling state for one host."""
+
+    limit: float
+    in_flight: int = 0
+    crawl_delay: float = 0.0
+    # Monotonic time before which no new request may start
+    next_start: float = 0.0
+    backoff: float = 0.0
+    robots_loaded: bool = False
+    robots_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    slot_freed: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+    @property
+    def current_limit(self) -> int:
+        return max(1, int(self.limit))
+
+
+@dataclass
+class HostSlot:
+    """A claimed request slot; report the response through ``observe`` before it is released."""
+
+    url: str
+    status_code: int | None = None
+    retry_after: str | None = None
+
+    def observe(self, status_code: int | None, headers: Any = None) -> None:
+        """Record the response status and its Retry-After header (any casing)."""
+        self.status_code = status_code
+        lowered = {str(k).lower(): v for k, v in dict(headers or {}).items()}
+        self.retry_after = lowered.get("retry-after")
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds from now."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostScheduler:
+    """Hands out per-host request slots with adaptive concurrency and politeness delays."""
+
+    def __init__(self, max_per_host: int, max_total: int | None = None, respect_crawl_delay: bool = True):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_per_host: Upper bound for any single host's concurrency
+            max_total: Optional cap on requests in flight across all hosts
+            respect_crawl_delay: Fetch each host's robots.txt and space requests by its Crawl-delay
+        """
+        self.max_per_host = max(1, max_per_host)
+        self.respect_crawl_delay = respect_crawl_delay
+        # Taken after the host's turn comes up, so a throttled host never holds global slots
+        self._total_slots = asyncio.Semaphore(max_total) if max_total else None
+        self._hosts: dict[str, HostState] = {}
+
+    def _state(self, host: str) -> HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = HostState(limit=min(self.max_per_host, INITIAL_HOST_CONCURRENCY))
+            self._hosts[host] = state
+        return state
+
+    def host_limit(self, host: str) -> int:
+        """
+        Current number of requests the host may have in flight.
+
+        Returns 0 while the host is backing off, so callers that pick work by host
+        (the crawl frontier) leave it alone until the pause is over.
+        """
+        state = self._hosts.get(host)
+        if state is None:
+            return min(self.max_per_host, INITIAL_HOST_CONCURRENCY)
+        if state.backoff and time.monotonic() < state.next_start:
+            return 0
+        return state.current_limit
+
+    async def _load_crawl_delay(self, url: str, state: HostState) -> None:
+        """Read the host's Crawl-delay from robots.txt once per crawl."""
+        async with state.robots_lock:
+            if state.robots_loaded:
+                return
+            state.robots_loaded = True
+
+            parsed = urlparse(url)
+            robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+            try:
+                response = await _get_shared_client().get(robots_url, timeout=ROBOTS_TIMEOUT_SECONDS)
+            except httpx.HTTPError as e:
+                logger.debug(f"Could not fetch {robots_url}: {e}")
+                return
+            if response.status_code != 200:
+                return
+
+            delay = DiscoveryService.parse_crawl_delay(response.text[:ROBOTS_MAX_BYTES])
+            if delay:
+                if delay > MAX_CRAWL_DELAY_SECONDS:
+                    logger.warning(
+                        f"{parsed.netloc} asks for Crawl-delay {delay}s, using {MAX_CRAWL_DELAY_SECONDS}s"
+                    )
+                    delay = MAX_CRAWL_DELAY_SECONDS
+                state.crawl_delay = delay
+                logger.info(f"Honouring Crawl-delay of {delay}s for {parsed.netloc}")
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[HostSlot]:
+        """
+        Wait for a request slot on the URL's host and hold it for the duration of the request.
+
+        Usage:
+            async with scheduler.slot(url) as slot:
+                response = await fetch(url)
+                slot.observe(response.status_code, response.headers)
+        """
+        host = urlparse(url).netloc.lower()
+        state = self._state(host)
+        if self.respect_crawl_delay and not state.robots_loaded:
+            await self._load_crawl_delay(url, state)
+
+        async with state.slot_freed:
+            await state.slot_freed.wait_for(lambda: state.in_flight < state.current_limit)
+            state.in_flight += 1
+            # Reserve this request's start time; the next one starts crawl_delay later
+            now = time.monotonic()
+            start_at = max(now, state.next_start)
+            state.next_start = start_at + state.crawl_delay
+
+        slot = HostSlot(url)
+        started = None
+        try:
+            if start_at > now:
+                await asyncio.sleep(start_at - now)
+            async with self._total_slots or nullcontext():
+                started = time.monotonic()
+                yield slot
+        finally:
+            if started is not None:
+                self._record(host, state, slot, time.monotonic() - started)
+            async with state.slot_freed:
+                state.in_flight -= 1
+                state.slot_freed.notify_all()
+
+    def _record(self, host: str, state: HostState, slot: HostSlot, elapsed: float) -> None:
+        """Adapt the host's limit and backoff to how the request went."""
+        if slot.status_code in THROTTLE_STATUS_CODES:
+            state.backoff = min(BACKOFF_MAX_SECONDS, max(BACKOFF_INITIAL_SECONDS, state.backoff * 2))
+            pause = min(BACKOFF_MAX_SECONDS, max(state.backoff, parse_retry_after(slot.retry_after) or 0.0))
+            state.next_start = max(state.next_start, time.monotonic() + pause)
+            state.limit = max(1.0, state.limit / 2)
+            logger.info(
+                f"{host} answered {slot.status_code}; pausing {pause:.1f}s, "
+                f"concurrency lowered to {state.current_limit}"
+            )
+            return
+
+        if slot.status_code is None or slot.status_code >= 400:
+            # Failures say nothing about how much load the host can take
+            return
+
+        state.backoff = 0.0
+        if elapsed > SLOW_RESPONSE_SECONDS:
+            state.limit = max(1.0, state.limit - 1)
+        else:
+            # Additive increase: about +1 per full round of requests
+            state.limit = min(float(self.max_per_host), state.limit + 1 / state.current_limit)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-host limits and delays, for logging."""
+        return {
+            host: {"limit": state.current_limit, "crawl_delay": state.crawl_delay, "backoff": state.backoff}
+            for host, state in self._hosts.items()
+        }
@@ -0,0 +1,273 @@
+"""
+HTTP Page Fetcher
+
+Lightweight fetch path for static HTML pages that skips headless Chromium.
+
+Pages are fetched over a pooled (HTTP/2 when available) httpx client and
+converted to markdown the way crawl4ai processes a browser-rendered page: the
+run config's scraping strategy cleans the HTML first, then its markdown
+generator (and content filter) runs on the cleaned HTML. A page therefore gives
+the same markdown, chunks and content hashes whichever path fetched it. Pages
+that look client-side rendered or come back too thin return None so the caller
+can fall back to the browser.
+
+Requests can carry the ETag / Last-Modified validators stored with the page
+on its previous crawl, so unchanged pages come back as a bodyless 304.
+"""
+
+import asyncio
+import re
+from contextlib import nullcontext
+from html.parser import HTMLParser
+from typing import Any
+from urllib.parse import urljoin, urlparse
+
+import httpx
+from crawl4ai import CrawlerRunConfig
+from crawl4ai.utils import preprocess_html_for_schema, sanitize_input_encode
+
+from ....config.logfire_config import get_logger
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+FETCH_TIMEOUT = 20.0
+FETCH_MAX_CONNECTIONS = 50
+# Pages whose markdown has fewer words than this go to the browser instead
+MIN_MARKDOWN_WORDS = 50
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0 Safari/537.36 ArchonCrawler"
+)
+
+# Markers of pages that render their content with JavaScript
+_JS_SHELL_PATTERNS = [
+    re.compile(r'<div[^>]+id=["\'](?:root|app|__next|___gatsby|svelte)["\'][^>]*>\s*</div>', re.IGNORECASE),
+    re.compile(r"<noscript[^>]*>[^<]*(?:enable|requires?|need)[^<]*javascript", re.IGNORECASE),
+]
+_TITLE_PATTERN = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+_shared_clients: dict[int, httpx.AsyncClient] = {}
+
+
+def _get_shared_client() -> httpx.AsyncClient:
+    """Return the pooled client for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _shared_clients.get(id(loop))
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=FETCH_TIMEOUT,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"},
+            limits=httpx.Limits(max_connections=FETCH_MAX_CONNECTIONS, max_keepalive_connections=FETCH_MAX_CONNECTIONS),
+        )
+        _shared_clients[id(loop)] = client
+    return client
+
+
+def looks_client_rendered(html: str) -> bool:
+    """Check whether a page is an empty shell filled in by JavaScript."""
+    return any(pattern.search(html) for pattern in _JS_SHELL_PATTERNS)
+
+
+def extract_title(html: str) -> str:
+    """Extract the <title> text, or "Untitled"."""
+    title_match = _TITLE_PATTERN.search(html)
+    if title_match:
+        extracted_title = title_match.group(1).strip()
+        # Clean up HTML entities
+        extracted_title = extracted_title.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>').replace('&quot;', '"')
+        if extracted_title:
+            return extracted_title
+    return "Untitled"
+
+
+class _LinkCollector(HTMLParser):
+    """Collect anchors in the same shape as crawl4ai's result.links."""
+
+    def __init__(self, base_url: str):
+        super().__init__()
+        self.base_url = base_url
+        self.base_host = urlparse(base_url).netloc
+        self.links: dict[str, list[dict[str, str]]] = {"internal": [], "external": []}
+        self._seen: set[str] = set()
+        self._current: dict[str, str] | None = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "a":
+            return
+        href = dict(attrs).get("href")
+        if not href or href.startswith(("#", "javascript:", "mailto:")):
+            return
+        absolute = urljoin(self.base_url, href).split("#", 1)[0]
+        if absolute in self._seen:
+            return
+        self._seen.add(absolute)
+        self._current = {"href": absolute, "text": ""}
+        kind = "internal" if urlparse(absolute).netloc == self.base_host else "external"
+        self.links[kind].append(self._current)
+
+    def handle_data(self, data):
+        if self._current is not None:
+            self._current["text"] += data
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._current is not None:
+            self._current["text"] = self._current["text"].strip()
+            self._current = None
+
+
+def extract_links(html: str, base_url: str) -> dict[str, list[dict[str, str]]]:
+    """Extract internal and external links from a page."""
+    collector = _LinkCollector(base_url)
+    try:
+        collector.feed(html)
+    except Exception as e:
+        logger.debug(f"Link extraction failed for {base_url}: {e}")
+    return collector.links
+
+
+def response_validators(headers: Any) -> dict[str, str | None]:
+    """Pick the HTTP cache validators out of a response's headers (any casing)."""
+    lowered = {str(k).lower(): v for k, v in dict(headers or {}).items()}
+    return {"etag": lowered.get("etag"), "last_modified": lowered.get("last-modified")}
+
+
+def conditional_headers(validators: dict[str, Any] | None) -> dict[str, str]:
+    """Build If-None-Match / If-Modified-Since headers from stored validators."""
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def html_to_markdown(url: str, html: str, crawl_config: CrawlerRunConfig):
+    """
+    Convert fetched HTML to markdown the same way crawl4ai does after a browser crawl.
+
+    Mirrors AsyncWebCrawler.aprocess_html: the config's scraping strategy produces the
+    cleaned HTML, and the markdown generator runs on the HTML source it asks for
+    (cleaned HTML by default). Browser-only options such as remove_overlay_elements act
+    on the live page and have no static-HTML equivalent.
+
+    Returns:
+        crawl4ai MarkdownGenerationResult
+    """
+    params = crawl_config.__dict__.copy()
+    params.pop("url", None)
+    scraped = crawl_config.scraping_strategy.scrap(url, html, **params)
+    if scraped is None:
+        raise ValueError(f"Failed to extract content from {url}")
+    cleaned = scraped.get("cleaned_html", "") if isinstance(scraped, dict) else scraped.cleaned_html
+    cleaned_html = sanitize_input_encode(cleaned or "")
+
+    content_source = getattr(crawl_config.markdown_generator, "content_source", "cleaned_html")
+    if content_source == "raw_html":
+        markdown_input = html
+    elif content_source == "fit_html":
+        markdown_input = preprocess_html_for_schema(html_content=html, text_threshold=500, max_size=300_000)
+    else:
+        markdown_input = cleaned_html
+    return crawl_config.markdown_generator.generate_markdown(input_html=markdown_input, base_url=url)
+
+
+class HttpPageFetcher:
+    """Fetches static HTML pages over plain HTTP and converts them to markdown."""
+
+    def __init__(self, markdown_generator, min_words: int = MIN_MARKDOWN_WORDS):
+        """
+        Initialize the HTTP page fetcher.
+
+        Args:
+            markdown_generator (DefaultMarkdownGenerator): Generator used to convert HTML to markdown
+            min_words: Minimum markdown words for a page to be accepted without the browser
+        """
+        self.markdown_generator = markdown_generator
+        self.min_words = min_words
+        # Used when the caller doesn't pass the run config of its browser path
+        self.default_crawl_config = CrawlerRunConfig(markdown_generator=markdown_generator)
+        self.stats = {"fetched": 0, "not_modified": 0, "fallbacks": 0}
+
+    async def fetch_page(
+        self,
+        url: str,
+        validators: dict[str, Any] | None = None,
+        scheduler=None,
+        crawl_config: CrawlerRunConfig | None = None,
+    ) -> dict[str, Any] | None:
+        """
+        Fetch a page without the browser.
+
+        Args:
+            url: URL of the page
+            validators: Stored {"etag", "last_modified"} from the previous crawl, sent as a
+                conditional request
+            scheduler (HostScheduler): Optional per-host scheduler the request waits on
+            crawl_config: Run config the browser would use for this page; its scraping
+                strategy and markdown generator are applied to the fetched HTML
+
+        Returns:
+            {"url", "not_modified": True} if the server answered 304; a dict with url,
+            html, title, markdown (raw), fit_markdown, etag and last_modified for a
+            fetched page; or None if the page needs the browser
+        """
+        async with scheduler.slot(url) if scheduler else nullcontext() as slot:
+            try:
+                response = await _get_shared_client().get(url, headers=conditional_headers(validators))
+            except httpx.HTTPError as e:
+                logger.debug(f"HTTP fetch failed for {url}: {e}")
+                self.stats["fallbacks"] += 1
+                return None
+            if slot:
+                slot.observe(response.status_code, response.headers)
+
+        if response.status_code == 304 and validators:
+            self.stats["not_modified"] += 1
+            return {"url": url, "not_modified": True}
+
+        html = response.text if response.status_code == 200 else None
+        if (
+            html is None
+            or "html" not in response.headers.get("content-type", "").lower()
+            or looks_client_rendered(html)
+        ):
+            self.stats["fallbacks"] += 1
+            return None
+
+        try:
+            # Scraping and markdown conversion are CPU-bound; keep them off the event loop
+            markdown_result = await asyncio.to_thread(
+                html_to_markdown, url, html, crawl_config or self.default_crawl_config
+            )
+        except Exception as e:
+            logger.debug(f"Markdown conversion failed for {url}, falling back to browser: {e}")
+            self.stats["fallbacks"] += 1
+            return None
+
+        raw_markdown = markdown_result.raw_markdown or ""
+        fit_markdown = markdown_result.fit_markdown or raw_markdown
+        if len(fit_markdown.split()) < self.min_words:
+            # Too little text - probably rendered client-side or gated
+            self.stats["fallbacks"] += 1
+            return None
+
+        self.stats["fetched"] += 1
+        return {
+            "url": url,
+            "html": html,
+            "title": extract_title(html),
+            "markdown": raw_markdown,
+            "fit_markdown": fit_markdown,
+            **response_validators(response.headers),
+        }
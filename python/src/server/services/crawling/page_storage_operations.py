@@ -5,11 +5,13 @@ Handles the storage of complete documentation pages in the archon_page_metadata
 Pages are stored BEFORE chunking to maintain full context for agent retrieval.
 """
 
+from datetime import UTC, datetime
 from typing import Any
 
 from postgrest.exceptions import APIError
 
 from ...config.logfire_config import get_logger, safe_logfire_error, safe_logfire_info
+from ..storage.document_storage_service import compute_content_hash
 from .helpers.llms_full_parser import parse_llms_full_sections
 
 logger = get_logger(__name__)
@@ -74,6 +76,10 @@ class PageStorageOperations:
                 "source_id": source_id,
                 "url": url,
                 "full_content": markdown,
+                "content_hash": compute_content_hash(markdown),
+                "updated_at": datetime.now(UTC).isoformat(),  # Compared with sitemap <lastmod> on recrawl
+                "http_etag": doc.get("etag"),
+                "http_last_modified": doc.get("last_modified"),
                 "section_title": None,  # Regular page, not a section
                 "section_order": 0,
                 "word_count": word_count,
@@ -168,6 +174,8 @@ class PageStorageOperations:
                 "source_id": source_id,
                 "url": section.url,
                 "full_content": section.content,
+                "content_hash": compute_content_hash(section.content),
+                "updated_at": datetime.now(UTC).isoformat(),
                 "section_title": section.section_title,
                 "section_order": section.section_order,
                 "word_count": section.word_count,
@@ -223,6 +231,123 @@ class PageStorageOperations:
 
         return url_to_page_id
 
+    async def get_existing_page_hashes(self, urls: list[str], batch_size: int = 100) -> dict[str, dict[str, Any]]:
+        """
+        Fetch stored content hashes for the given page URLs.
+
+        Args:
+            urls: Page URLs to look up
+            batch_size: Number of URLs per query
+
+        Returns:
+            {url: {"content_hash", "word_count", "chunk_count"}} for pages that have a hash
+        """
+        existing: dict[str, dict[str, Any]] = {}
+        for i in range(0, len(urls), batch_size):
+            try:
+                result = (
+                    self.supabase_client.table("archon_page_metadata")
+                    .select("url, content_hash, word_count, chunk_count")
+                    .in_("url", urls[i : i + batch_size])
+                    .execute()
+                )
+            except Exception as e:
+                logger.warning(f"Failed to load existing page hashes: {e}", exc_info=True)
+                continue
+
+            for page in result.data or []:
+                if page.get("content_hash"):
+                    existing[page["url"]] = page
+
+        return existing
+
+    async def get_page_crawl_dates(self, urls: list[str], batch_size: int = 100) -> dict[str, dict[str, Any]]:
+        """
+        Fetch when the given page URLs were last stored.
+
+        Args:
+            urls: Page URLs to look up
+            batch_size: Number of URLs per query
+
+        Returns:
+            {url: {"updated_at": datetime, "word_count": int}} for stored pages
+        """
+        stored: dict[str, dict[str, Any]] = {}
+        for i in range(0, len(urls), batch_size):
+            try:
+                result = (
+                    self.supabase_client.table("archon_page_metadata")
+                    .select("url, updated_at, word_count")
+                    .in_("url", urls[i : i + batch_size])
+                    .execute()
+                )
+            except Exception as e:
+                logger.warning(f"Failed to load page crawl dates: {e}", exc_info=True)
+                continue
+
+            for page in result.data or []:
+                if not page.get("updated_at"):
+                    continue
+                try:
+                    updated_at = datetime.fromisoformat(page["updated_at"])
+                except ValueError:
+                    continue
+                if updated_at.tzinfo is None:
+                    updated_at = updated_at.replace(tzinfo=UTC)
+                stored[page["url"]] = {"updated_at": updated_at, "word_count": page.get("word_count") or 0}
+
+        return stored
+
+    async def get_page_validators(self, urls: list[str], batch_size: int = 100) -> dict[str, dict[str, Any]]:
+        """
+        Fetch the HTTP validators stored for the given page URLs.
+
+        Args:
+            urls: Page URLs to look up
+            batch_size: Number of URLs per query
+
+        Returns:
+            {url: {"etag", "last_modified", "word_count"}} for pages that have a validator
+        """
+        validators: dict[str, dict[str, Any]] = {}
+        for i in range(0, len(urls), batch_size):
+            try:
+                result = (
+                    self.supabase_client.table("archon_page_metadata")
+                    .select("url, http_etag, http_last_modified, word_count")
+                    .in_("url", urls[i : i + batch_size])
+                    .execute()
+                )
+            except Exception as e:
+                logger.warning(f"Failed to load page validators: {e}", exc_info=True)
+                continue
+
+            for page in result.data or []:
+                if page.get("http_etag") or page.get("http_last_modified"):
+                    validators[page["url"]] = {
+                        "etag": page.get("http_etag"),
+                        "last_modified": page.get("http_last_modified"),
+                        "word_count": page.get("word_count") or 0,
+                    }
+
+        return validators
+
+    async def update_page_validators(self, validators_by_url: dict[str, dict[str, Any]]) -> None:
+        """
+        Refresh the stored HTTP validators of pages whose content did not change.
+
+        Args:
+            validators_by_url: {url: {"etag", "last_modified"}} from the latest crawl
+        """
+        for url, validators in validators_by_url.items():
+            try:
+                self.supabase_client.table("archon_page_metadata").update({
+                    "http_etag": validators.get("etag"),
+                    "http_last_modified": validators.get("last_modified"),
+                }).eq("url", url).execute()
+            except Exception as e:
+                logger.warning(f"Failed to update validators for page {url}: {e}", exc_info=True)
+
     async def update_page_chunk_count(self, page_id: str, chunk_count: int) -> None:
         """
         Update the chunk_count field for a page after chunking is complete.
@@ -2,16 +2,23 @@
 Batch Crawling Strategy
 
 Handles batch crawling of multiple URLs in parallel.
+
+Requests are scheduled per host (robots.txt Crawl-delay, 429/503 backoff and
+adaptive per-host concurrency), so mixed-domain batches such as llms.txt link
+collections spread load across hosts instead of hammering one.
 """
 
 import asyncio
 from collections.abc import Awaitable, Callable
 from typing import Any
 
-from crawl4ai import CacheMode, CrawlerRunConfig, MemoryAdaptiveDispatcher
+import psutil
+from crawl4ai import CacheMode, CrawlerRunConfig
 
 from ....config.logfire_config import get_logger
 from ...credential_service import credential_service
+from ..helpers.host_scheduler import HostScheduler
+from ..helpers.http_fetcher import HttpPageFetcher, extract_title, response_validators
 
 logger = get_logger(__name__)
 
@@ -29,6 +36,7 @@ class BatchCrawlStrategy:
         """
         self.crawler = crawler
         self.markdown_generator = markdown_generator
+        self.http_fetcher = HttpPageFetcher(markdown_generator)
 
     async def crawl_batch_with_progress(
         self,
@@ -39,6 +47,9 @@ class BatchCrawlStrategy:
         progress_callback: Callable[..., Awaitable[None]] | None = None,
         cancellation_check: Callable[[], None] | None = None,
         link_text_fallbacks: dict[str, str] | None = None,
+        page_callback: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+        validators: dict[str, dict[str, Any]] | None = None,
+        not_modified_callback: Callable[[str], Awaitable[None]] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Batch crawl multiple URLs in parallel with progress reporting.
@@ -51,9 +62,15 @@ class BatchCrawlStrategy:
             progress_callback: Optional callback for progress updates
             cancellation_check: Optional function to check for cancellation
             link_text_fallbacks: Optional dict mapping URLs to link text for title fallback
+            page_callback: Optional async callback that receives each successful page as it is
+                crawled. Pages handed to it are not kept in the returned list.
+            validators: Optional {url: {"etag", "last_modified"}} from the previous crawl. With the
+                HTTP fast path on, these URLs are requested conditionally and skipped when the
+                server answers 304.
+            not_modified_callback: Optional async callback that receives each URL skipped with a 304
 
         Returns:
-            List of crawl results
+            List of crawl results (empty when page_callback is given)
         """
         if not self.crawler:
             logger.error("No crawler instance available for batch crawling")
@@ -79,12 +96,18 @@ class BatchCrawlStrategy:
                 if max_concurrent != raw_max_concurrent:
                     logger.warning(f"Invalid CRAWL_MAX_CONCURRENT={raw_max_concurrent}, clamped to {max_concurrent}")
 
-            # Clamp memory threshold to sane bounds for dispatcher
+            # CRAWL_MAX_PER_HOST: Upper bound for pages of one host in flight (0 = same as CRAWL_MAX_CONCURRENT)
+            max_per_host = max(0, int(settings.get("CRAWL_MAX_PER_HOST", "0"))) or max_concurrent
+            respect_crawl_delay = str(settings.get("CRAWL_RESPECT_CRAWL_DELAY", "true")).lower() == "true"
+
+            # Clamp memory threshold to sane bounds; new pages wait while memory is above it
             raw_memory_threshold = float(settings.get("MEMORY_THRESHOLD_PERCENT", "80"))
             memory_threshold = min(99.0, max(10.0, raw_memory_threshold))
             if memory_threshold != raw_memory_threshold:
                 logger.warning(f"Invalid MEMORY_THRESHOLD_PERCENT={raw_memory_threshold}, clamped to {memory_threshold}")
             check_interval = float(settings.get("DISPATCHER_CHECK_INTERVAL", "0.5"))
+            # Try a plain HTTP GET before launching the browser for each page
+            use_http_fast_path = str(settings.get("CRAWL_HTTP_FAST_PATH", "true")).lower() == "true"
         except (ValueError, KeyError, TypeError) as e:
             # Critical configuration errors should fail fast
             logger.error(f"Invalid crawl settings format: {e}", exc_info=True)
@@ -97,8 +120,11 @@ class BatchCrawlStrategy:
             batch_size = 50
             if max_concurrent is None:
                 max_concurrent = 10  # Safe default to prevent memory issues
+            max_per_host = max_concurrent
+            respect_crawl_delay = True
             memory_threshold = 80.0
             check_interval = 0.5
+            use_http_fast_path = True
             settings = {}  # Empty dict for defaults
 
         # Check if any URLs are documentation sites
@@ -109,7 +135,6 @@ class BatchCrawlStrategy:
             # Use generic documentation selectors for batch crawling
             crawl_config = CrawlerRunConfig(
                 cache_mode=CacheMode.BYPASS,
-                stream=True,  # Enable streaming for faster parallel processing
                 markdown_generator=self.markdown_generator,
                 wait_until=settings.get("CRAWL_WAIT_STRATEGY", "domcontentloaded"),
                 page_timeout=int(settings.get("CRAWL_PAGE_TIMEOUT", "30000")),
@@ -124,7 +149,6 @@ class BatchCrawlStrategy:
             # Configuration for regular batch crawling
             crawl_config = CrawlerRunConfig(
                 cache_mode=CacheMode.BYPASS,
-                stream=True,  # Enable streaming
                 markdown_generator=self.markdown_generator,
                 wait_until=settings.get("CRAWL_WAIT_STRATEGY", "domcontentloaded"),
                 page_timeout=int(settings.get("CRAWL_PAGE_TIMEOUT", "45000")),
@@ -132,11 +156,7 @@ class BatchCrawlStrategy:
                 scan_full_page=True,
             )
 
-        dispatcher = MemoryAdaptiveDispatcher(
-            memory_threshold_percent=memory_threshold,
-            check_interval=check_interval,
-            max_session_permit=max_concurrent,
-        )
+        scheduler = HostScheduler(max_per_host, max_total=max_concurrent, respect_crawl_delay=respect_crawl_delay)
 
         async def report_progress(progress_val: int, message: str, status: str = "crawling", **kwargs):
             """Helper to report progress if callback is available"""
@@ -161,6 +181,7 @@ class BatchCrawlStrategy:
 
         # Use configured batch size
         successful_results = []
+        successful_count = 0
         processed = 0
         cancelled = False
 
@@ -172,6 +193,77 @@ class BatchCrawlStrategy:
             transformed_urls.append(transformed)
             url_mapping[transformed] = url
 
+        async def handle_page(
+            crawled_url: str, markdown: str, html: str | None, page_validators: dict[str, Any] | None = None
+        ):
+            """Hand a successfully crawled page to the caller"""
+            nonlocal successful_count
+            # Map back to original URL
+            original_url = url_mapping.get(crawled_url, crawled_url)
+
+            # Extract title from HTML <title> tag
+            title = extract_title(html) if html else "Untitled"
+
+            # Fallback to link text if HTML title extraction failed
+            if title == "Untitled" and link_text_fallbacks:
+                fallback_text = link_text_fallbacks.get(original_url, "")
+                if fallback_text:
+                    title = fallback_text
+
+            page = {
+                "url": original_url,
+                "markdown": markdown,
+                "html": html,  # Use raw HTML
+                "title": title,
+                # Stored with the page so the next crawl can ask "changed since?"
+                **(page_validators or {}),
+            }
+            if page_callback:
+                await page_callback(page)
+            else:
+                successful_results.append(page)
+            successful_count += 1
+
+        async def report_page_progress():
+            """Report individual URL progress with smooth increments"""
+            # Calculate progress as percentage of total URLs processed
+            progress_percentage = int((processed / total_urls) * 100)
+            # Report more frequently for smoother progress
+            if (
+                processed % 5 == 0 or processed == total_urls
+            ):  # Report every 5 URLs or at the end
+                await report_progress(
+                    progress_percentage,
+                    f"Crawled {processed}/{total_urls} pages",
+                    total_pages=total_urls,
+                    processed_pages=processed,
+                    successful_count=successful_count
+                )
+
+        async def fetch_without_browser(fetch_url: str):
+            page_validators = (validators or {}).get(url_mapping.get(fetch_url, fetch_url))
+            fetched = await self.http_fetcher.fetch_page(fetch_url, page_validators, scheduler, crawl_config)
+            return fetch_url, fetched
+
+        browser_active = 0
+
+        async def crawl_with_browser(crawl_url: str):
+            nonlocal browser_active
+            # Under memory pressure, let running pages finish before starting more
+            while browser_active and psutil.virtual_memory().percent >= memory_threshold:
+                await asyncio.sleep(check_interval)
+            browser_active += 1
+            try:
+                async with scheduler.slot(crawl_url) as slot:
+                    result = await self.crawler.arun(url=crawl_url, config=crawl_config)
+                    slot.observe(getattr(result, "status_code", None), getattr(result, "response_headers", None))
+                    return crawl_url, result
+            except Exception as e:
+                logger.warning(f"Crawler exception for {crawl_url}: {e}")
+                return crawl_url, None
+            finally:
+                browser_active -= 1
+
         for i in range(0, total_urls, batch_size):
             # Check for cancellation before processing each batch
             if cancellation_check:
@@ -185,7 +277,7 @@ class BatchCrawlStrategy:
                         status="cancelled",
                         total_pages=total_urls,
                         processed_pages=processed,
-                        successful_count=len(successful_results),
+                        successful_count=successful_count,
                     )
                     break
 
@@ -203,17 +295,67 @@ class BatchCrawlStrategy:
                 processed_pages=processed
             )
 
-            # Crawl this batch using arun_many with streaming
-            logger.info(
-                f"Starting parallel crawl of batch {batch_start + 1}-{batch_end} ({len(batch_urls)} URLs)"
-            )
-            batch_results = await self.crawler.arun_many(
-                urls=batch_urls, config=crawl_config, dispatcher=dispatcher
-            )
+            # Static and unchanged (304) pages are handled over plain HTTP; only the rest need the browser.
+            # With the fast path off every page goes straight to the browser (no extra conditional GET).
+            browser_urls = batch_urls
+            http_urls = batch_urls if use_http_fast_path else []
+            if http_urls:
+                fetched_urls = set()
+                not_modified_count = 0
+                http_tasks = [asyncio.create_task(fetch_without_browser(u)) for u in http_urls]
+                try:
+                    for fetch in asyncio.as_completed(http_tasks):
+                        fetch_url, fetched = await fetch
+                        # Check for cancellation as pages complete
+                        if cancellation_check:
+                            try:
+                                cancellation_check()
+                            except asyncio.CancelledError:
+                                cancelled = True
+                                await report_progress(
+                                    min(int((processed / max(total_urls, 1)) * 100), 99),
+                                    "Crawl cancelled",
+                                    status="cancelled",
+                                    total_pages=total_urls,
+                                    processed_pages=processed,
+                                    successful_count=successful_count,
+                                )
+                                break
+                            except Exception:
+                                logger.exception("Unexpected error from cancellation_check()")
+                                raise
+
+                        if fetched is None:
+                            continue
+                        fetched_urls.add(fetch_url)
+                        processed += 1
+                        if fetched.get("not_modified"):
+                            # Unchanged since the last crawl - nothing to convert, chunk or embed
+                            not_modified_count += 1
+                            if not_modified_callback:
+                                await not_modified_callback(url_mapping.get(fetch_url, fetch_url))
+                        else:
+                            await handle_page(
+                                fetch_url,
+                                fetched["fit_markdown"],
+                                fetched["html"],
+                                {"etag": fetched["etag"], "last_modified": fetched["last_modified"]},
+                            )
+                        await report_page_progress()
+                finally:
+                    # Cancellation or a failing page callback: stop fetches still in flight
+                    for task in http_tasks:
+                        task.cancel()
+                    await asyncio.gather(*http_tasks, return_exceptions=True)
+                if cancelled:
+                    break
+
+                browser_urls = [u for u in batch_urls if u not in fetched_urls]
+                logger.info(
+                    f"HTTP fast path handled {len(fetched_urls)}/{len(batch_urls)} URLs "
+                    f"({not_modified_count} not modified), {len(browser_urls)} need the browser"
+                )
 
-            # Handle streaming results
-            async for result in batch_results:
-                # Check for cancellation during streaming
                 if cancellation_check:
                     try:
                         cancellation_check()
@@ -225,61 +367,58 @@ class BatchCrawlStrategy:
                             status="cancelled",
                             total_pages=total_urls,
                             processed_pages=processed,
-                            successful_count=len(successful_results),
+                            successful_count=successful_count,
                         )
                         break
-                    except Exception:
-                        logger.exception("Unexpected error from cancellation_check()")
-                        raise
-
-                processed += 1
-                if result.success and result.markdown and result.markdown.fit_markdown:
-                    # Map back to original URL
-                    original_url = url_mapping.get(result.url, result.url)
-
-                    # Extract title from HTML <title> tag
-                    title = "Untitled"
-                    if result.html:
-                        import re
-                        title_match = re.search(r'<title[^>]*>(.*?)</title>', result.html, re.IGNORECASE | re.DOTALL)
-                        if title_match:
-                            extracted_title = title_match.group(1).strip()
-                            # Clean up HTML entities
-                            extracted_title = extracted_title.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>').replace('&quot;', '"')
-                            if extracted_title:
-                                title = extracted_title
-
-                    # Fallback to link text if HTML title extraction failed
-                    if title == "Untitled" and link_text_fallbacks:
-                        fallback_text = link_text_fallbacks.get(original_url, "")
-                        if fallback_text:
-                            title = fallback_text
-
-                    successful_results.append({
-                        "url": original_url,
-                        "markdown": result.markdown.fit_markdown,
-                        "html": result.html,  # Use raw HTML
-                        "title": title,
-                    })
-                else:
-                    logger.warning(
-                        f"Failed to crawl {result.url}: {getattr(result, 'error_message', 'Unknown error')}"
-                    )
 
-                # Report individual URL progress with smooth increments
-                # Calculate progress as percentage of total URLs processed
-                progress_percentage = int((processed / total_urls) * 100)
-                # Report more frequently for smoother progress
-                if (
-                    processed % 5 == 0 or processed == total_urls
-                ):  # Report every 5 URLs or at the end
-                    await report_progress(
-                        progress_percentage,
-                        f"Crawled {processed}/{total_urls} pages",
-                        total_pages=total_urls,
-                        processed_pages=processed,
-                        successful_count=len(successful_results)
-                    )
+            if not browser_urls:
+                continue
+
+            # Crawl the remaining pages with the browser, handling each as soon as it finishes
+            logger.info(
+                f"Starting parallel crawl of batch {batch_start + 1}-{batch_end} ({len(browser_urls)} URLs)"
+            )
+            browser_tasks = [asyncio.create_task(crawl_with_browser(u)) for u in browser_urls]
+            try:
+                for crawl in asyncio.as_completed(browser_tasks):
+                    crawl_url, result = await crawl
+                    # Check for cancellation as pages complete
+                    if cancellation_check:
+                        try:
+                            cancellation_check()
+                        except asyncio.CancelledError:
+                            cancelled = True
+                            await report_progress(
+                                min(int((processed / max(total_urls, 1)) * 100), 99),
+                                "Crawl cancelled",
+                                status="cancelled",
+                                total_pages=total_urls,
+                                processed_pages=processed,
+                                successful_count=successful_count,
+                            )
+                            break
+                        except Exception:
+                            logger.exception("Unexpected error from cancellation_check()")
+                            raise
+
+                    processed += 1
+                    if result is not None and result.success and result.markdown and result.markdown.fit_markdown:
+                        await handle_page(
+                            crawl_url,
+                            result.markdown.fit_markdown,
+                            result.html,
+                            response_validators(getattr(result, "response_headers", None)),
+                        )
+                    else:
+                        error = getattr(result, "error_message", "Unknown error") if result is not None else "crawler exception"
+                        logger.warning(f"Failed to crawl {crawl_url}: {error}")
+
+                    await report_page_progress()
+            finally:
+                # Cancellation or a failing page callback: stop pages still being crawled
+                for task in browser_tasks:
+                    task.cancel()
+                await asyncio.gather(*browser_tasks, return_exceptions=True)
             if cancelled:
                 break
 
@@ -287,9 +426,9 @@ class BatchCrawlStrategy:
             return successful_results
         await report_progress(
             100,
-            f"Batch crawling completed: {len(successful_results)}/{total_urls} pages successful",
+            f"Batch crawling completed: {successful_count}/{total_urls} pages successful",
             total_pages=total_urls,
             processed_pages=processed,
-            successful_count=len(successful_results)
+            successful_count=successful_count
         )
         return successful_results
@@ -2,17 +2,26 @@
 Recursive Crawling Strategy
 
 Handles recursive crawling of websites by following internal links.
+
+Pages are crawled from a continuous priority frontier rather than depth by
+depth: as soon as one page finishes, the next best URL starts, so the crawler
+never idles waiting for the slowest page of a batch. Each host's share of the
+window is set by a HostScheduler (robots.txt Crawl-delay, 429/503 backoff and
+adaptive per-host concurrency).
 """
 
 import asyncio
 from collections.abc import Awaitable, Callable
 from typing import Any
-from urllib.parse import urldefrag
 
-from crawl4ai import CacheMode, CrawlerRunConfig, MemoryAdaptiveDispatcher
+import psutil
+from crawl4ai import CacheMode, CrawlerRunConfig
 
 from ....config.logfire_config import get_logger
 from ...credential_service import credential_service
+from ..helpers.crawl_frontier import CrawlFrontier, FrontierItem
+from ..helpers.host_scheduler import HostScheduler
+from ..helpers.http_fetcher import extract_title
 from ..helpers.url_handler import URLHandler
 
 logger = get_logger(__name__)
@@ -42,6 +51,7 @@ class RecursiveCrawlStrategy:
         max_concurrent: int | None = None,
         progress_callback: Callable[..., Awaitable[None]] | None = None,
         cancellation_check: Callable[[], None] | None = None,
+        page_callback: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Recursively crawl internal links from start URLs up to a maximum depth with progress reporting.
@@ -54,9 +64,11 @@ class RecursiveCrawlStrategy:
             max_concurrent: Maximum concurrent crawls
             progress_callback: Optional callback for progress updates
             cancellation_check: Optional function to check for cancellation
+            page_callback: Optional async callback that receives each successful page as it is
+                crawled. Pages handed to it are not kept in the returned list.
 
         Returns:
-            List of crawl results
+            List of crawl results (empty when page_callback is given)
         """
         if not self.crawler:
             logger.error("No crawler instance available for recursive crawling")
@@ -68,12 +80,6 @@ class RecursiveCrawlStrategy:
         try:
             settings = await credential_service.get_credentials_by_category("rag_strategy")
 
-            # Clamp batch_size to prevent zero step in range()
-            raw_batch_size = int(settings.get("CRAWL_BATCH_SIZE", "50"))
-            batch_size = max(1, raw_batch_size)
-            if batch_size != raw_batch_size:
-                logger.warning(f"Invalid CRAWL_BATCH_SIZE={raw_batch_size}, clamped to {batch_size}")
-
             if max_concurrent is None:
                 # CRAWL_MAX_CONCURRENT: Pages to crawl in parallel within this single crawl operation
                 # (Different from server-level CONCURRENT_CRAWL_LIMIT which limits total crawl operations)
@@ -82,7 +88,11 @@ class RecursiveCrawlStrategy:
                 if max_concurrent != raw_max_concurrent:
                     logger.warning(f"Invalid CRAWL_MAX_CONCURRENT={raw_max_concurrent}, clamped to {max_concurrent}")
 
-            # Clamp memory threshold to sane bounds for dispatcher
+            # CRAWL_MAX_PER_HOST: Upper bound for pages of one host in flight (0 = same as CRAWL_MAX_CONCURRENT)
+            max_per_host = max(0, int(settings.get("CRAWL_MAX_PER_HOST", "0"))) or max_concurrent
+            respect_crawl_delay = str(settings.get("CRAWL_RESPECT_CRAWL_DELAY", "true")).lower() == "true"
+
+            # Clamp memory threshold to sane bounds; new pages wait while memory is above it
             raw_memory_threshold = float(settings.get("MEMORY_THRESHOLD_PERCENT", "80"))
             memory_threshold = min(99.0, max(10.0, raw_memory_threshold))
             if memory_threshold != raw_memory_threshold:
@@ -97,9 +107,10 @@ class RecursiveCrawlStrategy:
             logger.error(
                 f"Failed to load crawl settings from database: {e}, using defaults", exc_info=True
             )
-            batch_size = 50
             if max_concurrent is None:
                 max_concurrent = 10  # Safe default to prevent memory issues
+            max_per_host = max_concurrent
+            respect_crawl_delay = True
             memory_threshold = 80.0
             check_interval = 0.5
             settings = {}  # Empty dict for defaults
@@ -113,7 +124,6 @@ class RecursiveCrawlStrategy:
             )
             run_config = CrawlerRunConfig(
                 cache_mode=CacheMode.BYPASS,
-                stream=True,  # Enable streaming for faster parallel processing
                 markdown_generator=self.markdown_generator,
                 wait_until=settings.get("CRAWL_WAIT_STRATEGY", "domcontentloaded"),
                 page_timeout=int(settings.get("CRAWL_PAGE_TIMEOUT", "30000")),
@@ -128,7 +138,6 @@ class RecursiveCrawlStrategy:
             # Configuration for regular recursive crawling
             run_config = CrawlerRunConfig(
                 cache_mode=CacheMode.BYPASS,
-                stream=True,  # Enable streaming
                 markdown_generator=self.markdown_generator,
                 wait_until=settings.get("CRAWL_WAIT_STRATEGY", "domcontentloaded"),
                 page_timeout=int(settings.get("CRAWL_PAGE_TIMEOUT", "45000")),
@@ -136,12 +145,6 @@ class RecursiveCrawlStrategy:
                 scan_full_page=True,
             )
 
-        dispatcher = MemoryAdaptiveDispatcher(
-            memory_threshold_percent=memory_threshold,
-            check_interval=check_interval,
-            max_session_permit=max_concurrent,
-        )
-
         async def report_progress(progress_val: int, message: str, status: str = "crawling", **kwargs):
             """Helper to report progress if callback is available"""
             if progress_callback:
@@ -155,190 +158,129 @@ class RecursiveCrawlStrategy:
                     **kwargs
                 )
 
-        visited = set()
-
-        def normalize_url(url):
-            return urldefrag(url)[0]
+        scheduler = HostScheduler(max_per_host, respect_crawl_delay=respect_crawl_delay)
+        frontier = CrawlFrontier(host_limit=scheduler.host_limit)
+        for url in start_urls:
+            frontier.add(url, depth=0)
 
-        current_urls = {normalize_url(u) for u in start_urls}
         results_all = []
+        total_successful = 0
         total_processed = 0
-        total_discovered = len(current_urls)  # Track total URLs discovered (normalized & de-duped)
+        deepest_depth = 0
         cancelled = False
 
-        for depth in range(max_depth):
-            # Check for cancellation at the start of each depth level
-            if cancellation_check:
-                try:
-                    cancellation_check()
-                except asyncio.CancelledError:
-                    cancelled = True
-                    await report_progress(
-                        int(((depth) / max_depth) * 99),  # Cap at 99% for cancellation
-                        f"Crawl cancelled at depth {depth + 1}",
-                        status="cancelled",
-                        total_pages=total_discovered,
-                        processed_pages=total_processed,
-                    )
-                    break
-                except Exception:
-                    logger.exception("Unexpected error from cancellation_check()")
-                    raise
-
-            urls_to_crawl = [
-                normalize_url(url) for url in current_urls if normalize_url(url) not in visited
-            ]
-            if not urls_to_crawl:
-                break
-
-            # Calculate progress for this depth level
-            # Report 0-100 to properly integrate with ProgressMapper architecture
-            depth_progress = int((depth / max(max_depth, 1)) * 100)
-
-            await report_progress(
-                depth_progress,
-                f"Crawling depth {depth + 1}/{max_depth}: {len(urls_to_crawl)} URLs to process",
-                total_pages=total_discovered,
-                processed_pages=total_processed,
-            )
+        async def crawl_one(item: FrontierItem):
+            try:
+                async with scheduler.slot(item.url) as slot:
+                    result = await self.crawler.arun(url=transform_url_func(item.url), config=run_config)
+                    slot.observe(getattr(result, "status_code", None), getattr(result, "response_headers", None))
+                    return result
+            except Exception as e:
+                logger.warning(f"Crawler exception for {item.url}: {e}")
+                return None
+
+        def memory_pressure() -> bool:
+            return psutil.virtual_memory().percent >= memory_threshold
 
-            # Use configured batch size for recursive crawling
-            next_level_urls = set()
-            depth_successful = 0
+        await report_progress(
+            0,
+            f"Starting recursive crawl with max depth {max_depth}: {frontier.discovered} URLs to process",
+            total_pages=frontier.discovered,
+            processed_pages=0,
+        )
 
-            for batch_idx in range(0, len(urls_to_crawl), batch_size):
-                # Check for cancellation before processing each batch
+        in_flight: dict[asyncio.Task, FrontierItem] = {}
+        try:
+            while True:
+                # Check for cancellation before scheduling more work
                 if cancellation_check:
                     try:
                         cancellation_check()
                     except asyncio.CancelledError:
                         cancelled = True
+                        await report_progress(
+                            min(int((total_processed / max(frontier.discovered, 1)) * 100), 99),
+                            f"Crawl cancelled at depth {deepest_depth + 1}",
+                            status="cancelled",
+                            total_pages=frontier.discovered,
+                            processed_pages=total_processed,
+                        )
                         break
                     except Exception:
                         logger.exception("Unexpected error from cancellation_check()")
                         raise
 
-                batch_urls = urls_to_crawl[batch_idx : batch_idx + batch_size]
-                batch_end_idx = min(batch_idx + batch_size, len(urls_to_crawl))
-
-                # Transform URLs and create mapping for this batch
-                url_mapping = {}
-                transformed_batch_urls = []
-                for url in batch_urls:
-                    transformed = transform_url_func(url)
-                    transformed_batch_urls.append(transformed)
-                    url_mapping[transformed] = url
-
-                # Calculate overall progress based on URLs actually being crawled at this depth
-                # Use a more accurate progress calculation that accounts for depth
-                urls_at_this_depth = len(urls_to_crawl)
-                progress_within_depth = (batch_idx / urls_at_this_depth) if urls_at_this_depth > 0 else 0
-                # Weight by depth to show overall progress (later depths contribute less)
-                overall_progress = int(((depth + progress_within_depth) / max_depth) * 100)
-                await report_progress(
-                    min(overall_progress, 99),  # Never show 100% until actually complete
-                    f"Crawling URLs {batch_idx + 1}-{batch_end_idx} of {len(urls_to_crawl)} at depth {depth + 1}",
-                    total_pages=total_discovered,
-                    processed_pages=total_processed,
-                )
+                # Keep the in-flight window full; under memory pressure only drain
+                while len(in_flight) < max_concurrent and not (in_flight and memory_pressure()):
+                    item = frontier.pop()
+                    if item is None:
+                        break
+                    in_flight[asyncio.create_task(crawl_one(item))] = item
 
-                # Use arun_many for native parallel crawling with streaming
-                logger.info(f"Starting parallel crawl of {len(batch_urls)} URLs with arun_many")
-                batch_results = await self.crawler.arun_many(
-                    urls=transformed_batch_urls, config=run_config, dispatcher=dispatcher
-                )
+                if not in_flight:
+                    # Queued URLs may be waiting on memory or a host that is backing off
+                    if len(frontier):
+                        await asyncio.sleep(check_interval)
+                        continue
+                    break
 
-                # Handle streaming results from arun_many
-                i = 0
-                async for result in batch_results:
-                    # Check for cancellation during streaming results
-                    if cancellation_check:
-                        try:
-                            cancellation_check()
-                        except asyncio.CancelledError:
-                            cancelled = True
-                            await report_progress(
-                                min(int((total_processed / max(total_discovered, 1)) * 100), 99),
-                                "Crawl cancelled during batch processing",
-                                status="cancelled",
-                                total_pages=total_discovered,
-                                processed_pages=total_processed,
-                            )
-                            break
-                        except Exception:
-                            logger.exception("Unexpected error from cancellation_check()")
-                            raise
-
-                    # Map back to original URL using the mapping dict
-                    original_url = url_mapping.get(result.url, result.url)
-
-                    norm_url = normalize_url(original_url)
-                    visited.add(norm_url)
+                done, _ = await asyncio.wait(in_flight, timeout=check_interval, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    item = in_flight.pop(task)
+                    frontier.done(item)
+                    result = task.result()
                     total_processed += 1
+                    deepest_depth = max(deepest_depth, item.depth)
 
-                    if result.success and result.markdown and result.markdown.fit_markdown:
-                        # Extract title from HTML <title> tag
-                        title = "Untitled"
-                        if result.html:
-                            import re
-                            title_match = re.search(r'<title[^>]*>(.*?)</title>', result.html, re.IGNORECASE | re.DOTALL)
-                            if title_match:
-                                extracted_title = title_match.group(1).strip()
-                                # Clean up HTML entities
-                                extracted_title = extracted_title.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>').replace('&quot;', '"')
-                                if extracted_title:
-                                    title = extracted_title
-
-                        results_all.append({
-                            "url": original_url,
+                    if result is not None and result.success and result.markdown and result.markdown.fit_markdown:
+                        page = {
+                            "url": item.url,
                             "markdown": result.markdown.fit_markdown,
                             "html": result.html,  # Always use raw HTML for code extraction
-                            "title": title,
-                        })
-                        depth_successful += 1
-
-                        # Find internal links for next depth
-                        links = getattr(result, "links", {}) or {}
-                        for link in links.get("internal", []):
-                            next_url = normalize_url(link["href"])
-                            # Skip binary files and already visited URLs
-                            is_binary = self.url_handler.is_binary_file(next_url)
-                            if next_url not in visited and not is_binary:
-                                if next_url not in next_level_urls:
-                                    next_level_urls.add(next_url)
-                                    total_discovered += 1  # Increment when we discover a new URL
-                            elif is_binary:
-                                logger.debug(f"Skipping binary file from crawl queue: {next_url}")
+                            "title": extract_title(result.html) if result.html else "Untitled",
+                        }
+                        if page_callback:
+                            await page_callback(page)
+                        else:
+                            results_all.append(page)
+                        total_successful += 1
+
+                        # Queue internal links for the next depth
+                        if item.depth + 1 < max_depth:
+                            links = getattr(result, "links", {}) or {}
+                            for link in links.get("internal", []):
+                                next_url = link["href"]
+                                # Skip binary files
+                                if self.url_handler.is_binary_file(next_url):
+                                    logger.debug(f"Skipping binary file from crawl queue: {next_url}")
+                                    continue
+                                frontier.add(next_url, depth=item.depth + 1)
                     else:
-                        logger.warning(
-                            f"Failed to crawl {original_url}: {getattr(result, 'error_message', 'Unknown error')}"
+                        error = getattr(result, "error_message", "Unknown error") if result is not None else "crawler exception"
+                        logger.warning(f"Failed to crawl {item.url}: {error}")
+
+                    # Report every few pages; progress is processed vs. discovered so far
+                    if total_processed % 5 == 0:
+                        await report_progress(
+                            min(int((total_processed / max(frontier.discovered, 1)) * 100), 99),
+                            f"Crawled {total_processed} pages at depth up to {deepest_depth + 1}/{max_depth}, "
+                            f"{len(frontier)} URLs queued",
+                            total_pages=frontier.discovered,
+                            processed_pages=total_processed,
                         )
-
-                    # Skip the confusing "processed X/Y URLs" updates
-                    # The "crawling URLs" message at the start of each batch is more accurate
-                    i += 1
-                if cancelled:
-                    break
-
-            if cancelled:
-                break
-
-            current_urls = next_level_urls
-
-            # Report completion of this depth
-            await report_progress(
-                int(((depth + 1) / max_depth) * 100),
-                f"Depth {depth + 1} completed: {depth_successful} pages crawled, {len(next_level_urls)} URLs found for next depth",
-                total_pages=total_discovered,
-                processed_pages=total_processed,
-            )
+        finally:
+            # Cancellation or a failing page callback: stop pages still being crawled
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
 
         if cancelled:
             return results_all
         await report_progress(
             100,
-            f"Recursive crawling completed: {len(results_all)} total pages crawled across {max_depth} depth levels",
-            total_pages=total_discovered,
+            f"Recursive crawling completed: {total_successful} total pages crawled across {deepest_depth + 1} depth levels",
+            total_pages=frontier.discovered,
             processed_pages=total_processed,
         )
         return results_all
@@ -11,6 +11,8 @@ from typing import Any
 from crawl4ai import CacheMode, CrawlerRunConfig
 
 from ....config.logfire_config import get_logger
+from ...credential_service import credential_service
+from ..helpers.http_fetcher import HttpPageFetcher, extract_links, extract_title, response_validators
 
 logger = get_logger(__name__)
 
@@ -28,6 +30,7 @@ class SinglePageCrawlStrategy:
         """
         self.crawler = crawler
         self.markdown_generator = markdown_generator
+        self.http_fetcher = HttpPageFetcher(markdown_generator)
 
     def _get_wait_selector_for_docs(self, url: str) -> str:
         """Get appropriate wait selector based on documentation framework."""
@@ -59,7 +62,8 @@ class SinglePageCrawlStrategy:
         url: str,
         transform_url_func: Callable[[str], str],
         is_documentation_site_func: Callable[[str], bool],
-        retry_count: int = 3
+        retry_count: int = 3,
+        validators: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
         """
         Crawl a single web page and return the result with retry logic.
@@ -69,9 +73,12 @@ class SinglePageCrawlStrategy:
             transform_url_func: Function to transform URLs (e.g., GitHub URLs)
             is_documentation_site_func: Function to check if URL is a documentation site
             retry_count: Number of retry attempts
+            validators: Optional {"etag", "last_modified"} from the previous crawl of this page,
+                sent as a conditional request on the HTTP fast path
             
         Returns:
-            Dict with success status, content, and metadata
+            Dict with success status, content, and metadata. When the server reports the
+            page unchanged (304), the dict only has success, url and not_modified=True.
         """
         # Transform GitHub URLs to raw content URLs if applicable
         original_url = url
@@ -79,6 +86,27 @@ class SinglePageCrawlStrategy:
 
         last_error = None
 
+        # Static pages don't need the browser; a plain GET scraped the same way gives the same markdown
+        fast_path_setting = await credential_service.get_credential("CRAWL_HTTP_FAST_PATH", "true")
+        if str(fast_path_setting).lower() == "true":
+            fetched = await self.http_fetcher.fetch_page(url, validators)
+            if fetched and fetched.get("not_modified"):
+                logger.info(f"{url} not modified since the last crawl")
+                return {"success": True, "url": original_url, "not_modified": True}
+            if fetched:
+                logger.info(f"Crawled {url} over HTTP without the browser")
+                return {
+                    "success": True,
+                    "url": original_url,  # Use original URL for tracking
+                    "markdown": fetched["markdown"],
+                    "html": fetched["html"],
+                    "title": fetched["title"],
+                    "links": extract_links(fetched["html"], url),
+                    "content_length": len(fetched["markdown"]),
+                    "etag": fetched["etag"],
+                    "last_modified": fetched["last_modified"],
+                }
+
         for attempt in range(retry_count):
             try:
                 if not self.crawler:
@@ -180,16 +208,7 @@ class SinglePageCrawlStrategy:
                     logger.info(f"Markdown sample for getting-started: {markdown_sample}")
 
                 # Extract title from HTML <title> tag
-                title = "Untitled"
-                if result.html:
-                    import re
-                    title_match = re.search(r'<title[^>]*>(.*?)</title>', result.html, re.IGNORECASE | re.DOTALL)
-                    if title_match:
-                        extracted_title = title_match.group(1).strip()
-                        # Clean up HTML entities
-                        extracted_title = extracted_title.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>').replace('&quot;', '"')
-                        if extracted_title:
-                            title = extracted_title
+                title = extract_title(result.html) if result.html else "Untitled"
 
                 return {
                     "success": True,
@@ -198,7 +217,8 @@ class SinglePageCrawlStrategy:
                     "html": result.html,  # Use raw HTML instead of cleaned_html for code extraction
                     "title": title,
                     "links": result.links,
-                    "content_length": len(result.markdown)
+                    "content_length": len(result.markdown),
+                    **response_validators(getattr(result, "response_headers", None)),
                 }
 
             except TimeoutError:
@@ -2,33 +2,222 @@
 Sitemap Crawling Strategy
 
 Handles crawling of URLs from XML sitemaps.
+
+Sitemaps are fetched asynchronously and parsed incrementally as the response
+streams in, so large sitemaps neither block the event loop nor get loaded into
+memory as a whole. Gzipped sitemaps are supported and <sitemapindex> children
+are fetched concurrently.
 """
 import asyncio
+import zlib
 from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
 from xml.etree import ElementTree
 
-import requests
+import httpx
 
 from ....config.logfire_config import get_logger
 
 logger = get_logger(__name__)
 
+SITEMAP_FETCH_TIMEOUT = 30.0
+# Child sitemaps of a sitemap index fetched at the same time
+SITEMAP_MAX_CONCURRENT = 5
+# Nesting limit for sitemap indexes pointing at other indexes
+SITEMAP_MAX_DEPTH = 3
+# The protocol caps sitemaps at 50MB uncompressed; anything far beyond is refused
+SITEMAP_MAX_BYTES = 100 * 1024 * 1024
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass
+class SitemapEntry:
+    """A page URL listed in a sitemap, with its <lastmod> if the sitemap provides one."""
+
+    url: str
+    lastmod: datetime | None = None
+
+
+def parse_lastmod(value: str | None) -> datetime | None:
+    """
+    Parse a W3C datetime from <lastmod> into an aware UTC datetime.
+
+    Date-only values resolve to the end of that day so a page changed later on
+    the same day as the last crawl is not mistaken for unchanged.
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+    if len(value) == 10:  # YYYY-MM-DD
+        parsed += timedelta(days=1)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed.astimezone(UTC)
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+class _SitemapDocumentParser:
+    """Incremental parser for one <urlset> or <sitemapindex> document."""
+
+    def __init__(self):
+        self._parser = ElementTree.XMLPullParser(events=("start", "end"))
+        self._root: ElementTree.Element | None = None
+        self.is_index = False
+        self.entries: list[SitemapEntry] = []
+
+    def feed(self, data: bytes) -> None:
+        self._parser.feed(data)
+        self._drain()
+
+    def close(self) -> None:
+        self._parser.close()
+        self._drain()
+
+    def _drain(self) -> None:
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = elem
+                    self.is_index = _local_name(elem.tag) == "sitemapindex"
+                continue
+
+            if _local_name(elem.tag) not in ("url", "sitemap"):
+                continue
+
+            loc = lastmod = None
+            for child in elem:
+                name = _local_name(child.tag)
+                if name == "loc":
+                    loc = (child.text or "").strip()
+                elif name == "lastmod":
+                    lastmod = child.text
+
+            if loc:
+                self.entries.append(SitemapEntry(url=loc, lastmod=parse_lastmod(lastmod)))
+
+            # Drop parsed entries so memory stays flat regardless of sitemap size
+            if self._root is not None:
+                self._root.clear()
+
 
 class SitemapCrawlStrategy:
     """Strategy for parsing and crawling sitemaps."""
 
-    def parse_sitemap(self, sitemap_url: str, cancellation_check: Callable[[], None] | None = None) -> list[str]:
+    def __init__(
+        self,
+        max_concurrent: int = SITEMAP_MAX_CONCURRENT,
+        max_depth: int = SITEMAP_MAX_DEPTH,
+        timeout: float = SITEMAP_FETCH_TIMEOUT,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_depth = max_depth
+        self.timeout = timeout
+
+    async def parse_sitemap(
+        self, sitemap_url: str, cancellation_check: Callable[[], None] | None = None
+    ) -> list[str]:
         """
         Parse a sitemap and extract URLs with comprehensive error handling.
-        
+
         Args:
             sitemap_url: URL of the sitemap to parse
             cancellation_check: Optional function to check for cancellation
-            
+
         Returns:
             List of URLs extracted from the sitemap
         """
-        urls = []
+        entries = await self.read_sitemap(sitemap_url, cancellation_check)
+        return [entry.url for entry in entries]
+
+    async def read_sitemap(
+        self, sitemap_url: str, cancellation_check: Callable[[], None] | None = None
+    ) -> list[SitemapEntry]:
+        """
+        Read a sitemap or sitemap index and return its page entries.
+
+        Sitemap indexes are followed recursively, fetching child sitemaps
+        concurrently. Each URL is returned once, in sitemap order.
+
+        Args:
+            sitemap_url: URL of the sitemap or sitemap index
+            cancellation_check: Optional function to check for cancellation
+
+        Returns:
+            Page entries with their <lastmod> dates
+        """
+        logger.info(f"Parsing sitemap: {sitemap_url}")
+
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        visited: set[str] = set()
+
+        async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
+            entries = await self._read_recursive(
+                client, sitemap_url, 0, semaphore, visited, cancellation_check
+            )
+
+        seen: set[str] = set()
+        unique_entries = []
+        for entry in entries:
+            if entry.url not in seen:
+                seen.add(entry.url)
+                unique_entries.append(entry)
+
+        logger.info(f"Successfully extracted {len(unique_entries)} URLs from sitemap {sitemap_url}")
+        return unique_entries
+
+    async def _read_recursive(
+        self,
+        client: httpx.AsyncClient,
+        sitemap_url: str,
+        depth: int,
+        semaphore: asyncio.Semaphore,
+        visited: set[str],
+        cancellation_check: Callable[[], None] | None,
+    ) -> list[SitemapEntry]:
+        if sitemap_url in visited:
+            return []
+        visited.add(sitemap_url)
+
+        async with semaphore:
+            parsed = await self._fetch_and_parse(client, sitemap_url, cancellation_check)
+        if parsed is None:
+            return []
+
+        if not parsed.is_index:
+            return parsed.entries
+
+        if depth >= self.max_depth:
+            logger.warning(f"Sitemap index nesting limit reached at {sitemap_url}, skipping its children")
+            return []
+
+        logger.info(f"Sitemap index {sitemap_url} lists {len(parsed.entries)} sitemaps")
+        children = await asyncio.gather(*(
+            self._read_recursive(client, child.url, depth + 1, semaphore, visited, cancellation_check)
+            for child in parsed.entries
+        ))
+        return [entry for child_entries in children for entry in child_entries]
+
+    async def _fetch_and_parse(
+        self,
+        client: httpx.AsyncClient,
+        sitemap_url: str,
+        cancellation_check: Callable[[], None] | None,
+    ) -> _SitemapDocumentParser | None:
+        """Stream one sitemap document through the incremental parser."""
+        parser = _SitemapDocumentParser()
+        decompressor = None
+        received = 0
 
         try:
             # Check for cancellation before making the request
@@ -39,26 +228,45 @@ class SitemapCrawlStrategy:
                     logger.info("Sitemap parsing cancelled by user")
                     raise  # Re-raise to let the caller handle progress reporting
 
-            logger.info(f"Parsing sitemap: {sitemap_url}")
-            resp = requests.get(sitemap_url, timeout=30)
+            async with client.stream("GET", sitemap_url) as resp:
+                if resp.status_code != 200:
+                    logger.error(f"Failed to fetch sitemap {sitemap_url}: HTTP {resp.status_code}")
+                    return None
+
+                first_chunk = True
+                async for chunk in resp.aiter_bytes():
+                    if cancellation_check:
+                        cancellation_check()
 
-            if resp.status_code != 200:
-                logger.error(f"Failed to fetch sitemap: HTTP {resp.status_code}")
-                return urls
+                    # .xml.gz files are served as-is (not via Content-Encoding)
+                    if first_chunk:
+                        first_chunk = False
+                        if chunk.startswith(_GZIP_MAGIC):
+                            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                    if decompressor:
+                        chunk = decompressor.decompress(chunk)
 
-            try:
-                tree = ElementTree.fromstring(resp.content)
-                urls = [loc.text for loc in tree.findall('.//{*}loc') if loc.text]
-                logger.info(f"Successfully extracted {len(urls)} URLs from sitemap")
+                    received += len(chunk)
+                    if received > SITEMAP_MAX_BYTES:
+                        logger.error(f"Sitemap {sitemap_url} exceeds {SITEMAP_MAX_BYTES} bytes, truncating")
+                        break
+                    parser.feed(chunk)
 
-            except ElementTree.ParseError:
-                logger.exception(f"Error parsing sitemap XML from {sitemap_url}")
-            except Exception:
-                logger.exception(f"Unexpected error parsing sitemap from {sitemap_url}")
+            if decompressor and received <= SITEMAP_MAX_BYTES:
+                parser.feed(decompressor.flush())
+            if received <= SITEMAP_MAX_BYTES:
+                parser.close()
 
-        except requests.exceptions.RequestException:
+        except asyncio.CancelledError:
+            raise
+        except ElementTree.ParseError:
+            logger.exception(f"Error parsing sitemap XML from {sitemap_url}")
+        except zlib.error:
+            logger.exception(f"Error decompressing gzipped sitemap from {sitemap_url}")
+        except httpx.HTTPError:
             logger.exception(f"Network error fetching sitemap from {sitemap_url}")
         except Exception:
             logger.exception(f"Unexpected error in sitemap parsing for {sitemap_url}")
 
-        return urls
+        # Entries parsed before an error are still usable
+        return parser
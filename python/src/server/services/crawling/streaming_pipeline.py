@@ -0,0 +1,260 @@
+"""
+Streaming Storage Pipeline
+
+Stores crawled pages while the crawl is still running.
+
+The crawler submits each successful page into a bounded queue. A single consumer
+task groups pages into small micro-batches and runs them through the regular
+chunk -> embed -> store path (and code extraction), then drops them. Peak memory
+is bounded by the queue size instead of the site size, and the first chunks
+become searchable a few seconds into the crawl instead of after it finishes.
+
+When the queue is full, submit() waits, which applies backpressure to the crawler.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from ...config.logfire_config import get_logger, safe_logfire_error, safe_logfire_info
+from .document_storage_operations import DocumentStorageOperations
+
+logger = get_logger(__name__)
+
+DEFAULT_BATCH_PAGES = 10
+DEFAULT_QUEUE_SIZE = 50
+# Flush a partial batch when the crawler has been quiet for this long
+DEFAULT_FLUSH_INTERVAL = 5.0
+
+_END_OF_STREAM = object()
+
+
+class StreamingStoragePipeline:
+    """Bounded-queue pipeline from crawled pages to stored chunks."""
+
+    def __init__(
+        self,
+        doc_storage_ops: DocumentStorageOperations,
+        request: dict[str, Any],
+        source_id: str,
+        source_url: str | None = None,
+        source_display_name: str | None = None,
+        progress_callback: Callable[..., Awaitable[None]] | None = None,
+        cancellation_check: Callable[[], None] | None = None,
+        batch_pages: int = DEFAULT_BATCH_PAGES,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        extract_code_examples: bool = False,
+        provider: str | None = None,
+        embedding_provider: str | None = None,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            doc_storage_ops: Storage operations used for each micro-batch
+            request: The original crawl request
+            source_id: The unique source_id for all pages
+            source_url: Original URL that was crawled
+            source_display_name: Human-readable name for the source
+            progress_callback: Optional callback, called after each stored batch
+            cancellation_check: Optional function to check for cancellation
+            batch_pages: Number of pages stored together
+            queue_size: Maximum number of pages waiting to be stored
+            flush_interval: Seconds of crawler inactivity before a partial batch is stored
+            extract_code_examples: Extract code examples from each stored batch
+            provider: LLM provider for code summaries
+            embedding_provider: Embedding provider override for code examples
+        """
+        self.doc_storage_ops = doc_storage_ops
+        self.request = request
+        self.source_id = source_id
+        self.source_url = source_url
+        self.source_display_name = source_display_name
+        self.progress_callback = progress_callback
+        self.cancellation_check = cancellation_check
+        self.batch_pages = max(1, batch_pages)
+        self.flush_interval = flush_interval
+        self.extract_code_examples = extract_code_examples
+        self.provider = provider
+        self.embedding_provider = embedding_provider
+
+        # Set by the crawler before the first page is submitted
+        self.crawl_type: str | None = None
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+        self._consumer: asyncio.Task | None = None
+        self._error: BaseException | None = None
+        self._source_created = False
+
+        self.pages_submitted = 0
+        self.batches_stored = 0
+        self.chunk_count = 0
+        self.chunks_stored = 0
+        self.chunks_unchanged = 0
+        self.total_word_count = 0
+        self.code_examples_count = 0
+        self.unchanged_urls: list[str] = []
+
+    def start(self) -> None:
+        """Start the consumer task."""
+        if self._consumer is None:
+            self._consumer = asyncio.create_task(self._consume())
+
+    async def submit(self, page: dict[str, Any]) -> None:
+        """
+        Queue a crawled page for storage.
+
+        Raises:
+            The consumer's exception if storage has already failed
+        """
+        if self._error:
+            raise self._error
+        self.start()
+        await self._queue.put(page)
+        self.pages_submitted += 1
+
+    async def finish(self) -> dict[str, Any]:
+        """
+        Store everything still queued and return aggregate storage statistics.
+
+        The result has the same shape as process_and_store_documents.
+        """
+        if self._consumer is not None:
+            if not self._consumer.done():
+                await self._queue.put(_END_OF_STREAM)
+            await self._consumer
+            self._consumer = None
+
+        if self._error:
+            raise self._error
+
+        # Each micro-batch only knew its own word count
+        if self.batches_stored > 1 and self._source_created:
+            await self.doc_storage_ops.update_source_word_count(self.source_id, self.total_word_count)
+
+        safe_logfire_info(
+            f"Streaming storage completed | pages={self.pages_submitted} | batches={self.batches_stored} | "
+            f"chunks_stored={self.chunks_stored} | code_examples={self.code_examples_count}"
+        )
+
+        return {
+            "chunk_count": self.chunk_count,
+            "chunks_stored": self.chunks_stored,
+            "chunks_unchanged": self.chunks_unchanged,
+            "unchanged_urls": self.unchanged_urls,
+            "total_word_count": self.total_word_count,
+            "url_to_full_document": {},
+            "source_id": self.source_id,
+            "code_examples_count": self.code_examples_count,
+        }
+
+    async def abort(self) -> None:
+        """Stop the consumer without storing queued pages."""
+        if self._consumer is not None and not self._consumer.done():
+            self._consumer.cancel()
+            try:
+                await self._consumer
+            except asyncio.CancelledError:
+                pass
+        self._consumer = None
+
+    async def _consume(self) -> None:
+        batch: list[dict[str, Any]] = []
+        try:
+            while True:
+                try:
+                    page = await asyncio.wait_for(self._queue.get(), timeout=self.flush_interval)
+                except TimeoutError:
+                    # Crawler is slow; don't keep already crawled pages waiting
+                    if batch:
+                        await self._store_batch(batch)
+                        batch = []
+                    continue
+
+                if page is _END_OF_STREAM:
+                    break
+
+                batch.append(page)
+                if len(batch) >= self.batch_pages:
+                    await self._store_batch(batch)
+                    batch = []
+
+            if batch:
+                await self._store_batch(batch)
+        except asyncio.CancelledError as e:
+            self._error = e
+            self._drain()
+            raise
+        except Exception as e:
+            logger.error("Streaming storage pipeline failed", exc_info=True)
+            safe_logfire_error(f"Streaming storage pipeline failed | error={str(e)}")
+            self._error = e
+            self._drain()
+
+    def _drain(self) -> None:
+        # Unblock a crawler waiting on a full queue; it will see the error on its next submit
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    async def _store_batch(self, batch: list[dict[str, Any]]) -> None:
+        if self.cancellation_check:
+            self.cancellation_check()
+
+        storage_results = await self.doc_storage_ops.process_and_store_documents(
+            batch,
+            self.request,
+            self.crawl_type or "normal",
+            self.source_id,
+            None,  # Per-batch storage progress would interleave with crawl progress
+            self.cancellation_check,
+            source_url=self.source_url,
+            source_display_name=self.source_display_name,
+            incremental=bool(self.request.get("incremental", False)),
+            create_source=not self._source_created,
+        )
+
+        batch_chunks_stored = storage_results.get("chunks_stored", 0)
+        batch_chunks_unchanged = storage_results.get("chunks_unchanged", 0)
+        if storage_results["chunk_count"] > 0:
+            self._source_created = True
+            # Incremental recrawls may keep every chunk of a changed page as it was
+            if batch_chunks_stored + batch_chunks_unchanged == 0:
+                raise ValueError(
+                    f"Failed to store documents: {storage_results['chunk_count']} chunks processed but 0 stored"
+                )
+
+        self.batches_stored += 1
+        self.chunk_count += storage_results["chunk_count"]
+        self.chunks_stored += batch_chunks_stored
+        self.chunks_unchanged += batch_chunks_unchanged
+        self.total_word_count += storage_results.get("total_word_count", 0)
+        self.unchanged_urls.extend(storage_results.get("unchanged_urls", []))
+
+        if self.extract_code_examples and batch_chunks_stored > 0:
+            # Unchanged pages from an incremental recrawl keep their code examples
+            unchanged = set(storage_results.get("unchanged_urls", []))
+            changed_pages = [doc for doc in batch if doc.get("url") not in unchanged]
+            try:
+                self.code_examples_count += await self.doc_storage_ops.extract_and_store_code_examples(
+                    changed_pages,
+                    storage_results["url_to_full_document"],
+                    self.source_id,
+                    None,
+                    self.cancellation_check,
+                    self.provider,
+                    self.embedding_provider,
+                )
+            except RuntimeError as e:
+                # Same policy as the batch path: keep the crawl going without these code examples
+                logger.error("Code extraction failed for streamed batch, continuing", exc_info=True)
+                safe_logfire_error(f"Code extraction failed for streamed batch | error={e}")
+
+        if self.progress_callback:
+            await self.progress_callback(
+                "document_storage",
+                100,
+                f"Stored {self.pages_submitted - self._queue.qsize()} crawled pages so far",
+                chunks_stored=self.chunks_stored,
+                code_examples_found=self.code_examples_count,
+            )
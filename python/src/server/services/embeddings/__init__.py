@@ -9,14 +9,19 @@ from .contextual_embedding_service import (
     generate_contextual_embeddings_batch,
     process_chunk_with_context,
 )
+from .embedding_cache import get_embedding_cache
 from .embedding_service import create_embedding, create_embeddings_batch, get_openai_client
 from .multi_dimensional_embedding_service import multi_dimensional_embedding_service
+from .query_embedding_cache import get_query_embedding_cache
 
 __all__ = [
     # Embedding functions
     "create_embedding",
     "create_embeddings_batch",
     "get_openai_client",
+    # Embedding cache
+    "get_embedding_cache",
+    "get_query_embedding_cache",
     # Contextual embedding functions
     "generate_contextual_embedding",
     "generate_contextual_embeddings_batch",
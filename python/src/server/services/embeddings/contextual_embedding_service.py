@@ -17,7 +17,7 @@ from ..llm_provider_service import (
     prepare_chat_completion_params,
     requires_max_completion_tokens,
 )
-from ..threading_service import get_threading_service
+from ..threading_service import estimate_tokens, get_threading_service
 
 
 async def generate_contextual_embedding(
@@ -49,13 +49,19 @@ async def generate_contextual_embedding(
     search_logger.debug(f"Using MODEL_CHOICE: {model_choice}")
 
     threading_service = get_threading_service()
+    try:
+        threading_service.configure_provider_rate_limits(
+            await credential_service.get_credentials_by_category("rag_strategy")
+        )
+    except Exception as e:
+        search_logger.warning(f"Failed to load provider rate limits: {e}, keeping current limits")
 
-    # Estimate tokens: document preview (5000 chars ≈ 1250 tokens) + chunk + prompt
-    estimated_tokens = 1250 + len(chunk.split()) + 100  # Rough estimate
+    # Estimate tokens: document preview + chunk + prompt
+    estimated_tokens = estimate_tokens(full_document[:5000]) + estimate_tokens(chunk) + 100
 
     try:
         # Use rate limiting before making the API call
-        async with threading_service.rate_limited_operation(estimated_tokens):
+        async with threading_service.rate_limited_operation(estimated_tokens, provider=provider):
             async with get_llm_client(provider=provider) as client:
                 prompt = f"""<document>
 {full_document[:5000]}
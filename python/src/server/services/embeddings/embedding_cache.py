@@ -0,0 +1,232 @@
+"""
+Embedding Cache
+
+Content-addressed cache that sits in front of the embedding provider adapters.
+
+Vectors are stored in the archon_embedding_cache table keyed by a hash of
+(provider, model, dimensions, text), so recrawling unchanged content never pays
+for the same embedding twice. The table is bounded by EMBEDDING_CACHE_MAX_ENTRIES;
+entries are evicted least-recently-used first based on last_accessed_at.
+
+Database calls run in worker threads so the blocking Supabase client never
+stalls the event loop. Lookups only remember which rows were hit; their
+last_accessed_at is written in one go right before the periodic prune, which
+is the only thing that reads it.
+"""
+
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from ...config.logfire_config import search_logger
+from ..client_manager import get_supabase_client
+
+EMBEDDING_CACHE_TABLE = "archon_embedding_cache"
+DEFAULT_MAX_ENTRIES = 500_000
+
+# PostgREST encodes `in_` filters in the URL, so keep lookups reasonably small
+LOOKUP_CHUNK_SIZE = 100
+# Pruning runs a DELETE ... ORDER BY, so only do it every so often
+PRUNE_INTERVAL_WRITES = 1_000
+# Hit keys remembered for the next LRU touch; further hits are not recorded until then
+MAX_PENDING_TOUCHES = 100_000
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """Hit/miss counters for the embedding cache (process lifetime)."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class EmbeddingCache:
+    """Persistent, size-bounded LRU cache for embedding vectors."""
+
+    def __init__(self, supabase_client=None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._supabase = supabase_client
+        self.max_entries = max_entries
+        self.stats = EmbeddingCacheStats()
+        self._writes_since_prune = 0
+        self._pending_touches: set[str] = set()
+
+    def _get_client(self):
+        if self._supabase is None:
+            self._supabase = get_supabase_client()
+        return self._supabase
+
+    @staticmethod
+    def make_key(provider: str, model: str, dimensions: int | None, text: str) -> str:
+        """Build the cache key for a text under a given provider/model/dimension."""
+        content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        scope = f"{provider.lower()}|{model}|{dimensions or 0}|{content_hash}"
+        return hashlib.sha256(scope.encode("utf-8")).hexdigest()
+
+    async def get_many(
+        self,
+        provider: str,
+        model: str,
+        dimensions: int | None,
+        texts: list[str],
+    ) -> dict[int, list[float]]:
+        """
+        Look up cached embeddings for a list of texts.
+
+        Returns:
+            Mapping of input index -> cached embedding, for hits only
+        """
+        if not texts:
+            return {}
+
+        keys = [self.make_key(provider, model, dimensions, text) for text in texts]
+        unique_keys = list(dict.fromkeys(keys))
+
+        try:
+            found = await asyncio.to_thread(self._select_embeddings, unique_keys)
+        except Exception as e:
+            self.stats.errors += 1
+            search_logger.warning(f"Embedding cache lookup failed, treating batch as misses: {e}")
+            self.stats.misses += len(texts)
+            return {}
+
+        # Remember hit rows so eviction stays least-recently-used (written before the next prune)
+        for key in found:
+            if len(self._pending_touches) >= MAX_PENDING_TOUCHES:
+                break
+            self._pending_touches.add(key)
+
+        hits = {index: found[key] for index, key in enumerate(keys) if key in found}
+        self.stats.hits += len(hits)
+        self.stats.misses += len(texts) - len(hits)
+        return hits
+
+    async def put_many(
+        self,
+        provider: str,
+        model: str,
+        dimensions: int | None,
+        items: list[tuple[str, list[float]]],
+    ) -> None:
+        """Store freshly created embeddings. Failures are logged, never raised."""
+        if not items:
+            return
+
+        now = datetime.now(UTC).isoformat()
+        rows_by_key: dict[str, dict[str, Any]] = {}
+        for text, embedding in items:
+            key = self.make_key(provider, model, dimensions, text)
+            rows_by_key[key] = {
+                "cache_key": key,
+                "provider": provider.lower(),
+                "model": model,
+                "dimensions": dimensions or len(embedding),
+                "embedding": embedding,
+                "last_accessed_at": now,
+            }
+        rows = list(rows_by_key.values())
+
+        try:
+            await asyncio.to_thread(self._upsert_rows, rows)
+        except Exception as e:
+            self.stats.errors += 1
+            search_logger.warning(f"Failed to write {len(rows)} embeddings to cache: {e}")
+            return
+
+        self.stats.writes += len(rows)
+        self._writes_since_prune += len(rows)
+        if self._writes_since_prune >= PRUNE_INTERVAL_WRITES:
+            self._writes_since_prune = 0
+            await self.prune()
+
+    async def prune(self) -> int:
+        """Record pending LRU touches, then evict least-recently-used entries beyond max_entries."""
+        touched = list(self._pending_touches)
+        self._pending_touches.clear()
+        try:
+            if touched:
+                await asyncio.to_thread(self._touch_rows, touched)
+            evicted = await asyncio.to_thread(self._prune_rows)
+        except Exception as e:
+            self.stats.errors += 1
+            search_logger.warning(f"Embedding cache prune failed: {e}")
+            return 0
+
+        if evicted:
+            self.stats.evictions += evicted
+            search_logger.info(f"Evicted {evicted} entries from embedding cache")
+        return evicted
+
+    def _select_embeddings(self, keys: list[str]) -> dict[str, list[float]]:
+        client = self._get_client()
+        found: dict[str, list[float]] = {}
+        for i in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+            response = (
+                client.table(EMBEDDING_CACHE_TABLE)
+                .select("cache_key, embedding")
+                .in_("cache_key", keys[i : i + LOOKUP_CHUNK_SIZE])
+                .execute()
+            )
+            for row in response.data or []:
+                embedding = row.get("embedding")
+                if isinstance(embedding, list) and embedding:
+                    found[row["cache_key"]] = embedding
+        return found
+
+    def _upsert_rows(self, rows: list[dict[str, Any]]) -> None:
+        client = self._get_client()
+        for i in range(0, len(rows), LOOKUP_CHUNK_SIZE):
+            client.table(EMBEDDING_CACHE_TABLE).upsert(
+                rows[i : i + LOOKUP_CHUNK_SIZE], on_conflict="cache_key"
+            ).execute()
+
+    def _touch_rows(self, keys: list[str]) -> None:
+        client = self._get_client()
+        now = datetime.now(UTC).isoformat()
+        for i in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+            client.table(EMBEDDING_CACHE_TABLE).update({"last_accessed_at": now}).in_(
+                "cache_key", keys[i : i + LOOKUP_CHUNK_SIZE]
+            ).execute()
+
+    def _prune_rows(self) -> int:
+        response = (
+            self._get_client()
+            .rpc("prune_archon_embedding_cache", {"max_entries": self.max_entries})
+            .execute()
+        )
+        return response.data if isinstance(response.data, int) else 0
+
+    def get_stats(self) -> dict[str, Any]:
+        return {"max_entries": self.max_entries, **self.stats.to_dict()}
+
+
+_embedding_cache: EmbeddingCache | None = None
+
+
+def get_embedding_cache(max_entries: int | None = None) -> EmbeddingCache:
+    """Get the process-wide embedding cache, updating its size bound if given."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache(max_entries=max_entries or DEFAULT_MAX_ENTRIES)
+    elif max_entries:
+        _embedding_cache.max_entries = max_entries
+    return _embedding_cache
@@ -7,6 +7,7 @@ Handles all OpenAI embedding operations with proper rate limiting and error hand
 import asyncio
 import inspect
 import os
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Any
@@ -18,7 +19,8 @@ import openai
 from ...config.logfire_config import safe_span, search_logger
 from ..credential_service import credential_service
 from ..llm_provider_service import get_embedding_model, get_llm_client
-from ..threading_service import get_threading_service
+from ..threading_service import estimate_tokens, get_threading_service
+from .embedding_cache import DEFAULT_MAX_ENTRIES, get_embedding_cache
 from .embedding_exceptions import (
     EmbeddingAPIError,
     EmbeddingError,
@@ -224,6 +226,84 @@ def _get_embedding_adapter(provider: str, client: Any) -> EmbeddingProviderAdapt
     return OpenAICompatibleEmbeddingAdapter(client)
 
 
+DEFAULT_MAX_IN_FLIGHT = 4
+MAX_IN_FLIGHT_LIMIT = 16
+MIN_ADAPTIVE_BATCH_SIZE = 8
+TARGET_BATCH_LATENCY_SECONDS = 10.0
+# Estimated tokens per request; stays under OpenAI's 300k per-request limit and
+# the rate limiter's per-minute token budget so one batch can always be admitted
+MAX_BATCH_TOKENS = 100_000
+
+
+def _retry_after_seconds(error: Exception) -> float | None:
+    """Read the Retry-After header from a provider 429, if present."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        return None
+    try:
+        value = headers.get("retry-after")
+        return float(value) if isinstance(value, str | int | float) else None
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveBatchSizer:
+    """
+    Adjusts embedding sub-batch size from observed provider behaviour.
+
+    Starts at the configured EMBEDDING_BATCH_SIZE (which is also the ceiling),
+    halves on rate limits, shrinks when requests are slow and grows back when
+    they are fast.
+    """
+
+    def __init__(self, max_size: int, target_latency: float = TARGET_BATCH_LATENCY_SECONDS):
+        self.max_size = max(1, max_size)
+        self.min_size = min(MIN_ADAPTIVE_BATCH_SIZE, self.max_size)
+        self.target_latency = target_latency
+        self.batch_size = self.max_size
+
+    def record_success(self, batch_size: int, latency: float) -> None:
+        if latency > self.target_latency:
+            self.batch_size = max(self.min_size, int(batch_size * 0.75))
+        elif latency < self.target_latency / 2 and batch_size >= self.batch_size:
+            self.batch_size = min(self.max_size, int(self.batch_size * 1.25) + 1)
+
+    def record_rate_limit(self) -> None:
+        self.batch_size = max(self.min_size, self.batch_size // 2)
+
+
+_batch_sizers: dict[tuple[str, str], AdaptiveBatchSizer] = {}
+
+
+def get_batch_sizer(provider: str, model: str, max_size: int) -> AdaptiveBatchSizer:
+    """Get the batch sizer for a provider/model, resetting it when the configured size changes."""
+    key = (provider, model)
+    sizer = _batch_sizers.get(key)
+    if sizer is None or sizer.max_size != max(1, max_size):
+        sizer = AdaptiveBatchSizer(max_size)
+        _batch_sizers[key] = sizer
+    return sizer
+
+
+def reset_batch_sizers() -> None:
+    _batch_sizers.clear()
+
+
+def _next_batch_end(texts: list[str], start: int, batch_size: int, max_tokens: int) -> tuple[int, int]:
+    """Return the end index and estimated tokens of the next sub-batch, bounded by count and tokens."""
+    end = start
+    batch_tokens = 0
+    limit = min(len(texts), start + batch_size)
+    while end < limit:
+        text_tokens = estimate_tokens(texts[end])
+        if end > start and batch_tokens + text_tokens > max_tokens:
+            break
+        batch_tokens += text_tokens
+        end += 1
+    return end, batch_tokens
+
+
 async def _maybe_await(value: Any) -> Any:
     """Await the value if it is awaitable, otherwise return as-is."""
 
@@ -344,6 +424,11 @@ async def create_embeddings_batch(
             )
 
     texts = validated_texts
+    total_texts = len(texts)
+    cache_hits = 0
+    # Texts not yet handed to the provider, plus sub-batches currently in flight
+    next_index = 0
+    in_flight_batches: dict[int, list[str]] = {}
     threading_service = get_threading_service()
 
     with safe_span(
@@ -364,103 +449,166 @@ async def create_embeddings_batch(
                 raise ValueError("No embedding provider configured. Please set EMBEDDING_PROVIDER environment variable.")
 
             search_logger.info(f"Using embedding provider: '{embedding_provider}' (from EMBEDDING_PROVIDER setting)")
-            async with get_llm_client(provider=embedding_provider, use_embedding_provider=True) as client:
-                # Load batch size and dimensions from settings
-                try:
-                    rag_settings = await _maybe_await(
-                        credential_service.get_credentials_by_category("rag_strategy")
+
+            # Load batch size, concurrency, dimensions, cache and provider rate limit settings
+            try:
+                rag_settings = await _maybe_await(
+                    credential_service.get_credentials_by_category("rag_strategy")
+                )
+                batch_size = int(rag_settings.get("EMBEDDING_BATCH_SIZE", "100"))
+                # Clamp concurrent sub-batches to sane bounds
+                raw_max_in_flight = int(rag_settings.get("EMBEDDING_MAX_IN_FLIGHT", str(DEFAULT_MAX_IN_FLIGHT)))
+                max_in_flight = min(MAX_IN_FLIGHT_LIMIT, max(1, raw_max_in_flight))
+                if max_in_flight != raw_max_in_flight:
+                    search_logger.warning(
+                        f"Invalid EMBEDDING_MAX_IN_FLIGHT={raw_max_in_flight}, clamped to {max_in_flight}"
                     )
-                    batch_size = int(rag_settings.get("EMBEDDING_BATCH_SIZE", "100"))
-                    embedding_dimensions = int(rag_settings.get("EMBEDDING_DIMENSIONS", "1536"))
-                except Exception as e:
-                    search_logger.warning(f"Failed to load embedding settings: {e}, using defaults")
-                    batch_size = 100
-                    embedding_dimensions = 1536
+                embedding_dimensions = int(rag_settings.get("EMBEDDING_DIMENSIONS", "1536"))
+                use_cache = str(rag_settings.get("EMBEDDING_CACHE_ENABLED", "true")).lower() == "true"
+                cache_max_entries = int(
+                    rag_settings.get("EMBEDDING_CACHE_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES))
+                )
+                threading_service.configure_provider_rate_limits(rag_settings)
+            except Exception as e:
+                search_logger.warning(f"Failed to load embedding settings: {e}, using defaults")
+                batch_size = 100
+                max_in_flight = DEFAULT_MAX_IN_FLIGHT
+                embedding_dimensions = 1536
+                use_cache = True
+                cache_max_entries = DEFAULT_MAX_ENTRIES
+
+            dimensions_to_use = embedding_dimensions if embedding_dimensions > 0 else None
+            embedding_model = await get_embedding_model(provider=embedding_provider)
+
+            # Serve unchanged texts from the content-addressed cache; only misses hit the provider
+            embedding_cache = get_embedding_cache(cache_max_entries) if use_cache else None
+            if embedding_cache:
+                cached = await embedding_cache.get_many(
+                    embedding_provider, embedding_model, dimensions_to_use, texts
+                )
+                for index, vector in cached.items():
+                    result.add_success(vector, texts[index])
+                cache_hits = len(cached)
+                texts = [text for index, text in enumerate(texts) if index not in cached]
+                span.set_attribute("cache_hits", cache_hits)
+
+                if not texts:
+                    search_logger.info(f"All {cache_hits} embeddings served from cache")
+                    span.set_attribute("embeddings_created", result.success_count)
+                    span.set_attribute("embeddings_failed", result.failure_count)
+                    span.set_attribute("success", not result.has_failures)
+                    return result
 
+            async with get_llm_client(provider=embedding_provider, use_embedding_provider=True) as client:
                 total_tokens_used = 0
                 adapter = _get_embedding_adapter(embedding_provider, client)
-                dimensions_to_use = embedding_dimensions if embedding_dimensions > 0 else None
+                batch_sizer = get_batch_sizer(embedding_provider, embedding_model, batch_size)
+                batch_count = 0
+                quota_exhausted = False
+
+                # Create rate limit progress callback if we have a progress callback
+                rate_limit_callback = None
+                if progress_callback:
+                    async def rate_limit_callback(data: dict):
+                        # Send heartbeat during rate limit wait
+                        processed = result.success_count + result.failure_count
+                        message = f"Rate limited: {data.get('message', 'Waiting...')}"
+                        await progress_callback(message, (processed / total_texts) * 100)
+
+                def take_next_batch() -> tuple[int, list[str], int] | None:
+                    # Runs without awaiting, so concurrent workers never take the same texts
+                    nonlocal next_index, batch_count
+                    if quota_exhausted or next_index >= len(texts):
+                        return None
+                    end, batch_tokens = _next_batch_end(
+                        texts, next_index, batch_sizer.batch_size, MAX_BATCH_TOKENS
+                    )
+                    batch = texts[next_index:end]
+                    next_index = end
+                    batch_index = batch_count
+                    batch_count += 1
+                    in_flight_batches[batch_index] = batch
+                    return batch_index, batch, batch_tokens
 
-                for i in range(0, len(texts), batch_size):
-                    batch = texts[i : i + batch_size]
-                    batch_index = i // batch_size
+                async def embed_batch(batch_index: int, batch: list[str], batch_tokens: int) -> None:
+                    nonlocal total_tokens_used, quota_exhausted
 
                     try:
-                        # Estimate tokens for this batch
-                        batch_tokens = sum(len(text.split()) for text in batch) * 1.3
                         total_tokens_used += batch_tokens
 
-                        # Create rate limit progress callback if we have a progress callback
-                        rate_limit_callback = None
-                        if progress_callback:
-                            async def rate_limit_callback(data: dict):
-                                # Send heartbeat during rate limit wait
-                                processed = result.success_count + result.failure_count
-                                message = f"Rate limited: {data.get('message', 'Waiting...')}"
-                                await progress_callback(message, (processed / len(texts)) * 100)
-
                         # Rate limit each batch
-                        async with threading_service.rate_limited_operation(batch_tokens, rate_limit_callback):
+                        async with threading_service.rate_limited_operation(
+                            batch_tokens,
+                            rate_limit_callback,
+                            provider=embedding_provider,
+                            model=embedding_model,
+                        ):
                             retry_count = 0
                             max_retries = 3
 
                             while retry_count < max_retries:
                                 try:
                                     # Create embeddings for this batch
-                                    embedding_model = await get_embedding_model(provider=embedding_provider)
+                                    started_at = time.monotonic()
                                     embeddings = await adapter.create_embeddings(
                                         batch,
                                         embedding_model,
                                         dimensions=dimensions_to_use,
                                     )
+                                    batch_sizer.record_success(len(batch), time.monotonic() - started_at)
 
                                     for text, vector in zip(batch, embeddings, strict=False):
                                         result.add_success(vector, text)
 
+                                    if embedding_cache:
+                                        await embedding_cache.put_many(
+                                            embedding_provider,
+                                            embedding_model,
+                                            dimensions_to_use,
+                                            list(zip(batch, embeddings, strict=False)),
+                                        )
+
                                     break  # Success, exit retry loop
 
                                 except openai.RateLimitError as e:
                                     error_message = str(e)
                                     if "insufficient_quota" in error_message:
-                                        # Quota exhausted is critical - stop everything
-                                        tokens_so_far = total_tokens_used - batch_tokens
-                                        cost_so_far = (tokens_so_far / 1_000_000) * 0.02
-
+                                        # Quota exhausted is critical - stop taking new batches
+                                        quota_exhausted = True
                                         search_logger.error(
                                             f"⚠️ QUOTA EXHAUSTED at batch {batch_index}! "
                                             f"Processed {result.success_count} texts successfully.",
                                             exc_info=True,
                                         )
-
-                                        # Add remaining texts as failures
-                                        for text in texts[i:]:
+                                        for text in batch:
                                             result.add_failure(
                                                 text,
                                                 EmbeddingQuotaExhaustedError(
                                                     "OpenAI quota exhausted",
-                                                    tokens_used=tokens_so_far,
+                                                    tokens_used=total_tokens_used - batch_tokens,
                                                 ),
                                                 batch_index,
                                             )
+                                        return
 
-                                        # Return what we have so far
-                                        span.set_attribute("quota_exhausted", True)
-                                        span.set_attribute("partial_success", True)
-                                        return result
-
+                                    # Regular rate limit - pause this provider's bucket, shrink future batches and retry
+                                    threading_service.record_rate_limited(
+                                        embedding_provider, embedding_model, _retry_after_seconds(e)
+                                    )
+                                    batch_sizer.record_rate_limit()
+                                    retry_count += 1
+                                    if retry_count < max_retries:
+                                        wait_time = 2**retry_count
+                                        search_logger.warning(
+                                            f"Rate limit hit for batch {batch_index}, "
+                                            f"waiting {wait_time}s before retry {retry_count}/{max_retries}"
+                                        )
+                                        await asyncio.sleep(wait_time)
                                     else:
-                                        # Regular rate limit - retry
-                                        retry_count += 1
-                                        if retry_count < max_retries:
-                                            wait_time = 2**retry_count
-                                            search_logger.warning(
-                                                f"Rate limit hit for batch {batch_index}, "
-                                                f"waiting {wait_time}s before retry {retry_count}/{max_retries}"
-                                            )
-                                            await asyncio.sleep(wait_time)
-                                        else:
-                                            raise  # Will be caught by outer try
+                                        raise  # Will be caught by outer try
                                 except EmbeddingRateLimitError as e:
+                                    threading_service.record_rate_limited(embedding_provider, embedding_model)
+                                    batch_sizer.record_rate_limit()
                                     retry_count += 1
                                     if retry_count < max_retries:
                                         wait_time = 2**retry_count
@@ -488,24 +636,56 @@ async def create_embeddings_batch(
                                     batch_index,
                                 )
 
-                    # Progress reporting
-                    if progress_callback:
-                        processed = result.success_count + result.failure_count
-                        progress = (processed / len(texts)) * 100
-
-                        message = f"Processed {processed}/{len(texts)} texts"
-                        if result.has_failures:
-                            message += f" ({result.failure_count} failed)"
-
-                        await progress_callback(message, progress)
+                async def embedding_worker() -> None:
+                    while (next_batch := take_next_batch()) is not None:
+                        batch_index, batch, batch_tokens = next_batch
+                        await embed_batch(batch_index, batch, batch_tokens)
+                        del in_flight_batches[batch_index]
 
-                    # Yield control
-                    await asyncio.sleep(0.01)
+                        # Progress reporting
+                        if progress_callback:
+                            processed = result.success_count + result.failure_count
+                            progress = (processed / total_texts) * 100
+
+                            message = f"Processed {processed}/{total_texts} texts"
+                            if result.has_failures:
+                                message += f" ({result.failure_count} failed)"
+
+                            await progress_callback(message, progress)
+
+                        # Yield control
+                        await asyncio.sleep(0.01)
+
+                # Sub-batches run concurrently; the rate limiter still gates each request
+                estimated_batches = -(-len(texts) // max(1, batch_sizer.batch_size))
+                worker_count = max(1, min(max_in_flight, estimated_batches))
+                async with asyncio.TaskGroup() as task_group:
+                    for _ in range(worker_count):
+                        task_group.create_task(embedding_worker())
+
+                if quota_exhausted:
+                    # Texts that were never sent fail with the same quota error
+                    for text in texts[next_index:]:
+                        result.add_failure(
+                            text,
+                            EmbeddingQuotaExhaustedError(
+                                "OpenAI quota exhausted",
+                                tokens_used=total_tokens_used,
+                            ),
+                            batch_count,
+                        )
+                    next_index = len(texts)
+
+                    span.set_attribute("quota_exhausted", True)
+                    span.set_attribute("partial_success", True)
+                    return result
 
                 span.set_attribute("embeddings_created", result.success_count)
                 span.set_attribute("embeddings_failed", result.failure_count)
                 span.set_attribute("success", not result.has_failures)
                 span.set_attribute("total_tokens_used", total_tokens_used)
+                span.set_attribute("batch_count", batch_count)
+                span.set_attribute("final_batch_size", batch_sizer.batch_size)
 
                 return result
 
@@ -514,9 +694,9 @@ async def create_embeddings_batch(
             span.set_attribute("catastrophic_failure", True)
             search_logger.error(f"Catastrophic failure in batch embedding: {e}", exc_info=True)
 
-            # Mark remaining texts as failed
-            processed_count = result.success_count + result.failure_count
-            for text in texts[processed_count:]:
+            # Mark texts that were in flight or never sent as failed
+            unfinished_texts = [text for batch in in_flight_batches.values() for text in batch]
+            for text in unfinished_texts + texts[next_index:]:
                 result.add_failure(
                     text, EmbeddingAPIError(f"Catastrophic failure: {str(e)}", original_error=e)
                 )
@@ -0,0 +1,152 @@
+"""
+Query Embedding Cache
+
+In-process LRU cache with TTL for search query embeddings.
+
+MCP clients often repeat the same query many times in a session. Each repeat
+would otherwise go through the full embedding path (credential lookups, client
+construction, rate limiting and a provider round trip). Entries are keyed by
+normalized query text plus the embedding provider, model and dimensions, so a
+provider or model change never serves stale vectors.
+"""
+
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from ...config.logfire_config import search_logger
+from ..credential_service import credential_service
+from ..llm_provider_service import get_embedding_model
+
+DEFAULT_MAX_ENTRIES = 1_000
+DEFAULT_TTL_SECONDS = 3_600.0
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different spellings share a cache entry."""
+    return _WHITESPACE_RE.sub(" ", query).strip().lower()
+
+
+@dataclass
+class QueryEmbeddingCacheStats:
+    """Counters for the query embedding cache (process lifetime)."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class QueryEmbeddingCache:
+    """Bounded LRU cache of query embeddings with per-entry expiry."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = QueryEmbeddingCacheStats()
+        self._entries: OrderedDict[tuple[str, str, int, str], tuple[float, list[float]]] = OrderedDict()
+
+    def get(self, key: tuple[str, str, int, str]) -> list[float] | None:
+        """Return a live cached embedding and mark it most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, embedding = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return embedding
+
+    def put(self, key: tuple[str, str, int, str], embedding: list[float]) -> None:
+        """Store an embedding, evicting the least recently used entries beyond max_entries."""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, embedding)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def _make_key(self, query: str) -> tuple[str, str, int, str]:
+        rag_settings = await credential_service.get_credentials_by_category("rag_strategy")
+        provider_name = (rag_settings.get("EMBEDDING_PROVIDER") or "openai").lower()
+        model = await get_embedding_model()
+        dimensions = int(rag_settings.get("EMBEDDING_DIMENSIONS", "0") or 0)
+        return (provider_name, model, dimensions, normalize_query(query))
+
+    async def get_or_create(
+        self,
+        query: str,
+        create_fn: Callable[[str], Awaitable[list[float]]],
+    ) -> list[float]:
+        """
+        Return the embedding for a query, calling create_fn only on a cache miss.
+
+        Args:
+            query: Search query text
+            create_fn: Embedding function used on a miss (normally create_embedding)
+
+        Returns:
+            The query embedding
+        """
+        try:
+            key = await self._make_key(query)
+        except Exception as e:
+            # Without a reliable key we can't safely reuse vectors; embed directly
+            search_logger.warning(f"Query embedding cache unavailable, embedding directly: {e}")
+            return await create_fn(query)
+
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        embedding = await create_fn(query)
+        if embedding:
+            self.put(key, embedding)
+        return embedding
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            **self.stats.to_dict(),
+        }
+
+
+_query_embedding_cache: QueryEmbeddingCache | None = None
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Get the process-wide query embedding cache."""
+    global _query_embedding_cache
+    if _query_embedding_cache is None:
+        _query_embedding_cache = QueryEmbeddingCache()
+    return _query_embedding_cache
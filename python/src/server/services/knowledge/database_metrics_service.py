@@ -2,13 +2,31 @@
 Database Metrics Service
 
 Handles retrieval of database statistics and metrics.
+
+Metrics never read row payloads: totals come from archon_source_stats, sizes and
+row estimates from the Postgres catalogs (get_archon_database_metrics), and the
+result is cached for a few seconds since the metrics endpoint is polled.
 """
 
+import asyncio
+import time
 from datetime import datetime
 from typing import Any
 
 from ...config.logfire_config import safe_logfire_error, safe_logfire_info
 
+# How long one get_archon_database_metrics() result is served from cache
+METRICS_CACHE_TTL_SECONDS = 30.0
+
+# (fetched_at, payload) shared by all service instances
+_metrics_cache: tuple[float, dict[str, Any]] | None = None
+
+
+def clear_metrics_cache() -> None:
+    """Drop the cached metrics so the next request reads them fresh."""
+    global _metrics_cache
+    _metrics_cache = None
+
 
 class DatabaseMetricsService:
     """
@@ -34,31 +52,20 @@ class DatabaseMetricsService:
         try:
             safe_logfire_info("Getting database metrics")
 
-            # Get counts from various tables
-            metrics = {}
-
-            # Sources count
-            sources_result = (
-                self.supabase.table("archon_sources").select("*", count="exact").execute()
-            )
-            metrics["sources_count"] = sources_result.count if sources_result.count else 0
-
-            # Crawled pages count
-            pages_result = (
-                self.supabase.table("archon_crawled_pages").select("*", count="exact").execute()
-            )
-            metrics["pages_count"] = pages_result.count if pages_result.count else 0
-
-            # Code examples count
-            try:
-                code_examples_result = (
-                    self.supabase.table("archon_code_examples").select("*", count="exact").execute()
-                )
-                metrics["code_examples_count"] = (
-                    code_examples_result.count if code_examples_result.count else 0
-                )
-            except:
-                metrics["code_examples_count"] = 0
+            payload = await self._get_database_metrics()
+            if payload is not None:
+                totals = payload.get("totals") or {}
+                metrics = {
+                    "sources_count": totals.get("sources", 0),
+                    "pages_count": totals.get("chunks", 0),
+                    "code_examples_count": totals.get("code_examples", 0),
+                    "stored_pages_count": totals.get("pages", 0),
+                    "database_size_bytes": payload.get("database_bytes"),
+                    "tables": payload.get("tables") or {},
+                    "indexes": payload.get("indexes") or [],
+                }
+            else:
+                metrics = await self._get_head_only_counts()
 
             # Add timestamp
             metrics["timestamp"] = datetime.now().isoformat()
@@ -90,17 +97,23 @@ class DatabaseMetricsService:
         try:
             stats = {}
 
-            # Get knowledge type distribution
-            knowledge_types_result = (
-                self.supabase.table("archon_sources").select("metadata->knowledge_type").execute()
-            )
+            payload = await self._get_database_metrics()
+            if payload is not None:
+                stats["knowledge_type_distribution"] = payload.get("knowledge_types") or {}
+                stats["database_size_bytes"] = payload.get("database_bytes")
+                stats["tables"] = payload.get("tables") or {}
+            else:
+                # Get knowledge type distribution
+                knowledge_types_result = (
+                    self.supabase.table("archon_sources").select("metadata->knowledge_type").execute()
+                )
 
-            if knowledge_types_result.data:
-                type_counts = {}
-                for row in knowledge_types_result.data:
-                    ktype = row.get("knowledge_type", "unknown")
-                    type_counts[ktype] = type_counts.get(ktype, 0) + 1
-                stats["knowledge_type_distribution"] = type_counts
+                if knowledge_types_result.data:
+                    type_counts = {}
+                    for row in knowledge_types_result.data:
+                        ktype = row.get("knowledge_type", "unknown")
+                        type_counts[ktype] = type_counts.get(ktype, 0) + 1
+                    stats["knowledge_type_distribution"] = type_counts
 
             # Get recent activity
             recent_sources = (
@@ -121,3 +134,48 @@ class DatabaseMetricsService:
         except Exception as e:
             safe_logfire_error(f"Failed to get storage statistics | error={str(e)}")
             return {}
+
+    async def _get_database_metrics(self) -> dict[str, Any] | None:
+        """
+        Get the get_archon_database_metrics() payload, cached for METRICS_CACHE_TTL_SECONDS.
+
+        Returns:
+            The payload, or None if the function is unavailable (migration 023 not applied)
+        """
+        global _metrics_cache
+        if _metrics_cache is not None and time.time() - _metrics_cache[0] < METRICS_CACHE_TTL_SECONDS:
+            return _metrics_cache[1]
+
+        try:
+            result = await asyncio.to_thread(lambda: self.supabase.rpc("get_archon_database_metrics").execute())
+        except Exception as e:
+            safe_logfire_error(f"get_archon_database_metrics unavailable, using head-only counts | error={str(e)}")
+            return None
+
+        payload = result.data if isinstance(result.data, dict) else None
+        if payload is not None:
+            _metrics_cache = (time.time(), payload)
+        return payload
+
+    async def _get_head_only_counts(self) -> dict[str, Any]:
+        """
+        Count rows without fetching them: exact for sources, planner estimates for the large tables.
+
+        Returns:
+            Dictionary with sources_count, pages_count and code_examples_count
+        """
+
+        def count(table: str, column: str, method: str) -> int:
+            try:
+                result = self.supabase.table(table).select(column, count=method, head=True).execute()
+                return result.count or 0
+            except Exception as e:
+                safe_logfire_error(f"Failed to count {table} | error={str(e)}")
+                return 0
+
+        sources, pages, code_examples = await asyncio.gather(
+            asyncio.to_thread(count, "archon_sources", "source_id", "exact"),
+            asyncio.to_thread(count, "archon_crawled_pages", "id", "estimated"),
+            asyncio.to_thread(count, "archon_code_examples", "id", "estimated"),
+        )
+        return {"sources_count": sources, "pages_count": pages, "code_examples_count": code_examples}
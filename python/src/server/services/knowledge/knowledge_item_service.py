@@ -7,6 +7,7 @@ Handles all knowledge item CRUD operations and data transformations.
 from typing import Any
 
 from ...config.logfire_config import safe_logfire_error, safe_logfire_info
+from .source_stats import SOURCE_STATS_EMBED, get_source_stats
 
 
 class KnowledgeItemService:
@@ -44,7 +45,8 @@ class KnowledgeItemService:
         """
         try:
             # Build the query with filters at database level for better performance
-            query = self.supabase.from_("archon_sources").select("*")
+            # Per-source counts come from archon_source_stats in the same query
+            query = self.supabase.from_("archon_sources").select(f"*, {SOURCE_STATS_EMBED}")
 
             # Apply knowledge type filter at database level if provided
             if knowledge_type:
@@ -84,57 +86,12 @@ class KnowledgeItemService:
             result = query.execute()
             sources = result.data if result.data else []
 
-            # Get source IDs for batch queries
-            source_ids = [source["source_id"] for source in sources]
-
-            # Debug log source IDs
-            safe_logfire_info(f"Source IDs for batch query: {source_ids}")
-
-            # Batch fetch related data to avoid N+1 queries
-            first_urls = {}
-            code_example_counts = {}
-            chunk_counts = {}
-
-            if source_ids:
-                # Batch fetch first URLs
-                urls_result = (
-                    self.supabase.from_("archon_crawled_pages")
-                    .select("source_id, url")
-                    .in_("source_id", source_ids)
-                    .execute()
-                )
-
-                # Group URLs by source_id (take first one for each)
-                for item in urls_result.data or []:
-                    if item["source_id"] not in first_urls:
-                        first_urls[item["source_id"]] = item["url"]
-
-                # Get code example counts per source - NO CONTENT, just counts!
-                # Fetch counts individually for each source
-                for source_id in source_ids:
-                    count_result = (
-                        self.supabase.from_("archon_code_examples")
-                        .select("id", count="exact", head=True)
-                        .eq("source_id", source_id)
-                        .execute()
-                    )
-                    code_example_counts[source_id] = (
-                        count_result.count if hasattr(count_result, "count") else 0
-                    )
-
-                # Ensure all sources have a count (default to 0)
-                for source_id in source_ids:
-                    if source_id not in code_example_counts:
-                        code_example_counts[source_id] = 0
-                    chunk_counts[source_id] = 0  # Default to 0 to avoid timeout
-
-                safe_logfire_info(f"Code example counts: {code_example_counts}")
-
-            # Transform sources to items with batched data
+            # Transform sources to items
             items = []
             for source in sources:
                 source_id = source["source_id"]
                 source_metadata = source.get("metadata", {})
+                stats = get_source_stats(source)
 
                 # Use the original source_url from the source record (the URL the user entered)
                 # Fall back to first crawled page URL, then to source:// format as last resort
@@ -142,10 +99,10 @@ class KnowledgeItemService:
                 if source_url:
                     display_url = source_url
                 else:
-                    display_url = first_urls.get(source_id, f"source://{source_id}")
-                
-                code_examples_count = code_example_counts.get(source_id, 0)
-                chunks_count = chunk_counts.get(source_id, 0)
+                    display_url = stats["first_url"] or f"source://{source_id}"
+
+                code_examples_count = stats["code_example_count"]
+                chunks_count = stats["chunk_count"]
 
                 # Determine source type - use display_url for type detection
                 source_type = self._determine_source_type(source_metadata, display_url)
@@ -171,11 +128,12 @@ class KnowledgeItemService:
                         "word_count": source.get("total_word_count", 0),
                         "estimated_pages": round(source.get("total_word_count", 0) / 250, 1),
                         "pages_tooltip": f"{round(source.get('total_word_count', 0) / 250, 1)} pages (≈ {source.get('total_word_count', 0):,} words)",
-                        "last_scraped": source.get("updated_at"),
+                        "last_scraped": stats["last_crawled_at"] or source.get("updated_at"),
                         "file_name": source_metadata.get("file_name"),
                         "file_type": source_metadata.get("file_type"),
                         "update_frequency": source_metadata.get("update_frequency", 7),
                         "code_examples_count": code_examples_count,
+                        "page_count": stats["page_count"],
                         **source_metadata,
                     },
                     "created_at": source.get("created_at"),
@@ -215,7 +173,7 @@ class KnowledgeItemService:
             # Get the source record
             result = (
                 self.supabase.from_("archon_sources")
-                .select("*")
+                .select(f"*, {SOURCE_STATS_EMBED}")
                 .eq("source_id", source_id)
                 .single()
                 .execute()
@@ -359,9 +317,10 @@ class KnowledgeItemService:
         """
         source_metadata = source.get("metadata", {})
         source_id = source["source_id"]
+        stats = get_source_stats(source)
 
         # Get first page URL
-        first_page_url = await self._get_first_page_url(source_id)
+        first_page_url = stats["first_url"] or f"source://{source_id}"
 
         # Determine source type
         source_type = self._determine_source_type(source_metadata, first_page_url)
@@ -383,7 +342,7 @@ class KnowledgeItemService:
                 "source_type": source_type,  # This should be the correctly determined source_type
                 "status": "active",
                 "description": source_metadata.get("description", source.get("summary", "")),
-                "chunks_count": await self._get_chunks_count(source_id),  # Get actual chunk count
+                "chunks_count": stats["chunk_count"],
                 "word_count": source.get("total_words", 0),
                 "estimated_pages": round(
                     source.get("total_words", 0) / 250, 1
@@ -399,25 +358,6 @@ class KnowledgeItemService:
             "updated_at": source.get("updated_at"),
         }
 
-    async def _get_first_page_url(self, source_id: str) -> str:
-        """Get the first page URL for a source."""
-        try:
-            pages_response = (
-                self.supabase.from_("archon_crawled_pages")
-                .select("url")
-                .eq("source_id", source_id)
-                .limit(1)
-                .execute()
-            )
-
-            if pages_response.data:
-                return pages_response.data[0].get("url", f"source://{source_id}")
-
-        except Exception:
-            pass
-
-        return f"source://{source_id}"
-
     async def _get_code_examples(self, source_id: str) -> list[dict[str, Any]]:
         """Get code examples for a source."""
         try:
@@ -458,22 +398,3 @@ class KnowledgeItemService:
     ) -> list[dict[str, Any]]:
         """Filter items by knowledge type."""
         return [item for item in items if item["metadata"].get("knowledge_type") == knowledge_type]
-
-    async def _get_chunks_count(self, source_id: str) -> int:
-        """Get the actual number of chunks for a source."""
-        try:
-            # Count the actual rows in crawled_pages for this source
-            result = (
-                self.supabase.table("archon_crawled_pages")
-                .select("*", count="exact")
-                .eq("source_id", source_id)
-                .execute()
-            )
-
-            # Return the count of pages (chunks)
-            return result.count if result.count else 0
-
-        except Exception as e:
-            # If we can't get chunk count, return 0
-            safe_logfire_info(f"Failed to get chunk count for {source_id}: {e}")
-            return 0
@@ -0,0 +1,40 @@
+"""
+Source Statistics
+
+Reads the per-source counts kept in archon_source_stats. The table is maintained
+by database triggers as chunks, code examples and pages are inserted and deleted,
+so listings embed it in the sources query instead of counting rows per source.
+"""
+
+from typing import Any
+
+# PostgREST embed that loads each source's stats row with the source itself
+SOURCE_STATS_EMBED = (
+    "archon_source_stats(chunk_count, code_example_count, page_count, word_count, first_url, last_crawled_at)"
+)
+
+EMPTY_SOURCE_STATS: dict[str, Any] = {
+    "chunk_count": 0,
+    "code_example_count": 0,
+    "page_count": 0,
+    "word_count": 0,
+    "first_url": None,
+    "last_crawled_at": None,
+}
+
+
+def get_source_stats(source: dict[str, Any]) -> dict[str, Any]:
+    """
+    Get the stats embedded in a source row.
+
+    Args:
+        source: Source record selected with SOURCE_STATS_EMBED
+
+    Returns:
+        Stats dict; sources without stored content yet have zero counts
+    """
+    stats = source.get("archon_source_stats")
+    # One-to-one embeds come back as an object, or as a list on older PostgREST versions
+    if isinstance(stats, list):
+        stats = stats[0] if stats else None
+    return {**EMPTY_SOURCE_STATS, **(stats or {})}
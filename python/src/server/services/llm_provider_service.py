@@ -5,9 +5,13 @@ Provides a unified interface for creating OpenAI-compatible clients for differen
 Supports OpenAI, Ollama, and Google Gemini.
 """
 
+import asyncio
+import hashlib
 import inspect
 import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from typing import Any
 
 import openai
@@ -153,6 +157,7 @@ def clear_provider_cache() -> None:
 
     cache_size_before = len(_settings_cache)
     _settings_cache.clear()
+    _invalidate_client_pool()
     _log_cache_access("*", "clear")
     logger.debug(f"Provider configuration cache cleared ({cache_size_before} entries removed)")
 
@@ -170,6 +175,7 @@ def invalidate_provider_cache(provider: str = None) -> None:
         # Clear entire cache
         cache_size_before = len(_settings_cache)
         _settings_cache.clear()
+        _invalidate_client_pool()
         _log_cache_access("*", "invalidate")
         logger.debug(f"All provider cache entries invalidated ({cache_size_before} entries)")
     else:
@@ -188,6 +194,7 @@ def invalidate_provider_cache(provider: str = None) -> None:
         for key in keys_to_remove:
             del _settings_cache[key]
             _log_cache_access(key, "invalidate")
+        _invalidate_client_pool(provider)
 
         safe_provider = _sanitize_for_log(provider)
         logger.debug(f"Cache entries for provider '{safe_provider}' invalidated: {len(keys_to_remove)} entries removed")
@@ -309,6 +316,156 @@ def get_cache_security_report() -> dict[str, Any]:
         report["recommendations"].append(f"Multiple invalid configuration attempts ({invalid_configs}) - validate data sources")
 
     return report
+
+
+# Long-lived client pool so AI calls reuse HTTP keep-alive connections and TLS sessions
+# instead of paying a handshake per call. Clients are keyed by provider, base URL and a
+# fingerprint of the API key, and bound to the event loop that created them.
+_CLIENT_POOL_MAX_SIZE = 32
+
+
+@dataclass
+class _PooledClient:
+    client: Any
+    provider: str
+    base_url: str | None
+    loop: asyncio.AbstractEventLoop
+    created_at: float = field(default_factory=time.time)
+    acquisitions: int = 0
+    in_use: int = 0
+    retired: bool = False
+
+
+_client_pool: OrderedDict[tuple[str, str | None, str, int], _PooledClient] = OrderedDict()
+_pooled_clients_by_id: dict[int, _PooledClient] = {}
+_client_pool_stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+_client_close_tasks: set[asyncio.Task] = set()
+
+
+def _api_key_fingerprint(api_key: str | None) -> str:
+    """Short, non-reversible identifier for an API key (never log or key on the raw value)."""
+    if not api_key:
+        return "none"
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+def _get_pooled_client(provider: str, **client_kwargs: Any) -> Any:
+    """Return a pooled AsyncOpenAI client for these settings, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    base_url = client_kwargs.get("base_url")
+    key = (provider, base_url, _api_key_fingerprint(client_kwargs.get("api_key")), id(loop))
+
+    entry = _client_pool.get(key)
+    if entry is not None and entry.loop is loop and not entry.retired:
+        _client_pool.move_to_end(key)
+        _client_pool_stats["hits"] += 1
+    else:
+        entry = _PooledClient(
+            client=openai.AsyncOpenAI(**client_kwargs), provider=provider, base_url=base_url, loop=loop
+        )
+        _client_pool[key] = entry
+        _pooled_clients_by_id[id(entry.client)] = entry
+        _client_pool_stats["misses"] += 1
+        _evict_idle_clients()
+
+    entry.acquisitions += 1
+    entry.in_use += 1
+    return entry.client
+
+
+async def _release_pooled_client(client: Any) -> None:
+    """Return a client to the pool, closing it if it was retired while in use."""
+    entry = _pooled_clients_by_id.get(id(client))
+    if entry is None:
+        return
+    entry.in_use = max(0, entry.in_use - 1)
+    if entry.retired and entry.in_use == 0:
+        _pooled_clients_by_id.pop(id(client), None)
+        await _close_client(client, entry.provider)
+
+
+def _evict_idle_clients() -> None:
+    """Retire least recently used idle clients beyond the pool size limit."""
+    for key in list(_client_pool.keys()):
+        if len(_client_pool) <= _CLIENT_POOL_MAX_SIZE:
+            break
+        entry = _client_pool[key]
+        if entry.in_use == 0:
+            del _client_pool[key]
+            _retire_client(entry)
+            _client_pool_stats["evictions"] += 1
+
+
+def _retire_client(entry: _PooledClient) -> None:
+    """Stop handing out a client; close it now if idle, otherwise when its last user releases it."""
+    entry.retired = True
+    if entry.in_use > 0:
+        return
+
+    _pooled_clients_by_id.pop(id(entry.client), None)
+    if entry.loop.is_closed():
+        return  # Connections died with their loop
+
+    close_coro = _close_client(entry.client, entry.provider)
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+
+    if running_loop is entry.loop:
+        task = entry.loop.create_task(close_coro)
+        _client_close_tasks.add(task)
+        task.add_done_callback(_client_close_tasks.discard)
+    elif entry.loop.is_running():
+        asyncio.run_coroutine_threadsafe(close_coro, entry.loop)
+    else:
+        close_coro.close()
+
+
+def _invalidate_client_pool(provider: str | None = None) -> None:
+    """Retire pooled clients (all, or those for one provider) so new settings take effect."""
+    for key, entry in list(_client_pool.items()):
+        if provider is None or entry.provider == provider:
+            del _client_pool[key]
+            _retire_client(entry)
+            _client_pool_stats["invalidations"] += 1
+
+
+def _open_connection_count(client: Any) -> int | None:
+    """Best-effort count of open HTTP connections held by a client's transport."""
+    try:
+        connections = client._client._transport._pool.connections
+        return len(connections) if isinstance(connections, list) else None
+    except AttributeError:
+        return None
+
+
+def get_client_pool_stats() -> dict[str, Any]:
+    """
+    Get LLM client pool metrics for monitoring.
+
+    Returns:
+        Pool counters plus per-client usage and open connection counts
+    """
+    now = time.time()
+    return {
+        "size": len(_client_pool),
+        "max_size": _CLIENT_POOL_MAX_SIZE,
+        **_client_pool_stats,
+        "clients": [
+            {
+                "provider": entry.provider,
+                "base_url": entry.base_url,
+                "age_seconds": round(now - entry.created_at, 1),
+                "acquisitions": entry.acquisitions,
+                "in_use": entry.in_use,
+                "open_connections": _open_connection_count(entry.client),
+            }
+            for entry in _client_pool.values()
+        ],
+    }
+
+
 @asynccontextmanager
 async def get_llm_client(
     provider: str | None = None,
@@ -398,7 +555,7 @@ async def get_llm_client(
 
         if provider_name == "openai":
             if api_key:
-                client = openai.AsyncOpenAI(api_key=api_key)
+                client = _get_pooled_client(provider_name, api_key=api_key)
                 logger.info("OpenAI client created successfully")
             else:
                 logger.warning("OpenAI API key not found, attempting Ollama fallback")
@@ -412,7 +569,8 @@ async def get_llm_client(
                     if not ollama_base_url:
                         raise RuntimeError("No Ollama base URL resolved")
 
-                    client = openai.AsyncOpenAI(
+                    client = _get_pooled_client(
+                        "ollama",
                         api_key="ollama",
                         base_url=ollama_base_url,
                     )
@@ -436,7 +594,8 @@ async def get_llm_client(
             )
 
             # Ollama requires an API key in the client but doesn't actually use it
-            client = openai.AsyncOpenAI(
+            client = _get_pooled_client(
+                provider_name,
                 api_key="ollama",  # Required but unused by Ollama
                 base_url=ollama_base_url,
             )
@@ -446,7 +605,8 @@ async def get_llm_client(
             if not api_key:
                 raise ValueError("Google API key not found")
 
-            client = openai.AsyncOpenAI(
+            client = _get_pooled_client(
+                provider_name,
                 api_key=api_key,
                 base_url=base_url or "https://generativelanguage.googleapis.com/v1beta/openai/",
             )
@@ -456,7 +616,8 @@ async def get_llm_client(
             if not api_key:
                 raise ValueError("OpenRouter API key not found")
 
-            client = openai.AsyncOpenAI(
+            client = _get_pooled_client(
+                provider_name,
                 api_key=api_key,
                 base_url=base_url or "https://openrouter.ai/api/v1",
             )
@@ -466,7 +627,8 @@ async def get_llm_client(
             if not api_key:
                 raise ValueError("Anthropic API key not found")
 
-            client = openai.AsyncOpenAI(
+            client = _get_pooled_client(
+                provider_name,
                 api_key=api_key,
                 base_url=base_url or "https://api.anthropic.com/v1",
             )
@@ -490,7 +652,8 @@ async def get_llm_client(
                 f"Grok API key validation: format_valid={key_format_valid}, length_valid={key_length_valid}"
             )
 
-            client = openai.AsyncOpenAI(
+            client = _get_pooled_client(
+                provider_name,
                 api_key=api_key,
                 base_url=base_url or "https://api.x.ai/v1",
             )
@@ -509,43 +672,49 @@ async def get_llm_client(
         yield client
     finally:
         if client is not None:
-            safe_provider = _sanitize_for_log(provider_name) if provider_name else "unknown"
-
-            try:
-                close_method = getattr(client, "aclose", None)
-                if callable(close_method):
-                    if inspect.iscoroutinefunction(close_method):
-                        await close_method()
-                    else:
-                        maybe_coro = close_method()
-                        if inspect.isawaitable(maybe_coro):
-                            await maybe_coro
-                else:
-                    close_method = getattr(client, "close", None)
-                    if callable(close_method):
-                        if inspect.iscoroutinefunction(close_method):
-                            await close_method()
-                        else:
-                            close_result = close_method()
-                            if inspect.isawaitable(close_result):
-                                await close_result
-                logger.debug(f"Closed LLM client for provider: {safe_provider}")
-            except RuntimeError as close_error:
-                if "Event loop is closed" in str(close_error):
-                    logger.error(
-                        f"Failed to close LLM client cleanly for provider {safe_provider}: event loop already closed",
-                        exc_info=True,
-                    )
+            # Pooled clients stay open for reuse; they are closed when the pool retires them
+            await _release_pooled_client(client)
+
+
+async def _close_client(client: Any, provider_name: str | None) -> None:
+    """Close an LLM client, tolerating sync/async close methods and a closed event loop."""
+    safe_provider = _sanitize_for_log(provider_name) if provider_name else "unknown"
+
+    try:
+        close_method = getattr(client, "aclose", None)
+        if callable(close_method):
+            if inspect.iscoroutinefunction(close_method):
+                await close_method()
+            else:
+                maybe_coro = close_method()
+                if inspect.isawaitable(maybe_coro):
+                    await maybe_coro
+        else:
+            close_method = getattr(client, "close", None)
+            if callable(close_method):
+                if inspect.iscoroutinefunction(close_method):
+                    await close_method()
                 else:
-                    logger.error(
-                        f"Runtime error closing LLM client for provider {safe_provider}: {close_error}",
-                        exc_info=True,
-                    )
-            except Exception as close_error:
-                logger.error(
-                    f"Unexpected error while closing LLM client for provider {safe_provider}: {close_error}",
-                    exc_info=True,
-                )
+                    close_result = close_method()
+                    if inspect.isawaitable(close_result):
+                        await close_result
+        logger.debug(f"Closed LLM client for provider: {safe_provider}")
+    except RuntimeError as close_error:
+        if "Event loop is closed" in str(close_error):
+            logger.error(
+                f"Failed to close LLM client cleanly for provider {safe_provider}: event loop already closed",
+                exc_info=True,
+            )
+        else:
+            logger.error(
+                f"Runtime error closing LLM client for provider {safe_provider}: {close_error}",
+                exc_info=True,
+            )
+    except Exception as close_error:
+        logger.error(
+            f"Unexpected error while closing LLM client for provider {safe_provider}: {close_error}",
+            exc_info=True,
+        )
 
 
 
@@ -18,6 +18,7 @@ from supabase import Client
 
 from ...config.logfire_config import get_logger, safe_span
 from ..embeddings.embedding_service import create_embedding
+from ..embeddings.query_embedding_cache import get_query_embedding_cache
 
 logger = get_logger(__name__)
 
@@ -89,7 +90,7 @@ class AgenticRAGStrategy:
         ) as span:
             try:
                 # Create embedding for the query (no enhancement)
-                query_embedding = await create_embedding(query)
+                query_embedding = await get_query_embedding_cache().get_or_create(query, create_embedding)
 
                 if not query_embedding:
                     logger.error("Failed to create embedding for code example query")
@@ -10,6 +10,7 @@ from typing import Any
 from supabase import Client
 
 from ...config.logfire_config import get_logger, safe_span
+from .search_rpc import execute_search_rpc
 
 logger = get_logger(__name__)
 
@@ -61,12 +62,12 @@ class BaseSearchStrategy:
                     rpc_params["filter"] = {}
 
                 # Execute search
-                response = self.supabase_client.rpc(table_rpc, rpc_params).execute()
+                rows = await execute_search_rpc(self.supabase_client, table_rpc, rpc_params)
 
                 # Filter by similarity threshold
                 filtered_results = []
-                if response.data:
-                    for result in response.data:
+                if rows:
+                    for result in rows:
                         similarity = float(result.get("similarity", 0.0))
                         if similarity >= SIMILARITY_THRESHOLD:
                             filtered_results.append(result)
@@ -74,7 +75,7 @@ class BaseSearchStrategy:
                 span.set_attribute("results_found", len(filtered_results))
                 span.set_attribute(
                     "results_filtered",
-                    len(response.data) - len(filtered_results) if response.data else 0,
+                    len(rows) - len(filtered_results) if rows else 0,
                 )
 
                 return filtered_results
@@ -17,6 +17,8 @@ from supabase import Client
 
 from ...config.logfire_config import get_logger, safe_span
 from ..embeddings.embedding_service import create_embedding
+from ..embeddings.query_embedding_cache import get_query_embedding_cache
+from .search_rpc import execute_search_rpc
 
 logger = get_logger(__name__)
 
@@ -55,7 +57,8 @@ class HybridSearchStrategy:
                 source_filter = filter_json.pop("source", None) if "source" in filter_json else None
 
                 # Call the hybrid search PostgreSQL function
-                response = self.supabase_client.rpc(
+                rows = await execute_search_rpc(
+                    self.supabase_client,
                     "hybrid_search_archon_crawled_pages",
                     {
                         "query_embedding": query_embedding,
@@ -64,15 +67,15 @@ class HybridSearchStrategy:
                         "filter": filter_json,
                         "source_filter": source_filter,
                     },
-                ).execute()
+                )
 
-                if not response.data:
+                if not rows:
                     logger.debug("No results from hybrid search")
                     return []
 
                 # Format results to match expected structure
                 results = []
-                for row in response.data:
+                for row in rows:
                     result = {
                         "id": row["id"],
                         "url": row["url"],
@@ -128,7 +131,7 @@ class HybridSearchStrategy:
         with safe_span("hybrid_search_code_examples") as span:
             try:
                 # Create query embedding
-                query_embedding = await create_embedding(query)
+                query_embedding = await get_query_embedding_cache().get_or_create(query, create_embedding)
 
                 if not query_embedding:
                     logger.error("Failed to create embedding for code example query")
@@ -142,7 +145,8 @@ class HybridSearchStrategy:
                     final_source_filter = filter_json.pop("source")
 
                 # Call the hybrid search PostgreSQL function
-                response = self.supabase_client.rpc(
+                rows = await execute_search_rpc(
+                    self.supabase_client,
                     "hybrid_search_archon_code_examples",
                     {
                         "query_embedding": query_embedding,
@@ -151,15 +155,15 @@ class HybridSearchStrategy:
                         "filter": filter_json,
                         "source_filter": final_source_filter,
                     },
-                ).execute()
+                )
 
-                if not response.data:
+                if not rows:
                     logger.debug("No results from hybrid code search")
                     return []
 
                 # Format results to match expected structure
                 results = []
-                for row in response.data:
+                for row in rows:
                     result = {
                         "id": row["id"],
                         "url": row["url"],
@@ -12,21 +12,56 @@ It combines multiple RAG strategies in a pipeline fashion:
 Multiple strategies can be enabled simultaneously and work together.
 """
 
+import asyncio
 import os
+import time
 from typing import Any
 
 from ...config.logfire_config import get_logger, safe_span
 from ...utils import get_supabase_client
 from ..embeddings.embedding_service import create_embedding
+from ..embeddings.query_embedding_cache import get_query_embedding_cache
 from .agentic_rag_strategy import AgenticRAGStrategy
 
 # Import all strategies
 from .base_search_strategy import BaseSearchStrategy
 from .hybrid_search_strategy import HybridSearchStrategy
-from .reranking_strategy import RerankingStrategy
+from .reranking_strategy import DEFAULT_ONNX_FILE_NAME, DEFAULT_RERANKING_BACKEND, RerankingStrategy
 
 logger = get_logger(__name__)
 
+# Page metadata rarely changes between searches; cache it briefly by page_id
+PAGE_METADATA_CACHE_TTL_SECONDS = 300.0
+PAGE_METADATA_CACHE_MAX_ENTRIES = 5_000
+PAGE_METADATA_COLUMNS = "id, url, section_title, word_count"
+
+_page_metadata_cache: dict[str, tuple[float, dict[str, Any]]] = {}
+
+
+def _get_cached_page_metadata(page_id: str) -> dict[str, Any] | None:
+    entry = _page_metadata_cache.get(page_id)
+    if entry is None:
+        return None
+    expires_at, page = entry
+    if expires_at <= time.monotonic():
+        del _page_metadata_cache[page_id]
+        return None
+    return page
+
+
+def _cache_page_metadata(pages: list[dict[str, Any]]) -> None:
+    expires_at = time.monotonic() + PAGE_METADATA_CACHE_TTL_SECONDS
+    for page in pages:
+        _page_metadata_cache[str(page["id"])] = (expires_at, page)
+    # Dicts keep insertion order, so the oldest entries are dropped first
+    while len(_page_metadata_cache) > PAGE_METADATA_CACHE_MAX_ENTRIES:
+        del _page_metadata_cache[next(iter(_page_metadata_cache))]
+
+
+def clear_page_metadata_cache() -> None:
+    """Drop all cached page metadata."""
+    _page_metadata_cache.clear()
+
 
 class RAGService:
     """
@@ -52,7 +87,10 @@ class RAGService:
         use_reranking = self.get_bool_setting("USE_RERANKING", False)
         if use_reranking:
             try:
-                self.reranking_strategy = RerankingStrategy()
+                self.reranking_strategy = RerankingStrategy(
+                    backend=self.get_setting("RERANKING_BACKEND", DEFAULT_RERANKING_BACKEND),
+                    onnx_file_name=self.get_setting("RERANKING_ONNX_FILE", DEFAULT_ONNX_FILE_NAME),
+                )
                 logger.info("Reranking strategy loaded successfully")
             except Exception as e:
                 logger.warning(f"Failed to load reranking strategy: {e}")
@@ -113,7 +151,7 @@ class RAGService:
         ) as span:
             try:
                 # Create embedding for the query
-                query_embedding = await create_embedding(query)
+                query_embedding = await get_query_embedding_cache().get_or_create(query, create_embedding)
 
                 if not query_embedding:
                     logger.error("Failed to create embedding for query")
@@ -201,37 +239,29 @@ class RAGService:
             page_groups[group_key]["chunk_matches"] += 1
             page_groups[group_key]["total_similarity"] += result.get("similarity_score", 0.0)
 
+        pages_by_id, pages_by_url = await self._fetch_page_metadata(
+            [data["page_id"] for data in page_groups.values() if data["page_id"]],
+            [data["url"] for data in page_groups.values() if not data["page_id"]],
+        )
+
         page_results = []
         for group_key, data in page_groups.items():
             avg_similarity = data["total_similarity"] / data["chunk_matches"]
             match_boost = min(0.2, data["chunk_matches"] * 0.02)
             aggregate_score = avg_similarity * (1 + match_boost)
 
-            # Query page by page_id if available, otherwise by URL
+            # Match page by page_id if available, otherwise by exact URL
             if data["page_id"]:
-                page_info = (
-                    self.supabase_client.table("archon_page_metadata")
-                    .select("id, url, section_title, word_count")
-                    .eq("id", data["page_id"])
-                    .maybe_single()
-                    .execute()
-                )
+                page = pages_by_id.get(str(data["page_id"]))
             else:
-                # Regular pages - exact URL match
-                page_info = (
-                    self.supabase_client.table("archon_page_metadata")
-                    .select("id, url, section_title, word_count")
-                    .eq("url", data["url"])
-                    .maybe_single()
-                    .execute()
-                )
+                page = pages_by_url.get(data["url"])
 
-            if page_info and page_info.data is not None:
+            if page is not None:
                 page_results.append({
-                    "page_id": page_info.data["id"],
-                    "url": page_info.data["url"],
-                    "section_title": page_info.data.get("section_title"),
-                    "word_count": page_info.data.get("word_count", 0),
+                    "page_id": page["id"],
+                    "url": page["url"],
+                    "section_title": page.get("section_title"),
+                    "word_count": page.get("word_count", 0),
                     "chunk_matches": data["chunk_matches"],
                     "aggregate_similarity": aggregate_score,
                     "average_similarity": avg_similarity,
@@ -241,6 +271,54 @@ class RAGService:
         page_results.sort(key=lambda x: x["aggregate_similarity"], reverse=True)
         return page_results[:match_count]
 
+    async def _fetch_page_metadata(
+        self, page_ids: list[str], urls: list[str]
+    ) -> tuple[dict[str, dict[str, Any]], dict[str, dict[str, Any]]]:
+        """
+        Fetch page metadata for all page groups with at most two batched queries.
+
+        Args:
+            page_ids: Page IDs to look up (served from the TTL cache when possible)
+            urls: Page URLs for groups without a page_id (pre-migration chunks)
+
+        Returns:
+            Tuple of (pages keyed by page_id, pages keyed by URL)
+        """
+        pages_by_id: dict[str, dict[str, Any]] = {}
+        missing_ids = []
+        for page_id in dict.fromkeys(str(page_id) for page_id in page_ids):
+            cached = _get_cached_page_metadata(page_id)
+            if cached is not None:
+                pages_by_id[page_id] = cached
+            else:
+                missing_ids.append(page_id)
+
+        if missing_ids:
+            response = await asyncio.to_thread(
+                lambda: self.supabase_client.table("archon_page_metadata")
+                .select(PAGE_METADATA_COLUMNS)
+                .in_("id", missing_ids)
+                .execute()
+            )
+            fetched = response.data or []
+            _cache_page_metadata(fetched)
+            pages_by_id.update({str(page["id"]): page for page in fetched})
+
+        pages_by_url: dict[str, dict[str, Any]] = {}
+        unique_urls = list(dict.fromkeys(urls))
+        if unique_urls:
+            response = await asyncio.to_thread(
+                lambda: self.supabase_client.table("archon_page_metadata")
+                .select(PAGE_METADATA_COLUMNS)
+                .in_("url", unique_urls)
+                .execute()
+            )
+            for page in response.data or []:
+                # A URL should map to one page; keep the first if it does not
+                pages_by_url.setdefault(page["url"], page)
+
+        return pages_by_id, pages_by_url
+
     async def perform_rag_query(
         self, query: str, source: str = None, match_count: int = 5, return_mode: str = "chunks"
     ) -> tuple[bool, dict[str, Any]]:
@@ -6,9 +6,19 @@ The reranking process re-scores search results based on query-document relevance
 a trained neural model, typically improving precision over initial retrieval scores.
 
 Uses the cross-encoder/ms-marco-MiniLM-L-6-v2 model for reranking by default.
+
+Models are loaded once per process and scored on a dedicated worker thread so
+reranking never blocks the event loop. Scores are memoized per (query, chunk),
+and rerank calls from concurrent requests are micro-batched into a single
+forward pass. An ONNX (optionally int8-quantized) backend can be selected for
+CPU-only deployments.
 """
 
+import asyncio
+import hashlib
 import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 try:
@@ -25,13 +35,170 @@ logger = get_logger(__name__)
 
 # Default reranking model
 DEFAULT_RERANKING_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+DEFAULT_RERANKING_BACKEND = "torch"
+# int8-quantized export shipped with the default model; used when RERANKING_BACKEND=onnx
+DEFAULT_ONNX_FILE_NAME = "onnx/model_qint8_avx2.onnx"
+
+RERANK_SCORE_CACHE_MAX_ENTRIES = 10_000
+# Concurrent rerank calls arriving within this window share one forward pass
+RERANK_BATCH_WINDOW_SECONDS = 0.005
+RERANK_MAX_BATCH_PAIRS = 256
+
+_shared_models: dict[tuple[str, str, str | None], Any] = {}
+_rerank_executor: ThreadPoolExecutor | None = None
+_scorers: dict[int, "RerankScorer"] = {}
+
+
+def _get_rerank_executor() -> ThreadPoolExecutor:
+    # A single worker: the model already uses intra-op threads, and serializing
+    # forward passes lets requests queue up into larger micro-batches
+    global _rerank_executor
+    if _rerank_executor is None:
+        _rerank_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archon-rerank")
+    return _rerank_executor
+
+
+def _load_cross_encoder(model_name: str, backend: str, onnx_file_name: str | None) -> Any:
+    """Load a CrossEncoder, falling back to the torch backend if the requested one fails."""
+    if backend != "torch":
+        try:
+            model_kwargs = {"file_name": onnx_file_name} if backend == "onnx" and onnx_file_name else None
+            return CrossEncoder(model_name, backend=backend, model_kwargs=model_kwargs)
+        except Exception as e:
+            logger.warning(f"Failed to load {backend} reranking backend for {model_name}, using torch: {e}")
+    return CrossEncoder(model_name)
+
+
+class RerankScorer:
+    """
+    Scores query-document pairs for one model with memoization and micro-batching.
+
+    Shared by every RerankingStrategy using the same model instance, so
+    concurrent searches batch together and reuse each other's scores.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        max_cache_entries: int = RERANK_SCORE_CACHE_MAX_ENTRIES,
+        batch_window: float = RERANK_BATCH_WINDOW_SECONDS,
+        max_batch_pairs: int = RERANK_MAX_BATCH_PAIRS,
+    ):
+        self.model = model
+        self.max_cache_entries = max_cache_entries
+        self.batch_window = batch_window
+        self.max_batch_pairs = max_batch_pairs
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self._scores: OrderedDict[tuple[str, str, str], float] = OrderedDict()
+        self._pending: list[tuple[list[list[str]], asyncio.Future]] = []
+        self._pending_pairs = 0
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.stats = {"cache_hits": 0, "cache_misses": 0, "batches": 0, "pairs_scored": 0}
+
+    @staticmethod
+    def make_key(query: str, chunk_id: Any, text: str) -> tuple[str, str, str]:
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        return (query, str(chunk_id), digest)
+
+    async def score(self, query: str, pairs: list[list[str]], chunk_ids: list[Any]) -> list[float]:
+        """Return scores for pairs, running the model only for pairs not seen before."""
+        keys = [self.make_key(query, chunk_id, pair[1]) for pair, chunk_id in zip(pairs, chunk_ids, strict=True)]
+
+        scores: list[float | None] = []
+        missing: list[int] = []
+        for i, key in enumerate(keys):
+            cached = self._scores.get(key)
+            if cached is None:
+                missing.append(i)
+            else:
+                self._scores.move_to_end(key)
+            scores.append(cached)
+        self.stats["cache_hits"] += len(keys) - len(missing)
+        self.stats["cache_misses"] += len(missing)
+
+        if missing:
+            new_scores = await self._predict([pairs[i] for i in missing])
+            for i, value in zip(missing, new_scores, strict=True):
+                scores[i] = value
+                self._remember(keys[i], value)
+
+        return scores
+
+    def _remember(self, key: tuple[str, str, str], value: float) -> None:
+        self._scores[key] = value
+        self._scores.move_to_end(key)
+        while len(self._scores) > self.max_cache_entries:
+            self._scores.popitem(last=False)
+
+    async def _predict(self, pairs: list[list[str]]) -> list[float]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((pairs, future))
+        self._pending_pairs += len(pairs)
+
+        if self._pending_pairs >= self.max_batch_pairs:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending, self._pending_pairs = self._pending, [], 0
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: list[tuple[list[list[str]], asyncio.Future]]) -> None:
+        all_pairs = [pair for pairs, _ in batch for pair in pairs]
+        try:
+            raw_scores = await asyncio.get_running_loop().run_in_executor(
+                _get_rerank_executor(), self.model.predict, all_pairs
+            )
+            scores = [float(score) for score in raw_scores]
+            self.stats["batches"] += 1
+            self.stats["pairs_scored"] += len(all_pairs)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for pairs, future in batch:
+            if not future.done():
+                future.set_result(scores[offset : offset + len(pairs)])
+            offset += len(pairs)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {"cached_scores": len(self._scores), **self.stats}
+
+
+def get_rerank_scorer(model: Any) -> RerankScorer:
+    """Get the shared scorer for a model instance on the running event loop."""
+    loop = asyncio.get_running_loop()
+    scorer = _scorers.get(id(model))
+    if scorer is None or scorer.model is not model or scorer.loop not in (None, loop):
+        scorer = RerankScorer(model)
+        _scorers[id(model)] = scorer
+    scorer.loop = loop
+    return scorer
 
 
 class RerankingStrategy:
     """Strategy class implementing result reranking using CrossEncoder models"""
 
     def __init__(
-        self, model_name: str = DEFAULT_RERANKING_MODEL, model_instance: Any | None = None
+        self,
+        model_name: str = DEFAULT_RERANKING_MODEL,
+        model_instance: Any | None = None,
+        backend: str = DEFAULT_RERANKING_BACKEND,
+        onnx_file_name: str | None = DEFAULT_ONNX_FILE_NAME,
     ):
         """
         Initialize reranking strategy.
@@ -39,8 +206,12 @@ class RerankingStrategy:
         Args:
             model_name: Name/path of the CrossEncoder model to use
             model_instance: Pre-loaded CrossEncoder instance or any object with a predict method (optional)
+            backend: CrossEncoder backend ("torch", "onnx" or "openvino")
+            onnx_file_name: ONNX export to load with the onnx backend (e.g. an int8-quantized file)
         """
         self.model_name = model_name
+        self.backend = (backend or DEFAULT_RERANKING_BACKEND).lower()
+        self.onnx_file_name = onnx_file_name
         self.model = model_instance or self._load_model()
 
     @classmethod
@@ -60,18 +231,25 @@ class RerankingStrategy:
         return cls(model_name=model_name, model_instance=model)
 
     def _load_model(self) -> CrossEncoder:
-        """Load the CrossEncoder model for reranking."""
+        """Load the CrossEncoder model for reranking (once per process per model/backend)."""
         if not CROSSENCODER_AVAILABLE:
             logger.warning("sentence-transformers not available - reranking disabled")
             return None
 
+        key = (self.model_name, self.backend, self.onnx_file_name if self.backend == "onnx" else None)
+        if key in _shared_models:
+            return _shared_models[key]
+
         try:
-            logger.info(f"Loading reranking model: {self.model_name}")
-            return CrossEncoder(self.model_name)
+            logger.info(f"Loading reranking model: {self.model_name} (backend={self.backend})")
+            model = _load_cross_encoder(*key)
         except Exception as e:
             logger.error(f"Failed to load reranking model {self.model_name}: {e}")
             return None
 
+        _shared_models[key] = model
+        return model
+
     def is_available(self) -> bool:
         """Check if reranking is available (model loaded successfully)."""
         return self.model is not None
@@ -172,9 +350,11 @@ class RerankingStrategy:
                     logger.warning("No valid texts found for reranking")
                     return results
 
-                # Get reranking scores from the model
-                with safe_span("crossencoder_predict"):
-                    scores = self.model.predict(query_doc_pairs)
+                # Get reranking scores (memoized, micro-batched, scored off the event loop)
+                scorer = get_rerank_scorer(self.model)
+                chunk_ids = [results[i].get("id", i) for i in valid_indices]
+                with safe_span("crossencoder_predict", pair_count=len(query_doc_pairs)):
+                    scores = await scorer.score(query, query_doc_pairs, chunk_ids)
 
                 # Apply scores and sort results
                 reranked_results = self.apply_rerank_scores(results, scores, valid_indices, top_k)
@@ -200,6 +380,7 @@ class RerankingStrategy:
             "available": self.is_available(),
             "crossencoder_available": CROSSENCODER_AVAILABLE,
             "model_loaded": self.model is not None,
+            "backend": self.backend,
         }
 
 
@@ -213,15 +394,22 @@ class RerankingConfig:
             use_reranking = credential_service.get_bool_setting("USE_RERANKING", False)
             model_name = credential_service.get_setting("RERANKING_MODEL", DEFAULT_RERANKING_MODEL)
             top_k = int(credential_service.get_setting("RERANKING_TOP_K", "0"))
+            backend = credential_service.get_setting("RERANKING_BACKEND", DEFAULT_RERANKING_BACKEND)
 
             return {
                 "enabled": use_reranking,
                 "model_name": model_name,
                 "top_k": top_k if top_k > 0 else None,
+                "backend": backend,
             }
         except Exception as e:
             logger.error(f"Error loading reranking config: {e}")
-            return {"enabled": False, "model_name": DEFAULT_RERANKING_MODEL, "top_k": None}
+            return {
+                "enabled": False,
+                "model_name": DEFAULT_RERANKING_MODEL,
+                "top_k": None,
+                "backend": DEFAULT_RERANKING_BACKEND,
+            }
 
     @staticmethod
     def from_env() -> dict[str, Any]:
@@ -230,4 +418,5 @@ class RerankingConfig:
             "enabled": os.getenv("USE_RERANKING", "false").lower() in ("true", "1", "yes", "on"),
             "model_name": os.getenv("RERANKING_MODEL", DEFAULT_RERANKING_MODEL),
             "top_k": int(os.getenv("RERANKING_TOP_K", "0")) or None,
+            "backend": os.getenv("RERANKING_BACKEND", DEFAULT_RERANKING_BACKEND),
         }
@@ -0,0 +1,152 @@
+"""
+Search RPC Execution
+
+Async data path for the search hot path (vector and hybrid search functions).
+
+When SUPABASE_DB_URL is set, search functions are called directly over a shared
+asyncpg connection pool, so concurrent RAG queries run in parallel instead of
+blocking the event loop one PostgREST round trip at a time. Without a database
+URL (or while the pool can't be created) the supabase-py RPC call runs in a
+worker thread, which still keeps the event loop free. A failed pool creation is
+retried after POOL_RETRY_SECONDS, so a transient database hiccup doesn't
+downgrade the process for good.
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+from typing import Any
+
+from ...config.logfire_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+# Seconds to wait before trying to create the pool again after a failure
+POOL_RETRY_SECONDS = 60.0
+
+# Postgres casts for the search function arguments (named notation: arg => $n::type).
+# Embeddings travel as text so asyncpg doesn't need a pgvector codec.
+_PARAM_TYPES = {
+    "query_embedding": "text::vector",
+    "embedding_dimension": "int",
+    "query_text": "text",
+    "match_count": "int",
+    "filter": "jsonb",
+    "source_filter": "text",
+}
+
+_FUNCTION_NAME_RE = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+_pool = None
+_pool_lock: asyncio.Lock | None = None
+_pool_disabled = False  # No SUPABASE_DB_URL: never try
+_pool_retry_at = 0.0  # Monotonic time before which a failed pool creation isn't retried
+
+
+def _ensure_pool_lock() -> asyncio.Lock:
+    global _pool_lock
+    if _pool_lock is None:
+        _pool_lock = asyncio.Lock()
+    return _pool_lock
+
+
+async def _init_connection(connection) -> None:
+    # Decode json/jsonb columns (metadata) into Python objects like PostgREST does
+    for type_name in ("json", "jsonb"):
+        await connection.set_type_codec(
+            type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
+        )
+
+
+async def get_search_pool():
+    """
+    Get the shared asyncpg pool for search queries.
+
+    Returns:
+        The pool, or None when no database URL is configured or the pool can't be
+        created (creation is retried after POOL_RETRY_SECONDS)
+    """
+    global _pool, _pool_disabled, _pool_retry_at
+    if _pool is not None or _pool_disabled or time.monotonic() < _pool_retry_at:
+        return _pool
+
+    dsn = os.getenv("SUPABASE_DB_URL")
+    if not dsn:
+        _pool_disabled = True
+        return None
+
+    async with _ensure_pool_lock():
+        if _pool is not None or time.monotonic() < _pool_retry_at:
+            return _pool
+        try:
+            import asyncpg
+
+            pool_size = max(1, int(os.getenv("SEARCH_DB_POOL_SIZE") or DEFAULT_POOL_SIZE))
+            _pool = await asyncpg.create_pool(
+                dsn,
+                min_size=1,
+                max_size=pool_size,
+                # Supabase's transaction pooler doesn't support prepared statement caching
+                statement_cache_size=0,
+                init=_init_connection,
+            )
+            logger.info(f"Search database pool created | max_size={pool_size}")
+        except Exception as e:
+            logger.warning(
+                f"Could not create search database pool, using PostgREST RPCs "
+                f"(retrying in {POOL_RETRY_SECONDS:.0f}s): {e}"
+            )
+            _pool_retry_at = time.monotonic() + POOL_RETRY_SECONDS
+            _pool = None
+    return _pool
+
+
+async def close_search_pool() -> None:
+    """Close the shared search pool (application shutdown)."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+def _build_function_call(function_name: str, params: dict[str, Any]) -> tuple[str, list[Any]]:
+    if not _FUNCTION_NAME_RE.match(function_name):
+        raise ValueError(f"Invalid search function name: {function_name}")
+
+    arguments = []
+    values: list[Any] = []
+    for name, value in params.items():
+        if name not in _PARAM_TYPES:
+            raise ValueError(f"Unsupported search function argument: {name}")
+        if name == "query_embedding":
+            value = "[" + ",".join(str(float(v)) for v in value) + "]"
+        values.append(value)
+        arguments.append(f"{name} => ${len(values)}::{_PARAM_TYPES[name]}")
+
+    return f"SELECT * FROM {function_name}({', '.join(arguments)})", values
+
+
+async def execute_search_rpc(supabase_client, function_name: str, params: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Call a search function and return its rows without blocking the event loop.
+
+    Args:
+        supabase_client: Client used when no database pool is available
+        function_name: Postgres search function (e.g. match_archon_crawled_pages)
+        params: Function arguments, same shape as a supabase-py rpc() call
+
+    Returns:
+        List of result rows as dicts
+    """
+    pool = await get_search_pool()
+    if pool is not None:
+        query, values = _build_function_call(function_name, params)
+        async with pool.acquire() as connection:
+            records = await connection.fetch(query, *values)
+        return [dict(record) for record in records]
+
+    response = await asyncio.to_thread(lambda: supabase_client.rpc(function_name, params).execute())
+    return response.data or []
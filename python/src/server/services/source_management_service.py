@@ -5,16 +5,25 @@ Handles source metadata, summaries, and management.
 Consolidates both utility functions and class-based service.
 """
 
+import asyncio
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from supabase import Client
 
 from ..config.logfire_config import get_logger, search_logger
 from .client_manager import get_supabase_client
+from .knowledge.source_stats import SOURCE_STATS_EMBED, get_source_stats
 from .llm_provider_service import extract_message_text, get_llm_client
 
 logger = get_logger(__name__)
 
+# Rows removed per DELETE statement when deleting a source in batches
+SOURCE_DELETE_BATCH_SIZE = 1000
+
+# Tables cleared batch by batch before the source row itself is deleted
+SOURCE_DELETE_TABLES = ("archon_code_examples", "archon_crawled_pages", "archon_page_metadata")
+
 
 async def extract_source_summary(
     source_id: str, content: str, max_length: int = 500, provider: str = None
@@ -437,6 +446,123 @@ class SourceManagementService:
             logger.error(f"Error deleting source {source_id}: {e}")
             return False, {"error": f"Error deleting source: {str(e)}"}
 
+    async def delete_source_in_batches(
+        self,
+        source_id: str,
+        progress_callback: Callable[..., Awaitable[None]] | None = None,
+        batch_size: int = SOURCE_DELETE_BATCH_SIZE,
+        cancellation_check: Callable[[], None] | None = None,
+    ) -> tuple[bool, dict[str, Any]]:
+        """
+        Delete a source by removing its rows in bounded batches, then the source row.
+
+        Each batch is its own short DELETE, so large sources never hold one long
+        transaction (and its locks) on archon_crawled_pages. The final source delete
+        only cascades to whatever is left, which is small.
+
+        Args:
+            source_id: The source ID to delete
+            progress_callback: Optional async callback(status, progress, log, **kwargs)
+            batch_size: Maximum rows removed per DELETE statement
+            cancellation_check: Optional function that raises CancelledError to stop
+
+        Returns:
+            Tuple of (success, result_dict)
+        """
+        batch_size = max(1, int(batch_size))
+        try:
+            source = await asyncio.to_thread(
+                lambda: self.supabase_client.table("archon_sources")
+                .select(f"source_id, {SOURCE_STATS_EMBED}")
+                .eq("source_id", source_id)
+                .execute()
+            )
+            if not source.data:
+                return False, {"error": f"Source {source_id} not found"}
+
+            stats = get_source_stats(source.data[0])
+            totals = {
+                "archon_code_examples": stats["code_example_count"],
+                "archon_crawled_pages": stats["chunk_count"],
+                "archon_page_metadata": stats["page_count"],
+            }
+            total_rows = max(1, sum(totals.values()))
+            deleted = dict.fromkeys(totals, 0)
+
+            async def report(log: str) -> None:
+                if progress_callback:
+                    done = sum(deleted.values())
+                    await progress_callback(
+                        "deleting",
+                        min(99, int(done / total_rows * 100)),
+                        log,
+                        source_id=source_id,
+                        rows_deleted=done,
+                        total_rows=sum(totals.values()),
+                        chunks_deleted=deleted["archon_crawled_pages"],
+                        code_examples_deleted=deleted["archon_code_examples"],
+                        pages_deleted=deleted["archon_page_metadata"],
+                    )
+
+            # Chunks go before pages so their page_id references don't need updating
+            for table in SOURCE_DELETE_TABLES:
+                while True:
+                    if cancellation_check:
+                        cancellation_check()
+                    removed, more = await asyncio.to_thread(
+                        self._delete_source_rows_batch, table, source_id, batch_size
+                    )
+                    deleted[table] += removed
+                    await report(f"Deleted {deleted[table]} rows from {table}")
+                    if not more:
+                        break
+                    # Let searches and other writers in between batches
+                    await asyncio.sleep(0)
+
+            # Remaining rows (source stats, project links) cascade from here
+            await asyncio.to_thread(
+                lambda: self.supabase_client.table("archon_sources")
+                .delete(returning="minimal")
+                .eq("source_id", source_id)
+                .execute()
+            )
+            logger.info(f"Deleted source {source_id} in batches | rows={sum(deleted.values())}")
+            return True, {
+                "source_id": source_id,
+                "message": "Source and all related data deleted successfully",
+                "chunks_deleted": deleted["archon_crawled_pages"],
+                "code_examples_deleted": deleted["archon_code_examples"],
+                "pages_deleted": deleted["archon_page_metadata"],
+            }
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error deleting source {source_id} in batches: {e}")
+            return False, {"error": f"Error deleting source: {str(e)}"}
+
+    def _delete_source_rows_batch(self, table: str, source_id: str, batch_size: int) -> tuple[int, bool]:
+        """
+        Delete up to batch_size rows of a source from a table, lowest ids first.
+
+        Returns:
+            (rows deleted, whether more rows may remain)
+        """
+        # The id of the batch_size-th row bounds this batch without sending the ids themselves
+        boundary = (
+            self.supabase_client.table(table)
+            .select("id")
+            .eq("source_id", source_id)
+            .order("id")
+            .range(batch_size - 1, batch_size - 1)
+            .execute()
+        )
+        query = self.supabase_client.table(table).delete(count="exact", returning="minimal").eq("source_id", source_id)
+        if boundary.data:
+            query = query.lte("id", boundary.data[0]["id"])
+        result = query.execute()
+        return result.count or 0, bool(boundary.data)
+
     def update_source_metadata(
         self,
         source_id: str,
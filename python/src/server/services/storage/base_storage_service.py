@@ -8,16 +8,24 @@ Provides common functionality for all document storage operations including:
 - Progress reporting
 """
 
+import asyncio
 import re
 from abc import ABC, abstractmethod
 from collections.abc import Callable
+from concurrent.futures.process import BrokenProcessPool
 from typing import Any
 from urllib.parse import urlparse
 
 from ...config.logfire_config import get_logger, safe_span
+from ..text_processing.chunking import chunk_documents, smart_chunk_text
 
 logger = get_logger(__name__)
 
+# Document batches at least this large are chunked in the process pool
+PROCESS_POOL_MIN_DOCUMENTS = 20
+# Characters of text sent to a worker process per task
+PROCESS_BATCH_CHARS = 1_000_000
+
 
 class BaseStorageService(ABC):
     """Base class for all storage services with common functionality."""
@@ -40,11 +48,7 @@ class BaseStorageService(ABC):
         """
         Split text into chunks intelligently, preserving context.
 
-        This function implements a context-aware chunking strategy that:
-        1. Preserves code blocks (```) as complete units when possible
-        2. Prefers to break at paragraph boundaries (\\n\\n)
-        3. Falls back to sentence boundaries (. ) if needed
-        4. Only splits mid-content when absolutely necessary
+        See the module-level smart_chunk_text for the strategy.
 
         Args:
             text: Text to chunk
@@ -57,67 +61,7 @@ class BaseStorageService(ABC):
             logger.warning("Invalid text provided for chunking")
             return []
 
-        chunks = []
-        start = 0
-        text_length = len(text)
-
-        while start < text_length:
-            # Determine the end of this chunk
-            end = start + chunk_size
-
-            # If we're at the end of the text, take what's left
-            if end >= text_length:
-                chunk = text[start:].strip()
-                if chunk:
-                    chunks.append(chunk)
-                break
-
-            # Try to find a good break point
-            chunk = text[start:end]
-
-            # First, try to break at a code block boundary
-            code_block_pos = chunk.rfind("```")
-            if code_block_pos != -1 and code_block_pos > chunk_size * 0.3:
-                end = start + code_block_pos
-
-            # If no code block, try paragraph break
-            elif "\n\n" in chunk:
-                last_break = chunk.rfind("\n\n")
-                if last_break > chunk_size * 0.3:
-                    end = start + last_break
-
-            # If no paragraph break, try sentence break
-            elif ". " in chunk:
-                last_period = chunk.rfind(". ")
-                if last_period > chunk_size * 0.3:
-                    end = start + last_period + 1
-
-            # Extract chunk and clean it up
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
-
-            # Move start position for next chunk
-            start = end
-
-        # Combine consecutive small chunks (<200 chars) together
-        if chunks:
-            combined_chunks: list[str] = []
-            i = 0
-            while i < len(chunks):
-                current = chunks[i]
-
-                # Keep combining while current is small and there are more chunks
-                while len(current) < 200 and i + 1 < len(chunks):
-                    i += 1
-                    current = current + "\n\n" + chunks[i]
-
-                combined_chunks.append(current)
-                i += 1
-
-            chunks = combined_chunks
-
-        return chunks
+        return smart_chunk_text(text, chunk_size)
 
     async def smart_chunk_text_async(
         self, text: str, chunk_size: int = 5000, progress_callback: Callable | None = None
@@ -163,6 +107,85 @@ class BaseStorageService(ABC):
                 logger.error(f"Error chunking text: {e}")
                 raise
 
+    async def chunk_documents_async(
+        self,
+        texts: list[str],
+        chunk_size: int = 5000,
+        cancellation_check: Callable[[], None] | None = None,
+    ) -> list[list[tuple[str, int]]]:
+        """
+        Chunk many documents, spreading large batches across CPU cores.
+
+        smart_chunk_text is pure Python, so threads only take turns on the GIL. Batches
+        of PROCESS_POOL_MIN_DOCUMENTS or more are split into tasks of about
+        PROCESS_BATCH_CHARS characters that run in the shared process pool; smaller
+        ones are chunked document by document with smart_chunk_text_async.
+
+        Args:
+            texts: Document texts to chunk
+            chunk_size: Maximum chunk size
+            cancellation_check: Optional function to check for cancellation between tasks
+
+        Returns:
+            One list of (chunk, word_count) pairs per text, in input order
+        """
+        if len(texts) < PROCESS_POOL_MIN_DOCUMENTS:
+            results = []
+            for text in texts:
+                if cancellation_check:
+                    cancellation_check()
+                chunks = await self.smart_chunk_text_async(text, chunk_size=chunk_size)
+                results.append([(chunk, len(chunk.split())) for chunk in chunks])
+            return results
+
+        batches: list[list[str]] = [[]]
+        batch_chars = 0
+        for text in texts:
+            if batches[-1] and batch_chars + len(text) > PROCESS_BATCH_CHARS:
+                batches.append([])
+                batch_chars = 0
+            batches[-1].append(text)
+            batch_chars += len(text)
+
+        with safe_span("chunk_documents_async", documents=len(texts), batches=len(batches)) as span:
+            batch_results: list[list[list[tuple[str, int]]]] = [[] for _ in batches]
+            pending: dict[asyncio.Task, int] = {}
+            max_parallel = self.threading_service.config.process_workers
+
+            async def collect(done: set[asyncio.Task]) -> None:
+                for task in done:
+                    batch_results[pending.pop(task)] = task.result()
+
+            try:
+                for index, batch in enumerate(batches):
+                    if cancellation_check:
+                        cancellation_check()
+                    if len(pending) >= max_parallel:
+                        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        await collect(done)
+                    pending[asyncio.create_task(self._chunk_batch(batch, chunk_size))] = index
+
+                while pending:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    await collect(done)
+            finally:
+                for task in pending:
+                    task.cancel()
+
+            results = [document for batch in batch_results for document in batch]
+            span.set_attribute("chunks_created", sum(len(document) for document in results))
+
+        logger.info(f"Chunked {len(texts)} documents in {len(batches)} process pool batches")
+        return results
+
+    async def _chunk_batch(self, texts: list[str], chunk_size: int) -> list[list[tuple[str, int]]]:
+        """Chunk one batch in the process pool, falling back to a thread if a worker died."""
+        try:
+            return await self.threading_service.run_in_process(chunk_documents, texts, chunk_size)
+        except BrokenProcessPool as e:
+            logger.error(f"Chunking worker died, chunking in a thread instead | error={e}")
+            return await asyncio.to_thread(chunk_documents, texts, chunk_size)
+
     def extract_metadata(
         self, chunk: str, base_metadata: dict[str, Any] | None = None
     ) -> dict[str, Any]:
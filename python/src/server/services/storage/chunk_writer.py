@@ -0,0 +1,182 @@
+"""
+Chunk Writers
+
+Pluggable backends that write embedded chunk rows into archon_crawled_pages and
+archon_code_examples.
+
+- PostgrestChunkWriter inserts rows through the Supabase client (JSON over HTTP).
+- CopyChunkWriter streams rows with binary COPY into a temporary staging table
+  over the shared asyncpg pool, then inserts them into the target table with
+  INSERT ... SELECT in the same transaction (a plain insert, like PostgREST). Embeddings travel as binary float4 arrays and are cast to
+  vector inside Postgres, so they are never serialized as JSON text.
+
+The CHUNK_STORAGE_WRITER setting ('postgrest' or 'copy') selects the backend.
+COPY needs SUPABASE_DB_URL; without it the PostgREST writer is used.
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Any
+
+from ...config.logfire_config import search_logger
+
+# Embedding columns a row may carry; exactly one is set per row
+EMBEDDING_COLUMNS = ("embedding_384", "embedding_768", "embedding_1024", "embedding_1536", "embedding_3072")
+
+# Non-embedding columns per table as (name, staging type, cast applied when inserting)
+_TABLE_COLUMNS: dict[str, tuple[tuple[str, str, str], ...]] = {
+    "archon_crawled_pages": (
+        ("url", "text", ""),
+        ("chunk_number", "integer", ""),
+        ("content", "text", ""),
+        ("content_hash", "text", ""),
+        ("metadata", "text", "::jsonb"),
+        ("source_id", "text", ""),
+        ("llm_chat_model", "text", ""),
+        ("embedding_model", "text", ""),
+        ("embedding_dimension", "integer", ""),
+        ("page_id", "text", "::uuid"),
+    ),
+    "archon_code_examples": (
+        ("url", "text", ""),
+        ("chunk_number", "integer", ""),
+        ("content", "text", ""),
+        ("summary", "text", ""),
+        ("metadata", "text", "::jsonb"),
+        ("source_id", "text", ""),
+        ("llm_chat_model", "text", ""),
+        ("embedding_model", "text", ""),
+        ("embedding_dimension", "integer", ""),
+    ),
+}
+
+STAGING_TABLE = "archon_chunk_staging"
+
+
+class ChunkWriter(ABC):
+    """Base class for chunk storage backends."""
+
+    name = "base"
+
+    @abstractmethod
+    async def write(self, table: str, records: list[dict[str, Any]]) -> int:
+        """
+        Write chunk rows to a table.
+
+        Args:
+            table: archon_crawled_pages or archon_code_examples
+            records: Rows keyed by column name, each with one embedding column
+
+        Returns:
+            Number of rows written
+        """
+
+
+class PostgrestChunkWriter(ChunkWriter):
+    """Insert rows through the Supabase client."""
+
+    name = "postgrest"
+
+    def __init__(self, client):
+        self.client = client
+
+    async def write(self, table: str, records: list[dict[str, Any]]) -> int:
+        if not records:
+            return 0
+        self.client.table(table).insert(records).execute()
+        return len(records)
+
+
+class CopyChunkWriter(ChunkWriter):
+    """Stream rows with binary COPY into a staging table and insert them from there."""
+
+    name = "copy"
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def write(self, table: str, records: list[dict[str, Any]]) -> int:
+        if not records:
+            return 0
+        columns = _TABLE_COLUMNS.get(table)
+        if columns is None:
+            raise ValueError(f"Unsupported table for COPY ingestion: {table}")
+
+        # Rows are inserted one embedding column at a time (usually there is only one)
+        rows_by_column: dict[str, list[tuple]] = {}
+        for record in records:
+            embedding_column = _get_embedding_column(record)
+            rows_by_column.setdefault(embedding_column, []).append(_to_staging_row(record, columns))
+
+        column_names = [name for name, _type, _cast in columns]
+        staging_columns = ", ".join(f"{name} {type_}" for name, type_, _cast in columns)
+        select_list = ", ".join(f"{name}{cast}" for name, _type, cast in columns)
+
+        async with self.pool.acquire() as connection, connection.transaction():
+            await connection.execute(
+                f"CREATE TEMP TABLE {STAGING_TABLE} ({staging_columns}, embedding real[]) ON COMMIT DROP"
+            )
+            for embedding_column, rows in rows_by_column.items():
+                await connection.copy_records_to_table(
+                    STAGING_TABLE, records=rows, columns=[*column_names, "embedding"]
+                )
+                await connection.execute(
+                    f"INSERT INTO {table} ({', '.join(column_names)}, {embedding_column}) "
+                    f"SELECT {select_list}, embedding::vector FROM {STAGING_TABLE}"
+                )
+                await connection.execute(f"TRUNCATE {STAGING_TABLE}")
+
+        return len(records)
+
+
+def _get_embedding_column(record: dict[str, Any]) -> str:
+    for column in EMBEDDING_COLUMNS:
+        if record.get(column) is not None:
+            return column
+    raise ValueError(f"Row for {record.get('url')} has no supported embedding column")
+
+
+def _to_staging_row(record: dict[str, Any], columns: tuple[tuple[str, str, str], ...]) -> tuple:
+    values = []
+    for name, _type, _cast in columns:
+        value = record.get(name)
+        if name == "metadata":
+            value = json.dumps(value or {})
+        elif name == "page_id" and value is not None:
+            value = str(value)
+        values.append(value)
+    embedding = record[_get_embedding_column(record)]
+    values.append(embedding.tolist() if hasattr(embedding, "tolist") else embedding)
+    return tuple(values)
+
+
+async def get_chunk_writer(client) -> ChunkWriter:
+    """
+    Get the chunk writer selected by the CHUNK_STORAGE_WRITER setting.
+
+    Args:
+        client: Supabase client used by the PostgREST writer
+
+    Returns:
+        A CopyChunkWriter when 'copy' is selected and a database pool is available,
+        otherwise a PostgrestChunkWriter
+    """
+    try:
+        from ..credential_service import credential_service
+
+        setting = await credential_service.get_credential("CHUNK_STORAGE_WRITER", "postgrest")
+    except Exception:
+        setting = os.getenv("CHUNK_STORAGE_WRITER", "postgrest")
+
+    if str(setting or "").strip().lower() == CopyChunkWriter.name:
+        from ..search.search_rpc import get_search_pool
+
+        pool = await get_search_pool()
+        if pool is not None:
+            return CopyChunkWriter(pool)
+        search_logger.warning(
+            "CHUNK_STORAGE_WRITER=copy needs the SUPABASE_DB_URL pool, which is unavailable; "
+            "storing chunks through PostgREST"
+        )
+    return PostgrestChunkWriter(client)
@@ -0,0 +1,145 @@
+"""
+Code Deduplication
+
+Near-duplicate detection for extracted code examples.
+
+Instead of comparing every code block with every other one, each block's
+normalized code is cut into character shingles and summarized by a MinHash
+signature. Signatures are split into bands and hashed into buckets
+(locality-sensitive hashing): blocks that share a bucket are likely similar and
+become candidates. The exact SequenceMatcher ratio is then only computed for
+candidate pairs, which keeps deduplication near-linear in the number of blocks.
+"""
+
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+import numpy as np
+
+# Blocks at least this similar (SequenceMatcher ratio of the normalized code) are variants
+SIMILARITY_THRESHOLD = 0.85
+
+# Character shingle length
+SHINGLE_SIZE = 5
+# 32 bands of 4 rows: pairs whose shingle sets have a Jaccard similarity of 0.5 share
+# a bucket with ~87% probability, at 0.6 with ~99%. Ratio-0.85 variants sit well above.
+LSH_BANDS = 32
+LSH_ROWS = 4
+NUM_PERMUTATIONS = LSH_BANDS * LSH_ROWS
+
+_HASH_BASE = np.uint64(1099511628211)
+_rng = np.random.default_rng(0x5EED)
+# Multiply-shift hash family: odd multipliers, random offsets, top 32 bits kept
+_PERMUTATION_A = _rng.integers(1, 2**63, size=NUM_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_PERMUTATION_B = _rng.integers(0, 2**63, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_NORMALIZATION_RULES = tuple(
+    (re.compile(pattern), replacement)
+    for pattern, replacement in (
+        # Handle typing imports variations
+        (r"from typing_extensions import", "from typing import"),
+        (r"from typing import Annotated[^,\n]*,?", ""),
+        (r"from typing_extensions import Annotated[^,\n]*,?", ""),
+        # Annotated[type, dependency] -> type
+        (r"Annotated\[\s*([^,\]]+)[^]]*\]", r"\1"),
+        # Normalize common FastAPI parameter patterns
+        (r":\s*Annotated\[[^\]]+\]\s*=", "="),
+        # Remove trailing commas
+        (r",\s*\)", ")"),
+        (r",\s*]", "]"),
+    )
+)
+
+
+def normalize_code_for_comparison(code: str) -> str:
+    """
+    Normalize code for similarity comparison by removing version-specific variations.
+
+    Args:
+        code: The code string to normalize
+
+    Returns:
+        Normalized code string for comparison
+    """
+    normalized = _WHITESPACE_RE.sub(" ", code.strip())
+    for pattern, replacement in _NORMALIZATION_RULES:
+        normalized = pattern.sub(replacement, normalized)
+    return normalized
+
+
+def _shingle_hashes(text: str) -> np.ndarray:
+    """Rolling polynomial hashes of every SHINGLE_SIZE-byte window of the text."""
+    data = np.frombuffer(text.encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+    if len(data) < SHINGLE_SIZE:
+        # Too short to shingle: the whole text is the only shingle
+        data = np.concatenate([data, np.zeros(SHINGLE_SIZE - len(data), dtype=np.uint64)])
+
+    count = len(data) - SHINGLE_SIZE + 1
+    hashes = np.zeros(count, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for offset in range(SHINGLE_SIZE):
+            hashes = hashes * _HASH_BASE + data[offset : offset + count]
+    return np.unique(hashes)
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """MinHash signature (NUM_PERMUTATIONS values) of the text's shingle set."""
+    hashes = _shingle_hashes(text)
+    with np.errstate(over="ignore"):
+        permuted = (_PERMUTATION_A[:, None] * hashes[None, :] + _PERMUTATION_B[:, None]) >> np.uint64(32)
+    return permuted.min(axis=1)
+
+
+def group_near_duplicates(codes: list[str], threshold: float = SIMILARITY_THRESHOLD) -> list[list[int]]:
+    """
+    Group code strings that are near-duplicates of each other.
+
+    Groups are built greedily in input order: each code that is not yet grouped
+    starts a group and collects every later, ungrouped code whose similarity to it
+    reaches the threshold. Only pairs that share an LSH bucket are compared.
+
+    Args:
+        codes: Code strings to group
+        threshold: Minimum SequenceMatcher ratio of the normalized code
+
+    Returns:
+        Groups of indices into codes, every index in exactly one group, in input order
+    """
+    normalized = [normalize_code_for_comparison(code) for code in codes]
+
+    buckets: dict[tuple[int, bytes], list[int]] = defaultdict(list)
+    band_keys: list[list[tuple[int, bytes]]] = []
+    for index, text in enumerate(normalized):
+        signature = minhash_signature(text)
+        keys = [
+            (band, signature[band * LSH_ROWS : (band + 1) * LSH_ROWS].tobytes()) for band in range(LSH_BANDS)
+        ]
+        for key in keys:
+            buckets[key].append(index)
+        band_keys.append(keys)
+
+    grouped = [False] * len(codes)
+    groups = []
+    for index, text in enumerate(normalized):
+        if grouped[index]:
+            continue
+        grouped[index] = True
+        group = [index]
+
+        candidates = sorted(
+            {other for key in band_keys[index] for other in buckets[key] if other > index and not grouped[other]}
+        )
+        if candidates:
+            matcher = SequenceMatcher(None, text)
+            for other in candidates:
+                matcher.set_seq2(normalized[other])
+                # quick_ratio() bounds ratio() from above and is far cheaper
+                if matcher.real_quick_ratio() >= threshold and matcher.quick_ratio() >= threshold and (
+                    matcher.ratio() >= threshold
+                ):
+                    grouped[other] = True
+                    group.append(other)
+        groups.append(group)
+    return groups
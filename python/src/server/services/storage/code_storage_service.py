@@ -11,7 +11,6 @@ import re
 import time
 from collections import defaultdict, deque
 from collections.abc import Callable
-from difflib import SequenceMatcher
 from typing import Any
 from urllib.parse import urlparse
 
@@ -28,6 +27,8 @@ from ..llm_provider_service import (
     prepare_chat_completion_params,
     synthesize_json_from_reasoning,
 )
+from .chunk_writer import get_chunk_writer
+from .code_dedup import group_near_duplicates
 
 
 def _extract_json_payload(raw_response: str, context_code: str = "", language: str = "") -> str:
@@ -127,60 +128,6 @@ def _get_max_workers() -> int:
     return int(os.getenv("CONTEXTUAL_EMBEDDINGS_MAX_WORKERS", "3"))
 
 
-def _normalize_code_for_comparison(code: str) -> str:
-    """
-    Normalize code for similarity comparison by removing version-specific variations.
-
-    Args:
-        code: The code string to normalize
-
-    Returns:
-        Normalized code string for comparison
-    """
-    # Remove extra whitespace and normalize line endings
-    normalized = re.sub(r"\s+", " ", code.strip())
-
-    # Remove common version-specific imports that don't change functionality
-    # Handle typing imports variations
-    normalized = re.sub(r"from typing_extensions import", "from typing import", normalized)
-    normalized = re.sub(r"from typing import Annotated[^,\n]*,?", "", normalized)
-    normalized = re.sub(r"from typing_extensions import Annotated[^,\n]*,?", "", normalized)
-
-    # Remove Annotated wrapper variations for comparison
-    # This handles: Annotated[type, dependency] -> type
-    normalized = re.sub(r"Annotated\[\s*([^,\]]+)[^]]*\]", r"\1", normalized)
-
-    # Normalize common FastAPI parameter patterns
-    normalized = re.sub(r":\s*Annotated\[[^\]]+\]\s*=", "=", normalized)
-
-    # Remove trailing commas and normalize punctuation spacing
-    normalized = re.sub(r",\s*\)", ")", normalized)
-    normalized = re.sub(r",\s*]", "]", normalized)
-
-    return normalized
-
-
-def _calculate_code_similarity(code1: str, code2: str) -> float:
-    """
-    Calculate similarity between two code strings using normalized comparison.
-
-    Args:
-        code1: First code string
-        code2: Second code string
-
-    Returns:
-        Similarity ratio between 0.0 and 1.0
-    """
-    # Normalize both code strings for comparison
-    norm1 = _normalize_code_for_comparison(code1)
-    norm2 = _normalize_code_for_comparison(code2)
-
-    # Use difflib's SequenceMatcher for similarity calculation
-    similarity = SequenceMatcher(None, norm1, norm2).ratio()
-
-    return similarity
-
-
 def _select_best_code_variant(similar_blocks: list[dict[str, Any]]) -> dict[str, Any]:
     """
     Select the best variant from a list of similar code blocks.
@@ -239,6 +186,33 @@ def _select_best_code_variant(similar_blocks: list[dict[str, Any]]) -> dict[str,
     return best_block
 
 
+def deduplicate_code_blocks(code_blocks: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Collapse near-duplicate code blocks into their best variant.
+
+    Args:
+        code_blocks: Code block dictionaries with a "code" key
+
+    Returns:
+        One block per group of similar blocks, in the order the groups first appear
+    """
+    if not code_blocks:
+        return code_blocks
+
+    search_logger.debug(f"Starting deduplication process for {len(code_blocks)} code blocks")
+
+    groups = group_near_duplicates([block["code"] for block in code_blocks])
+    grouped_blocks = [_select_best_code_variant([code_blocks[i] for i in group]) for group in groups]
+
+    deduplicated_count = len(code_blocks) - len(grouped_blocks)
+    if deduplicated_count > 0:
+        search_logger.info(
+            f"Code deduplication: removed {deduplicated_count} duplicate variants, kept {len(grouped_blocks)} unique code blocks"
+        )
+
+    return grouped_blocks
+
+
 
 def extract_code_blocks(markdown_content: str, min_length: int = None) -> list[dict[str, Any]]:
     """
@@ -530,47 +504,7 @@ def extract_code_blocks(markdown_content: str, min_length: int = None) -> list[d
         i += 2
 
     # Apply deduplication logic to remove similar code variants
-    if not code_blocks:
-        return code_blocks
-
-    search_logger.debug(f"Starting deduplication process for {len(code_blocks)} code blocks")
-
-    # Group similar code blocks together
-    similarity_threshold = 0.85  # 85% similarity threshold
-    grouped_blocks = []
-    processed_indices = set()
-
-    for i, block1 in enumerate(code_blocks):
-        if i in processed_indices:
-            continue
-
-        # Start a new group with this block
-        similar_group = [block1]
-        processed_indices.add(i)
-
-        # Find all similar blocks
-        for j, block2 in enumerate(code_blocks):
-            if j <= i or j in processed_indices:
-                continue
-
-            similarity = _calculate_code_similarity(block1["code"], block2["code"])
-
-            if similarity >= similarity_threshold:
-                similar_group.append(block2)
-                processed_indices.add(j)
-                search_logger.debug(f"Found similar code blocks with {similarity:.2f} similarity")
-
-        # Select the best variant from the similar group
-        best_variant = _select_best_code_variant(similar_group)
-        grouped_blocks.append(best_variant)
-
-    deduplicated_count = len(code_blocks) - len(grouped_blocks)
-    if deduplicated_count > 0:
-        search_logger.info(
-            f"Code deduplication: removed {deduplicated_count} duplicate variants, kept {len(grouped_blocks)} unique code blocks"
-        )
-
-    return grouped_blocks
+    return deduplicate_code_blocks(code_blocks)
 
 
 def generate_code_example_summary(
@@ -1188,6 +1122,9 @@ async def add_code_examples_to_supabase(
         f"Using contextual embeddings for code examples: {use_contextual_embeddings}"
     )
 
+    # Backend that writes the embedded rows (PostgREST or COPY, see chunk_writer)
+    writer = await get_chunk_writer(client)
+
     # Process in batches
     total_items = len(urls)
     for i in range(0, total_items, batch_size):
@@ -1345,7 +1282,7 @@ async def add_code_examples_to_supabase(
 
         for retry in range(max_retries):
             try:
-                client.table("archon_code_examples").insert(batch_data).execute()
+                await writer.write("archon_code_examples", batch_data)
                 # Success - break out of retry loop
                 break
             except Exception as e:
@@ -1364,7 +1301,7 @@ async def add_code_examples_to_supabase(
                     successful_inserts = 0
                     for record in batch_data:
                         try:
-                            client.table("archon_code_examples").insert(record).execute()
+                            await writer.write("archon_code_examples", [record])
                             successful_inserts += 1
                         except Exception as individual_error:
                             search_logger.error(
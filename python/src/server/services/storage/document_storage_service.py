@@ -5,12 +5,111 @@ Handles storage of documents in Supabase with parallel processing support.
 """
 
 import asyncio
+import hashlib
 import os
 from typing import Any
 
 from ...config.logfire_config import safe_span, search_logger
+from ..credential_service import credential_service
 from ..embeddings.contextual_embedding_service import generate_contextual_embeddings_batch
 from ..embeddings.embedding_service import create_embeddings_batch
+from .chunk_writer import get_chunk_writer
+
+
+def compute_content_hash(content: str) -> str:
+    """Return the SHA256 hex digest used to detect changed pages and chunks."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _diff_against_existing_chunks(
+    client,
+    urls: list[str],
+    chunk_numbers: list[int],
+    contents: list[str],
+    fetch_batch_size: int,
+) -> tuple[list[int], list[int], int]:
+    """
+    Compare fresh chunks with the rows already stored for the same URLs.
+
+    A chunk is unchanged when a row exists at the same (url, chunk_number) with
+    the same content_hash. Those rows keep their content and vectors.
+
+    Returns:
+        (indices of chunks to insert, ids of stale rows to delete, unchanged count)
+    """
+    existing: dict[tuple[str, int], tuple[Any, str | None]] = {}
+    unique_urls = list(dict.fromkeys(urls))
+    for i in range(0, len(unique_urls), fetch_batch_size):
+        response = (
+            client.table("archon_crawled_pages")
+            .select("id, url, chunk_number, content_hash")
+            .in_("url", unique_urls[i : i + fetch_batch_size])
+            .execute()
+        )
+        for row in response.data or []:
+            existing[(row["url"], row["chunk_number"])] = (row["id"], row.get("content_hash"))
+
+    to_insert: list[int] = []
+    kept_keys: set[tuple[str, int]] = set()
+    for index, (url, chunk_number, content) in enumerate(zip(urls, chunk_numbers, contents, strict=False)):
+        key = (url, chunk_number)
+        stored = existing.get(key)
+        if stored and stored[1] and stored[1] == compute_content_hash(content):
+            kept_keys.add(key)
+        else:
+            to_insert.append(index)
+
+    stale_ids = [row_id for key, (row_id, _hash) in existing.items() if key not in kept_keys]
+    return to_insert, stale_ids, len(kept_keys)
+
+
+async def get_embedding_fingerprint(provider: str | None, use_contextual_embeddings: bool) -> str:
+    """
+    Describe how chunk vectors are produced: provider, model, dimensions and contextual flag.
+
+    Stored with each chunk so incremental recrawls can tell whether kept vectors
+    still match the current embedding configuration.
+    """
+    from ..llm_provider_service import get_embedding_model
+
+    if not provider:
+        provider_config = await credential_service.get_active_provider("embedding")
+        provider = provider_config.get("provider") or "openai"
+    rag_settings = await credential_service.get_credentials_by_category("rag_strategy")
+    dimensions = int(rag_settings.get("EMBEDDING_DIMENSIONS", "1536") or 0)
+    model = await get_embedding_model(provider=provider)
+    return f"{provider}|{model}|{dimensions}|{'contextual' if use_contextual_embeddings else 'plain'}"
+
+
+async def stored_embeddings_match(client, source_id: str, provider: str | None = None) -> bool:
+    """
+    Check whether every stored chunk of a source was embedded with the current configuration.
+
+    Incremental recrawls keep unchanged chunks' vectors, which is only valid if
+    the embedding provider, model, dimensions and contextual setting are the same.
+
+    Returns:
+        False if any chunk has a different (or no) embedding fingerprint
+    """
+    try:
+        contextual = await credential_service.get_credential("USE_CONTEXTUAL_EMBEDDINGS", "false", decrypt=True)
+        use_contextual_embeddings = str(contextual).lower() == "true"
+        fingerprint = await get_embedding_fingerprint(provider, use_contextual_embeddings)
+        response = (
+            client.table("archon_crawled_pages")
+            .select("id")
+            .eq("source_id", source_id)
+            .or_(
+                "metadata->>embedding_fingerprint.is.null,"
+                f'metadata->>embedding_fingerprint.neq."{fingerprint}"'
+            )
+            .limit(1)
+            .execute()
+        )
+        return not response.data
+    except Exception as e:
+        search_logger.warning(f"Could not compare stored embeddings for {source_id}: {e}")
+        return False
 
 
 async def add_documents_to_supabase(
@@ -26,12 +125,16 @@ async def add_documents_to_supabase(
     provider: str | None = None,
     cancellation_check: Any | None = None,
     url_to_page_id: dict[str, str] | None = None,
+    incremental: bool = False,
 ) -> dict[str, int]:
     """
     Add documents to Supabase with threading optimizations.
 
     This is the simpler sequential version for smaller batches.
 
+    In incremental mode only chunks whose content hash changed are deleted,
+    re-embedded and inserted; unchanged chunks keep their existing rows.
+
     Args:
         client: Supabase client
         urls: List of URLs
@@ -42,6 +145,7 @@ async def add_documents_to_supabase(
         batch_size: Size of each batch for insertion
         progress_callback: Optional async callback function for progress reporting
         provider: Optional provider override for embeddings
+        incremental: Diff against stored chunk hashes instead of replacing every chunk
     """
     with safe_span(
         "add_documents_to_supabase", total_documents=len(contents), batch_size=batch_size
@@ -77,8 +181,40 @@ async def add_documents_to_supabase(
             delete_batch_size = max(1, 50)
             # enable_parallel = True
 
-        # Get unique URLs to delete existing records
-        unique_urls = list(set(urls))
+        chunks_unchanged = 0
+        chunks_deleted = 0
+
+        if incremental and urls:
+            try:
+                to_insert, stale_ids, chunks_unchanged = _diff_against_existing_chunks(
+                    client, urls, chunk_numbers, contents, delete_batch_size
+                )
+                # Remove only changed or vanished chunks, by id
+                for i in range(0, len(stale_ids), delete_batch_size):
+                    if cancellation_check:
+                        cancellation_check()
+                    client.table("archon_crawled_pages").delete().in_(
+                        "id", stale_ids[i : i + delete_batch_size]
+                    ).execute()
+                chunks_deleted = len(stale_ids)
+
+                urls = [urls[k] for k in to_insert]
+                chunk_numbers = [chunk_numbers[k] for k in to_insert]
+                contents = [contents[k] for k in to_insert]
+                metadatas = [metadatas[k] for k in to_insert]
+                search_logger.info(
+                    f"Incremental storage: {len(contents)} changed, {chunks_unchanged} unchanged, "
+                    f"{chunks_deleted} stale rows deleted"
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                search_logger.warning(f"Incremental diff failed: {e}. Falling back to full replace.")
+                incremental = False
+                chunks_unchanged = 0
+
+        # Get unique URLs to delete existing records (incremental mode already removed stale rows)
+        unique_urls = [] if incremental else list(set(urls))
 
         # Delete existing records for these URLs in batches
         try:
@@ -154,6 +290,16 @@ async def add_documents_to_supabase(
             # Fallback to environment variable
             use_contextual_embeddings = os.getenv("USE_CONTEXTUAL_EMBEDDINGS", "false") == "true"
 
+        # Backend that writes the embedded rows (PostgREST or COPY, see chunk_writer)
+        writer = await get_chunk_writer(client)
+
+        # Recorded with each chunk so incremental recrawls can detect embedding config changes
+        try:
+            embedding_fingerprint = await get_embedding_fingerprint(provider, use_contextual_embeddings)
+        except Exception as e:
+            search_logger.warning(f"Could not determine embedding fingerprint: {e}")
+            embedding_fingerprint = None
+
         # Initialize batch tracking for simplified progress
         completed_batches = 0
         total_batches = (len(contents) + batch_size - 1) // batch_size
@@ -331,7 +477,6 @@ async def add_documents_to_supabase(
             
             # Get model information for tracking
             from ..llm_provider_service import get_embedding_model
-            from ..credential_service import credential_service
             
             # Get embedding model name
             embedding_model_name = await get_embedding_model(provider=provider)
@@ -407,7 +552,12 @@ async def add_documents_to_supabase(
                     "url": batch_urls[j],
                     "chunk_number": batch_chunk_numbers[j],
                     "content": text,  # Use the successful text
-                    "metadata": {"chunk_size": len(text), **batch_metadatas[j]},
+                    "content_hash": compute_content_hash(batch_contents[j]),  # Hash of the raw chunk
+                    "metadata": {
+                        "chunk_size": len(text),
+                        **batch_metadatas[j],
+                        **({"embedding_fingerprint": embedding_fingerprint} if embedding_fingerprint else {}),
+                    },
                     "source_id": source_id,
                     embedding_column: embedding,  # Use the successful embedding with correct column
                     "llm_chat_model": llm_chat_model,  # Add LLM model tracking
@@ -439,8 +589,7 @@ async def add_documents_to_supabase(
                         raise
 
                 try:
-                    client.table("archon_crawled_pages").insert(batch_data).execute()
-                    total_chunks_stored += len(batch_data)
+                    total_chunks_stored += await writer.write("archon_crawled_pages", batch_data)
 
                     # Increment completed batches and report simple progress
                     completed_batches += 1
@@ -497,7 +646,7 @@ async def add_documents_to_supabase(
                                     raise
 
                             try:
-                                client.table("archon_crawled_pages").insert(record).execute()
+                                await writer.write("archon_crawled_pages", [record])
                                 successful_inserts += 1
                                 total_chunks_stored += 1
                             except Exception as individual_error:
@@ -538,5 +687,10 @@ async def add_documents_to_supabase(
         span.set_attribute("success", True)
         span.set_attribute("total_processed", len(contents))
         span.set_attribute("total_stored", total_chunks_stored)
+        span.set_attribute("chunks_unchanged", chunks_unchanged)
 
-        return {"chunks_stored": total_chunks_stored}
+        return {
+            "chunks_stored": total_chunks_stored,
+            "chunks_unchanged": chunks_unchanged,
+            "chunks_deleted": chunks_deleted,
+        }
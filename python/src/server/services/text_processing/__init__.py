@@ -0,0 +1,9 @@
+"""
+Text Processing
+
+Pure, CPU-bound text functions (document chunking, code block extraction) that
+run in ThreadingService's process pool as well as inline.
+
+Spawned workers import these modules by name, so this package must stay light:
+no re-exports here, and the modules only import the standard library and lxml.
+"""
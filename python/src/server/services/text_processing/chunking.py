@@ -0,0 +1,103 @@
+"""
+Document Chunking
+
+Context-aware text chunking used by the storage services. Module-level and free
+of I/O so batches can be pickled to the process pool.
+"""
+
+
+def smart_chunk_text(text: str, chunk_size: int = 5000) -> list[str]:
+    """
+    Split text into chunks intelligently, preserving context.
+
+    This function implements a context-aware chunking strategy that:
+    1. Preserves code blocks (```) as complete units when possible
+    2. Prefers to break at paragraph boundaries (\\n\\n)
+    3. Falls back to sentence boundaries (. ) if needed
+    4. Only splits mid-content when absolutely necessary
+
+    Args:
+        text: Text to chunk
+        chunk_size: Maximum chunk size (default: 5000)
+
+    Returns:
+        List of text chunks
+    """
+    if not text or not isinstance(text, str):
+        return []
+
+    chunks = []
+    start = 0
+    text_length = len(text)
+
+    while start < text_length:
+        # Determine the end of this chunk
+        end = start + chunk_size
+
+        # If we're at the end of the text, take what's left
+        if end >= text_length:
+            chunk = text[start:].strip()
+            if chunk:
+                chunks.append(chunk)
+            break
+
+        # Try to find a good break point
+        chunk = text[start:end]
+
+        # First, try to break at a code block boundary
+        code_block_pos = chunk.rfind("```")
+        if code_block_pos != -1 and code_block_pos > chunk_size * 0.3:
+            end = start + code_block_pos
+
+        # If no code block, try paragraph break
+        elif "\n\n" in chunk:
+            last_break = chunk.rfind("\n\n")
+            if last_break > chunk_size * 0.3:
+                end = start + last_break
+
+        # If no paragraph break, try sentence break
+        elif ". " in chunk:
+            last_period = chunk.rfind(". ")
+            if last_period > chunk_size * 0.3:
+                end = start + last_period + 1
+
+        # Extract chunk and clean it up
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+
+        # Move start position for next chunk
+        start = end
+
+    # Combine consecutive small chunks (<200 chars) together
+    if chunks:
+        combined_chunks: list[str] = []
+        i = 0
+        while i < len(chunks):
+            current = chunks[i]
+
+            # Keep combining while current is small and there are more chunks
+            while len(current) < 200 and i + 1 < len(chunks):
+                i += 1
+                current = current + "\n\n" + chunks[i]
+
+            combined_chunks.append(current)
+            i += 1
+
+        chunks = combined_chunks
+
+    return chunks
+
+
+def chunk_documents(texts: list[str], chunk_size: int = 5000) -> list[list[tuple[str, int]]]:
+    """
+    Chunk a batch of documents, pairing every chunk with its word count.
+
+    Args:
+        texts: Document texts to chunk
+        chunk_size: Maximum chunk size
+
+    Returns:
+        One list of (chunk, word_count) pairs per text, in input order
+    """
+    return [[(chunk, len(chunk.split())) for chunk in smart_chunk_text(text, chunk_size)] for text in texts]
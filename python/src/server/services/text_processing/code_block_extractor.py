@@ -0,0 +1,685 @@
+"""
+Code Block Extractor
+
+CPU-bound code block extraction used by CodeExtractionService.
+
+Everything in this module is synchronous, free of I/O and logging, and takes its
+configuration as an ExtractionSettings snapshot, so the functions can run in a
+worker process as well as inline. All regular expressions are compiled once at
+import time.
+
+HTML pages are parsed with lxml and walked once: the walk builds the page's
+visible text and records where each code container (<pre>, CodeMirror and
+Monaco editors, standalone <code>) starts and ends in it. Code, context and
+block boundaries are then slices of that text, with entities already decoded
+and highlighting markup already gone.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from lxml import etree
+from lxml import html as lxml_html
+
+# Language-specific patterns for better extraction
+LANGUAGE_PATTERNS = {
+    "typescript": {
+        "block_start": r"^\s*(export\s+)?(class|interface|function|const|type|enum)\s+\w+",
+        "block_end": r"^\}(\s*;)?$",
+        "min_indicators": [":", "{", "}", "=>", "function", "class", "interface", "type"],
+    },
+    "javascript": {
+        "block_start": r"^\s*(export\s+)?(class|function|const|let|var)\s+\w+",
+        "block_end": r"^\}(\s*;)?$",
+        "min_indicators": ["function", "{", "}", "=>", "const", "let", "var"],
+    },
+    "python": {
+        "block_start": r"^\s*(class|def|async\s+def)\s+\w+",
+        "block_end": r"^\S",  # Unindented line
+        "min_indicators": ["def", ":", "return", "self", "import", "class"],
+    },
+    "java": {
+        "block_start": r"^\s*(public|private|protected)?\s*(class|interface|enum)\s+\w+",
+        "block_end": r"^\}$",
+        "min_indicators": ["class", "public", "private", "{", "}", ";"],
+    },
+    "rust": {
+        "block_start": r"^\s*(pub\s+)?(fn|struct|impl|trait|enum)\s+\w+",
+        "block_end": r"^\}$",
+        "min_indicators": ["fn", "let", "mut", "impl", "struct", "->"],
+    },
+    "go": {
+        "block_start": r"^\s*(func|type|struct)\s+\w+",
+        "block_end": r"^\}$",
+        "min_indicators": ["func", "type", "struct", "{", "}", ":="],
+    },
+}
+
+DIAGRAM_LANGUAGES = frozenset({"mermaid", "plantuml", "graphviz", "dot", "diagram"})
+
+# Minimum length of a standalone <code> element (not inside <pre>) to count as a block
+MIN_STANDALONE_CODE_LENGTH = 100
+# Characters of surrounding page text kept as context for each block
+CONTEXT_CHARS = 1000
+# Characters around a block inspected for "example" / "complete" wording
+LENGTH_CONTEXT_CHARS = 500
+
+
+@dataclass(frozen=True)
+class ExtractionSettings:
+    """Code extraction settings, resolved once per crawl and passed to the extractors."""
+
+    min_code_length: int = 250
+    max_code_length: int = 5000
+    complete_block_detection: bool = True
+    language_patterns: bool = True
+    prose_filtering: bool = True
+    max_prose_ratio: float = 0.15
+    min_code_indicators: int = 3
+    diagram_filtering: bool = True
+    contextual_length: bool = True
+
+
+# --- Minimum length -------------------------------------------------------------------------
+
+BASE_MIN_LENGTHS = {
+    "json": 100,  # JSON can be short
+    "yaml": 100,  # YAML too
+    "xml": 100,  # XML structures
+    "html": 150,  # HTML snippets
+    "css": 150,  # CSS rules
+    "sql": 150,  # SQL queries
+    "python": 200,  # Python functions
+    "javascript": 250,  # JavaScript typically longer
+    "typescript": 250,  # TypeScript typically longer
+    "java": 300,  # Java even more verbose
+    "c++": 300,  # C++ similar to Java
+    "cpp": 300,  # C++ alternative
+    "c": 250,  # C slightly less verbose
+    "rust": 250,  # Rust medium verbosity
+    "go": 200,  # Go is concise
+}
+
+
+def calculate_min_length(language: str, context: str, settings: ExtractionSettings) -> int:
+    """
+    Calculate appropriate minimum length based on language and context.
+
+    Args:
+        language: The detected programming language
+        context: Surrounding context of the code
+        settings: Extraction settings
+
+    Returns:
+        Calculated minimum length
+    """
+    if not settings.contextual_length:
+        return settings.min_code_length
+
+    min_length = BASE_MIN_LENGTHS.get(language.lower(), settings.min_code_length)
+
+    # Adjust based on context clues
+    context_lower = context.lower()
+    if any(word in context_lower for word in ("example", "snippet", "sample", "demo")):
+        min_length = int(min_length * 0.7)  # Examples can be shorter
+    elif any(word in context_lower for word in ("implementation", "complete", "full")):
+        min_length = int(min_length * 1.5)  # Full implementations should be longer
+    elif any(word in context_lower for word in ("minimal", "simple", "basic")):
+        min_length = int(min_length * 0.8)  # Simple examples can be shorter
+
+    # Ensure reasonable bounds
+    return max(100, min(1000, min_length))
+
+
+# --- Complete block detection ---------------------------------------------------------------
+
+# Natural code boundaries, combined into one alternation so each window is scanned once
+BOUNDARY_PATTERNS = (
+    r"\n}\s*$",  # Closing brace at end of line
+    r"\n}\s*;?\s*$",  # Closing brace with optional semicolon
+    r"\n\)\s*;?\s*$",  # Closing parenthesis
+    r"\n\s*$\n\s*$",  # Double newline (paragraph break)
+    r"\n(?=class\s)",  # Before next class
+    r"\n(?=function\s)",  # Before next function
+    r"\n(?=def\s)",  # Before next Python function
+    r"\n(?=export\s)",  # Before next export
+    r"\n(?=const\s)",  # Before next const declaration
+    r"\n(?=//)",  # Before comment block
+    r"\n(?=#)",  # Before Python comment
+    r"\n(?=\*)",  # Before JSDoc/comment
+    r"\n(?=```)",  # Before next code block
+)
+BOUNDARY_LOOKAHEAD_CHARS = 500
+BOUNDARY_STEP_CHARS = 100
+
+
+@lru_cache(maxsize=16)
+def _boundary_pattern(language: str, language_patterns: bool) -> re.Pattern:
+    patterns = list(BOUNDARY_PATTERNS)
+    lang_info = LANGUAGE_PATTERNS.get(language) if language_patterns else None
+    if lang_info and "block_end" in lang_info:
+        patterns.insert(0, lang_info["block_end"])
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.MULTILINE)
+
+
+def find_complete_code_block(
+    content: str,
+    start_pos: int,
+    min_length: int,
+    language: str,
+    settings: ExtractionSettings,
+) -> tuple[str, int]:
+    """
+    Find a complete code block starting from a position, extending until a natural boundary.
+
+    Args:
+        content: The full content to search in
+        start_pos: Starting position in the content
+        min_length: Minimum length for the code block
+        language: Detected language for language-specific patterns
+        settings: Extraction settings (max_code_length caps the extension)
+
+    Returns:
+        Tuple of (complete_code_block, end_position)
+    """
+    if start_pos + min_length > len(content):
+        return content[start_pos:], len(content)
+
+    boundary = _boundary_pattern(language.lower(), settings.language_patterns)
+    extended_pos = start_pos + min_length
+    while extended_pos < len(content):
+        # Check the next window for a boundary; pos/endpos avoid copying the window
+        lookahead_end = min(extended_pos + BOUNDARY_LOOKAHEAD_CHARS, len(content))
+        match = boundary.search(content, extended_pos, lookahead_end)
+        if match:
+            return content[start_pos : match.end()].rstrip(), match.end()
+
+        extended_pos += BOUNDARY_STEP_CHARS
+        if extended_pos - start_pos > settings.max_code_length:
+            break
+
+    return content[start_pos:extended_pos].rstrip(), extended_pos
+
+
+# --- Cleaning -------------------------------------------------------------------------------
+
+_SPAN_CLOSE_RE = re.compile(r"</span>")
+_SPAN_OPEN_RE = re.compile(r"<span[^>]*>")
+_SPAN_CLOSE_BEFORE_WORD_RE = re.compile(r"</span>(?=[A-Za-z0-9])")
+_ANY_TAG_RE = re.compile(r"</?[^>]+>")
+_SPACES_RE = re.compile(r" +")
+_INNER_SPACES_RE = re.compile(r" {2,}")
+
+HTML_ENTITY_REPLACEMENTS = {
+    "&lt;": "<",
+    "&gt;": ">",
+    "&amp;": "&",
+    "&quot;": '"',
+    "&#39;": "'",
+    "&nbsp;": " ",
+    "&#x27;": "'",
+    "&#x2F;": "/",
+    "&#60;": "<",
+    "&#62;": ">",
+}
+
+# Spaces lost between tokens when highlighting markup is stripped with regexes
+_SPACING_FIXES = tuple(
+    (re.compile(pattern), replacement)
+    for pattern, replacement in (
+        # Import statements
+        (r"(\b(?:from|import|as)\b)([A-Za-z])", r"\1 \2"),
+        # Function/class definitions
+        (r"(\b(?:def|class|async|await|return|raise|yield)\b)([A-Za-z])", r"\1 \2"),
+        # Control flow
+        (r"(\b(?:if|elif|else|for|while|try|except|finally|with)\b)([A-Za-z])", r"\1 \2"),
+        # Type hints and declarations
+        (r"(\b(?:int|str|float|bool|list|dict|tuple|set|None|True|False)\b)([A-Za-z])", r"\1 \2"),
+        # Common Python keywords
+        (r"(\b(?:and|or|not|in|is|lambda)\b)([A-Za-z])", r"\1 \2"),
+        # Fix missing spaces around operators (but be careful with negative numbers)
+        (r"([A-Za-z_)])(\+|-|\*|/|=|<|>|%)", r"\1 \2"),
+        (r"(\+|-|\*|/|=|<|>|%)([A-Za-z_(])", r"\1 \2"),
+    )
+)
+_PYTHON_IMPORT_FIX_RE = re.compile(r"(\b(?:from|import)\b)(\w+)(\b(?:import)\b)")
+_PYTHON_COLON_FIX_RE = re.compile(
+    r"(\b(?:def|class|if|elif|else|for|while|try|except|finally|with)\b[^:]+)$", re.MULTILINE
+)
+
+
+def decode_html_entities(text: str) -> str:
+    """Decode common HTML entities and strip HTML tags from code captured as raw markup."""
+    # Spans with no whitespace between them are syntax highlighting - strip them in place
+    if "</span><span" in text:
+        text = _SPAN_CLOSE_RE.sub("", text)
+        text = _SPAN_OPEN_RE.sub("", text)
+    else:
+        # Normal span usage - only add a space if there isn't already whitespace
+        text = _SPAN_CLOSE_BEFORE_WORD_RE.sub(" ", text)
+        text = _SPAN_OPEN_RE.sub("", text)
+
+    # Remove any other HTML tags but preserve their content
+    text = _ANY_TAG_RE.sub("", text)
+
+    for entity, char in HTML_ENTITY_REPLACEMENTS.items():
+        text = text.replace(entity, char)
+
+    # Replace escaped newlines with actual newlines
+    text = text.replace("\\n", "\n")
+
+    # Collapse runs of spaces and trim trailing spaces on every line
+    return "\n".join(_SPACES_RE.sub(" ", line).rstrip() for line in text.split("\n"))
+
+
+def repair_token_spacing(code: str, language: str = "") -> str:
+    """Re-insert spaces between tokens that were glued together by markup stripping."""
+    for pattern, replacement in _SPACING_FIXES:
+        code = pattern.sub(replacement, code)
+
+    if language.lower() in ("python", "py"):
+        code = _PYTHON_IMPORT_FIX_RE.sub(r"\1 \2 \3", code)
+        # Fix missing colons
+        code = _PYTHON_COLON_FIX_RE.sub(r"\1:", code)
+    return code
+
+
+def tidy_code(code: str) -> str:
+    """Strip stray backtick fences and collapse repeated spaces while keeping indentation."""
+    if code.startswith("```") and code.endswith("```"):
+        lines = code.split("\n")
+        if len(lines) > 2:
+            code = "\n".join(lines[1:-1])
+    elif code.startswith("`") and code.endswith("`"):
+        code = code[1:-1]
+
+    cleaned_lines = []
+    for line in code.split("\n"):
+        stripped = line.lstrip()
+        indent = line[: len(line) - len(stripped)]
+        cleaned_lines.append(indent + _INNER_SPACES_RE.sub(" ", stripped))
+    return "\n".join(cleaned_lines).strip()
+
+
+def clean_code_content(code: str, language: str = "") -> str:
+    """
+    Clean code captured as raw markup or plain text.
+
+    Args:
+        code: The code content to clean
+        language: The detected language (optional)
+
+    Returns:
+        Cleaned code content
+    """
+    return tidy_code(repair_token_spacing(decode_html_entities(code), language))
+
+
+# --- Validation -----------------------------------------------------------------------------
+
+_BAD_PATTERNS = tuple(
+    re.compile(pattern)
+    for pattern in (
+        # Concatenated keywords without spaces (but allow camelCase)
+        r"\b(from|import|def|class|if|for|while|return)(?=[a-z])",
+        # HTML entities that weren't decoded
+        r"&[lg]t;|&amp;|&quot;|&#\d+;",
+        # Very long HTML tags
+        r"<[^>]{50,}>",
+        # Multiple spans in a row (indicates poor extraction)
+        r"(<span[^>]*>){5,}",
+        # Very long unbroken strings
+        r"[^\s]{200,}",
+    )
+)
+
+_CODE_INDICATORS = tuple(
+    (name, re.compile(pattern))
+    for name, pattern in (
+        ("function_calls", r"\w+\s*\([^)]*\)"),
+        ("assignments", r"\w+\s*=\s*.+"),
+        ("control_flow", r"\b(if|for|while|switch|case|try|catch|except)\b"),
+        ("declarations", r"\b(var|let|const|def|class|function|interface|type|struct|enum)\b"),
+        ("imports", r"\b(import|from|require|include|using|use)\b"),
+        ("brackets", r"[\{\}\[\]]"),
+        ("operators", r"[\+\-\*\/\%\&\|\^<>=!]"),
+        ("method_chains", r"\.\w+"),
+        ("arrows", r"(=>|->)"),
+        ("keywords", r"\b(return|break|continue|yield|await|async)\b"),
+    )
+)
+
+# Single-line comments, docstring delimiters and JSDoc lines
+_COMMENT_LINE_RE = re.compile(r"\s*(?://|#|/\*|\*|<!--|\"\"\"|''')")
+
+_PROSE_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"\b(the|this|that|these|those|is|are|was|were|will|would|should|could|have|has|had)\b",
+        r"[.!?]\s+[A-Z]",  # Sentence endings followed by capital letter
+        r"\b(however|therefore|furthermore|moreover|nevertheless)\b",
+    )
+)
+
+
+def validate_code_quality(code: str, language: str, settings: ExtractionSettings) -> tuple[bool, str]:
+    """
+    Check that extracted content is actual code.
+
+    Args:
+        code: The code content to validate
+        language: The detected language (may be empty)
+        settings: Extraction settings
+
+    Returns:
+        Tuple of (passed, reason); the reason explains a rejection and is empty on success
+    """
+    if not code or len(code.strip()) < 20:
+        return False, "Code is empty or too short"
+
+    language = language.lower()
+    if settings.diagram_filtering and language in DIAGRAM_LANGUAGES:
+        return False, f"Skipping diagram language: {language}"
+
+    # Formatting issues that indicate poor extraction
+    for pattern in _BAD_PATTERNS:
+        if pattern.search(code):
+            return False, f"Code failed quality check: pattern '{pattern.pattern}' found"
+
+    # Minimum code complexity
+    indicator_details = [name for name, pattern in _CODE_INDICATORS if pattern.search(code)]
+    if len(indicator_details) < settings.min_code_indicators:
+        return False, (
+            f"Code has insufficient indicators: {len(indicator_details)} found ({', '.join(indicator_details)})"
+        )
+
+    lines = code.split("\n")
+    non_empty_lines = [line for line in lines if line.strip()]
+    if not non_empty_lines:
+        return False, "Code has no non-empty lines"
+
+    # Allow up to 70% comments (documentation is important)
+    comment_lines = sum(1 for line in lines if _COMMENT_LINE_RE.match(line.strip()))
+    if comment_lines / len(non_empty_lines) > 0.7:
+        return False, f"Code is mostly comments: {comment_lines}/{len(non_empty_lines)} lines"
+
+    # Language-specific indicators
+    lang_info = LANGUAGE_PATTERNS.get(language) if settings.language_patterns else None
+    if lang_info:
+        code_lower = code.lower()
+        found_lang_indicators = sum(1 for indicator in lang_info["min_indicators"] if indicator in code_lower)
+        if found_lang_indicators < 2:
+            return False, f"Code lacks {language} indicators: only {found_lang_indicators} found"
+
+    if len(non_empty_lines) < 3:
+        return False, f"Code has too few non-empty lines: {len(non_empty_lines)}"
+
+    very_long_lines = sum(1 for line in lines if len(line) > 300)
+    if very_long_lines > len(lines) * 0.5:
+        return False, "Code has too many very long lines"
+
+    if settings.prose_filtering:
+        word_count = len(code.split())
+        prose_score = sum(1 for pattern in _PROSE_PATTERNS for _ in pattern.finditer(code))
+        if word_count > 0 and prose_score / word_count > settings.max_prose_ratio:
+            return False, f"Code appears to be prose: prose_score={prose_score}, word_count={word_count}"
+
+    return True, ""
+
+
+# --- Language detection ---------------------------------------------------------------------
+
+_LANGUAGE_DETECTION_PATTERNS = {
+    language: tuple(re.compile(pattern, re.MULTILINE) for pattern in patterns)
+    for language, patterns in {
+        "python": [r"\bdef\s+\w+\s*\(", r"\bclass\s+\w+", r"\bimport\s+\w+", r"\bfrom\s+\w+\s+import"],
+        "javascript": [r"\bfunction\s+\w+\s*\(", r"\bconst\s+\w+\s*=", r"\blet\s+\w+\s*=", r"\bvar\s+\w+\s*="],
+        "typescript": [r"\binterface\s+\w+", r":\s*\w+\[\]", r"\btype\s+\w+\s*=", r"\bclass\s+\w+.*\{"],
+        "java": [r"\bpublic\s+class\s+\w+", r"\bprivate\s+\w+\s+\w+", r"\bpublic\s+static\s+void\s+main"],
+        "rust": [r"\bfn\s+\w+\s*\(", r"\blet\s+mut\s+\w+", r"\bimpl\s+\w+", r"\bstruct\s+\w+"],
+        "go": [r"\bfunc\s+\w+\s*\(", r"\bpackage\s+\w+", r"\btype\s+\w+\s+struct"],
+    }.items()
+}
+
+
+def detect_language(code: str) -> str:
+    """Guess the programming language of a snippet; empty string if nothing matches."""
+    scores = {}
+    for language, patterns in _LANGUAGE_DETECTION_PATTERNS.items():
+        score = sum(1 for pattern in patterns if pattern.search(code))
+        if score:
+            scores[language] = score
+    return max(scores, key=scores.get) if scores else ""
+
+
+# --- HTML extraction ------------------------------------------------------------------------
+
+_LANGUAGE_CLASS_RE = re.compile(r"language-(\w+)")
+
+# Elements whose text is never shown on the page
+_SKIPPED_TAGS = frozenset({"head", "script", "style", "noscript", "template", "svg", "math", "button"})
+# Elements that end a line of text; lets CodeMirror/Monaco line <div>s and page prose keep their breaks
+_BLOCK_TAGS = frozenset({
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "figcaption", "figure",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav",
+    "ol", "p", "pre", "section", "table", "td", "th", "tr", "ul",
+})
+
+# Class fragments on a block or its wrappers, most specific first, mapped to the
+# documentation framework that produced it (recorded as the block's source_type)
+_SOURCE_TYPE_CLASSES = (
+    ("snippet-clipboard-content", "github-snippet"),
+    ("codeblockcontainer", "docusaurus"),
+    ("prism-code", "docusaurus"),
+    ("milkdown", "milkdown"),
+    ("code-block-wrapper", "milkdown-wrapper-code"),
+    ("code-wrapper", "milkdown-wrapper"),
+    ("astro-code", "astro-shiki"),
+    ("shiki", "shiki"),
+    ("vp-code", "vitepress-vp"),
+    ("nx-", "nextra-nx"),
+    ("hljs", "hljs"),
+    ("highlight", "github-highlight"),
+    ("codeblock", "generic-codeblock"),
+    ("code-block", "generic-div"),
+    ("language-", "prism"),
+)
+_SOURCE_TYPE_ATTRIBUTES = (("data-nextra-code", "nextra"), ("data-code-block", "milkdown-alt"))
+# Wrapper levels inspected for language and framework classes
+_WRAPPER_DEPTH = 3
+
+
+@dataclass
+class _CodeSpan:
+    """A code container found during the walk, as offsets into the page text."""
+
+    kind: str
+    start: int
+    end: int = -1
+    language: str = ""
+    classes: str = ""
+    attributes: tuple[str, ...] = ()
+
+
+def _element_language(element: Any) -> str:
+    match = _LANGUAGE_CLASS_RE.search(element.get("class") or "")
+    if match:
+        return match.group(1)
+    return element.get("data-language") or element.get("data-lang") or ""
+
+
+def _code_container_kind(element: Any) -> str | None:
+    tag = element.tag
+    if tag == "pre":
+        return "pre"
+    if tag == "code":
+        return "standalone"
+    if tag == "div":
+        classes = element.get("class") or ""
+        if "cm-content" in classes:
+            return "codemirror"
+        if "CodeMirror-code" in classes:
+            return "codemirror-legacy"
+        if "view-lines" in classes:
+            return "monaco"
+    return None
+
+
+def _open_span(kind: str, element: Any, offset: int) -> _CodeSpan:
+    span = _CodeSpan(kind=kind, start=offset, language=_element_language(element))
+    classes = [element.get("class") or ""]
+    attributes: list[str] = []
+    for depth, ancestor in enumerate(element.iterancestors()):
+        if depth >= _WRAPPER_DEPTH:
+            break
+        classes.append(ancestor.get("class") or "")
+        attributes.extend(ancestor.attrib.keys())
+        if not span.language:
+            span.language = _element_language(ancestor)
+    span.classes = " ".join(classes).lower()
+    span.attributes = tuple(attributes)
+    return span
+
+
+def _source_type(span: _CodeSpan) -> str:
+    if span.kind != "pre":
+        return span.kind
+    for fragment, source_type in _SOURCE_TYPE_CLASSES:
+        if fragment in span.classes:
+            return source_type
+    for attribute, source_type in _SOURCE_TYPE_ATTRIBUTES:
+        if attribute in span.attributes:
+            return source_type
+    return "standard-lang" if span.language else "standard"
+
+
+def _walk_page(html: str) -> tuple[str, list[_CodeSpan], list[_CodeSpan]]:
+    """
+    Walk the parsed page once.
+
+    Returns:
+        Tuple of (visible page text, code container spans, standalone <code> spans)
+    """
+    parser = lxml_html.HTMLParser(encoding="utf-8", remove_comments=True, remove_pis=True)
+    try:
+        root = lxml_html.document_fromstring(html.encode("utf-8", errors="replace"), parser=parser)
+    except (etree.ParserError, ValueError):
+        return "", [], []
+
+    parts: list[str] = []
+    length = 0
+    blocks: list[_CodeSpan] = []
+    standalone: list[_CodeSpan] = []
+    open_span: _CodeSpan | None = None
+    open_element = None
+
+    def append(text: str | None) -> None:
+        nonlocal length
+        if text:
+            parts.append(text)
+            length += len(text)
+
+    def break_line() -> None:
+        if parts and not parts[-1].endswith("\n"):
+            append("\n")
+
+    walker = etree.iterwalk(root, events=("start", "end"))
+    for event, element in walker:
+        tag = element.tag
+        if event == "start":
+            if tag in _SKIPPED_TAGS:
+                walker.skip_subtree()
+                continue
+            if open_span is None:
+                kind = _code_container_kind(element)
+                if kind:
+                    if kind != "standalone":
+                        break_line()
+                    open_span = _open_span(kind, element, length)
+                    open_element = element
+            elif not open_span.language and tag == "code":
+                open_span.language = _element_language(element)
+            if tag == "br":
+                append("\n")
+            append(element.text)
+        else:
+            if tag in _BLOCK_TAGS:
+                break_line()
+            if element is open_element:
+                open_span.end = length
+                (standalone if open_span.kind == "standalone" else blocks).append(open_span)
+                open_span = None
+                open_element = None
+            append(element.tail)
+
+    return "".join(parts), blocks, standalone
+
+
+def _block(code: str, language: str, text: str, start: int, end: int, source_type: str) -> dict[str, Any]:
+    context_before = text[max(0, start - CONTEXT_CHARS) : start].strip()
+    context_after = text[end : end + CONTEXT_CHARS].strip()
+    return {
+        "code": code,
+        "language": language,
+        "context_before": context_before,
+        "context_after": context_after,
+        "full_context": f"{context_before}\n\n{code}\n\n{context_after}",
+        "source_type": source_type,
+    }
+
+
+def extract_html_code_blocks(html: str, settings: ExtractionSettings) -> list[dict[str, Any]]:
+    """
+    Extract code blocks from a page's HTML.
+
+    Code inside <pre> elements and CodeMirror/Monaco editors is taken in document
+    order; standalone <code> elements are only considered when the page has none
+    of those.
+
+    Args:
+        html: The page HTML
+        settings: Extraction settings
+
+    Returns:
+        List of code blocks with code, language, context and source_type
+    """
+    text, spans, standalone = _walk_page(html)
+    if not text:
+        return []
+
+    code_blocks = []
+    last_end = 0
+    for span in spans:
+        # A block extended to its natural boundary may already cover the next container
+        if span.start < last_end:
+            continue
+
+        start, end = span.start, span.end
+        code = text[start:end].strip()
+        language = span.language
+        length_context = text[max(0, start - LENGTH_CONTEXT_CHARS) : start + LENGTH_CONTEXT_CHARS]
+        min_length = calculate_min_length(language, length_context, settings)
+
+        if len(code) < min_length:
+            if not (language and settings.complete_block_detection and start > 0):
+                continue
+            code, end = find_complete_code_block(text, start, min_length, language, settings)
+            if len(code) < min_length:
+                continue
+
+        cleaned_code = tidy_code(code)
+        if validate_code_quality(cleaned_code, language, settings)[0]:
+            code_blocks.append(_block(cleaned_code, language, text, start, end, _source_type(span)))
+            last_end = end
+
+    if not code_blocks:
+        for span in standalone:
+            cleaned_code = tidy_code(text[span.start : span.end].strip())
+            if len(cleaned_code) >= MIN_STANDALONE_CODE_LENGTH and validate_code_quality(
+                cleaned_code, "", settings
+            )[0]:
+                code_blocks.append(_block(cleaned_code, "", text, span.start, span.end, "standalone"))
+
+    return code_blocks
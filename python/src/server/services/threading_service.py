@@ -9,13 +9,17 @@ Based on proven patterns from crawl4ai_mcp.py architecture.
 
 import asyncio
 import gc
+import math
+import multiprocessing
+import os
+import re
 import threading
 import time
-from collections import deque
 from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from contextlib import asynccontextmanager
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 
 # Removed direct logging import - using unified config
 from enum import Enum
@@ -43,11 +47,46 @@ class RateLimitConfig:
 
     tokens_per_minute: int = 200_000  # OpenAI embedding limit
     requests_per_minute: int = 3000  # Request rate limit
-    max_concurrent: int = 2  # Concurrent request limit
+    max_concurrent: int = 4  # Concurrent request limit (embedding sub-batches run in parallel)
     backoff_multiplier: float = 1.5  # Exponential backoff multiplier
     max_backoff: float = 60.0  # Maximum backoff delay in seconds
 
 
+# Per-provider limits come from RATE_LIMIT_<PROVIDER>_TPM / RATE_LIMIT_<PROVIDER>_RPM settings
+_PROVIDER_LIMIT_KEY_RE = re.compile(r"^RATE_LIMIT_([A-Z0-9_]+)_(TPM|RPM)$")
+
+
+def parse_provider_rate_limits(
+    settings: dict[str, Any], base: RateLimitConfig | None = None
+) -> dict[str, RateLimitConfig]:
+    """Build per-provider rate limit configs from settings.
+
+    Args:
+        settings: Settings such as {"RATE_LIMIT_OPENAI_TPM": "1000000", "RATE_LIMIT_OPENAI_RPM": "3000"}
+        base: Config supplying every value a provider doesn't set (defaults to RateLimitConfig())
+
+    Returns:
+        Mapping of lowercase provider name to its RateLimitConfig
+    """
+    base = base or RateLimitConfig()
+    overrides: dict[str, dict[str, int]] = {}
+    for key, value in settings.items():
+        match = _PROVIDER_LIMIT_KEY_RE.match(str(key))
+        if not match or value in (None, ""):
+            continue
+        try:
+            amount = int(value)
+        except (TypeError, ValueError):
+            logfire_logger.warning(f"Invalid {key}={value!r}, ignoring")
+            continue
+        if amount <= 0:
+            logfire_logger.warning(f"Invalid {key}={amount}, must be positive; ignoring")
+            continue
+        field_name = "tokens_per_minute" if match.group(2) == "TPM" else "requests_per_minute"
+        overrides.setdefault(match.group(1).lower(), {})[field_name] = amount
+    return {provider: replace(base, **fields) for provider, fields in overrides.items()}
+
+
 @dataclass
 class SystemMetrics:
     """Current system performance metrics"""
@@ -70,17 +109,83 @@ class ThreadingConfig:
     batch_size: int = 15
     yield_interval: float = 0.1  # How often to yield control to event loop
     health_check_interval: float = 30  # System health check frequency
+    # Worker processes for pure-Python CPU work (parsing, regex scans) that threads cannot parallelize
+    process_workers: int = field(default_factory=lambda: max(1, min(4, (os.cpu_count() or 2) - 1)))
+
+
+# BPE tokenizers (cl100k and similar) split text into roughly: one token per
+# common word, an extra token per ~8 letters of longer words, one per group of
+# up to three digits and one per punctuation mark or non-ASCII character.
+_TOKEN_PIECE_RE = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]")
+TOKEN_ESTIMATE_MARGIN_PERCENT = 10
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens a BPE tokenizer produces for text.
+
+    Approximates cl100k-style tokenizers without loading one; errs slightly high so requests
+    admitted by the rate limiter don't come back as 429s.
+    """
+    if not text:
+        return 0
+    tokens = 0
+    for piece in _TOKEN_PIECE_RE.findall(text):
+        tokens += 1 + len(piece) // 8 if piece[0].isascii() and piece[0].isalpha() else 1
+    return tokens + math.ceil(tokens * TOKEN_ESTIMATE_MARGIN_PERCENT / 100)
+
+
+class TokenBucket:
+    """Token bucket with continuous refill and O(1) accounting"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.available = capacity
+        self._updated_at = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self.available = min(self.capacity, self.available + elapsed * self.refill_per_second)
+            self._updated_at = now
+
+    def deficit_wait(self, amount: float) -> float:
+        """Seconds until amount is available (0 if it already is)"""
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        self.available -= amount
+
+    def drain(self) -> None:
+        self.available = min(self.available, 0.0)
 
 
 class RateLimiter:
-    """Thread-safe rate limiter with token bucket algorithm"""
+    """Async rate limiter with request and token buckets
 
-    def __init__(self, config: RateLimitConfig):
+    Both buckets refill continuously at their per-minute rate. Callers wait
+    exactly as long as the larger deficit needs, and a provider 429 pauses
+    the limiter for the provider's Retry-After instead of retrying blindly.
+    """
+
+    def __init__(self, config: RateLimitConfig, name: str = "default"):
         self.config = config
-        self.request_times = deque()
-        self.token_usage = deque()
+        self.name = name
+        self.request_bucket = TokenBucket(config.requests_per_minute, config.requests_per_minute / 60)
+        self.token_bucket = TokenBucket(config.tokens_per_minute, config.tokens_per_minute / 60)
         self.semaphore = asyncio.Semaphore(config.max_concurrent)
         self._lock = asyncio.Lock()
+        self._blocked_until = 0.0
+        self.in_flight = 0
+
+        # Metrics (process lifetime)
+        self.total_requests = 0
+        self.total_tokens = 0
+        self.total_waits = 0
+        self.total_wait_seconds = 0.0
+        self.rate_limit_hits = 0
 
     async def acquire(self, estimated_tokens: int = 8000, progress_callback: Callable | None = None) -> bool:
         """Acquire permission to make API call with token awareness
@@ -89,103 +194,99 @@ class RateLimiter:
             estimated_tokens: Estimated number of tokens for the operation
             progress_callback: Optional async callback for progress updates during wait
         """
+        # A request larger than the bucket could never be admitted; let it through on a full bucket
+        tokens = min(max(0, estimated_tokens), self.config.tokens_per_minute)
+
         while True:  # Loop instead of recursion to avoid stack overflow
-            wait_time_to_sleep = None
-            
             async with self._lock:
-                now = time.time()
+                now = time.monotonic()
+                self.request_bucket.refill(now)
+                self.token_bucket.refill(now)
+
+                wait_time = max(
+                    self._blocked_until - now,
+                    self.request_bucket.deficit_wait(1),
+                    self.token_bucket.deficit_wait(tokens),
+                )
+                if wait_time <= 0:
+                    self.request_bucket.consume(1)
+                    self.token_bucket.consume(tokens)
+                    self.total_requests += 1
+                    self.total_tokens += tokens
+                    return True
 
-                # Clean old entries
-                self._clean_old_entries(now)
+                self.total_waits += 1
+                self.total_wait_seconds += wait_time
+                logfire_logger.info(
+                    f"Rate limiting: waiting {wait_time:.1f}s",
+                    extra={
+                        "limiter": self.name,
+                        "tokens": tokens,
+                        "current_usage": self._get_current_usage(),
+                    }
+                )
 
-                # Check if we can make the request
-                if self._can_make_request(estimated_tokens):
-                    # Record the request
-                    self.request_times.append(now)
-                    self.token_usage.append((now, estimated_tokens))
-                    return True
-                
-                # Calculate wait time if we can't make the request
-                wait_time = self._calculate_wait_time(estimated_tokens)
-                if wait_time > 0:
-                    logfire_logger.info(
-                        f"Rate limiting: waiting {wait_time:.1f}s",
-                        extra={
-                            "tokens": estimated_tokens,
-                            "current_usage": self._get_current_usage(),
-                        }
-                    )
-                    wait_time_to_sleep = wait_time
-                else:
-                    return False
-            
             # Sleep outside the lock to avoid deadlock
-            if wait_time_to_sleep is not None:
-                # For long waits, break into smaller chunks with progress updates
-                if wait_time_to_sleep > 5 and progress_callback:
-                    chunks = int(wait_time_to_sleep / 5)  # 5 second chunks
-                    for i in range(chunks):
-                        await asyncio.sleep(5)
-                        remaining = wait_time_to_sleep - (i + 1) * 5
-                        if progress_callback:
-                            await progress_callback({
-                                "type": "rate_limit_wait",
-                                "remaining_seconds": max(0, remaining),
-                                "message": f"waiting {max(0, remaining):.1f}s more..."
-                            })
-                    # Sleep any remaining time
-                    if wait_time_to_sleep % 5 > 0:
-                        await asyncio.sleep(wait_time_to_sleep % 5)
-                else:
-                    await asyncio.sleep(wait_time_to_sleep)
-                # Continue the loop to try again
-
-    def _can_make_request(self, estimated_tokens: int) -> bool:
-        """Check if request can be made within limits"""
-        # Check request rate limit
-        if len(self.request_times) >= self.config.requests_per_minute:
-            return False
-
-        # Check token usage limit
-        current_tokens = sum(tokens for _, tokens in self.token_usage)
-        if current_tokens + estimated_tokens > self.config.tokens_per_minute:
-            return False
-
-        return True
-
-    def _clean_old_entries(self, current_time: float):
-        """Remove entries older than 1 minute"""
-        cutoff_time = current_time - 60
-
-        while self.request_times and self.request_times[0] < cutoff_time:
-            self.request_times.popleft()
-
-        while self.token_usage and self.token_usage[0][0] < cutoff_time:
-            self.token_usage.popleft()
-
-    def _calculate_wait_time(self, estimated_tokens: int) -> float:
-        """Calculate how long to wait before retrying"""
-        if not self.request_times:
-            return 0
-
-        oldest_request = self.request_times[0]
-        time_since_oldest = time.time() - oldest_request
-
-        if time_since_oldest < 60:
-            return 60 - time_since_oldest + 0.1
+            # For long waits, break into smaller chunks with progress updates
+            if wait_time > 5 and progress_callback:
+                chunks = int(wait_time / 5)  # 5 second chunks
+                for i in range(chunks):
+                    await asyncio.sleep(5)
+                    remaining = wait_time - (i + 1) * 5
+                    await progress_callback({
+                        "type": "rate_limit_wait",
+                        "remaining_seconds": max(0, remaining),
+                        "message": f"waiting {max(0, remaining):.1f}s more..."
+                    })
+                # Sleep any remaining time
+                if wait_time % 5 > 0:
+                    await asyncio.sleep(wait_time % 5)
+            else:
+                await asyncio.sleep(wait_time)
+            # Continue the loop to try again
 
-        return 0
+    def record_rate_limited(self, retry_after: float | None = None) -> None:
+        """Record a provider 429 and pause every caller of this limiter
+
+        Args:
+            retry_after: Provider's Retry-After in seconds, if it sent one
+        """
+        now = time.monotonic()
+        pause = retry_after if retry_after and retry_after > 0 else self.config.backoff_multiplier
+        self._blocked_until = max(self._blocked_until, now + min(pause, self.config.max_backoff))
+        # Our view of the budget was too optimistic; start refilling from empty
+        self.token_bucket.refill(now)
+        self.token_bucket.drain()
+        self.rate_limit_hits += 1
 
     def _get_current_usage(self) -> dict[str, int]:
         """Get current usage statistics"""
-        current_tokens = sum(tokens for _, tokens in self.token_usage)
         return {
-            "requests": len(self.request_times),
-            "tokens": current_tokens,
+            "requests": int(self.config.requests_per_minute - self.request_bucket.available),
+            "tokens": int(self.config.tokens_per_minute - self.token_bucket.available),
             "max_requests": self.config.requests_per_minute,
             "max_tokens": self.config.tokens_per_minute,
         }
 
+    def get_metrics(self) -> dict[str, Any]:
+        """Snapshot of bucket levels and counters"""
+        now = time.monotonic()
+        self.request_bucket.refill(now)
+        self.token_bucket.refill(now)
+        return {
+            "name": self.name,
+            **self._get_current_usage(),
+            "tokens_available": int(self.token_bucket.available),
+            "requests_available": int(self.request_bucket.available),
+            "blocked_for_seconds": round(max(0.0, self._blocked_until - now), 2),
+            "in_flight": self.in_flight,
+            "total_requests": self.total_requests,
+            "total_tokens": self.total_tokens,
+            "total_waits": self.total_waits,
+            "total_wait_seconds": round(self.total_wait_seconds, 2),
+            "rate_limit_hits": self.rate_limit_hits,
+        }
+
 
 class MemoryAdaptiveDispatcher:
     """Dynamically adjust concurrency based on memory usage"""
@@ -410,9 +511,14 @@ class ThreadingService:
         self,
         threading_config: ThreadingConfig | None = None,
         rate_limit_config: RateLimitConfig | None = None,
+        provider_rate_limits: dict[str, RateLimitConfig] | None = None,
     ):
         self.config = threading_config or ThreadingConfig()
-        self.rate_limiter = RateLimiter(rate_limit_config or RateLimitConfig())
+        self.rate_limit_config = rate_limit_config or RateLimitConfig()
+        self.rate_limiter = RateLimiter(self.rate_limit_config)
+        # Per-provider overrides; every (provider, model) pair gets its own buckets
+        self.provider_rate_limits = provider_rate_limits or {}
+        self._rate_limiters: dict[tuple[str, str | None], RateLimiter] = {}
         self.memory_dispatcher = MemoryAdaptiveDispatcher(self.config)
 
         # Thread pools for different workload types
@@ -423,6 +529,9 @@ class ThreadingService:
             max_workers=self.config.max_workers * 2, thread_name_prefix="archon-io"
         )
 
+        # Created on first use: spawning workers costs an interpreter start and app import each
+        self._process_executor: ProcessPoolExecutor | None = None
+
         self._running = False
         self._health_check_task = None
 
@@ -452,26 +561,74 @@ class ThreadingService:
         # Shutdown thread pools
         self.cpu_executor.shutdown(wait=True)
         self.io_executor.shutdown(wait=True)
+        if self._process_executor:
+            self._process_executor.shutdown(wait=True, cancel_futures=True)
+            self._process_executor = None
 
         logfire_logger.info("Threading service stopped")
 
+    def configure_provider_rate_limits(self, settings: dict[str, Any]) -> None:
+        """Apply RATE_LIMIT_<PROVIDER>_TPM/RPM settings; providers without them use the default limits"""
+        limits = parse_provider_rate_limits(settings, self.rate_limit_config)
+        for provider in set(self.provider_rate_limits) | set(limits):
+            if self.provider_rate_limits.get(provider) != limits.get(provider):
+                # Limits changed: the provider's buckets are recreated on next use
+                for key in [key for key in self._rate_limiters if key[0] == provider]:
+                    del self._rate_limiters[key]
+        self.provider_rate_limits = limits
+
+    def get_rate_limiter(self, provider: str | None = None, model: str | None = None) -> RateLimiter:
+        """Get the rate limiter for a provider/model (the shared default when no provider is given)"""
+        if not provider:
+            return self.rate_limiter
+
+        key = (provider.lower(), model)
+        limiter = self._rate_limiters.get(key)
+        if limiter is None:
+            config = self.provider_rate_limits.get(key[0], self.rate_limit_config)
+            limiter = RateLimiter(config, name=f"{key[0]}:{model}" if model else key[0])
+            self._rate_limiters[key] = limiter
+        return limiter
+
+    def record_rate_limited(
+        self, provider: str | None = None, model: str | None = None, retry_after: float | None = None
+    ) -> None:
+        """Tell the provider/model limiter that the provider answered 429"""
+        self.get_rate_limiter(provider, model).record_rate_limited(retry_after)
+
+    def get_rate_limit_metrics(self) -> dict[str, dict[str, Any]]:
+        """Metrics snapshot for every rate limiter in use"""
+        limiters = [self.rate_limiter, *self._rate_limiters.values()]
+        return {limiter.name: limiter.get_metrics() for limiter in limiters}
+
     @asynccontextmanager
-    async def rate_limited_operation(self, estimated_tokens: int = 8000, progress_callback: Callable | None = None):
+    async def rate_limited_operation(
+        self,
+        estimated_tokens: int = 8000,
+        progress_callback: Callable | None = None,
+        provider: str | None = None,
+        model: str | None = None,
+    ):
         """Context manager for rate-limited operations
         
         Args:
             estimated_tokens: Estimated number of tokens for the operation
             progress_callback: Optional async callback for progress updates during wait
+            provider: Provider whose buckets to use (shared default bucket if omitted)
+            model: Model whose buckets to use within the provider
         """
-        async with self.rate_limiter.semaphore:
-            can_proceed = await self.rate_limiter.acquire(estimated_tokens, progress_callback)
+        rate_limiter = self.get_rate_limiter(provider, model)
+        async with rate_limiter.semaphore:
+            can_proceed = await rate_limiter.acquire(estimated_tokens, progress_callback)
             if not can_proceed:
                 raise Exception("Rate limit exceeded")
 
             start_time = time.time()
+            rate_limiter.in_flight += 1
             try:
                 yield
             finally:
+                rate_limiter.in_flight -= 1
                 duration = time.time() - start_time
                 logfire_logger.debug(
                     "Rate limited operation completed",
@@ -483,6 +640,30 @@ class ThreadingService:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(self.cpu_executor, func, *args, **kwargs)
 
+    @property
+    def process_executor(self) -> ProcessPoolExecutor:
+        """Process pool for CPU-bound work, started on first use"""
+        if self._process_executor is None:
+            # spawn, not fork: forking a process that runs an event loop and thread pools is unsafe
+            self._process_executor = ProcessPoolExecutor(
+                max_workers=self.config.process_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._process_executor
+
+    async def run_in_process(self, func: Callable, *args) -> Any:
+        """Run a picklable, module-level function in the process pool
+
+        Use for pure-Python CPU work that would hold the GIL (and the event loop) for long
+        stretches; arguments and results are pickled, so keep them to plain data.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.process_executor, func, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool on the next call
+            self._process_executor = None
+            raise
+
     async def run_io_bound(self, func: Callable, *args, **kwargs) -> Any:
         """Run I/O-bound function in thread pool"""
         loop = asyncio.get_event_loop()
@@ -3,6 +3,7 @@ Progress Tracking Utilities
 
 Provides utilities for tracking and broadcasting progress updates.
 """
+from . import progress_stream
 from .progress_tracker import ProgressTracker
 
-__all__ = ['ProgressTracker']
+__all__ = ['ProgressTracker', 'progress_stream']
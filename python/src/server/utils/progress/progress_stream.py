@@ -0,0 +1,211 @@
+"""
+Progress Stream
+
+Push channel for ProgressTracker state. Every state change is published as a
+versioned delta (only the fields that changed, plus new log entries) to the
+subscribers of that operation, so clients don't have to poll and re-fetch the
+full state.
+
+Each operation keeps a short history of deltas so a reconnecting client can
+resume from the last sequence number it saw; if that point has fallen out of
+the history it gets a full snapshot instead. Subscribers coalesce bursts of
+updates into one event.
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
+# Deltas kept per operation for resuming streams
+HISTORY_SIZE = 256
+
+# Pending deltas a subscriber may buffer before it is resynced with a snapshot
+SUBSCRIBER_QUEUE_SIZE = 1024
+
+# Deltas arriving within this window are sent as one event
+COALESCE_SECONDS = 0.25
+
+# Idle time after which a keepalive is sent
+HEARTBEAT_SECONDS = 15.0
+
+TERMINAL_STATES = {"completed", "failed", "error", "cancelled"}
+
+_MISSING = object()
+
+
+@dataclass(eq=False)
+class _Subscriber:
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE))
+    overflowed: bool = False
+
+
+@dataclass
+class _Channel:
+    seq: int = 0
+    published: dict[str, Any] = field(default_factory=dict)
+    last_log: dict[str, Any] | None = None
+    history: deque = field(default_factory=lambda: deque(maxlen=HISTORY_SIZE))
+    subscribers: set = field(default_factory=set)
+
+
+_channels: dict[str, _Channel] = {}
+
+
+def publish(progress_id: str, state: dict[str, Any]) -> int:
+    """
+    Publish the changes in a progress state since the last publish.
+
+    Args:
+        progress_id: Operation the state belongs to
+        state: Current ProgressTracker state
+
+    Returns:
+        Sequence number of the published delta (unchanged if nothing changed)
+    """
+    channel = _channels.setdefault(progress_id, _Channel())
+
+    delta = {
+        key: value
+        for key, value in state.items()
+        if key != "logs" and channel.published.get(key, _MISSING) != value
+    }
+    new_logs = _new_log_entries(channel.last_log, state.get("logs") or [])
+    if new_logs:
+        delta["logs_appended"] = new_logs
+        channel.last_log = new_logs[-1]
+    if not delta:
+        return channel.seq
+
+    channel.seq += 1
+    channel.published = {key: value for key, value in state.items() if key != "logs"}
+    channel.history.append((channel.seq, delta))
+
+    for subscriber in channel.subscribers:
+        if subscriber.overflowed:
+            continue
+        try:
+            subscriber.queue.put_nowait((channel.seq, delta))
+        except asyncio.QueueFull:
+            # Too far behind: drop the backlog and resync from a snapshot
+            subscriber.overflowed = True
+            _drain(subscriber.queue)
+            subscriber.queue.put_nowait(None)
+    return channel.seq
+
+
+def get_sequence(progress_id: str) -> int:
+    """Get the last published sequence number of an operation (0 if none)."""
+    channel = _channels.get(progress_id)
+    return channel.seq if channel else 0
+
+
+def discard(progress_id: str) -> None:
+    """Drop an operation's channel once its progress state is removed."""
+    _channels.pop(progress_id, None)
+
+
+def coalesce(deltas: list[dict[str, Any]]) -> dict[str, Any]:
+    """Merge consecutive deltas into one, keeping the latest values and all new log entries."""
+    merged: dict[str, Any] = {}
+    logs: list[dict[str, Any]] = []
+    for delta in deltas:
+        logs.extend(delta.get("logs_appended", ()))
+        merged.update({key: value for key, value in delta.items() if key != "logs_appended"})
+    if logs:
+        merged["logs_appended"] = logs
+    return merged
+
+
+async def stream_progress(
+    progress_id: str,
+    get_state,
+    since: int | None = None,
+) -> AsyncIterator[tuple[str, int, dict[str, Any] | None]]:
+    """
+    Stream an operation's progress as (event, seq, payload) tuples.
+
+    Events are "snapshot" (full state), "delta" (changed fields and
+    logs_appended) and "heartbeat" (payload None). The stream ends after the
+    operation reaches a terminal state or its state disappears.
+
+    Args:
+        progress_id: Operation to stream
+        get_state: Callable returning the operation's current state, or None
+        since: Last sequence number the client has seen, to resume after it
+    """
+    channel = _channels.setdefault(progress_id, _Channel())
+    subscriber = _Subscriber()
+    # Subscribe before reading history so no delta falls between the two
+    channel.subscribers.add(subscriber)
+    try:
+        last_seq = channel.seq
+        backlog = [(seq, delta) for seq, delta in channel.history if since is not None and seq > since]
+        resumable = since is not None and (
+            since == channel.seq or bool(backlog and backlog[0][0] == since + 1)
+        )
+
+        state = get_state()
+        if state is None:
+            return
+        if not resumable:
+            yield "snapshot", last_seq, dict(state)
+        elif backlog:
+            last_seq = backlog[-1][0]
+            yield "delta", last_seq, coalesce([delta for _seq, delta in backlog])
+        if state.get("status") in TERMINAL_STATES:
+            return
+
+        while True:
+            try:
+                item = await asyncio.wait_for(subscriber.queue.get(), timeout=HEARTBEAT_SECONDS)
+            except TimeoutError:
+                if get_state() is None:
+                    return
+                yield "heartbeat", last_seq, None
+                continue
+
+            # Give a burst of updates a moment to arrive, then send them together
+            await asyncio.sleep(COALESCE_SECONDS)
+            items = [item, *_drain(subscriber.queue)]
+
+            if subscriber.overflowed or None in items:
+                subscriber.overflowed = False
+                _drain(subscriber.queue)
+                state = get_state()
+                if state is None:
+                    return
+                last_seq = channel.seq
+                yield "snapshot", last_seq, dict(state)
+            else:
+                fresh = [(seq, delta) for seq, delta in items if seq > last_seq]
+                if not fresh:
+                    continue
+                last_seq = fresh[-1][0]
+                yield "delta", last_seq, coalesce([delta for _seq, delta in fresh])
+
+            # Stop once the client has seen the terminal state
+            if last_seq == channel.seq and channel.published.get("status") in TERMINAL_STATES:
+                return
+    finally:
+        channel.subscribers.discard(subscriber)
+
+
+def _new_log_entries(last_log: dict[str, Any] | None, logs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    if last_log is None:
+        return list(logs)
+    # Log entries are appended (and trimmed from the front), so find the last one sent
+    for index in range(len(logs) - 1, -1, -1):
+        if logs[index] is last_log:
+            return logs[index + 1 :]
+    return list(logs)
+
+
+def _drain(queue: asyncio.Queue) -> list:
+    items = []
+    while True:
+        try:
+            items.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            return items
@@ -1,7 +1,8 @@
 """
 Progress Tracker Utility
 
-Tracks operation progress in memory for HTTP polling access.
+Tracks operation progress in memory for HTTP polling access, and publishes
+each change to streaming subscribers (see progress_stream).
 """
 
 import asyncio
@@ -9,6 +10,7 @@ from datetime import datetime
 from typing import Any
 
 from ...config.logfire_config import safe_logfire_error, safe_logfire_info
+from . import progress_stream
 
 
 class ProgressTracker:
@@ -51,6 +53,7 @@ class ProgressTracker:
         """Remove progress state from memory."""
         if progress_id in cls._progress_states:
             del cls._progress_states[progress_id]
+        progress_stream.discard(progress_id)
 
     @classmethod
     def list_active(cls) -> dict[str, dict[str, Any]]:
@@ -70,6 +73,7 @@ class ProgressTracker:
             # Only clean up if still in terminal state (prevent cleanup of reused IDs)
             if status in ["completed", "failed", "error", "cancelled"]:
                 del cls._progress_states[progress_id]
+                progress_stream.discard(progress_id)
                 safe_logfire_info(f"Progress state cleaned up after delay | progress_id={progress_id} | status={status}")
 
     async def start(self, initial_data: dict[str, Any] | None = None):
@@ -346,6 +350,8 @@ class ProgressTracker:
         """Update progress state in memory storage."""
         # Update the class-level dictionary
         ProgressTracker._progress_states[self.progress_id] = self.state
+        # Push the change to stream subscribers
+        progress_stream.publish(self.progress_id, self.state)
 
         safe_logfire_info(
             f"📊 [PROGRESS] Updated {self.operation_type} | ID: {self.progress_id} | "
@@ -86,6 +86,33 @@ def prevent_real_db_calls():
                 yield
 
 
+@pytest.fixture(autouse=True)
+def clear_query_embedding_cache():
+    """Keep cached query embeddings from leaking between tests."""
+    from src.server.services.embeddings.query_embedding_cache import get_query_embedding_cache
+
+    get_query_embedding_cache().clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_embedding_batch_sizers():
+    """Start every test from the configured embedding batch size."""
+    from src.server.services.embeddings.embedding_service import reset_batch_sizers
+
+    reset_batch_sizers()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def clear_llm_client_pool():
+    """Don't hand one test's (mocked) pooled LLM client to the next."""
+    from src.server.services.llm_provider_service import clear_provider_cache
+
+    clear_provider_cache()
+    yield
+
+
 @pytest.fixture
 def mock_supabase_client():
     """Mock Supabase client for testing."""
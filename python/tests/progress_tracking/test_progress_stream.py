@@ -0,0 +1,138 @@
+"""
+Tests for push-based progress streaming.
+
+ProgressTracker changes must be published as versioned deltas, streams must
+resume from a sequence number (or fall back to a snapshot) and coalesce
+bursts of updates into one event.
+"""
+
+import asyncio
+import json
+from collections import deque
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.server.api_routes.progress_api import router
+from src.server.utils.progress import ProgressTracker, progress_stream
+
+
+@pytest.fixture(autouse=True)
+def fast_coalescing(monkeypatch):
+    monkeypatch.setattr(progress_stream, "COALESCE_SECONDS", 0.05)
+
+
+async def collect(progress_id: str, since: int | None = None) -> list:
+    events = []
+    async for event in progress_stream.stream_progress(
+        progress_id, lambda: ProgressTracker.get_progress(progress_id), since=since
+    ):
+        events.append(event)
+    return events
+
+
+class TestPublish:
+    @pytest.mark.asyncio
+    async def test_updates_publish_changed_fields_and_new_logs(self):
+        tracker = ProgressTracker("stream-delta", operation_type="crawl")
+        await tracker.start({"url": "https://docs.example.com"})
+        first_seq = progress_stream.get_sequence("stream-delta")
+
+        await tracker.update("crawling", 10, "Crawling page 1", total_pages=50)
+
+        seq, delta = progress_stream._channels["stream-delta"].history[-1]
+        assert seq == first_seq + 1
+        assert delta["status"] == "crawling"
+        assert delta["progress"] == 10
+        assert delta["total_pages"] == 50
+        assert "url" not in delta
+        assert "logs" not in delta
+        assert [entry["message"] for entry in delta["logs_appended"]] == ["Crawling page 1"]
+
+        ProgressTracker.clear_progress("stream-delta")
+        assert progress_stream.get_sequence("stream-delta") == 0
+
+    def test_coalesce_keeps_latest_values_and_all_logs(self):
+        merged = progress_stream.coalesce([
+            {"progress": 10, "logs_appended": [{"message": "a"}]},
+            {"progress": 20, "status": "crawling", "logs_appended": [{"message": "b"}]},
+        ])
+        assert merged == {
+            "progress": 20,
+            "status": "crawling",
+            "logs_appended": [{"message": "a"}, {"message": "b"}],
+        }
+
+
+class TestStreamProgress:
+    @pytest.mark.asyncio
+    async def test_bursts_are_coalesced_and_stream_ends_on_completion(self):
+        tracker = ProgressTracker("stream-burst", operation_type="crawl")
+        await tracker.start()
+
+        async def produce():
+            await asyncio.sleep(0.01)
+            for page in range(1, 6):
+                await tracker.update("crawling", page * 10, f"Page {page}")
+            await asyncio.sleep(0.1)
+            await tracker.complete({"log": "done"})
+
+        producer = asyncio.create_task(produce())
+        events = await asyncio.wait_for(collect("stream-burst"), timeout=5)
+        await producer
+
+        kinds = [event for event, _seq, _payload in events]
+        assert kinds[0] == "snapshot"
+        assert kinds.count("delta") == 2
+        _event, _seq, burst = events[1]
+        assert burst["progress"] == 50
+        assert len(burst["logs_appended"]) == 5
+        assert events[-1][2]["status"] == "completed"
+        assert events[-1][1] == progress_stream.get_sequence("stream-burst")
+
+    @pytest.mark.asyncio
+    async def test_resume_replays_missed_deltas_or_sends_a_snapshot(self):
+        tracker = ProgressTracker("stream-resume", operation_type="crawl")
+        await tracker.start()
+        seen = progress_stream.get_sequence("stream-resume")
+        for page in range(1, 4):
+            await tracker.update("crawling", page * 10, f"Page {page}")
+        await tracker.update("completed", 100, "Done")
+
+        events = await collect("stream-resume", since=seen)
+        assert [event for event, _seq, _payload in events] == ["delta"]
+        assert events[0][2]["progress"] == 100
+        assert len(events[0][2]["logs_appended"]) == 4
+
+        # A point older than the kept history can't be replayed
+        channel = progress_stream._channels["stream-resume"]
+        channel.history = deque(list(channel.history)[-2:], maxlen=2)
+        events = await collect("stream-resume", since=seen)
+        assert [event for event, _seq, _payload in events] == ["snapshot"]
+        assert events[0][2]["progress"] == 100
+
+
+class TestStreamEndpoint:
+    def test_unknown_operation_returns_404(self):
+        app = FastAPI()
+        app.include_router(router)
+
+        response = TestClient(app).get("/api/progress/missing-op/stream")
+
+        assert response.status_code == 404
+
+    def test_finished_operation_streams_one_snapshot(self):
+        app = FastAPI()
+        app.include_router(router)
+        tracker = ProgressTracker("stream-http", operation_type="upload")
+        tracker.state.update({"status": "completed", "progress": 100, "log": "Uploaded"})
+
+        with TestClient(app).stream("GET", "/api/progress/stream-http/stream") as response:
+            body = "".join(response.iter_text())
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "event: snapshot" in body
+        data_line = next(line for line in body.splitlines() if line.startswith("data: "))
+        assert json.loads(data_line[len("data: ") :])["status"] == "completed"
+        ProgressTracker.clear_progress("stream-http")
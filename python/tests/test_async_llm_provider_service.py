@@ -5,6 +5,7 @@ Tests all aspects of the async LLM provider service after sync function removal.
 Covers different providers (OpenAI, Ollama, Google) and error scenarios.
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -12,8 +13,11 @@ import pytest
 from src.server.services.llm_provider_service import (
     _get_cached_settings,
     _set_cached_settings,
+    clear_provider_cache,
+    get_client_pool_stats,
     get_embedding_model,
     get_llm_client,
+    invalidate_provider_cache,
 )
 
 
@@ -478,9 +482,76 @@ class TestAsyncLLMProviderService:
                     client_ref = client
                     assert client == mock_client
 
-                # After context manager exits, should still have reference to client
+                # After context manager exits the pooled client stays open for reuse
                 assert client_ref == mock_client
+                mock_client.aclose.assert_not_awaited()
+
+                # Invalidating the provider cache retires and closes it
+                clear_provider_cache()
+                await asyncio.sleep(0)
+                mock_client.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_clients_are_pooled_per_provider_url_and_key(self, mock_credential_service):
+        """Test that repeat calls reuse one client and different keys get their own"""
+        with patch(
+            "src.server.services.llm_provider_service.credential_service", mock_credential_service
+        ):
+            with patch(
+                "src.server.services.llm_provider_service.openai.AsyncOpenAI"
+            ) as mock_openai:
+                mock_openai.side_effect = lambda **kwargs: self._make_mock_client()
+                stats_before = get_client_pool_stats()
+
+                mock_credential_service.get_active_provider.return_value = {
+                    "provider": "openai", "api_key": "key-one", "base_url": None
+                }
+                async with get_llm_client() as first:
+                    pass
+                async with get_llm_client() as second:
+                    pass
+
+                import src.server.services.llm_provider_service as llm_module
+
+                llm_module._settings_cache.clear()
+                mock_credential_service.get_active_provider.return_value = {
+                    "provider": "openai", "api_key": "key-two", "base_url": None
+                }
+                async with get_llm_client() as third:
+                    pass
+
+                assert first is second
+                assert third is not first
+                assert mock_openai.call_count == 2
+
+                stats = get_client_pool_stats()
+                assert stats["size"] == 2
+                assert stats["hits"] - stats_before["hits"] == 1
+                assert stats["misses"] - stats_before["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_client_retired_while_in_use_closes_on_release(
+        self, mock_credential_service, openai_provider_config
+    ):
+        """Test that invalidation never closes a client mid-request"""
+        mock_credential_service.get_active_provider.return_value = openai_provider_config
+
+        with patch(
+            "src.server.services.llm_provider_service.credential_service", mock_credential_service
+        ):
+            with patch(
+                "src.server.services.llm_provider_service.openai.AsyncOpenAI"
+            ) as mock_openai:
+                mock_client = self._make_mock_client()
+                mock_openai.return_value = mock_client
+
+                async with get_llm_client():
+                    invalidate_provider_cache("openai")
+                    await asyncio.sleep(0)
+                    mock_client.aclose.assert_not_awaited()
+
                 mock_client.aclose.assert_awaited_once()
+                assert get_client_pool_stats()["size"] == 0
 
     @pytest.mark.asyncio
     async def test_multiple_providers_in_sequence(self, mock_credential_service):
@@ -0,0 +1,154 @@
+"""
+Tests for the pluggable chunk writers.
+
+The COPY writer must stream rows into a staging table with binary float
+arrays and insert them into the target table with the same plain-insert
+semantics as PostgREST; the writer selection must fall
+back to PostgREST when no database pool is available.
+"""
+
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.server.services.storage.chunk_writer import (
+    STAGING_TABLE,
+    ChunkWriter,
+    CopyChunkWriter,
+    PostgrestChunkWriter,
+    get_chunk_writer,
+)
+
+
+def make_pool():
+    connection = MagicMock()
+    connection.execute = AsyncMock()
+    connection.copy_records_to_table = AsyncMock()
+
+    @asynccontextmanager
+    async def transaction():
+        yield
+
+    connection.transaction = transaction
+    pool = MagicMock()
+
+    @asynccontextmanager
+    async def acquire():
+        yield connection
+
+    pool.acquire = acquire
+    return pool, connection
+
+
+def chunk_row(chunk_number: int, embedding, column: str = "embedding_1536") -> dict:
+    return {
+        "url": "https://docs.example.com/a",
+        "chunk_number": chunk_number,
+        "content": f"chunk {chunk_number}",
+        "content_hash": "abc",
+        "metadata": {"chunk_size": 7, "source_id": "src"},
+        "source_id": "src",
+        column: embedding,
+        "llm_chat_model": None,
+        "embedding_model": "text-embedding-3-small",
+        "embedding_dimension": len(embedding),
+        "page_id": None,
+    }
+
+
+class TestChunkWriter:
+    def test_base_class_requires_write(self):
+        with pytest.raises(TypeError):
+            ChunkWriter()
+
+
+class TestCopyChunkWriter:
+    @pytest.mark.asyncio
+    async def test_copies_into_staging_and_inserts(self):
+        pool, connection = make_pool()
+        rows = [chunk_row(0, [0.1, 0.2]), chunk_row(1, np.array([0.3, 0.4]))]
+
+        written = await CopyChunkWriter(pool).write("archon_crawled_pages", rows)
+
+        assert written == 2
+        statements = [call.args[0] for call in connection.execute.call_args_list]
+        assert statements[0].startswith(f"CREATE TEMP TABLE {STAGING_TABLE}")
+        assert "embedding real[]" in statements[0]
+        assert "ON COMMIT DROP" in statements[0]
+
+        copy = connection.copy_records_to_table.call_args
+        assert copy.args[0] == STAGING_TABLE
+        assert copy.kwargs["columns"][-1] == "embedding"
+        copied = copy.kwargs["records"]
+        assert copied[0][-1] == [0.1, 0.2]
+        assert copied[1][-1] == [0.3, 0.4]
+        assert json.loads(copied[0][copy.kwargs["columns"].index("metadata")]) == rows[0]["metadata"]
+
+        merge = statements[1]
+        assert merge.startswith("INSERT INTO archon_crawled_pages (")
+        assert "embedding_1536" in merge
+        assert "embedding::vector" in merge
+        assert "metadata::jsonb" in merge
+        # Plain insert, like the PostgREST writer: duplicates fail instead of being overwritten
+        assert "ON CONFLICT" not in merge
+
+    @pytest.mark.asyncio
+    async def test_inserts_each_embedding_column_separately(self):
+        pool, connection = make_pool()
+        rows = [chunk_row(0, [0.1] * 3, "embedding_768"), chunk_row(1, [0.2] * 3, "embedding_1024")]
+        for row in rows:
+            row["summary"] = "Example"
+
+        await CopyChunkWriter(pool).write("archon_code_examples", rows)
+
+        assert connection.copy_records_to_table.call_count == 2
+        merges = [c.args[0] for c in connection.execute.call_args_list if c.args[0].startswith("INSERT")]
+        assert ["embedding_768" in merges[0], "embedding_1024" in merges[1]] == [True, True]
+        assert all("page_id" not in merge and "summary" in merge for merge in merges)
+
+    @pytest.mark.asyncio
+    async def test_rejects_rows_without_embedding_and_unknown_tables(self):
+        pool, _connection = make_pool()
+        row = chunk_row(0, [0.1])
+        del row["embedding_1536"]
+
+        with pytest.raises(ValueError):
+            await CopyChunkWriter(pool).write("archon_crawled_pages", [row])
+        with pytest.raises(ValueError):
+            await CopyChunkWriter(pool).write("archon_sources", [chunk_row(0, [0.1])])
+
+
+class TestGetChunkWriter:
+    @pytest.mark.asyncio
+    async def test_copy_falls_back_to_postgrest_without_pool(self):
+        client = MagicMock()
+        with (
+            patch(
+                "src.server.services.credential_service.credential_service.get_credential",
+                AsyncMock(return_value="copy"),
+            ),
+            patch("src.server.services.search.search_rpc.get_search_pool", AsyncMock(return_value=None)),
+        ):
+            writer = await get_chunk_writer(client)
+
+        assert isinstance(writer, PostgrestChunkWriter)
+        await writer.write("archon_crawled_pages", [chunk_row(0, [0.1])])
+        client.table.assert_called_once_with("archon_crawled_pages")
+
+    @pytest.mark.asyncio
+    async def test_copy_writer_uses_database_pool(self):
+        pool, _connection = make_pool()
+        with (
+            patch(
+                "src.server.services.credential_service.credential_service.get_credential",
+                AsyncMock(return_value="copy"),
+            ),
+            patch("src.server.services.search.search_rpc.get_search_pool", AsyncMock(return_value=pool)),
+        ):
+            writer = await get_chunk_writer(MagicMock())
+
+        assert isinstance(writer, CopyChunkWriter)
+        assert writer.pool is pool
@@ -0,0 +1,178 @@
+"""
+Tests for the single-pass HTML code block extractor.
+
+Covers the lxml walk (entity decoding, highlighting markup, editor widgets),
+the precompiled validators, and how CodeExtractionService dispatches pages.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server.services.crawling.code_extraction_service import CodeExtractionService
+from src.server.services.text_processing.code_block_extractor import (
+    ExtractionSettings,
+    extract_html_code_blocks,
+    find_complete_code_block,
+    validate_code_quality,
+)
+from src.server.services.threading_service import ThreadingConfig, ThreadingService
+
+PYTHON_CODE = """import asyncio
+from typing import Any
+
+async def fetch(url: str, retries: int = 3) -> dict[str, Any]:
+    for attempt in range(retries):
+        result = await client.get(url)
+        if result.status < 400:
+            return result.json()
+        await asyncio.sleep(2 ** attempt)
+    return {}"""
+
+SETTINGS = ExtractionSettings()
+
+
+def escape(code: str) -> str:
+    return code.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def highlighted(code: str) -> str:
+    """Shiki-style markup: one span per line, one span per token."""
+    lines = []
+    for line in code.split("\n"):
+        tokens = " ".join(f'<span style="color:#f00">{escape(token)}</span>' for token in line.split(" "))
+        lines.append(f'<span class="line">{tokens}</span>')
+    return "\n".join(lines)
+
+
+def page(body: str) -> str:
+    return f"<html><head><title>Docs</title><script>var x = 1;</script></head><body>{body}</body></html>"
+
+
+class TestExtractHtmlCodeBlocks:
+    def test_highlighted_block_keeps_code_and_indentation(self):
+        html = page(
+            "<h2>Example</h2><p>Fetch a URL &amp; decode it.</p>"
+            '<div class="language-python vp-adaptive-theme"><button class="copy">Copy</button>'
+            f'<pre class="shiki"><code>{highlighted(PYTHON_CODE)}</code></pre></div>'
+            "<p>Returns an empty dict on errors.</p>"
+        )
+
+        [block] = extract_html_code_blocks(html, SETTINGS)
+
+        assert block["code"] == PYTHON_CODE
+        assert block["language"] == "python"
+        assert block["source_type"] == "shiki"
+        assert block["context_before"] == "Example\nFetch a URL & decode it."
+        assert block["context_after"] == "Returns an empty dict on errors."
+
+    def test_language_from_nested_code_class(self):
+        html = page(f'<pre><code class="hljs language-python">{escape(PYTHON_CODE)}</code></pre>')
+
+        [block] = extract_html_code_blocks(html, SETTINGS)
+
+        assert block["language"] == "python"
+        assert block["source_type"] == "standard-lang"
+
+    def test_codemirror_lines_become_newlines(self):
+        lines = "".join(f'<div class="cm-line">{escape(line) or "<br>"}</div>' for line in PYTHON_CODE.split("\n"))
+        html = page(f'<div class="cm-editor"><div class="cm-content">{lines}</div></div>')
+
+        [block] = extract_html_code_blocks(html, SETTINGS)
+
+        assert block["code"] == PYTHON_CODE
+        assert block["source_type"] == "codemirror"
+
+    def test_standalone_code_only_used_without_pre_blocks(self):
+        standalone = f"<p>Run this:</p><code>{escape(PYTHON_CODE)}</code>"
+
+        [block] = extract_html_code_blocks(page(standalone), SETTINGS)
+        assert block["source_type"] == "standalone"
+
+        with_pre = standalone + f'<pre class="language-python"><code>{escape(PYTHON_CODE)}</code></pre>'
+        [block] = extract_html_code_blocks(page(with_pre), SETTINGS)
+        assert block["source_type"] == "prism"
+
+    def test_xhtml_page_with_encoding_declaration(self):
+        html = '<?xml version="1.0" encoding="utf-8"?>' + page(
+            f'<pre class="language-python">{escape(PYTHON_CODE)}</pre><p>Größe</p>'
+        )
+
+        [block] = extract_html_code_blocks(html, SETTINGS)
+
+        assert block["code"] == PYTHON_CODE
+        assert block["context_after"] == "Größe"
+
+    def test_prose_and_short_snippets_are_rejected(self):
+        prose = "This is the part of the guide that explains what the options are. " * 5
+        html = page(f"<pre>{prose}</pre><pre><code>x = 1</code></pre>")
+
+        assert extract_html_code_blocks(html, SETTINGS) == []
+        assert extract_html_code_blocks("", SETTINGS) == []
+
+
+class TestValidationAndBoundaries:
+    def test_validation_reports_the_reason(self):
+        assert validate_code_quality(PYTHON_CODE, "python", SETTINGS) == (True, "")
+
+        passed, reason = validate_code_quality("graph TD;\n  A-->B;\n  B-->C;\n  C-->D;", "mermaid", SETTINGS)
+        assert not passed
+        assert "diagram" in reason
+
+    def test_language_specific_checks_follow_the_setting(self):
+        code = "x = compute(a, b)\ny = [x, x]\nprint(x.value)"
+        assert not validate_code_quality(code, "rust", SETTINGS)[0]
+        assert validate_code_quality(code, "rust", ExtractionSettings(language_patterns=False))[0]
+
+    def test_complete_block_stops_at_closing_brace(self):
+        content = "function a() {\n  return 1;\n}\nSome prose follows here."
+
+        code, end = find_complete_code_block(content, 0, 10, "javascript", SETTINGS)
+
+        assert code == "function a() {\n  return 1;\n}"
+        assert content[end:].startswith("\nSome prose")
+
+
+class TestCodeExtractionServiceDispatch:
+    @pytest.fixture
+    def service(self):
+        service = CodeExtractionService(MagicMock())
+        service._get_setting = AsyncMock(side_effect=lambda key, default: default)
+        return service
+
+    @pytest.mark.asyncio
+    async def test_blocks_keep_document_order_across_parallel_extraction(self, service):
+        html = page(f'<pre class="language-python">{escape(PYTHON_CODE)}</pre>')
+        docs = [{"url": f"https://docs.example.com/{i}", "html": html, "markdown": ""} for i in range(25)]
+        threading_service = ThreadingService(ThreadingConfig(process_workers=4))
+
+        async def run_in_process(func, *args):
+            return func(*args)
+
+        threading_service.run_in_process = AsyncMock(side_effect=run_in_process)
+        progress = AsyncMock()
+        with patch(
+            "src.server.services.crawling.code_extraction_service.get_threading_service",
+            return_value=threading_service,
+        ):
+            blocks = await service._extract_code_blocks_from_documents(docs, "src-1", progress)
+
+        assert [block["source_url"] for block in blocks] == [doc["url"] for doc in docs]
+        assert threading_service.run_in_process.await_count == 25
+        assert progress.await_args.args[0]["completed_documents"] == 25
+
+    @pytest.mark.asyncio
+    async def test_html_is_parsed_in_a_worker_process(self, service):
+        threading_service = ThreadingService(ThreadingConfig(process_workers=1))
+        try:
+            with patch(
+                "src.server.services.crawling.code_extraction_service.get_threading_service",
+                return_value=threading_service,
+            ):
+                blocks = await service._extract_html_code_blocks(
+                    page(f'<pre class="language-python">{escape(PYTHON_CODE)}</pre>'), use_process_pool=True
+                )
+        finally:
+            threading_service.process_executor.shutdown()
+
+        assert [block["code"] for block in blocks] == [PYTHON_CODE]
@@ -0,0 +1,146 @@
+"""
+Tests for MinHash/LSH near-duplicate code detection.
+
+Checks that LSH candidate grouping matches exhaustive pairwise comparison,
+and that page-level and source-wide deduplication keep the best variant.
+"""
+
+import random
+from difflib import SequenceMatcher
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.server.services.crawling.code_extraction_service import CodeExtractionService
+from src.server.services.storage.code_dedup import (
+    SIMILARITY_THRESHOLD,
+    group_near_duplicates,
+    minhash_signature,
+    normalize_code_for_comparison,
+)
+from src.server.services.storage.code_storage_service import extract_code_blocks
+
+ENDPOINT = """from fastapi import Depends, FastAPI
+
+app = FastAPI()
+
+
+@app.get("/items/{item_id}")
+async def read_item(item_id: int, session: Session = Depends(get_session)):
+    item = await session.get(Item, item_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return {"id": item.id, "name": item.name, "price": item.price}"""
+
+ANNOTATED_ENDPOINT = """from typing import Annotated
+
+from fastapi import Depends, FastAPI
+
+app = FastAPI()
+
+
+@app.get("/items/{item_id}")
+async def read_item(item_id: int, session: Annotated[Session, Depends(get_session)]):
+    item = await session.get(Item, item_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return {"id": item.id, "name": item.name, "price": item.price}"""
+
+WORKER = """import asyncio
+
+
+async def worker(name: str, queue: asyncio.Queue) -> None:
+    while True:
+        delay = await queue.get()
+        await asyncio.sleep(delay)
+        queue.task_done()
+        print(f"{name} slept for {delay:.2f} seconds")
+
+
+async def main(total: int = 10) -> None:
+    queue: asyncio.Queue = asyncio.Queue()
+    workers = [asyncio.create_task(worker(f"worker-{i}", queue)) for i in range(3)]
+    for _ in range(total):
+        queue.put_nowait(0.1)
+    await queue.join()"""
+
+
+def pairwise_groups(codes: list[str]) -> list[list[int]]:
+    """The exhaustive O(n^2) grouping that LSH replaces."""
+    normalized = [normalize_code_for_comparison(code) for code in codes]
+    grouped = set()
+    groups = []
+    for i in range(len(codes)):
+        if i in grouped:
+            continue
+        grouped.add(i)
+        group = [i]
+        for j in range(i + 1, len(codes)):
+            if j not in grouped and SequenceMatcher(None, normalized[i], normalized[j]).ratio() >= SIMILARITY_THRESHOLD:
+                grouped.add(j)
+                group.append(j)
+        groups.append(group)
+    return groups
+
+
+def mutate(code: str, rng: random.Random, edits: int) -> str:
+    lines = code.split("\n")
+    for _ in range(edits):
+        lines[rng.randrange(len(lines))] = f"    value_{rng.randrange(1000)} = compute()"
+    return "\n".join(lines)
+
+
+class TestGroupNearDuplicates:
+    def test_matches_pairwise_comparison(self):
+        rng = random.Random(7)
+        bases = [ENDPOINT, ANNOTATED_ENDPOINT, WORKER] + [
+            "\n".join(f"def function_{n}_{line}(arg):\n    return arg * {line}" for line in range(8)) for n in range(6)
+        ]
+        codes = bases + [mutate(rng.choice(bases), rng, rng.randint(1, 4)) for _ in range(40)]
+        rng.shuffle(codes)
+
+        assert group_near_duplicates(codes) == pairwise_groups(codes)
+
+    def test_annotated_variant_is_grouped_with_plain_version(self):
+        groups = group_near_duplicates([ENDPOINT, WORKER, ANNOTATED_ENDPOINT])
+
+        assert groups == [[0, 2], [1]]
+
+    def test_signatures_are_deterministic(self):
+        assert (minhash_signature(ENDPOINT) == minhash_signature(ENDPOINT)).all()
+        assert group_near_duplicates([]) == []
+        assert group_near_duplicates(["x", "x"]) == [[0, 1]]
+
+
+class TestDeduplication:
+    def test_extract_code_blocks_keeps_best_variant(self):
+        markdown = (
+            f"Plain version:\n\n```python\n{ENDPOINT}\n```\n\n"
+            f"With Annotated:\n\n```python\n{ANNOTATED_ENDPOINT}\n```\n\n"
+            f"A worker:\n\n```python\n{WORKER}\n```\n"
+        )
+
+        blocks = extract_code_blocks(markdown, min_length=100)
+
+        assert [block["code"] for block in blocks] == [ANNOTATED_ENDPOINT, WORKER]
+        assert blocks[0]["consolidated_variants"] == 2
+        assert "consolidated_variants" not in blocks[1]
+
+    @pytest.mark.asyncio
+    async def test_source_wide_dedup_follows_the_setting(self):
+        service = CodeExtractionService(MagicMock())
+        docs = [
+            {"url": "https://docs.example.com/a", "markdown": f"```python\n{ENDPOINT}\n```", "html": ""},
+            {"url": "https://docs.example.com/b", "markdown": f"```python\n{WORKER}\n```", "html": ""},
+            {"url": "https://docs.example.com/c", "markdown": f"```python\n{ANNOTATED_ENDPOINT}\n```", "html": ""},
+        ]
+
+        settings = {"MIN_CODE_BLOCK_LENGTH": 100}
+        service._get_setting = AsyncMock(side_effect=lambda key, default: settings.get(key, default))
+        blocks = await service._extract_code_blocks_from_documents(docs, "src-1")
+        assert len(blocks) == 3
+
+        settings["CODE_DEDUP_ACROSS_SOURCE"] = True
+        blocks = await service._extract_code_blocks_from_documents(docs, "src-1")
+        assert [item["source_url"] for item in blocks] == ["https://docs.example.com/c", "https://docs.example.com/b"]
+        assert blocks[0]["block"]["consolidated_variants"] == 2
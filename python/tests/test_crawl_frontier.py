@@ -0,0 +1,139 @@
+"""
+Tests for the recursive crawl frontier.
+
+Verifies URL priority, de-duplication, per-host limits, and that the recursive
+strategy keeps crawling while a slow page is still in flight.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.server.services.crawling.helpers.crawl_frontier import CrawlFrontier, score_url
+from src.server.services.crawling.strategies.recursive import RecursiveCrawlStrategy
+
+
+class TestCrawlFrontier:
+    def test_shallow_and_docs_pages_come_first(self):
+        frontier = CrawlFrontier()
+        frontier.add("https://example.com/blog/post", depth=1)
+        frontier.add("https://example.com/docs/intro", depth=1)
+        frontier.add("https://example.com/deep/page", depth=2)
+        frontier.add("https://example.com/", depth=0)
+
+        order = [frontier.pop().url for _ in range(4)]
+
+        assert order == [
+            "https://example.com/",
+            "https://example.com/docs/intro",
+            "https://example.com/blog/post",
+            "https://example.com/deep/page",
+        ]
+
+    def test_normalized_duplicates_are_dropped(self):
+        frontier = CrawlFrontier()
+
+        assert frontier.add("https://Example.com/docs/", depth=0)
+        assert not frontier.add("https://example.com/docs#install", depth=1)
+        assert frontier.discovered == 1
+
+    def test_host_at_its_limit_is_skipped_until_a_page_finishes(self):
+        frontier = CrawlFrontier(max_per_host=1)
+        frontier.add("https://a.com/1", depth=0)
+        frontier.add("https://a.com/2", depth=0)
+        frontier.add("https://b.com/1", depth=1)
+
+        first = frontier.pop()
+        second = frontier.pop()
+
+        assert (first.url, second.url) == ("https://a.com/1", "https://b.com/1")
+        assert frontier.pop() is None
+
+        frontier.done(first)
+        assert frontier.pop().url == "https://a.com/2"
+
+    def test_query_strings_are_deferred(self):
+        assert score_url("https://a.com/docs?page=2", 1) > score_url("https://a.com/docs", 1)
+
+
+def page(url: str, links: list[str]) -> SimpleNamespace:
+    return SimpleNamespace(
+        url=url,
+        success=True,
+        markdown=SimpleNamespace(fit_markdown=f"Content of {url}"),
+        html=f"<title>{url}</title>",
+        links={"internal": [{"href": link} for link in links]},
+    )
+
+
+class FakeSite:
+    """Crawler stand-in serving a small link graph, with one slow page."""
+
+    def __init__(self, graph: dict[str, list[str]], slow_url: str | None = None):
+        self.graph = graph
+        self.slow_url = slow_url
+        self.release_slow = asyncio.Event()
+        self.crawled: list[str] = []
+
+    async def arun(self, url, config):
+        if url == self.slow_url:
+            await self.release_slow.wait()
+        self.crawled.append(url)
+        if url == "https://example.com/c":
+            # Everything else finished while the slow page was in flight
+            self.release_slow.set()
+        return page(url, self.graph.get(url, []))
+
+
+@pytest.fixture
+def crawl_settings():
+    with patch("src.server.services.crawling.strategies.recursive.credential_service") as credentials:
+        credentials.get_credentials_by_category = AsyncMock(
+            return_value={
+                "CRAWL_MAX_CONCURRENT": "4",
+                "MEMORY_THRESHOLD_PERCENT": "99",
+                "CRAWL_RESPECT_CRAWL_DELAY": "false",
+            }
+        )
+        yield
+
+
+class TestRecursiveCrawlStrategy:
+    @pytest.mark.asyncio
+    async def test_slow_page_does_not_hold_back_the_next_depth(self, crawl_settings):
+        site = FakeSite(
+            {
+                "https://example.com/": ["https://example.com/slow", "https://example.com/b"],
+                "https://example.com/b": ["https://example.com/c"],
+            },
+            slow_url="https://example.com/slow",
+        )
+        strategy = RecursiveCrawlStrategy(site, markdown_generator=None)
+
+        results = await strategy.crawl_recursive_with_progress(
+            ["https://example.com/"], lambda url: url, lambda url: False, max_depth=3
+        )
+
+        assert site.crawled.index("https://example.com/c") < site.crawled.index("https://example.com/slow")
+        assert {r["url"] for r in results} == {
+            "https://example.com/",
+            "https://example.com/slow",
+            "https://example.com/b",
+            "https://example.com/c",
+        }
+
+    @pytest.mark.asyncio
+    async def test_links_beyond_max_depth_are_not_crawled(self, crawl_settings):
+        site = FakeSite({
+            "https://example.com/": ["https://example.com/b"],
+            "https://example.com/b": ["https://example.com/c"],
+        })
+        strategy = RecursiveCrawlStrategy(site, markdown_generator=None)
+
+        await strategy.crawl_recursive_with_progress(
+            ["https://example.com/"], lambda url: url, lambda url: False, max_depth=2
+        )
+
+        assert site.crawled == ["https://example.com/", "https://example.com/b"]
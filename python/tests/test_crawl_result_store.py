@@ -0,0 +1,137 @@
+"""
+Tests for the disk-backed crawl result store.
+
+Verifies that page contents round-trip through the temp file, stay off the
+heap until read, and that CrawlingService collects non-streamed pages there.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.server.services.crawling.crawling_service import CrawlingService
+from src.server.services.crawling.helpers.crawl_result_store import (
+    CrawlResultStore,
+    FullDocumentMap,
+    SpilledPage,
+)
+
+
+def make_page(url: str, markdown: str, html: str = "<p>page</p>") -> dict:
+    return {"url": url, "markdown": markdown, "html": html, "title": "Title", "etag": '"v1"'}
+
+
+class TestCrawlResultStore:
+    def test_pages_round_trip_through_disk(self):
+        with CrawlResultStore() as store:
+            pages = [make_page(f"https://example.com/{i}", f"# Page {i}\n\n" + "text " * i) for i in range(50)]
+            spilled = [store.add(page) for page in pages]
+
+            assert all(isinstance(page, SpilledPage) for page in spilled)
+            for original, page in zip(pages, spilled, strict=True):
+                assert dict(page) == original
+            assert store.pages_stored == 50
+
+    def test_only_large_fields_are_spilled(self):
+        with CrawlResultStore() as store:
+            page = store.add(make_page("https://example.com", "# Title"))
+
+            assert page._fields == {"url": "https://example.com", "title": "Title", "etag": '"v1"'}
+            assert set(page._spans) == {"markdown", "html"}
+            assert store.bytes_stored == len("# Title") + len("<p>page</p>")
+
+    def test_reads_after_more_pages_are_added(self):
+        with CrawlResultStore() as store:
+            first = store.add(make_page("https://example.com/a", "first"))
+            assert first["markdown"] == "first"
+
+            # The file grows past the current mapping
+            second = store.add(make_page("https://example.com/b", "second " * 10_000))
+            assert second["markdown"] == "second " * 10_000
+            assert first["markdown"] == "first"
+
+    def test_unicode_and_empty_fields(self):
+        with CrawlResultStore() as store:
+            page = store.add(make_page("https://example.com", "Größe — 漢字 🚀", html=""))
+
+            assert page["markdown"] == "Größe — 漢字 🚀"
+            assert page["html"] == ""
+            assert page.get("missing") is None
+
+    def test_keeps_page_in_memory_when_disk_write_fails(self):
+        store = CrawlResultStore()
+        store._file = MagicMock()
+        store._file.write.side_effect = OSError("No space left on device")
+        page = make_page("https://example.com", "content")
+
+        assert store.add(page) is page
+        assert store.add(page) is page
+        assert store._file.write.call_count == 1
+
+
+class TestFullDocumentMap:
+    def test_spilled_pages_are_read_lazily(self):
+        with CrawlResultStore() as store:
+            documents = FullDocumentMap()
+            page = store.add(make_page("https://example.com/a", "  # Spilled  \n"))
+            documents.set_page("https://example.com/a", page)
+            documents.set_page("https://example.com/b", make_page("https://example.com/b", " plain "))
+
+            assert documents._documents["https://example.com/a"] is page
+            assert documents["https://example.com/a"] == "# Spilled"
+            assert documents.get("https://example.com/b") == "plain"
+            assert dict(documents.items()) == {
+                "https://example.com/a": "# Spilled",
+                "https://example.com/b": "plain",
+            }
+
+    def test_behaves_like_a_dict(self):
+        documents = FullDocumentMap()
+        documents["https://example.com/a"] = "a"
+        documents["https://example.com/b"] = "b"
+        del documents["https://example.com/a"]
+
+        assert list(documents.keys()) == ["https://example.com/b"]
+        documents.clear()
+        assert len(documents) == 0
+
+
+class TestCrawlingServiceSpilling:
+    def make_service(self) -> CrawlingService:
+        service = CrawlingService(crawler=MagicMock(), supabase_client=MagicMock())
+
+        async def crawl(*args):
+            page_callback = args[7]
+            for i in range(3):
+                await page_callback(make_page(f"https://example.com/{i}", f"page {i}"))
+            return []
+
+        service.batch_strategy.crawl_batch_with_progress = AsyncMock(side_effect=crawl)
+        return service
+
+    @pytest.mark.asyncio
+    async def test_batch_results_are_spilled_during_orchestration(self):
+        service = self.make_service()
+        with CrawlResultStore() as store:
+            service.result_store = store
+            results = await service.crawl_batch_with_progress(["https://example.com/0"])
+
+            assert [page["markdown"] for page in results] == ["page 0", "page 1", "page 2"]
+            assert all(isinstance(page, SpilledPage) for page in results)
+            assert store.pages_stored == 3
+
+    @pytest.mark.asyncio
+    async def test_streamed_pages_bypass_the_store(self):
+        service = self.make_service()
+        streamed = []
+
+        async def stream(page):
+            streamed.append(page)
+
+        with CrawlResultStore() as store:
+            service.result_store = store
+            results = await service.crawl_batch_with_progress(["https://example.com/0"], page_callback=stream)
+
+            assert results == []
+            assert len(streamed) == 3
+            assert store.pages_stored == 0
@@ -0,0 +1,106 @@
+"""
+Tests for DatabaseMetricsService.
+
+Metrics must come from get_archon_database_metrics() (cached) or from
+head-only counts, never from selects that return row payloads.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.server.services.knowledge import database_metrics_service
+from src.server.services.knowledge.database_metrics_service import DatabaseMetricsService, clear_metrics_cache
+
+PAYLOAD = {
+    "database_bytes": 52_428_800_000,
+    "totals": {"sources": 40, "chunks": 3_000_000, "code_examples": 120_000, "pages": 90_000},
+    "tables": {
+        "archon_crawled_pages": {
+            "estimated_rows": 2_998_512,
+            "total_bytes": 48_000_000_000,
+            "table_bytes": 30_000_000_000,
+            "index_bytes": 18_000_000_000,
+        }
+    },
+    "indexes": [{"name": "idx_archon_crawled_pages_embedding_1536", "table": "archon_crawled_pages", "bytes": 9_000_000_000}],
+    "knowledge_types": {"technical": 31, "business": 9},
+}
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_metrics_cache()
+    yield
+    clear_metrics_cache()
+
+
+def make_client(payload=None, rpc_error: Exception | None = None) -> MagicMock:
+    client = MagicMock()
+    if rpc_error:
+        client.rpc.return_value.execute.side_effect = rpc_error
+    else:
+        client.rpc.return_value.execute.return_value = MagicMock(data=payload)
+    return client
+
+
+class TestGetMetrics:
+    @pytest.mark.asyncio
+    async def test_reads_totals_and_sizes_from_the_metrics_function(self):
+        client = make_client(PAYLOAD)
+
+        metrics = await DatabaseMetricsService(client).get_metrics()
+
+        assert metrics["sources_count"] == 40
+        assert metrics["pages_count"] == 3_000_000
+        assert metrics["code_examples_count"] == 120_000
+        assert metrics["stored_pages_count"] == 90_000
+        assert metrics["average_pages_per_source"] == 75_000
+        assert metrics["tables"]["archon_crawled_pages"]["estimated_rows"] == 2_998_512
+        assert metrics["indexes"][0]["bytes"] == 9_000_000_000
+        client.rpc.assert_called_once_with("get_archon_database_metrics")
+        client.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_result_is_cached_across_instances(self, monkeypatch):
+        client = make_client(PAYLOAD)
+
+        await DatabaseMetricsService(client).get_metrics()
+        await DatabaseMetricsService(client).get_metrics()
+        assert client.rpc.call_count == 1
+
+        monkeypatch.setattr(database_metrics_service, "METRICS_CACHE_TTL_SECONDS", 0)
+        await DatabaseMetricsService(client).get_metrics()
+        assert client.rpc.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_head_only_counts(self):
+        client = make_client(rpc_error=Exception("Could not find the function get_archon_database_metrics"))
+        query = client.table.return_value.select.return_value
+        query.execute.return_value = MagicMock(count=7)
+
+        metrics = await DatabaseMetricsService(client).get_metrics()
+
+        assert metrics["sources_count"] == 7
+        assert metrics["pages_count"] == 7
+        counts = {call.args[0]: call for call in client.table.call_args_list}
+        assert set(counts) == {"archon_sources", "archon_crawled_pages", "archon_code_examples"}
+        for call in client.table.return_value.select.call_args_list:
+            assert call.args[0] != "*"
+            assert call.kwargs["head"] is True
+        methods = sorted(call.kwargs["count"] for call in client.table.return_value.select.call_args_list)
+        assert methods == ["estimated", "estimated", "exact"]
+
+
+class TestGetStorageStatistics:
+    @pytest.mark.asyncio
+    async def test_knowledge_types_are_grouped_in_the_database(self):
+        client = make_client(PAYLOAD)
+        recent = client.table.return_value.select.return_value.order.return_value.limit.return_value
+        recent.execute.return_value = MagicMock(data=[{"source_id": "a", "created_at": "2026-10-01"}])
+
+        stats = await DatabaseMetricsService(client).get_storage_statistics()
+
+        assert stats["knowledge_type_distribution"] == {"technical": 31, "business": 9}
+        assert stats["recent_sources"] == [{"source_id": "a", "created_at": "2026-10-01"}]
+        client.table.return_value.select.assert_called_once_with("source_id, created_at")
@@ -1,6 +1,11 @@
 """Unit tests for DiscoveryService class."""
+import asyncio
+import inspect
 import socket
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
 
 from src.server.services.crawling.discovery_service import DiscoveryService
 
@@ -13,230 +18,279 @@ def create_mock_dns_response():
     ]
 
 
-def create_mock_response(status_code: int, text: str = "", url: str = "https://example.com") -> Mock:
-    """Create a mock response object that supports streaming API."""
-    response = Mock()
-    response.status_code = status_code
-    response.text = text
-    response.encoding = 'utf-8'
-    response.history = []  # Empty list for no redirects
-    response.url = url  # Mock URL for redirect checks (must be string, not Mock)
+def create_mock_response(status_code: int, text: str = "", **headers) -> httpx.Response:
+    """Create a response for the mock transport."""
+    return httpx.Response(status_code, text=text, headers=headers)
+
+
+def serve(handler):
+    """
+    Patch the discovery HTTP client so requests are answered by ``handler``.
 
-    # Mock iter_content to yield text in chunks as bytes
-    text_bytes = text.encode('utf-8')
-    chunk_size = 8192
-    chunks = [text_bytes[i:i+chunk_size] for i in range(0, len(text_bytes), chunk_size)]
-    if not chunks:
-        chunks = [b'']  # Ensure at least one empty chunk
-    response.iter_content = Mock(return_value=iter(chunks))
+    The handler receives the request URL (and the method, if it takes a second
+    argument) and returns a response; it may be async. The patched client factory
+    records every request in ``.seen``.
+    """
+    real_client = httpx.AsyncClient
+    wants_method = len(inspect.signature(handler).parameters) > 1
+    seen: list[httpx.Request] = []
 
-    # Mock close method
-    response.close = Mock()
+    async def transport_handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        args = (str(request.url), request.method) if wants_method else (str(request.url),)
+        response = handler(*args)
+        if inspect.isawaitable(response):
+            response = await response
+        return response
 
-    return response
+    client_factory = MagicMock(
+        side_effect=lambda **kwargs: real_client(transport=httpx.MockTransport(transport_handler), **kwargs)
+    )
+    client_factory.seen = seen
+    return patch("src.server.services.crawling.discovery_service.httpx.AsyncClient", new=client_factory)
 
 
 class TestDiscoveryService:
     """Test suite for DiscoveryService class."""
 
+    @pytest.mark.asyncio
     @patch('socket.getaddrinfo', return_value=create_mock_dns_response())
-    @patch('requests.Session')
-    @patch('requests.get')
-    def test_discover_files_basic(self, mock_get, mock_session, mock_dns):
+    async def test_discover_files_basic(self, mock_dns):
         """Test main discovery method returns single best file."""
         service = DiscoveryService()
         base_url = "https://example.com"
 
-        # Mock robots.txt response (no sitemaps)
-        robots_response = create_mock_response(200, "User-agent: *\nDisallow: /admin/")
-
         # Mock file existence - llms-full.txt doesn't exist, but llms.txt does
-        def mock_get_side_effect(url, **kwargs):
+        def handler(url):
             if url.endswith('robots.txt'):
-                return robots_response
+                return create_mock_response(200, "User-agent: *\nDisallow: /admin/")
             elif url.endswith('llms-full.txt'):
-                return create_mock_response(404)  # Highest priority doesn't exist
+                return create_mock_response(404)
             elif url.endswith('llms.txt'):
-                return create_mock_response(200)  # Second priority exists
+                return create_mock_response(200)
             else:
                 return create_mock_response(404)
 
-        mock_get.side_effect = mock_get_side_effect
-        mock_session.return_value.get.side_effect = mock_get_side_effect
-
-        result = service.discover_files(base_url)
+        with serve(handler):
+            result = await service.discover_files(base_url)
 
         # Should return single URL string (not dict, not list)
         assert isinstance(result, str)
         assert result == 'https://example.com/llms.txt'
 
+    @pytest.mark.asyncio
     @patch('socket.getaddrinfo', return_value=create_mock_dns_response())
-    @patch('requests.Session')
-    @patch('requests.get')
-    def test_discover_files_no_files_found(self, mock_get, mock_session, mock_dns):
+    async def test_discover_files_no_files_found(self, mock_dns):
         """Test discovery when no files are found."""
         service = DiscoveryService()
-        base_url = "https://example.com"
 
         # Mock all HTTP requests to return 404
-        mock_get.return_value = create_mock_response(404)
-        mock_session.return_value.get.return_value = create_mock_response(404)
-
-        result = service.discover_files(base_url)
+        with serve(lambda url: create_mock_response(404)):
+            result = await service.discover_files("https://example.com")
 
         # Should return None when no files found
         assert result is None
 
+    @pytest.mark.asyncio
     @patch('socket.getaddrinfo', return_value=create_mock_dns_response())
-    @patch('requests.Session')
-    @patch('requests.get')
-    def test_discover_files_priority_order(self, mock_get, mock_session, mock_dns):
+    async def test_discover_files_priority_order(self, mock_dns):
         """Test that discovery follows the correct priority order."""
         service = DiscoveryService()
-        base_url = "https://example.com"
-
-        # Mock robots.txt response (no sitemaps declared)
-        robots_response = create_mock_response(200, "User-agent: *\nDisallow: /admin/")
 
-        # Mock file existence - both sitemap.xml and llms.txt exist, but llms.txt has higher priority
-        def mock_get_side_effect(url, **kwargs):
-            if url.endswith('robots.txt'):
-                return robots_response
-            elif url.endswith('llms.txt') or url.endswith('sitemap.xml'):
-                return create_mock_response(200)  # Both exist
-            else:
-                return create_mock_response(404)
-
-        mock_get.side_effect = mock_get_side_effect
-        mock_session.return_value.get.side_effect = mock_get_side_effect
+        # Both sitemap.xml and llms.txt exist, but llms.txt has higher priority
+        def handler(url):
+            if url.endswith('llms.txt') or url.endswith('sitemap.xml'):
+                return create_mock_response(200)
+            return create_mock_response(404)
 
-        result = service.discover_files(base_url)
+        with serve(handler):
+            result = await service.discover_files("https://example.com")
 
         # Should return llms.txt since it has higher priority than sitemap.xml
         assert result == 'https://example.com/llms.txt'
 
+    @pytest.mark.asyncio
     @patch('socket.getaddrinfo', return_value=create_mock_dns_response())
-    @patch('requests.Session')
-    @patch('requests.get')
-    def test_discover_files_robots_sitemap_priority(self, mock_get, mock_session, mock_dns):
+    async def test_discover_files_robots_sitemap_priority(self, mock_dns):
         """Test that llms files have priority over robots.txt sitemap declarations."""
         service = DiscoveryService()
-        base_url = "https://example.com"
-
-        # Mock robots.txt response WITH sitemap declaration
-        robots_response = create_mock_response(200, "User-agent: *\nSitemap: https://example.com/declared-sitemap.xml")
 
-        # Mock other files also exist (both llms and sitemap files)
-        def mock_get_side_effect(url, **kwargs):
+        def handler(url):
             if url.endswith('robots.txt'):
-                return robots_response
+                return create_mock_response(200, "User-agent: *\nSitemap: https://example.com/declared-sitemap.xml")
             elif 'llms' in url or 'sitemap' in url:
                 return create_mock_response(200)
-            else:
-                return create_mock_response(404)
-
-        mock_get.side_effect = mock_get_side_effect
-        mock_session.return_value.get.side_effect = mock_get_side_effect
+            return create_mock_response(404)
 
-        result = service.discover_files(base_url)
+        with serve(handler):
+            result = await service.discover_files("https://example.com")
 
         # Should return llms.txt (highest priority llms file) since llms files have priority over sitemaps
         # even when sitemaps are declared in robots.txt
         assert result == 'https://example.com/llms.txt'
 
+    @pytest.mark.asyncio
     @patch('socket.getaddrinfo', return_value=create_mock_dns_response())
-    @patch('requests.Session')
-    @patch('requests.get')
-    def test_discover_files_subdirectory_fallback(self, mock_get, mock_session, mock_dns):
+    async def test_discover_files_subdirectory_fallback(self, mock_dns):
         """Test discovery falls back to subdirectories for llms files."""
         service = DiscoveryService()
-        base_url = "https://example.com"
-
-        # Mock robots.txt response (no sitemaps declared)
-        robots_response = create_mock_response(200, "User-agent: *\nDisallow: /admin/")
-
-        # Mock file existence - no root llms files, but static/llms.txt exists
-        def mock_get_side_effect(url, **kwargs):
-            if url.endswith('robots.txt'):
-                return robots_response
-            elif '/static/llms.txt' in url:
-                return create_mock_response(200)  # Found in subdirectory
-            else:
-                return create_mock_response(404)
 
-        mock_get.side_effect = mock_get_side_effect
-        mock_session.return_value.get.side_effect = mock_get_side_effect
+        # No root llms files, but static/llms.txt exists
+        def handler(url):
+            if '/static/llms.txt' in url:
+                return create_mock_response(200)
+            return create_mock_response(404)
 
-        result = service.discover_files(base_url)
+        with serve(handler):
+            result = await service.discover_files("https://example.com")
 
         # Should find the file in static subdirectory
         assert result == 'https://example.com/static/llms.txt'
 
+    @pytest.mark.asyncio
+    @patch('socket.getaddrinfo', return_value=create_mock_dns_response())
+    async def test_discover_files_returns_without_waiting_for_lower_priority_probes(self, mock_dns):
+        """Test discovery returns as soon as the highest-priority hit is known."""
+        service = DiscoveryService()
+
+        async def handler(url):
+            if url == 'https://example.com/llms.txt':
+                return create_mock_response(200)
+            if url.endswith('sitemap.xml'):
+                await asyncio.sleep(30)  # A slow server for a lower-priority candidate
+            return create_mock_response(404)
+
+        with serve(handler):
+            result = await asyncio.wait_for(service.discover_files("https://example.com"), timeout=5)
+
+        assert result == 'https://example.com/llms.txt'
+
+    @pytest.mark.asyncio
     @patch('socket.getaddrinfo', return_value=create_mock_dns_response())
-    @patch('requests.Session')
-    @patch('requests.get')
-    def test_check_url_exists(self, mock_get, mock_session, mock_dns):
+    async def test_discover_files_resolves_each_hostname_once(self, mock_dns):
+        """Test all probes share one SSRF-validated resolver lookup."""
+        service = DiscoveryService()
+
+        with serve(lambda url: create_mock_response(404)) as client_factory:
+            await service.discover_files("https://example.com/docs/")
+
+        assert mock_dns.call_count == 1
+        # One connection pool for the whole discovery run
+        assert client_factory.call_count == 1
+
+    @pytest.mark.asyncio
+    @patch('socket.getaddrinfo', return_value=create_mock_dns_response())
+    async def test_check_url_exists(self, mock_dns):
         """Test URL existence checking."""
         service = DiscoveryService()
 
         # Test successful response
-        mock_get.return_value = create_mock_response(200)
-        mock_session.return_value.get.return_value = create_mock_response(200)
-        assert service._check_url_exists("https://example.com/exists") is True
+        with serve(lambda url: create_mock_response(200)):
+            assert await service._check_url_exists("https://example.com/exists") is True
 
         # Test 404 response
-        mock_get.return_value = create_mock_response(404)
-        mock_session.return_value.get.return_value = create_mock_response(404)
-        assert service._check_url_exists("https://example.com/not-found") is False
+        with serve(lambda url: create_mock_response(404)):
+            assert await service._check_url_exists("https://example.com/not-found") is False
 
         # Test network error
-        mock_get.side_effect = Exception
-        mock_session.return_value.get.side_effect = Exception("Network error")
-        assert service._check_url_exists("https://example.com/error") is False
+        def fail(url):
+            raise httpx.ConnectError("Network error")
+
+        with serve(fail):
+            assert await service._check_url_exists("https://example.com/error") is False
+
+    @pytest.mark.asyncio
+    @patch('socket.getaddrinfo', return_value=create_mock_dns_response())
+    async def test_check_url_exists_falls_back_to_get_when_head_is_rejected(self, mock_dns):
+        """Test servers that reject HEAD are asked again with GET."""
+        service = DiscoveryService()
+
+        def handler(url, method):
+            return create_mock_response(405 if method == "HEAD" else 200)
+
+        with serve(handler) as client_factory:
+            assert await service._check_url_exists("https://example.com/llms.txt") is True
+
+        assert [request.method for request in client_factory.seen] == ["HEAD", "GET"]
+
+    @pytest.mark.asyncio
+    async def test_check_url_exists_blocks_redirect_to_private_address(self):
+        """Test every redirect hop is SSRF-validated."""
+        service = DiscoveryService()
+
+        def resolve(hostname, *args, **kwargs):
+            ip = '10.0.0.5' if hostname == 'internal.example.com' else '93.184.216.34'
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', (ip, 0))]
+
+        def handler(url):
+            if url == 'https://example.com/llms.txt':
+                return create_mock_response(302, location='https://internal.example.com/llms.txt')
+            return create_mock_response(200)
+
+        with patch('socket.getaddrinfo', side_effect=resolve), serve(handler) as client_factory:
+            assert await service._check_url_exists("https://example.com/llms.txt") is False
+
+        assert [str(request.url) for request in client_factory.seen] == ['https://example.com/llms.txt']
 
+    @pytest.mark.asyncio
     @patch('socket.getaddrinfo', return_value=create_mock_dns_response())
-    @patch('requests.Session')
-    @patch('requests.get')
-    def test_parse_robots_txt_with_sitemap(self, mock_get, mock_session, mock_dns):
+    async def test_parse_robots_txt_with_sitemap(self, mock_dns):
         """Test robots.txt parsing with sitemap directives."""
         service = DiscoveryService()
 
-        # Mock successful robots.txt response
         robots_text = """User-agent: *
 Disallow: /admin/
 Sitemap: https://example.com/sitemap.xml
 Sitemap: https://example.com/sitemap-news.xml"""
-        mock_get.return_value = create_mock_response(200, robots_text)
 
-        result = service._parse_robots_txt("https://example.com")
+        with serve(lambda url: create_mock_response(200, robots_text)) as client_factory:
+            result = await service._parse_robots_txt("https://example.com")
 
         assert len(result) == 2
         assert "https://example.com/sitemap.xml" in result
         assert "https://example.com/sitemap-news.xml" in result
-        mock_get.assert_called_once_with("https://example.com/robots.txt", timeout=30, stream=True, verify=True, headers={'User-Agent': 'Archon-Discovery/1.0 (SSRF-Protected)'})
+        assert [str(request.url) for request in client_factory.seen] == ["https://example.com/robots.txt"]
+        assert client_factory.seen[0].headers["User-Agent"] == 'Archon-Discovery/1.0 (SSRF-Protected)'
 
+    @pytest.mark.asyncio
     @patch('socket.getaddrinfo', return_value=create_mock_dns_response())
-    @patch('requests.Session')
-    @patch('requests.get')
-    def test_parse_robots_txt_no_sitemap(self, mock_get, mock_session, mock_dns):
+    async def test_parse_robots_txt_no_sitemap(self, mock_dns):
         """Test robots.txt parsing without sitemap directives."""
         service = DiscoveryService()
 
-        # Mock robots.txt without sitemaps
         robots_text = """User-agent: *
 Disallow: /admin/
 Allow: /public/"""
-        mock_get.return_value = create_mock_response(200, robots_text)
 
-        result = service._parse_robots_txt("https://example.com")
+        with serve(lambda url: create_mock_response(200, robots_text)) as client_factory:
+            result = await service._parse_robots_txt("https://example.com")
 
         assert len(result) == 0
-        mock_get.assert_called_once_with("https://example.com/robots.txt", timeout=30, stream=True, verify=True, headers={'User-Agent': 'Archon-Discovery/1.0 (SSRF-Protected)'})
+        assert [str(request.url) for request in client_factory.seen] == ["https://example.com/robots.txt"]
 
+    def test_parse_crawl_delay_prefers_our_user_agent_group(self):
+        """Test Crawl-delay lookup picks our group over the wildcard group."""
+        robots_text = """User-agent: *
+Crawl-delay: 2
+
+User-agent: Googlebot
+User-agent: archoncrawler/1.0
+Crawl-delay: 5 # be gentle
+"""
+        assert DiscoveryService.parse_crawl_delay(robots_text) == 5.0
+        assert DiscoveryService.parse_crawl_delay("User-agent: *\nDisallow: /admin/\nCrawl-delay: 1.5") == 1.5
+
+    def test_parse_crawl_delay_ignores_other_agents_and_bad_values(self):
+        """Test Crawl-delay lookup ignores groups for other crawlers and invalid values."""
+        assert DiscoveryService.parse_crawl_delay("User-agent: bingbot\nCrawl-delay: 10") is None
+        # Only the whole product token matches, not a part of it
+        assert DiscoveryService.parse_crawl_delay("User-agent: Archon\nCrawl-delay: 10") is None
+        assert DiscoveryService.parse_crawl_delay("User-agent: Crawler\nCrawl-delay: 10") is None
+        assert DiscoveryService.parse_crawl_delay("User-agent: *\nCrawl-delay: soon") is None
+
+    @pytest.mark.asyncio
     @patch('socket.getaddrinfo', return_value=create_mock_dns_response())
-    @patch('requests.Session')
-    @patch('requests.get')
-    def test_parse_html_meta_tags(self, mock_get, mock_session, mock_dns):
+    async def test_parse_html_meta_tags(self, mock_dns):
         """Test HTML meta tag parsing for sitemaps."""
         service = DiscoveryService()
 
@@ -250,104 +304,82 @@ Allow: /public/"""
         <body>Content here</body>
         </html>
         """
-        mock_get.return_value = create_mock_response(200, html_content)
 
-        result = service._parse_html_meta_tags("https://example.com")
+        with serve(lambda url: create_mock_response(200, html_content)) as client_factory:
+            result = await service._parse_html_meta_tags("https://example.com")
 
         # Should find sitemaps from both link and meta tags
         assert len(result) >= 1
         assert any('sitemap' in url.lower() for url in result)
-        mock_get.assert_called_once_with("https://example.com", timeout=30, stream=True, verify=True, headers={'User-Agent': 'Archon-Discovery/1.0 (SSRF-Protected)'})
+        assert [str(request.url) for request in client_factory.seen] == ["https://example.com"]
 
+    @pytest.mark.asyncio
     @patch('socket.getaddrinfo', return_value=create_mock_dns_response())
-    @patch('requests.Session')
-    @patch('requests.get')
-    def test_discovery_priority_behavior(self, mock_get, mock_session, mock_dns):
+    async def test_discovery_priority_behavior(self, mock_dns):
         """Test that discovery returns highest-priority file when multiple files exist."""
-        service = DiscoveryService()
         base_url = "https://example.com"
 
-        # Mock robots.txt response (no sitemaps declared)
-        robots_response = create_mock_response(200, "User-agent: *\nDisallow: /admin/")
-
         # Scenario 1: All files exist - should return llms.txt (highest priority)
-        def mock_all_exist(url, **kwargs):
-            if url.endswith('robots.txt'):
-                return robots_response
-            elif any(file in url for file in ['llms.txt', 'llms-full.txt', 'sitemap.xml']):
+        def mock_all_exist(url):
+            if any(file in url for file in ['llms.txt', 'llms-full.txt', 'sitemap.xml']):
                 return create_mock_response(200)
-            else:
-                return create_mock_response(404)
+            return create_mock_response(404)
 
-        mock_get.side_effect = mock_all_exist
-        mock_session.return_value.get.side_effect = mock_all_exist
-        result = service.discover_files(base_url)
+        with serve(mock_all_exist):
+            result = await DiscoveryService().discover_files(base_url)
         assert result == 'https://example.com/llms.txt', "Should return llms.txt when all files exist (highest priority)"
 
         # Scenario 2: llms.txt missing, others exist - should return llms-full.txt
-        def mock_without_txt(url, **kwargs):
-            if url.endswith('robots.txt'):
-                return robots_response
-            elif url.endswith('llms.txt'):
+        def mock_without_txt(url):
+            if url.endswith('llms.txt'):
                 return create_mock_response(404)
             elif any(file in url for file in ['llms-full.txt', 'sitemap.xml']):
                 return create_mock_response(200)
-            else:
-                return create_mock_response(404)
+            return create_mock_response(404)
 
-        mock_get.side_effect = mock_without_txt
-        mock_session.return_value.get.side_effect = mock_without_txt
-        result = service.discover_files(base_url)
+        with serve(mock_without_txt):
+            result = await DiscoveryService().discover_files(base_url)
         assert result == 'https://example.com/llms-full.txt', "Should return llms-full.txt when llms.txt is missing"
 
         # Scenario 3: Only sitemap files exist - should return sitemap.xml
-        def mock_only_sitemaps(url, **kwargs):
-            if url.endswith('robots.txt'):
-                return robots_response
-            elif any(file in url for file in ['llms.txt', 'llms-full.txt']):
+        def mock_only_sitemaps(url):
+            if any(file in url for file in ['llms.txt', 'llms-full.txt']):
                 return create_mock_response(404)
             elif url.endswith('sitemap.xml'):
                 return create_mock_response(200)
-            else:
-                return create_mock_response(404)
+            return create_mock_response(404)
 
-        mock_get.side_effect = mock_only_sitemaps
-        mock_session.return_value.get.side_effect = mock_only_sitemaps
-        result = service.discover_files(base_url)
+        with serve(mock_only_sitemaps):
+            result = await DiscoveryService().discover_files(base_url)
         assert result == 'https://example.com/sitemap.xml', "Should return sitemap.xml when llms files are missing"
 
         # Scenario 4: llms files have priority over sitemap files
-        def mock_llms_and_sitemap(url, **kwargs):
-            if url.endswith('robots.txt'):
-                return robots_response
-            elif url.endswith('llms.txt') or url.endswith('sitemap.xml'):
+        def mock_llms_and_sitemap(url):
+            if url.endswith('llms.txt') or url.endswith('sitemap.xml'):
                 return create_mock_response(200)
-            else:
-                return create_mock_response(404)
+            return create_mock_response(404)
 
-        mock_get.side_effect = mock_llms_and_sitemap
-        mock_session.return_value.get.side_effect = mock_llms_and_sitemap
-        result = service.discover_files(base_url)
+        with serve(mock_llms_and_sitemap):
+            result = await DiscoveryService().discover_files(base_url)
         assert result == 'https://example.com/llms.txt', "Should prefer llms.txt over sitemap.xml"
 
+    @pytest.mark.asyncio
     @patch('socket.getaddrinfo', return_value=create_mock_dns_response())
-    @patch('requests.Session')
-    @patch('requests.get')
-    def test_network_error_handling(self, mock_get, mock_session, mock_dns):
+    async def test_network_error_handling(self, mock_dns):
         """Test error scenarios with network failures."""
         service = DiscoveryService()
 
-        # Mock network error
-        mock_get.side_effect = Exception("Network error")
-        mock_session.return_value.get.side_effect = Exception("Network error")
+        def fail(url):
+            raise httpx.ConnectError("Network error")
 
-        # Should not raise exception, but return None
-        result = service.discover_files("https://example.com")
-        assert result is None
+        with serve(fail):
+            # Should not raise exception, but return None
+            result = await service.discover_files("https://example.com")
+            assert result is None
 
-        # Individual methods should also handle errors gracefully
-        result = service._parse_robots_txt("https://example.com")
-        assert result == []
+            # Individual methods should also handle errors gracefully
+            result = await service._parse_robots_txt("https://example.com")
+            assert result == []
 
-        result = service._parse_html_meta_tags("https://example.com")
-        assert result == []
+            result = await service._parse_html_meta_tags("https://example.com")
+            assert result == []
@@ -0,0 +1,106 @@
+"""
+Tests for batched document chunking.
+
+Verifies that the process-pool chunking stage returns the same chunks and
+word counts as smart_chunk_text, in document order, and that small batches
+keep using the per-document path, and that the modules worker processes
+import stay free of the heavy service packages.
+"""
+
+import subprocess
+import sys
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+
+from src.server.services.storage import base_storage_service
+from src.server.services.storage.storage_services import DocumentStorageService
+from src.server.services.text_processing.chunking import chunk_documents, smart_chunk_text
+from src.server.services.threading_service import ThreadingConfig, ThreadingService
+
+
+def make_text(n: int) -> str:
+    paragraphs = [f"## Section {n}.{i}\n\nParagraph {i} of document {n}. " + "word " * (40 + n % 7) for i in range(30)]
+    return "\n\n".join(paragraphs)
+
+
+@pytest.fixture
+def storage_service():
+    service = DocumentStorageService(MagicMock())
+    service.threading_service = ThreadingService(ThreadingConfig(process_workers=2))
+    return service
+
+
+class TestChunkDocuments:
+    def test_matches_smart_chunk_text(self):
+        texts = [make_text(n) for n in range(3)] + [""]
+
+        results = chunk_documents(texts, chunk_size=1000)
+
+        for text, chunks in zip(texts, results, strict=True):
+            assert [chunk for chunk, _ in chunks] == smart_chunk_text(text, 1000)
+            assert [count for _, count in chunks] == [len(chunk.split()) for chunk, _ in chunks]
+        assert results[-1] == []
+
+
+class TestChunkDocumentsAsync:
+    @pytest.mark.asyncio
+    async def test_large_batches_keep_document_order(self, storage_service):
+        texts = [make_text(n) for n in range(45)]
+
+        async def run_in_process(func, *args):
+            return func(*args)
+
+        storage_service.threading_service.run_in_process = AsyncMock(side_effect=run_in_process)
+        with patch.object(base_storage_service, "PROCESS_BATCH_CHARS", len(texts[0]) * 4):
+            results = await storage_service.chunk_documents_async(texts, chunk_size=1000)
+
+        assert results == chunk_documents(texts, chunk_size=1000)
+        assert storage_service.threading_service.run_in_process.await_count > 5
+
+    @pytest.mark.asyncio
+    async def test_small_batches_use_per_document_chunking(self, storage_service):
+        storage_service.smart_chunk_text = Mock(side_effect=lambda text, chunk_size: [text, "two words"])
+        storage_service.threading_service.run_in_process = AsyncMock()
+
+        results = await storage_service.chunk_documents_async(["a", "b"])
+
+        assert results == [[("a", 1), ("two words", 2)], [("b", 1), ("two words", 2)]]
+        storage_service.threading_service.run_in_process.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_cancellation_stops_dispatch(self, storage_service):
+        storage_service.threading_service.run_in_process = AsyncMock()
+        cancellation_check = Mock(side_effect=RuntimeError("cancelled"))
+
+        with pytest.raises(RuntimeError):
+            await storage_service.chunk_documents_async(
+                [make_text(n) for n in range(25)], cancellation_check=cancellation_check
+            )
+        storage_service.threading_service.run_in_process.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_chunks_in_worker_processes(self, storage_service):
+        texts = [make_text(n) for n in range(25)]
+        try:
+            with patch.object(base_storage_service, "PROCESS_BATCH_CHARS", len(texts[0]) * 10):
+                results = await storage_service.chunk_documents_async(texts, chunk_size=1000)
+        finally:
+            storage_service.threading_service.process_executor.shutdown()
+
+        assert results == chunk_documents(texts, chunk_size=1000)
+
+
+class TestWorkerImports:
+    def test_worker_modules_do_not_import_service_packages(self):
+        # Spawned workers import these modules by name on every pool start
+        script = (
+            "import sys\n"
+            "import src.server.services.text_processing.chunking\n"
+            "import src.server.services.text_processing.code_block_extractor\n"
+            "heavy = ('src.server.services.crawling', 'src.server.services.storage', 'src.server.utils')\n"
+            "print([name for name in sys.modules if name.startswith(heavy)])\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == "[]"
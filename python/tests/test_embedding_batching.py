@@ -0,0 +1,146 @@
+"""
+Tests for concurrent, adaptively sized embedding sub-batches.
+
+Verifies that sub-batches overlap up to the in-flight limit, that the batch
+size reacts to latency and rate limits, and that token estimates bound batches.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import openai
+import pytest
+
+from src.server.services.embeddings.embedding_service import (
+    AdaptiveBatchSizer,
+    _next_batch_end,
+    create_embeddings_batch,
+)
+
+
+class ConcurrencyTrackingClient:
+    """Fake OpenAI-compatible client that records how many requests overlap."""
+
+    def __init__(self, error: Exception | None = None):
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.batch_sizes: list[int] = []
+        self.error = error
+        self.embeddings = MagicMock()
+        self.embeddings.create = self.create
+
+    async def create(self, model: str, input: list[str], **kwargs):
+        self.batch_sizes.append(len(input))
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.02)
+            if self.error:
+                raise self.error
+            return MagicMock(data=[MagicMock(embedding=[0.5] * 4) for _ in input])
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def embedding_env():
+    """Patch settings, model resolution and the rate limiter for create_embeddings_batch."""
+
+    @asynccontextmanager
+    async def no_rate_limit(*args, **kwargs):
+        yield
+
+    threading_service = MagicMock()
+    threading_service.rate_limited_operation = no_rate_limit
+
+    @asynccontextmanager
+    async def run(client, settings: dict):
+        @asynccontextmanager
+        async def fake_llm_client(*args, **kwargs):
+            yield client
+
+        cred = MagicMock()
+        cred.get_active_provider = AsyncMock(return_value={"provider": "openai"})
+        cred.get_credentials_by_category = AsyncMock(
+            return_value={"EMBEDDING_CACHE_ENABLED": "false", **settings}
+        )
+        with (
+            patch("src.server.services.embeddings.embedding_service.credential_service", cred),
+            patch("src.server.services.embeddings.embedding_service.get_llm_client", fake_llm_client),
+        ):
+            yield
+
+    with (
+        patch("src.server.services.embeddings.embedding_service.get_threading_service", return_value=threading_service),
+        patch(
+            "src.server.services.embeddings.embedding_service.get_embedding_model",
+            new=AsyncMock(return_value="text-embedding-3-small"),
+        ),
+    ):
+        yield run
+
+
+class TestAdaptiveBatchSizer:
+    def test_rate_limit_halves_batch_size(self):
+        sizer = AdaptiveBatchSizer(100)
+        sizer.record_rate_limit()
+        assert sizer.batch_size == 50
+
+    def test_slow_batches_shrink_and_fast_batches_recover_to_configured_size(self):
+        sizer = AdaptiveBatchSizer(100, target_latency=10.0)
+        sizer.record_success(100, latency=20.0)
+        assert sizer.batch_size == 75
+
+        for _ in range(5):
+            sizer.record_success(sizer.batch_size, latency=1.0)
+        assert sizer.batch_size == 100
+
+    def test_token_budget_bounds_batch(self):
+        texts = ["word " * 100] * 10  # 110 estimated tokens each
+
+        assert _next_batch_end(texts, 0, batch_size=10, max_tokens=300) == (2, 220)
+        # A single oversized text still forms its own batch
+        assert _next_batch_end(texts, 0, batch_size=10, max_tokens=50) == (1, 110)
+
+
+class TestConcurrentEmbeddingBatches:
+    @pytest.mark.asyncio
+    async def test_sub_batches_run_concurrently_up_to_in_flight_limit(self, embedding_env):
+        client = ConcurrencyTrackingClient()
+        async with embedding_env(client, {"EMBEDDING_BATCH_SIZE": "2", "EMBEDDING_MAX_IN_FLIGHT": "3"}):
+            result = await create_embeddings_batch([f"text {i}" for i in range(10)])
+
+        assert result.success_count == 10
+        assert sorted(result.texts_processed) == sorted(f"text {i}" for i in range(10))
+        assert client.peak_in_flight == 3
+        assert client.batch_sizes == [2] * 5
+
+    @pytest.mark.asyncio
+    async def test_in_flight_setting_is_clamped(self, embedding_env):
+        client = ConcurrencyTrackingClient()
+        async with embedding_env(client, {"EMBEDDING_BATCH_SIZE": "1", "EMBEDDING_MAX_IN_FLIGHT": "0"}):
+            result = await create_embeddings_batch([f"text {i}" for i in range(3)])
+
+        assert result.success_count == 3
+        assert client.peak_in_flight == 1
+
+        client = ConcurrencyTrackingClient()
+        async with embedding_env(client, {"EMBEDDING_BATCH_SIZE": "1", "EMBEDDING_MAX_IN_FLIGHT": "100"}):
+            result = await create_embeddings_batch([f"text {i}" for i in range(40)])
+
+        assert result.success_count == 40
+        assert client.peak_in_flight == 16
+
+    @pytest.mark.asyncio
+    async def test_quota_exhaustion_stops_new_batches(self, embedding_env):
+        error = openai.RateLimitError("insufficient_quota", response=MagicMock(), body=None)
+        client = ConcurrencyTrackingClient(error=error)
+        async with embedding_env(client, {"EMBEDDING_BATCH_SIZE": "2", "EMBEDDING_MAX_IN_FLIGHT": "2"}):
+            result = await create_embeddings_batch([f"text {i}" for i in range(10)])
+
+        # Only the two sub-batches already in flight reached the provider
+        assert len(client.batch_sizes) == 2
+        assert result.success_count == 0
+        assert result.failure_count == 10
+        assert all(item["error_type"] == "EmbeddingQuotaExhaustedError" for item in result.failed_items)
@@ -0,0 +1,178 @@
+"""
+Tests for the content-addressed embedding cache.
+
+Verifies cache key scoping, hit/miss accounting, that LRU touches are deferred
+to the periodic prune and that create_embeddings_batch only sends cache misses
+to the provider.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server.services.embeddings.embedding_cache import EmbeddingCache
+from src.server.services.embeddings.embedding_service import create_embeddings_batch
+
+
+class AsyncContextManager:
+    """Helper class for properly mocking async context managers"""
+
+    def __init__(self, return_value):
+        self.return_value = return_value
+
+    async def __aenter__(self):
+        return self.return_value
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+def make_cache_client(rows: list[dict]) -> MagicMock:
+    """Supabase mock whose select().in_().execute() returns the given rows."""
+    client = MagicMock()
+    table = client.table.return_value
+    table.select.return_value.in_.return_value.execute.return_value.data = rows
+    return client
+
+
+class TestEmbeddingCacheKeys:
+    def test_key_is_scoped_by_provider_model_and_dimensions(self):
+        base = EmbeddingCache.make_key("openai", "text-embedding-3-small", 1536, "hello")
+
+        assert base == EmbeddingCache.make_key("OpenAI", "text-embedding-3-small", 1536, "hello")
+        assert base != EmbeddingCache.make_key("ollama", "text-embedding-3-small", 1536, "hello")
+        assert base != EmbeddingCache.make_key("openai", "text-embedding-3-large", 1536, "hello")
+        assert base != EmbeddingCache.make_key("openai", "text-embedding-3-small", 768, "hello")
+        assert base != EmbeddingCache.make_key("openai", "text-embedding-3-small", 1536, "hello!")
+
+
+class TestEmbeddingCacheLookups:
+    @pytest.mark.asyncio
+    async def test_get_many_maps_hits_back_to_indices(self):
+        key = EmbeddingCache.make_key("openai", "m", 3, "cached")
+        cache = EmbeddingCache(supabase_client=make_cache_client([{"cache_key": key, "embedding": [0.1, 0.2, 0.3]}]))
+
+        hits = await cache.get_many("openai", "m", 3, ["new", "cached", "other", "cached"])
+
+        assert hits == {1: [0.1, 0.2, 0.3], 3: [0.1, 0.2, 0.3]}
+        assert cache.stats.hits == 2
+        assert cache.stats.misses == 2
+
+    @pytest.mark.asyncio
+    async def test_hit_rows_are_touched_before_the_next_prune(self):
+        key = EmbeddingCache.make_key("openai", "m", 3, "cached")
+        client = make_cache_client([{"cache_key": key, "embedding": [0.1, 0.2, 0.3]}])
+        client.rpc.return_value.execute.return_value.data = 0
+        cache = EmbeddingCache(supabase_client=client)
+
+        await cache.get_many("openai", "m", 3, ["cached"])
+
+        # The lookup itself makes no extra round trip
+        client.table.return_value.update.assert_not_called()
+
+        await cache.prune()
+
+        update_payload = client.table.return_value.update.call_args[0][0]
+        assert "last_accessed_at" in update_payload
+        client.table.return_value.update.return_value.in_.assert_called_once_with("cache_key", [key])
+        client.rpc.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_lookup_failure_is_treated_as_misses(self):
+        client = MagicMock()
+        client.table.side_effect = Exception("relation does not exist")
+        cache = EmbeddingCache(supabase_client=client)
+
+        hits = await cache.get_many("openai", "m", 3, ["a", "b"])
+
+        assert hits == {}
+        assert cache.stats.misses == 2
+        assert cache.stats.errors == 1
+
+    @pytest.mark.asyncio
+    async def test_put_many_prunes_after_interval(self):
+        client = make_cache_client([])
+        client.rpc.return_value.execute.return_value.data = 5
+        cache = EmbeddingCache(supabase_client=client, max_entries=10)
+
+        with patch("src.server.services.embeddings.embedding_cache.PRUNE_INTERVAL_WRITES", 2):
+            await cache.put_many("openai", "m", 3, [("a", [0.1, 0.2, 0.3]), ("b", [0.4, 0.5, 0.6])])
+
+        client.rpc.assert_called_once_with("prune_archon_embedding_cache", {"max_entries": 10})
+        assert cache.stats.writes == 2
+        assert cache.stats.evictions == 5
+
+
+class TestCreateEmbeddingsBatchWithCache:
+    @pytest.mark.asyncio
+    async def test_only_misses_are_sent_to_provider(self):
+        fake_cache = MagicMock()
+        fake_cache.get_many = AsyncMock(return_value={0: [1.0, 1.0, 1.0]})
+        fake_cache.put_many = AsyncMock()
+
+        mock_client = MagicMock()
+        mock_response = MagicMock()
+        mock_response.data = [MagicMock(embedding=[0.5, 0.5, 0.5])]
+        mock_client.embeddings.create = AsyncMock(return_value=mock_response)
+
+        mock_threading = MagicMock()
+        mock_threading.rate_limited_operation.return_value = AsyncContextManager(None)
+
+        with (
+            patch(
+                "src.server.services.embeddings.embedding_service.get_embedding_cache",
+                return_value=fake_cache,
+            ),
+            patch(
+                "src.server.services.embeddings.embedding_service.get_llm_client",
+                return_value=AsyncContextManager(mock_client),
+            ),
+            patch(
+                "src.server.services.embeddings.embedding_service.get_threading_service",
+                return_value=mock_threading,
+            ),
+            patch(
+                "src.server.services.embeddings.embedding_service.get_embedding_model",
+                new=AsyncMock(return_value="text-embedding-3-small"),
+            ),
+            patch("src.server.services.embeddings.embedding_service.credential_service") as mock_cred,
+        ):
+            mock_cred.get_active_provider = AsyncMock(return_value={"provider": "openai"})
+            mock_cred.get_credentials_by_category = AsyncMock(return_value={"EMBEDDING_DIMENSIONS": "3"})
+
+            result = await create_embeddings_batch(["unchanged chunk", "changed chunk"])
+
+        assert result.success_count == 2
+        assert dict(zip(result.texts_processed, result.embeddings, strict=True)) == {
+            "unchanged chunk": [1.0, 1.0, 1.0],
+            "changed chunk": [0.5, 0.5, 0.5],
+        }
+        assert mock_client.embeddings.create.call_args.kwargs["input"] == ["changed chunk"]
+        fake_cache.put_many.assert_awaited_once_with(
+            "openai", "text-embedding-3-small", 3, [("changed chunk", [0.5, 0.5, 0.5])]
+        )
+
+    @pytest.mark.asyncio
+    async def test_full_cache_hit_skips_client_creation(self):
+        fake_cache = MagicMock()
+        fake_cache.get_many = AsyncMock(return_value={0: [1.0, 1.0, 1.0]})
+
+        with (
+            patch(
+                "src.server.services.embeddings.embedding_service.get_embedding_cache",
+                return_value=fake_cache,
+            ),
+            patch("src.server.services.embeddings.embedding_service.get_llm_client") as mock_get_client,
+            patch(
+                "src.server.services.embeddings.embedding_service.get_embedding_model",
+                new=AsyncMock(return_value="text-embedding-3-small"),
+            ),
+            patch("src.server.services.embeddings.embedding_service.credential_service") as mock_cred,
+        ):
+            mock_cred.get_active_provider = AsyncMock(return_value={"provider": "openai"})
+            mock_cred.get_credentials_by_category = AsyncMock(return_value={})
+
+            result = await create_embeddings_batch(["unchanged chunk"])
+
+        assert result.embeddings == [[1.0, 1.0, 1.0]]
+        mock_get_client.assert_not_called()
@@ -0,0 +1,92 @@
+"""
+Tests for the per-host crawl scheduler.
+
+Verifies Crawl-delay spacing, 429/503 backoff and adaptive per-host concurrency.
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.server.services.crawling.helpers.crawl_frontier import CrawlFrontier
+from src.server.services.crawling.helpers.host_scheduler import (
+    INITIAL_HOST_CONCURRENCY,
+    HostScheduler,
+    parse_retry_after,
+)
+
+
+def serve_robots(text: str):
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, text=text))
+    )
+    return patch("src.server.services.crawling.helpers.host_scheduler._get_shared_client", return_value=client)
+
+
+async def request(scheduler: HostScheduler, url: str, status_code: int = 200, headers=None):
+    async with scheduler.slot(url) as slot:
+        slot.observe(status_code, headers)
+
+
+class TestHostScheduler:
+    @pytest.mark.asyncio
+    async def test_crawl_delay_spaces_request_starts(self):
+        scheduler = HostScheduler(max_per_host=4)
+        starts = []
+
+        async def timed_request():
+            async with scheduler.slot("https://example.com/page"):
+                starts.append(time.monotonic())
+
+        with serve_robots("User-agent: *\nCrawl-delay: 0.2"):
+            await asyncio.gather(timed_request(), timed_request(), timed_request())
+
+        starts.sort()
+        assert starts[1] - starts[0] >= 0.18
+        assert starts[2] - starts[1] >= 0.18
+
+    @pytest.mark.asyncio
+    async def test_throttled_host_backs_off_and_halves_concurrency(self):
+        scheduler = HostScheduler(max_per_host=8, respect_crawl_delay=False)
+        for _ in range(30):
+            await request(scheduler, "https://docs.example.com/a")
+        assert scheduler.host_limit("docs.example.com") == 8
+
+        await request(scheduler, "https://docs.example.com/a", 429, {"Retry-After": "30"})
+
+        assert scheduler.host_limit("docs.example.com") == 0
+        assert scheduler.stats()["docs.example.com"]["limit"] == 4
+        # Other hosts are unaffected
+        assert scheduler.host_limit("other.example.com") == INITIAL_HOST_CONCURRENCY
+
+    @pytest.mark.asyncio
+    async def test_fast_host_gains_concurrency_up_to_the_cap(self):
+        scheduler = HostScheduler(max_per_host=3, respect_crawl_delay=False)
+
+        await request(scheduler, "https://fast.example.com/")
+        await request(scheduler, "https://fast.example.com/")
+        assert scheduler.host_limit("fast.example.com") == 3
+
+        for _ in range(10):
+            await request(scheduler, "https://fast.example.com/")
+        assert scheduler.host_limit("fast.example.com") == 3
+
+    @pytest.mark.asyncio
+    async def test_frontier_skips_hosts_that_are_backing_off(self):
+        scheduler = HostScheduler(max_per_host=4, respect_crawl_delay=False)
+        await request(scheduler, "https://slow.example.com/", 503)
+        frontier = CrawlFrontier(host_limit=scheduler.host_limit)
+        frontier.add("https://slow.example.com/docs", depth=0)
+        frontier.add("https://other.example.com/blog", depth=1)
+
+        assert frontier.pop().url == "https://other.example.com/blog"
+        assert frontier.pop() is None
+
+
+def test_parse_retry_after_accepts_seconds_and_dates():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("later") is None
@@ -0,0 +1,204 @@
+"""
+Tests for the plain-HTTP crawl fast path.
+
+Verifies that static pages skip the browser, that JavaScript shells and thin
+pages fall back to it, that fetched HTML is scraped like a browser-rendered
+page, that recrawls send conditional requests, and that a cancelled batch stops
+its in-flight HTTP fetches.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from src.server.services.crawling.helpers.http_fetcher import HttpPageFetcher, extract_links
+from src.server.services.crawling.strategies.batch import BatchCrawlStrategy
+
+ARTICLE = " ".join(["word"] * 80)
+STATIC_PAGE = f"<html><head><title>Guide &amp; Docs</title></head><body><p>{ARTICLE}</p></body></html>"
+JS_SHELL = '<html><body><div id="root"></div><script src="/app.js"></script></body></html>'
+
+
+def markdown_generator() -> MagicMock:
+    """Generator stand-in that strips tags naively."""
+    import re
+
+    def generate(input_html, base_url=""):
+        text = re.sub(r"<[^>]+>", " ", input_html)
+        return SimpleNamespace(raw_markdown=text, fit_markdown=text)
+
+    generator = MagicMock()
+    generator.generate_markdown.side_effect = generate
+    return generator
+
+
+def serve(handler):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return patch("src.server.services.crawling.helpers.http_fetcher._get_shared_client", return_value=client)
+
+
+def html_response(body: str, **headers) -> httpx.Response:
+    return httpx.Response(200, text=body, headers={"content-type": "text/html; charset=utf-8", **headers})
+
+
+class TestHttpPageFetcher:
+    @pytest.mark.asyncio
+    async def test_static_page_is_fetched_without_browser(self):
+        fetcher = HttpPageFetcher(markdown_generator())
+
+        with serve(lambda request: html_response(STATIC_PAGE)):
+            page = await fetcher.fetch_page("https://docs.example.com/guide")
+
+        assert page is not None
+        assert page["title"] == "Guide & Docs"
+        assert "word" in page["markdown"]
+
+    @pytest.mark.asyncio
+    async def test_javascript_shell_falls_back_to_browser(self):
+        fetcher = HttpPageFetcher(markdown_generator())
+
+        with serve(lambda request: html_response(JS_SHELL)):
+            page = await fetcher.fetch_page("https://app.example.com/")
+
+        assert page is None
+        assert fetcher.stats["fallbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_thin_page_falls_back_to_browser(self):
+        fetcher = HttpPageFetcher(markdown_generator())
+
+        with serve(lambda request: html_response("<html><body><p>Loading...</p></body></html>")):
+            assert await fetcher.fetch_page("https://example.com/") is None
+
+    @pytest.mark.asyncio
+    async def test_non_html_responses_are_left_to_the_browser(self):
+        fetcher = HttpPageFetcher(markdown_generator())
+
+        with serve(lambda request: httpx.Response(200, json={"a": 1})):
+            assert await fetcher.fetch_page("https://example.com/api") is None
+
+    @pytest.mark.asyncio
+    async def test_fetched_page_carries_validators(self):
+        fetcher = HttpPageFetcher(markdown_generator())
+
+        with serve(lambda request: html_response(STATIC_PAGE, etag='"v1"', **{"last-modified": "Mon, 01 Jan 2024 00:00:00 GMT"})):
+            page = await fetcher.fetch_page("https://docs.example.com/guide")
+
+        assert page["etag"] == '"v1"'
+        assert page["last_modified"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+    @pytest.mark.asyncio
+    async def test_not_modified_page_short_circuits(self):
+        fetcher = HttpPageFetcher(markdown_generator())
+        seen_headers = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_headers.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return html_response(STATIC_PAGE, etag='"v2"')
+
+        with serve(handler):
+            page = await fetcher.fetch_page("https://docs.example.com/guide", {"etag": '"v1"'})
+
+        assert seen_headers == ['"v1"']
+        assert page == {"url": "https://docs.example.com/guide", "not_modified": True}
+        assert fetcher.markdown_generator.generate_markdown.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_markdown_is_generated_from_scraped_html(self):
+        """The fast path cleans HTML with the run config's scraping strategy, like the browser path."""
+        generator = markdown_generator()
+        fetcher = HttpPageFetcher(generator)
+        page_html = STATIC_PAGE.replace("</body>", "<script>trackVisitor()</script></body>")
+
+        with serve(lambda request: html_response(page_html)):
+            page = await fetcher.fetch_page("https://docs.example.com/guide")
+
+        assert page is not None
+        markdown_input = generator.generate_markdown.call_args.kwargs["input_html"]
+        assert "trackVisitor" not in markdown_input
+        assert "word" in markdown_input
+        # The page keeps its raw HTML for code extraction
+        assert "trackVisitor" in page["html"]
+
+
+class TestBatchHttpPhase:
+    @pytest.mark.asyncio
+    async def test_cancellation_stops_in_flight_fetches(self):
+        crawler = MagicMock()
+        crawler.arun = AsyncMock()
+        strategy = BatchCrawlStrategy(crawler, markdown_generator())
+        cancelled_fetches = []
+
+        async def fetch_page(url, validators=None, scheduler=None, crawl_config=None):
+            if url.endswith("/0"):
+                return {"fit_markdown": ARTICLE, "html": STATIC_PAGE, "etag": None, "last_modified": None}
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled_fetches.append(url)
+                raise
+
+        strategy.http_fetcher = MagicMock()
+        strategy.http_fetcher.fetch_page = fetch_page
+        # Let the check before the batch pass, then cancel once the first page is in
+        checks = iter([None])
+
+        def cancellation_check():
+            if next(checks, "cancel") == "cancel":
+                raise asyncio.CancelledError()
+
+        progress = AsyncMock()
+        urls = [f"https://docs.example.com/{i}" for i in range(3)]
+        with patch(
+            "src.server.services.crawling.strategies.batch.credential_service.get_credentials_by_category",
+            AsyncMock(return_value={}),
+        ):
+            results = await strategy.crawl_batch_with_progress(
+                urls,
+                lambda url: url,
+                lambda url: False,
+                progress_callback=progress,
+                cancellation_check=cancellation_check,
+            )
+
+        assert results == []
+        assert sorted(cancelled_fetches) == urls[1:]
+        crawler.arun.assert_not_awaited()
+        assert progress.await_args.args[0] == "cancelled"
+
+    @pytest.mark.asyncio
+    async def test_disabled_fast_path_sends_no_http_requests(self):
+        crawler = MagicMock()
+        crawler.arun = AsyncMock(return_value=SimpleNamespace(success=False, error_message="boom"))
+        strategy = BatchCrawlStrategy(crawler, markdown_generator())
+        strategy.http_fetcher = MagicMock()
+        strategy.http_fetcher.fetch_page = AsyncMock()
+        url = "https://docs.example.com/guide"
+
+        with patch(
+            "src.server.services.crawling.strategies.batch.credential_service.get_credentials_by_category",
+            AsyncMock(return_value={"CRAWL_HTTP_FAST_PATH": "false"}),
+        ):
+            await strategy.crawl_batch_with_progress(
+                [url],
+                lambda u: u,
+                lambda u: False,
+                validators={url: {"etag": '"v1"'}},
+            )
+
+        strategy.http_fetcher.fetch_page.assert_not_awaited()
+        crawler.arun.assert_awaited_once()
+
+
+def test_extract_links_splits_internal_and_external():
+    html = '<a href="/a">A</a><a href="https://other.com/b">B</a><a href="#top">Top</a><a href="/a#x">A again</a>'
+
+    links = extract_links(html, "https://example.com/docs/")
+
+    assert links["internal"] == [{"href": "https://example.com/a", "text": "A"}]
+    assert links["external"] == [{"href": "https://other.com/b", "text": "B"}]
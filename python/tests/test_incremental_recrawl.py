@@ -0,0 +1,151 @@
+"""
+Tests for incremental recrawls.
+
+Verifies that unchanged pages are skipped and that only changed chunks are
+deleted and re-inserted when a source is refreshed.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+
+from src.server.services.crawling.document_storage_operations import DocumentStorageOperations
+from src.server.services.storage.document_storage_service import (
+    _diff_against_existing_chunks,
+    compute_content_hash,
+    stored_embeddings_match,
+)
+
+
+def make_client_with_chunks(rows: list[dict]) -> MagicMock:
+    """Supabase mock whose select().in_().execute() returns the given chunk rows."""
+    client = MagicMock()
+    client.table.return_value.select.return_value.in_.return_value.execute.return_value.data = rows
+    return client
+
+
+class TestChunkDiff:
+    def test_unchanged_chunks_are_kept_and_changed_ones_replaced(self):
+        url = "https://example.com/doc"
+        client = make_client_with_chunks([
+            {"id": 1, "url": url, "chunk_number": 0, "content_hash": compute_content_hash("same")},
+            {"id": 2, "url": url, "chunk_number": 1, "content_hash": compute_content_hash("old")},
+            {"id": 3, "url": url, "chunk_number": 2, "content_hash": compute_content_hash("gone")},
+        ])
+
+        to_insert, stale_ids, unchanged = _diff_against_existing_chunks(
+            client, [url, url], [0, 1], ["same", "new"], fetch_batch_size=50
+        )
+
+        assert to_insert == [1]
+        assert sorted(stale_ids) == [2, 3]
+        assert unchanged == 1
+
+    def test_rows_without_hash_are_treated_as_changed(self):
+        url = "https://example.com/doc"
+        client = make_client_with_chunks([
+            {"id": 1, "url": url, "chunk_number": 0, "content_hash": None},
+        ])
+
+        to_insert, stale_ids, unchanged = _diff_against_existing_chunks(
+            client, [url], [0], ["same"], fetch_batch_size=50
+        )
+
+        assert to_insert == [0]
+        assert stale_ids == [1]
+        assert unchanged == 0
+
+
+class TestIncrementalDocumentStorage:
+    @pytest.mark.asyncio
+    async def test_unchanged_pages_are_skipped(self):
+        doc_storage = DocumentStorageOperations(Mock())
+        doc_storage.doc_storage_service.smart_chunk_text = Mock(side_effect=lambda text, chunk_size: [text])
+        doc_storage._create_source_records = AsyncMock()
+
+        unchanged_markdown = "Nothing new here"
+        existing_pages = {
+            "https://example.com/a": {
+                "url": "https://example.com/a",
+                "content_hash": compute_content_hash(unchanged_markdown),
+                "word_count": 3,
+                "chunk_count": 1,
+            }
+        }
+
+        with (
+            patch(
+                "src.server.services.crawling.page_storage_operations.PageStorageOperations.get_existing_page_hashes",
+                new=AsyncMock(return_value=existing_pages),
+            ),
+            patch(
+                "src.server.services.crawling.page_storage_operations.PageStorageOperations.store_pages",
+                new=AsyncMock(return_value={}),
+            ),
+            patch(
+                "src.server.services.crawling.document_storage_operations.add_documents_to_supabase",
+                new=AsyncMock(return_value={"chunks_stored": 1, "chunks_unchanged": 0}),
+            ) as mock_add,
+        ):
+            result = await doc_storage.process_and_store_documents(
+                crawl_results=[
+                    {"url": "https://example.com/a", "markdown": unchanged_markdown},
+                    {"url": "https://example.com/b", "markdown": "Fresh content"},
+                ],
+                request={},
+                crawl_type="normal",
+                original_source_id="src123",
+                incremental=True,
+            )
+
+        call_kwargs = mock_add.call_args.kwargs
+        assert call_kwargs["urls"] == ["https://example.com/b"]
+        assert call_kwargs["incremental"] is True
+        assert result["unchanged_urls"] == ["https://example.com/a"]
+        assert result["total_word_count"] == 3 + 2
+
+
+class TestStoredEmbeddingsMatch:
+    @pytest.fixture(autouse=True)
+    def embedding_config(self):
+        with (
+            patch(
+                "src.server.services.credential_service.credential_service.get_credential",
+                new=AsyncMock(return_value="false"),
+            ),
+            patch(
+                "src.server.services.credential_service.credential_service.get_active_provider",
+                new=AsyncMock(return_value={"provider": "openai"}),
+            ),
+            patch(
+                "src.server.services.credential_service.credential_service.get_credentials_by_category",
+                new=AsyncMock(return_value={"EMBEDDING_DIMENSIONS": "1536"}),
+            ),
+            patch(
+                "src.server.services.llm_provider_service.get_embedding_model",
+                new=AsyncMock(return_value="text-embedding-3-small"),
+            ),
+        ):
+            yield
+
+    @staticmethod
+    def make_client(mismatched_rows: list[dict]) -> MagicMock:
+        client = MagicMock()
+        query = client.table.return_value.select.return_value.eq.return_value.or_.return_value
+        query.limit.return_value.execute.return_value.data = mismatched_rows
+        return client
+
+    @pytest.mark.asyncio
+    async def test_matching_fingerprints_allow_incremental(self):
+        client = self.make_client([])
+
+        assert await stored_embeddings_match(client, "src123") is True
+        filters = client.table.return_value.select.return_value.eq.return_value.or_.call_args.args[0]
+        assert "embedding_fingerprint.is.null" in filters
+        assert '"openai|text-embedding-3-small|1536|plain"' in filters
+
+    @pytest.mark.asyncio
+    async def test_changed_embedding_config_forces_full_reembed(self):
+        client = self.make_client([{"id": 7}])
+
+        assert await stored_embeddings_match(client, "src123") is False
@@ -0,0 +1,92 @@
+"""
+Tests for the in-process query embedding cache.
+
+Verifies normalization, LRU eviction, TTL expiry and that repeat queries skip
+the embedding provider.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.server.services.embeddings.query_embedding_cache import (
+    QueryEmbeddingCache,
+    normalize_query,
+)
+
+
+@pytest.fixture
+def embedding_settings():
+    """Patch provider/model resolution used to build cache keys."""
+    with (
+        patch("src.server.services.embeddings.query_embedding_cache.credential_service") as mock_cred,
+        patch(
+            "src.server.services.embeddings.query_embedding_cache.get_embedding_model",
+            new=AsyncMock(return_value="text-embedding-3-small"),
+        ) as mock_model,
+    ):
+        mock_cred.get_credentials_by_category = AsyncMock(
+            return_value={"EMBEDDING_PROVIDER": "openai", "EMBEDDING_DIMENSIONS": "1536"}
+        )
+        yield mock_model
+
+
+class TestNormalizeQuery:
+    def test_whitespace_and_case_are_ignored(self):
+        assert normalize_query("  How do I   use\tHooks? ") == "how do i use hooks?"
+
+
+class TestQueryEmbeddingCache:
+    @pytest.mark.asyncio
+    async def test_repeat_query_skips_provider(self, embedding_settings):
+        cache = QueryEmbeddingCache()
+        create_fn = AsyncMock(return_value=[0.1, 0.2])
+
+        first = await cache.get_or_create("react hooks", create_fn)
+        second = await cache.get_or_create("  React   Hooks ", create_fn)
+
+        assert first == second == [0.1, 0.2]
+        create_fn.assert_awaited_once_with("react hooks")
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_model_change_does_not_reuse_vectors(self, embedding_settings):
+        cache = QueryEmbeddingCache()
+        create_fn = AsyncMock(return_value=[0.1, 0.2])
+
+        await cache.get_or_create("react hooks", create_fn)
+        embedding_settings.return_value = "text-embedding-3-large"
+        await cache.get_or_create("react hooks", create_fn)
+
+        assert create_fn.await_count == 2
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = QueryEmbeddingCache(max_entries=2)
+        cache.put(("openai", "m", 0, "a"), [1.0])
+        cache.put(("openai", "m", 0, "b"), [2.0])
+        cache.get(("openai", "m", 0, "a"))
+        cache.put(("openai", "m", 0, "c"), [3.0])
+
+        assert cache.get(("openai", "m", 0, "b")) is None
+        assert cache.get(("openai", "m", 0, "a")) == [1.0]
+        assert cache.stats.evictions == 1
+
+    def test_expired_entries_are_misses(self):
+        cache = QueryEmbeddingCache(ttl_seconds=10)
+        with patch("src.server.services.embeddings.query_embedding_cache.time.monotonic", return_value=100.0):
+            cache.put(("openai", "m", 0, "a"), [1.0])
+        with patch("src.server.services.embeddings.query_embedding_cache.time.monotonic", return_value=111.0):
+            assert cache.get(("openai", "m", 0, "a")) is None
+
+        assert cache.stats.expirations == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_embeddings_are_not_cached(self, embedding_settings):
+        cache = QueryEmbeddingCache()
+        create_fn = AsyncMock(return_value=[])
+
+        await cache.get_or_create("react hooks", create_fn)
+        await cache.get_or_create("react hooks", create_fn)
+
+        assert create_fn.await_count == 2
@@ -0,0 +1,58 @@
+"""
+Tests for page grouping in RAGService.
+
+Verifies that page metadata for all groups is fetched with one batched query
+and served from the TTL cache on repeat searches.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.server.services.search.rag_service import RAGService, clear_page_metadata_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_page_cache():
+    clear_page_metadata_cache()
+    yield
+    clear_page_metadata_cache()
+
+
+@pytest.fixture
+def rag_service():
+    client = MagicMock()
+    client.table.return_value.select.return_value.in_.return_value.execute.return_value.data = [
+        {"id": "p1", "url": "https://example.com/a", "section_title": None, "word_count": 100},
+        {"id": "p2", "url": "https://example.com/b", "section_title": "Intro", "word_count": 50},
+    ]
+    return RAGService(supabase_client=client)
+
+
+def make_chunks() -> list[dict]:
+    return [
+        {"content": "a1", "similarity_score": 0.9, "metadata": {"page_id": "p1", "url": "https://example.com/a"}},
+        {"content": "a2", "similarity_score": 0.7, "metadata": {"page_id": "p1", "url": "https://example.com/a"}},
+        {"content": "b1", "similarity_score": 0.8, "metadata": {"page_id": "p2", "url": "https://example.com/b"}},
+    ]
+
+
+class TestGroupChunksByPages:
+    @pytest.mark.asyncio
+    async def test_metadata_is_fetched_in_one_query(self, rag_service):
+        pages = await rag_service._group_chunks_by_pages(make_chunks(), match_count=10)
+
+        select = rag_service.supabase_client.table.return_value.select.return_value
+        select.in_.assert_called_once_with("id", ["p1", "p2"])
+        assert [page["page_id"] for page in pages] == ["p1", "p2"]
+        assert pages[0]["chunk_matches"] == 2
+        assert pages[1]["section_title"] == "Intro"
+
+    @pytest.mark.asyncio
+    async def test_repeat_search_is_served_from_cache(self, rag_service):
+        await rag_service._group_chunks_by_pages(make_chunks(), match_count=10)
+        pages = await rag_service._group_chunks_by_pages(make_chunks(), match_count=10)
+
+        select = rag_service.supabase_client.table.return_value.select.return_value
+        assert select.in_.call_count == 1
+        assert len(pages) == 2
@@ -0,0 +1,162 @@
+"""
+Tests for the token-bucket rate limiter and token estimation.
+
+Verifies deficit-based waits, 429 pauses, per-provider/model buckets sized
+from settings and the metrics snapshot.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.server.services.threading_service import (
+    RateLimitConfig,
+    RateLimiter,
+    ThreadingService,
+    estimate_tokens,
+    parse_provider_rate_limits,
+)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    fake = FakeClock()
+    with (
+        patch("src.server.services.threading_service.time.monotonic", side_effect=fake.monotonic),
+        patch("src.server.services.threading_service.asyncio.sleep", new=AsyncMock(side_effect=fake.sleep)) as sleep,
+    ):
+        fake.sleep_mock = sleep
+        yield fake
+
+
+class TestEstimateTokens:
+    def test_prose_is_about_one_token_per_word(self):
+        assert estimate_tokens("the quick brown fox jumps over the lazy dog") == 10
+
+    def test_code_and_long_words_count_more_than_word_splitting(self):
+        code = "def f(x):\n    return {'key': x[0]}"
+        assert estimate_tokens(code) > len(code.split()) * 1.3
+        assert estimate_tokens("internationalization") == 4
+
+    def test_empty_text(self):
+        assert estimate_tokens("") == 0
+
+
+class TestRateLimiter:
+    @pytest.mark.asyncio
+    async def test_wait_is_sized_to_the_token_deficit(self, clock):
+        limiter = RateLimiter(RateLimitConfig(tokens_per_minute=6000, requests_per_minute=1000))
+
+        await limiter.acquire(6000)
+        await limiter.acquire(600)
+
+        # 600 tokens refill at 100 tokens/second
+        clock.sleep_mock.assert_awaited_once_with(pytest.approx(6.0))
+        metrics = limiter.get_metrics()
+        assert metrics["total_requests"] == 2
+        assert metrics["total_waits"] == 1
+        assert metrics["tokens_available"] == 0
+
+    @pytest.mark.asyncio
+    async def test_no_sleep_while_budget_remains(self, clock):
+        limiter = RateLimiter(RateLimitConfig(tokens_per_minute=10_000, requests_per_minute=100))
+
+        for _ in range(10):
+            await limiter.acquire(500)
+
+        clock.sleep_mock.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_oversized_request_waits_for_a_full_bucket_instead_of_failing(self, clock):
+        limiter = RateLimiter(RateLimitConfig(tokens_per_minute=1000))
+
+        assert await limiter.acquire(5000) is True
+
+    @pytest.mark.asyncio
+    async def test_provider_429_pauses_for_retry_after(self, clock):
+        limiter = RateLimiter(RateLimitConfig(tokens_per_minute=1_000_000))
+        limiter.record_rate_limited(retry_after=3.0)
+
+        await limiter.acquire(10)
+
+        assert clock.now >= 1003.0
+        assert limiter.get_metrics()["rate_limit_hits"] == 1
+
+
+class TestPerProviderBuckets:
+    def test_each_provider_and_model_gets_its_own_limiter(self):
+        service = ThreadingService(
+            provider_rate_limits={"ollama": RateLimitConfig(tokens_per_minute=50_000)}
+        )
+
+        openai_small = service.get_rate_limiter("openai", "text-embedding-3-small")
+        openai_large = service.get_rate_limiter("openai", "text-embedding-3-large")
+        ollama = service.get_rate_limiter("Ollama", "nomic-embed-text")
+
+        assert openai_small is not openai_large
+        assert service.get_rate_limiter("openai", "text-embedding-3-small") is openai_small
+        assert service.get_rate_limiter() is service.rate_limiter
+        assert ollama.config.tokens_per_minute == 50_000
+        assert set(service.get_rate_limit_metrics()) == {
+            "default",
+            "openai:text-embedding-3-small",
+            "openai:text-embedding-3-large",
+            "ollama:nomic-embed-text",
+        }
+
+    def test_configured_provider_gets_its_own_limits(self):
+        service = ThreadingService(rate_limit_config=RateLimitConfig(tokens_per_minute=200_000))
+
+        service.configure_provider_rate_limits({
+            "RATE_LIMIT_OLLAMA_TPM": "10000000",
+            "RATE_LIMIT_OLLAMA_RPM": "10000",
+            "RATE_LIMIT_GOOGLE_RPM": "1500",
+            "EMBEDDING_BATCH_SIZE": "100",
+        })
+
+        ollama = service.get_rate_limiter("ollama", "nomic-embed-text")
+        assert ollama.config.tokens_per_minute == 10_000_000
+        assert ollama.config.requests_per_minute == 10_000
+        assert ollama.token_bucket.capacity == 10_000_000
+        # Unset values fall back to the default limits
+        google = service.get_rate_limiter("google", "text-embedding-004")
+        assert google.config.requests_per_minute == 1500
+        assert google.config.tokens_per_minute == 200_000
+        assert service.get_rate_limiter("openai", "m").config is service.rate_limit_config
+
+    def test_changed_limits_replace_the_provider_buckets(self):
+        service = ThreadingService()
+        service.configure_provider_rate_limits({"RATE_LIMIT_OLLAMA_TPM": "1000"})
+        ollama = service.get_rate_limiter("ollama", "m")
+        openai = service.get_rate_limiter("openai", "m")
+
+        service.configure_provider_rate_limits({"RATE_LIMIT_OLLAMA_TPM": "1000"})
+        assert service.get_rate_limiter("ollama", "m") is ollama
+
+        service.configure_provider_rate_limits({"RATE_LIMIT_OLLAMA_TPM": "5000"})
+        assert service.get_rate_limiter("ollama", "m").config.tokens_per_minute == 5000
+        assert service.get_rate_limiter("openai", "m") is openai
+
+    def test_invalid_limits_are_ignored(self):
+        limits = parse_provider_rate_limits({"RATE_LIMIT_OPENAI_TPM": "lots", "RATE_LIMIT_OPENAI_RPM": "0"})
+
+        assert limits == {}
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_operation_tracks_in_flight(self):
+        service = ThreadingService()
+
+        async with service.rate_limited_operation(100, provider="openai", model="m"):
+            assert service.get_rate_limiter("openai", "m").get_metrics()["in_flight"] == 1
+        assert service.get_rate_limiter("openai", "m").get_metrics()["in_flight"] == 0
@@ -0,0 +1,93 @@
+"""
+Tests for the shared cross-encoder scorer used by reranking.
+
+Verifies off-loop scoring, score memoization and micro-batching of concurrent
+rerank calls.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.server.services.search.reranking_strategy import RerankingStrategy, RerankScorer
+
+
+class RecordingModel:
+    """Cross-encoder stand-in that scores by text length and records each forward pass."""
+
+    def __init__(self):
+        self.calls: list[list[list[str]]] = []
+        self.threads: list[str] = []
+
+    def predict(self, pairs):
+        self.calls.append(pairs)
+        self.threads.append(threading.current_thread().name)
+        return [float(len(text)) for _, text in pairs]
+
+
+class TestRerankScorer:
+    @pytest.mark.asyncio
+    async def test_scores_are_computed_off_the_event_loop(self):
+        model = RecordingModel()
+        strategy = RerankingStrategy.from_model(model)
+
+        results = await strategy.rerank_results(
+            "query", [{"id": "a", "content": "short"}, {"id": "b", "content": "much longer text"}]
+        )
+
+        assert [r["id"] for r in results] == ["b", "a"]
+        assert model.threads == ["archon-rerank_0"]
+
+    @pytest.mark.asyncio
+    async def test_repeat_query_reuses_memoized_scores(self):
+        model = RecordingModel()
+        scorer = RerankScorer(model)
+        pairs = [["query", "alpha"], ["query", "beta"]]
+
+        await scorer.score("query", pairs, ["1", "2"])
+        scores = await scorer.score("query", pairs + [["query", "gamma"]], ["1", "2", "3"])
+
+        assert scores == [5.0, 4.0, 5.0]
+        assert [len(call) for call in model.calls] == [2, 1]
+        assert scorer.get_stats()["cache_hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_changed_chunk_content_is_rescored(self):
+        model = RecordingModel()
+        scorer = RerankScorer(model)
+
+        await scorer.score("query", [["query", "old text"]], ["1"])
+        await scorer.score("query", [["query", "new, longer text"]], ["1"])
+
+        assert len(model.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_forward_pass(self):
+        model = RecordingModel()
+        scorer = RerankScorer(model, batch_window=0.01)
+
+        first, second = await asyncio.gather(
+            scorer.score("q1", [["q1", "one"], ["q1", "three"]], ["1", "3"]),
+            scorer.score("q2", [["q2", "four"]], ["4"]),
+        )
+
+        assert first == [3.0, 5.0]
+        assert second == [4.0]
+        assert len(model.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_model_errors_reach_every_waiting_caller(self):
+        class FailingModel:
+            def predict(self, pairs):
+                raise RuntimeError("model crashed")
+
+        scorer = RerankScorer(FailingModel())
+
+        results = await asyncio.gather(
+            scorer.score("q", [["q", "a"]], ["1"]),
+            scorer.score("q", [["q", "b"]], ["2"]),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
@@ -0,0 +1,106 @@
+"""
+Tests for the async search RPC data path.
+
+Verifies the asyncpg query built for search functions and the PostgREST
+fallback used when no database URL is configured.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server.services.search import search_rpc
+from src.server.services.search.search_rpc import _build_function_call, execute_search_rpc
+
+
+class TestBuildFunctionCall:
+    def test_uses_named_arguments_with_casts(self):
+        query, values = _build_function_call(
+            "match_archon_crawled_pages",
+            {"query_embedding": [0.5, 1], "match_count": 5, "filter": {}, "source_filter": None},
+        )
+
+        assert query == (
+            "SELECT * FROM match_archon_crawled_pages(query_embedding => $1::text::vector, "
+            "match_count => $2::int, filter => $3::jsonb, source_filter => $4::text)"
+        )
+        assert values == ["[0.5,1.0]", 5, {}, None]
+
+    def test_rejects_unsafe_function_names(self):
+        with pytest.raises(ValueError):
+            _build_function_call("match(); DROP TABLE archon_sources; --", {})
+
+    def test_rejects_unknown_arguments(self):
+        with pytest.raises(ValueError):
+            _build_function_call("match_archon_crawled_pages", {"unexpected": 1})
+
+
+class TestExecuteSearchRpc:
+    @pytest.mark.asyncio
+    async def test_falls_back_to_supabase_rpc_without_pool(self):
+        client = MagicMock()
+        client.rpc.return_value.execute.return_value.data = [{"id": 1}]
+
+        with patch.object(search_rpc, "get_search_pool", new=AsyncMock(return_value=None)):
+            rows = await execute_search_rpc(client, "match_archon_crawled_pages", {"match_count": 5})
+
+        assert rows == [{"id": 1}]
+        client.rpc.assert_called_once_with("match_archon_crawled_pages", {"match_count": 5})
+
+    @pytest.mark.asyncio
+    async def test_uses_pool_when_available(self):
+        connection = MagicMock()
+        connection.fetch = AsyncMock(return_value=[{"id": 7, "similarity": 0.9}])
+        acquire = MagicMock()
+        acquire.__aenter__ = AsyncMock(return_value=connection)
+        acquire.__aexit__ = AsyncMock(return_value=None)
+        pool = MagicMock()
+        pool.acquire.return_value = acquire
+        client = MagicMock()
+
+        with patch.object(search_rpc, "get_search_pool", new=AsyncMock(return_value=pool)):
+            rows = await execute_search_rpc(client, "match_archon_code_examples", {"match_count": 3})
+
+        assert rows == [{"id": 7, "similarity": 0.9}]
+        connection.fetch.assert_awaited_once_with(
+            "SELECT * FROM match_archon_code_examples(match_count => $1::int)", 3
+        )
+        client.rpc.assert_not_called()
+
+
+class TestGetSearchPool:
+    @pytest.fixture(autouse=True)
+    def reset_pool_state(self, monkeypatch):
+        monkeypatch.setattr(search_rpc, "_pool", None)
+        monkeypatch.setattr(search_rpc, "_pool_lock", None)
+        monkeypatch.setattr(search_rpc, "_pool_disabled", False)
+        monkeypatch.setattr(search_rpc, "_pool_retry_at", 0.0)
+
+    @pytest.mark.asyncio
+    async def test_failed_pool_creation_is_retried_after_the_window(self, monkeypatch):
+        pytest.importorskip("asyncpg")
+        monkeypatch.setenv("SUPABASE_DB_URL", "postgresql://localhost/db")
+        pool = MagicMock()
+        create_pool = AsyncMock(side_effect=[OSError("connection refused"), pool])
+        now = [1000.0]
+
+        with (
+            patch("asyncpg.create_pool", create_pool),
+            patch.object(search_rpc.time, "monotonic", side_effect=lambda: now[0]),
+        ):
+            assert await search_rpc.get_search_pool() is None
+            # Inside the retry window the fallback is used without reconnecting
+            now[0] += search_rpc.POOL_RETRY_SECONDS - 1
+            assert await search_rpc.get_search_pool() is None
+            assert create_pool.await_count == 1
+
+            now[0] += 1
+            assert await search_rpc.get_search_pool() is pool
+            assert create_pool.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_database_url_disables_the_pool(self, monkeypatch):
+        monkeypatch.delenv("SUPABASE_DB_URL", raising=False)
+
+        assert await search_rpc.get_search_pool() is None
+        assert search_rpc._pool_disabled is True
@@ -0,0 +1,119 @@
+"""
+Tests for the streaming sitemap reader.
+
+Verifies incremental parsing, gzipped sitemaps, sitemap-index recursion and
+<lastmod> handling.
+"""
+
+import gzip
+from datetime import UTC, datetime
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.server.services.crawling.strategies.sitemap import (
+    SitemapCrawlStrategy,
+    _SitemapDocumentParser,
+    parse_lastmod,
+)
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def urlset(*urls: tuple[str, str | None]) -> bytes:
+    items = "".join(
+        f"<url><loc>{loc}</loc>{f'<lastmod>{lastmod}</lastmod>' if lastmod else ''}</url>"
+        for loc, lastmod in urls
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>{items}</urlset>'.encode()
+
+
+def sitemap_index(*locs: str) -> bytes:
+    items = "".join(f"<sitemap><loc>{loc}</loc></sitemap>" for loc in locs)
+    return f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex {NS}>{items}</sitemapindex>'.encode()
+
+
+def serve(documents: dict[str, bytes]):
+    """Patch httpx.AsyncClient so requests are answered from an in-memory site."""
+    real_client = httpx.AsyncClient
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = documents.get(str(request.url))
+        if body is None:
+            return httpx.Response(404)
+        return httpx.Response(200, content=body)
+
+    def make_client(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    return patch("src.server.services.crawling.strategies.sitemap.httpx.AsyncClient", side_effect=make_client)
+
+
+class TestParseLastmod:
+    def test_full_datetime_is_normalized_to_utc(self):
+        assert parse_lastmod("2024-05-01T12:00:00+02:00") == datetime(2024, 5, 1, 10, 0, tzinfo=UTC)
+
+    def test_date_only_resolves_to_end_of_day(self):
+        assert parse_lastmod("2024-05-01") == datetime(2024, 5, 2, tzinfo=UTC)
+
+    def test_invalid_values_are_ignored(self):
+        assert parse_lastmod("yesterday") is None
+        assert parse_lastmod(None) is None
+
+
+class TestSitemapDocumentParser:
+    def test_parses_document_fed_in_small_chunks(self):
+        body = urlset(("https://example.com/a", "2024-01-01"), ("https://example.com/b", None))
+        parser = _SitemapDocumentParser()
+
+        for i in range(0, len(body), 7):
+            parser.feed(body[i : i + 7])
+        parser.close()
+
+        assert not parser.is_index
+        assert [entry.url for entry in parser.entries] == ["https://example.com/a", "https://example.com/b"]
+        assert parser.entries[0].lastmod == datetime(2024, 1, 2, tzinfo=UTC)
+        assert parser.entries[1].lastmod is None
+
+
+class TestSitemapCrawlStrategy:
+    @pytest.mark.asyncio
+    async def test_follows_sitemap_index_children(self):
+        site = {
+            "https://example.com/sitemap.xml": sitemap_index(
+                "https://example.com/docs.xml", "https://example.com/blog.xml.gz"
+            ),
+            "https://example.com/docs.xml": urlset(("https://example.com/docs/1", None)),
+            "https://example.com/blog.xml.gz": gzip.compress(
+                urlset(("https://example.com/blog/1", None), ("https://example.com/docs/1", None))
+            ),
+        }
+
+        with serve(site):
+            urls = await SitemapCrawlStrategy().parse_sitemap("https://example.com/sitemap.xml")
+
+        assert urls == ["https://example.com/docs/1", "https://example.com/blog/1"]
+
+    @pytest.mark.asyncio
+    async def test_missing_child_sitemap_does_not_fail_the_index(self):
+        site = {
+            "https://example.com/sitemap.xml": sitemap_index(
+                "https://example.com/missing.xml", "https://example.com/docs.xml"
+            ),
+            "https://example.com/docs.xml": urlset(("https://example.com/docs/1", None)),
+        }
+
+        with serve(site):
+            urls = await SitemapCrawlStrategy().parse_sitemap("https://example.com/sitemap.xml")
+
+        assert urls == ["https://example.com/docs/1"]
+
+    @pytest.mark.asyncio
+    async def test_self_referencing_index_stops(self):
+        site = {"https://example.com/sitemap.xml": sitemap_index("https://example.com/sitemap.xml")}
+
+        with serve(site):
+            urls = await SitemapCrawlStrategy().parse_sitemap("https://example.com/sitemap.xml")
+
+        assert urls == []
@@ -0,0 +1,129 @@
+"""
+Tests for batched source deletion.
+
+Sources must be deleted by removing their rows in bounded DELETEs per table,
+reporting progress, and only then deleting the source row.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server.services.source_management_service import SOURCE_DELETE_TABLES, SourceManagementService
+
+
+class FakeTable:
+    """Minimal query builder over a list of row ids for one source."""
+
+    def __init__(self, name: str, ids: list, calls: list):
+        self.name = name
+        self.ids = ids
+        self.calls = calls
+        self._op = None
+        self._range = None
+        self._lte = None
+
+    def select(self, *args, **kwargs):
+        self._op = "select"
+        return self
+
+    def delete(self, **kwargs):
+        self._op = "delete"
+        self.calls.append((self.name, "delete", kwargs))
+        return self
+
+    def eq(self, *args):
+        return self
+
+    def order(self, *args):
+        return self
+
+    def range(self, start, end):
+        self._range = (start, end)
+        return self
+
+    def lte(self, column, value):
+        self._lte = value
+        return self
+
+    def execute(self):
+        if self.name == "archon_sources":
+            if self._op == "select":
+                return MagicMock(data=[SOURCE_ROW])
+            return MagicMock(data=None)
+        if self._op == "select":
+            start = self._range[0]
+            return MagicMock(data=[{"id": self.ids[start]}] if start < len(self.ids) else [])
+        removed = [i for i in self.ids if self._lte is None or i <= self._lte]
+        self.ids[:] = [i for i in self.ids if i not in removed]
+        return MagicMock(count=len(removed))
+
+
+SOURCE_ROW = {
+    "source_id": "src",
+    "archon_source_stats": {"chunk_count": 25, "code_example_count": 3, "page_count": 4},
+}
+
+
+def make_client(rows: dict[str, list]) -> tuple[MagicMock, list]:
+    calls: list = []
+    client = MagicMock()
+    client.table.side_effect = lambda name: FakeTable(name, rows.setdefault(name, []), calls)
+    return client, calls
+
+
+class TestDeleteSourceInBatches:
+    @pytest.mark.asyncio
+    async def test_deletes_rows_in_bounded_batches_then_the_source(self):
+        rows = {
+            "archon_crawled_pages": list(range(25)),
+            "archon_code_examples": list(range(3)),
+            "archon_page_metadata": [f"uuid-{i}" for i in range(4)],
+        }
+        client, calls = make_client(rows)
+        progress = AsyncMock()
+
+        success, result = await SourceManagementService(client).delete_source_in_batches(
+            "src", progress_callback=progress, batch_size=10
+        )
+
+        assert success
+        assert result["chunks_deleted"] == 25
+        assert result["code_examples_deleted"] == 3
+        assert result["pages_deleted"] == 4
+        assert all(not ids for ids in rows.values())
+
+        deleted_tables = [name for name, op, _kwargs in calls if op == "delete"]
+        # 25 chunks take three batches; the source row goes last
+        assert deleted_tables.count("archon_crawled_pages") == 3
+        assert deleted_tables[-1] == "archon_sources"
+        assert [t for t in dict.fromkeys(deleted_tables) if t != "archon_sources"] == list(SOURCE_DELETE_TABLES)
+        assert all(kwargs.get("returning") == "minimal" for _name, _op, kwargs in calls)
+
+        last_call = progress.await_args_list[-1]
+        assert last_call.args[0] == "deleting"
+        assert last_call.kwargs["rows_deleted"] == 32
+        assert last_call.kwargs["total_rows"] == 32
+
+    @pytest.mark.asyncio
+    async def test_missing_source_is_reported(self):
+        client = MagicMock()
+        client.table.return_value.select.return_value.eq.return_value.execute.return_value = MagicMock(data=[])
+
+        success, result = await SourceManagementService(client).delete_source_in_batches("missing")
+
+        assert not success
+        assert "not found" in result["error"]
+        client.table.return_value.delete.assert_not_called()
+
+
+class TestDeleteEndpoint:
+    def test_unknown_source_returns_404_without_starting_a_task(self, client, mock_supabase_client):
+        from src.server.api_routes import knowledge_api
+
+        with patch.object(knowledge_api, "get_supabase_client", return_value=mock_supabase_client):
+            response = client.delete("/api/knowledge-items/missing")
+
+        assert response.status_code == 404
+        assert not knowledge_api.active_crawl_tasks
+        mock_supabase_client.table.return_value.delete.assert_not_called()
@@ -0,0 +1,104 @@
+"""
+Tests for reading per-source statistics from archon_source_stats.
+
+The listing services must take counts from the stats embedded in the sources
+query instead of counting chunks and code examples per source.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.server.services.knowledge.knowledge_item_service import KnowledgeItemService
+from src.server.services.knowledge.knowledge_summary_service import KnowledgeSummaryService
+from src.server.services.knowledge.source_stats import SOURCE_STATS_EMBED, get_source_stats
+
+STATS = {
+    "chunk_count": 1200,
+    "code_example_count": 35,
+    "page_count": 80,
+    "word_count": 96000,
+    "first_url": "https://docs.example.com/intro",
+    "last_crawled_at": "2026-10-01T12:00:00+00:00",
+}
+
+
+def make_source(source_id: str, stats) -> dict:
+    return {
+        "source_id": source_id,
+        "title": f"Source {source_id}",
+        "summary": "Docs",
+        "metadata": {"knowledge_type": "technical", "tags": []},
+        "source_url": None,
+        "total_word_count": 96000,
+        "created_at": "2026-09-01T00:00:00+00:00",
+        "updated_at": "2026-09-02T00:00:00+00:00",
+        "archon_source_stats": stats,
+    }
+
+
+def make_client(sources: list[dict]) -> MagicMock:
+    """Supabase mock whose every query returns the sources and a total count."""
+    client = MagicMock()
+    query = MagicMock()
+    for method in ("select", "contains", "or_", "range", "order", "eq", "single"):
+        getattr(query, method).return_value = query
+    result = MagicMock(data=sources, count=len(sources))
+    query.execute.return_value = result
+    client.from_.return_value = query
+    return client
+
+
+class TestGetSourceStats:
+    def test_object_list_and_missing_embeds(self):
+        assert get_source_stats({"archon_source_stats": STATS}) == STATS
+        assert get_source_stats({"archon_source_stats": [STATS]}) == STATS
+
+        empty = get_source_stats({"archon_source_stats": None})
+        assert empty["chunk_count"] == 0
+        assert empty["first_url"] is None
+        assert get_source_stats({"archon_source_stats": []}) == empty
+        assert get_source_stats({}) == empty
+
+
+class TestListingsReadStats:
+    @pytest.mark.asyncio
+    async def test_list_items_uses_embedded_stats(self):
+        client = make_client([make_source("a", STATS), make_source("b", None)])
+
+        result = await KnowledgeItemService(client).list_items()
+
+        first, second = result["items"]
+        assert first["url"] == "https://docs.example.com/intro"
+        assert first["metadata"]["chunks_count"] == 1200
+        assert first["metadata"]["code_examples_count"] == 35
+        assert first["metadata"]["page_count"] == 80
+        assert first["metadata"]["last_scraped"] == STATS["last_crawled_at"]
+        assert second["url"] == "source://b"
+        assert second["metadata"]["chunks_count"] == 0
+        assert second["metadata"]["last_scraped"] == "2026-09-02T00:00:00+00:00"
+
+        # Only archon_sources is queried (page + total count), never chunks or code examples
+        assert {call.args[0] for call in client.from_.call_args_list} == {"archon_sources"}
+        assert SOURCE_STATS_EMBED in client.from_.return_value.select.call_args_list[0].args[0]
+
+    @pytest.mark.asyncio
+    async def test_summaries_use_embedded_stats(self):
+        client = make_client([make_source(str(i), STATS) for i in range(20)])
+
+        result = await KnowledgeSummaryService(client).get_summaries(per_page=20)
+
+        assert len(result["items"]) == 20
+        assert all(item["document_count"] == 1200 for item in result["items"])
+        assert all(item["code_examples_count"] == 35 for item in result["items"])
+        assert client.from_.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_item_reads_chunk_count_from_stats(self):
+        client = make_client([])
+        client.from_.return_value.execute.return_value = MagicMock(data=make_source("a", [STATS]))
+
+        item = await KnowledgeItemService(client).get_item("a")
+
+        assert item["metadata"]["chunks_count"] == 1200
+        assert item["url"] == "https://docs.example.com/intro"
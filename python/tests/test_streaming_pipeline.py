@@ -0,0 +1,116 @@
+"""
+Tests for the streaming crawl storage pipeline.
+
+Verifies micro-batching, that only the first batch creates the source record,
+and that storage failures stop the crawler.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.server.services.crawling.streaming_pipeline import StreamingStoragePipeline
+
+
+def make_doc_storage_ops(chunks_per_page: int = 2) -> MagicMock:
+    """DocumentStorageOperations mock that stores every page it is given."""
+    ops = MagicMock()
+
+    async def store(batch, *args, **kwargs):
+        chunk_count = len(batch) * chunks_per_page
+        return {
+            "chunk_count": chunk_count,
+            "chunks_stored": chunk_count,
+            "chunks_unchanged": 0,
+            "unchanged_urls": [],
+            "total_word_count": len(batch) * 10,
+            "url_to_full_document": {doc["url"]: doc["markdown"] for doc in batch},
+            "source_id": "src123",
+        }
+
+    ops.process_and_store_documents = AsyncMock(side_effect=store)
+    ops.extract_and_store_code_examples = AsyncMock(return_value=1)
+    ops.update_source_word_count = AsyncMock()
+    return ops
+
+
+def make_pages(count: int) -> list[dict]:
+    return [{"url": f"https://example.com/{i}", "markdown": f"Page {i}"} for i in range(count)]
+
+
+class TestStreamingStoragePipeline:
+    @pytest.mark.asyncio
+    async def test_pages_are_stored_in_micro_batches(self):
+        ops = make_doc_storage_ops()
+        pipeline = StreamingStoragePipeline(ops, {}, "src123", batch_pages=2, queue_size=2)
+        pipeline.crawl_type = "sitemap"
+
+        for page in make_pages(5):
+            await pipeline.submit(page)
+        result = await pipeline.finish()
+
+        batch_sizes = [len(call.args[0]) for call in ops.process_and_store_documents.call_args_list]
+        assert batch_sizes == [2, 2, 1]
+        assert result["chunks_stored"] == 10
+        assert result["total_word_count"] == 50
+        assert ops.process_and_store_documents.call_args.args[2] == "sitemap"
+
+    @pytest.mark.asyncio
+    async def test_only_first_batch_creates_source_and_word_count_is_fixed_up(self):
+        ops = make_doc_storage_ops()
+        pipeline = StreamingStoragePipeline(ops, {}, "src123", batch_pages=1)
+
+        for page in make_pages(3):
+            await pipeline.submit(page)
+        await pipeline.finish()
+
+        create_flags = [call.kwargs["create_source"] for call in ops.process_and_store_documents.call_args_list]
+        assert create_flags == [True, False, False]
+        ops.update_source_word_count.assert_awaited_once_with("src123", 30)
+
+    @pytest.mark.asyncio
+    async def test_code_examples_are_extracted_per_batch(self):
+        ops = make_doc_storage_ops()
+        pipeline = StreamingStoragePipeline(ops, {}, "src123", batch_pages=2, extract_code_examples=True)
+
+        for page in make_pages(4):
+            await pipeline.submit(page)
+        result = await pipeline.finish()
+
+        assert ops.extract_and_store_code_examples.await_count == 2
+        assert result["code_examples_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_storage_failure_stops_the_crawler(self):
+        ops = make_doc_storage_ops()
+        ops.process_and_store_documents = AsyncMock(side_effect=RuntimeError("database down"))
+        pipeline = StreamingStoragePipeline(ops, {}, "src123", batch_pages=1, queue_size=1)
+
+        with pytest.raises(RuntimeError, match="database down"):
+            for page in make_pages(10):
+                await pipeline.submit(page)
+            await pipeline.finish()
+
+    @pytest.mark.asyncio
+    async def test_batch_with_only_unchanged_chunks_is_not_a_failure(self):
+        ops = make_doc_storage_ops()
+
+        async def store_unchanged(batch, *args, **kwargs):
+            return {
+                "chunk_count": 2,
+                "chunks_stored": 0,
+                "chunks_unchanged": 2,
+                "unchanged_urls": [],
+                "total_word_count": 10,
+                "url_to_full_document": {},
+                "source_id": "src123",
+            }
+
+        ops.process_and_store_documents = AsyncMock(side_effect=store_unchanged)
+        pipeline = StreamingStoragePipeline(ops, {"incremental": True}, "src123", batch_pages=1)
+
+        await pipeline.submit(make_pages(1)[0])
+        result = await pipeline.finish()
+
+        assert result["chunks_stored"] == 0
+        assert result["chunks_unchanged"] == 2